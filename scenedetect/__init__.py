@@ -26,28 +26,74 @@
 
 """ ``scenedetect`` Module
 
-This is the main PySceneDetect module, containing imports of all classes
+This is the main PySceneDetect module, providing access to all commonly used classes
 so they can be directly accessed from the scenedetect module in addition
 to being directly imported (e.g. `from scenedetect import FrameTimecode`
 is the same as `from scenedetect.frame_timecode import FrameTimecode`).
 
+These classes (and all submodules, e.g. `scenedetect.detectors`) are only imported
+on first use, so that importing the scenedetect module (or running a command which
+does not process any videos, e.g. `scenedetect version`) does not also import
+OpenCV and NumPy.
+
 This file also contains the PySceneDetect version string (displayed when calling
 'scenedetect version'), the about string for license/copyright information
 (when calling 'scenedetect about').
 """
 
-# Commonly used classes for easier use directly from the scenedetect namespace (e.g.
-# scenedetect.SceneManager instead of scenedetect.scene_manager.SceneManager).
-from scenedetect.scene_manager import SceneManager
-from scenedetect.frame_timecode import FrameTimecode
-from scenedetect.video_manager import VideoManager
-from scenedetect.stats_manager import StatsManager
+# Standard Library Imports
+import importlib
+import sys
 
+# Commonly used classes for easier use directly from the scenedetect namespace (e.g.
+# scenedetect.SceneManager instead of scenedetect.scene_manager.SceneManager), mapped
+# to the module each is imported from on first use.
+#
 # We also bring the detectors into the main scenedetect package namespace
 # for convenience as well. Examples still reference the full package.
-from scenedetect.detectors import ThresholdDetector
-from scenedetect.detectors import ContentDetector
-from scenedetect.detectors import AdaptiveDetector
+_LAZY_ATTRIBUTES = {
+    'SceneManager': 'scenedetect.scene_manager',
+    'FrameTimecode': 'scenedetect.frame_timecode',
+    'VideoManager': 'scenedetect.video_manager',
+    'StatsManager': 'scenedetect.stats_manager',
+    'ThresholdDetector': 'scenedetect.detectors',
+    'ContentDetector': 'scenedetect.detectors',
+    'AdaptiveDetector': 'scenedetect.detectors',
+}
+
+# Submodules which can be accessed as attributes after only importing the scenedetect
+# module (e.g. scenedetect.detectors.HashDetector).
+_LAZY_SUBMODULES = frozenset([
+    'benchmark', 'cli', 'detectors', 'evaluation', 'frame_buffer', 'frame_timecode',
+    'metrics', 'platform', 'profiler', 'scene_detector', 'scene_manager', 'staging',
+    'stats_cache', 'stats_manager', 'sweep', 'thread_pool', 'video_manager', 'video_splitter',
+])
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    # type: (str) -> Any
+    """ Imports the module of the requested class or submodule on first access. """
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    elif name in _LAZY_SUBMODULES:
+        value = importlib.import_module('scenedetect.%s' % name)
+    else:
+        raise AttributeError("module 'scenedetect' has no attribute '%s'" % name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    # type: () -> List[str]
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | _LAZY_SUBMODULES)
+
+
+# Module-level __getattr__ requires Python 3.7+, so import everything up front otherwise.
+if sys.version_info < (3, 7):
+    for _name in __all__:
+        __getattr__(_name)
 
 
 # Used for module identification and when printing version & about info
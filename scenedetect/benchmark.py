@@ -0,0 +1,506 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" ``scenedetect.benchmark`` Module
+
+This module implements the `benchmark` command, which measures the throughput of
+PySceneDetect reproducibly. Deterministic synthetic videos (see :py:func:`generate_video`)
+are generated locally with a given resolution, length, and number of cuts, and each
+detector is run on them with every combination of downscale factor, frame skip, and
+execution mode (see :py:data:`MODES`) requested.
+
+The frames per second, peak memory usage, and time spent in each stage of processing
+(from a :py:class:`Profiler <scenedetect.profiler.Profiler>`) of each case are saved
+in JSON format, which can be compared against a previously saved baseline
+(see :py:func:`compare_results`) to detect performance regressions.
+
+Usage example::
+
+    video = generate_video('synthetic.avi', width=640, height=360, num_frames=600,
+                           num_cuts=10)
+    results = run_benchmark(video, get_benchmark_cases(['content'], modes=['sequential',
+                                                                          'workers']))
+    regressions = compare_results(results, baseline, tolerance=0.1)
+"""
+
+# Standard Library Imports
+import bisect
+import collections
+import itertools
+import json
+import os
+import os.path
+import platform
+
+# Third-Party Library Imports
+import numpy
+
+# PySceneDetect Library Imports
+import scenedetect
+from scenedetect.detectors import AdaptiveDetector
+from scenedetect.detectors import CascadeDetector
+from scenedetect.detectors import ContentDetector
+from scenedetect.detectors import DissolveDetector
+from scenedetect.detectors import HashDetector
+from scenedetect.detectors import HistogramDetector
+from scenedetect.detectors import MotionDetector
+from scenedetect.detectors import ThresholdDetector
+from scenedetect.platform import format_table
+from scenedetect.platform import get_peak_memory_usage
+from scenedetect.platform import import_cv2
+from scenedetect.profiler import Profiler
+from scenedetect.profiler import get_time
+from scenedetect.scene_manager import SceneManager
+from scenedetect.video_manager import VideoManager
+
+
+# Functions to create each detector which can be benchmarked, given the VideoManager, the
+# number of threads (for the detectors which support it), and any other arguments of the
+# detector (see parse_detector_spec).
+DETECTORS = collections.OrderedDict([
+    ('content', lambda video_manager, num_threads, **kwargs: ContentDetector(
+        num_threads=num_threads, **kwargs)),
+    ('content-luma', lambda video_manager, num_threads, **kwargs: ContentDetector(
+        luma_only=True, num_threads=num_threads, **kwargs)),
+    ('adaptive', lambda video_manager, num_threads, **kwargs: AdaptiveDetector(
+        video_manager, num_threads=num_threads, **kwargs)),
+    ('threshold', lambda video_manager, num_threads, **kwargs: ThresholdDetector(
+        num_threads=num_threads, **kwargs)),
+    ('cascade', lambda video_manager, num_threads, **kwargs: CascadeDetector(
+        ContentDetector(num_threads=num_threads), **kwargs)),
+    ('hash', lambda video_manager, num_threads, **kwargs: HashDetector(**kwargs)),
+    ('histogram', lambda video_manager, num_threads, **kwargs: HistogramDetector(**kwargs)),
+    ('dissolve', lambda video_manager, num_threads, **kwargs: DissolveDetector(**kwargs)),
+    ('motion', lambda video_manager, num_threads, **kwargs: MotionDetector(**kwargs)),
+])
+
+# Execution modes which can be benchmarked: sequential (the default), threads (frame
+# metrics computed on tiles of each frame in parallel, see --threads), workers (pipeline
+# mode, see --workers), and processes (multiprocess mode, see --processes).
+MODES = ('sequential', 'threads', 'workers', 'processes')
+
+# Types of transitions of synthetic videos with fades (see get_transitions).
+TRANSITIONS = ('cut', 'dissolve', 'fade')
+
+# Parameters of a single benchmark case. The detector may combine several detectors
+# with + (e.g. content+threshold), each with arguments (see parse_detector_spec).
+BenchmarkCase = collections.namedtuple(
+    'BenchmarkCase', ['detector', 'downscale', 'frame_skip', 'mode', 'num_jobs'])
+
+
+##
+## Synthetic Video Generation
+##
+
+def get_cut_frames(num_frames, num_cuts):
+    # type: (int, int) -> List[int]
+    """ Returns the frame numbers of num_cuts cuts spread evenly over num_frames frames. """
+    return [(i * num_frames) // (num_cuts + 1) for i in range(1, num_cuts + 1)]
+
+
+def get_transitions(num_cuts, fade_length=0):
+    # type: (int, int) -> List[str]
+    """ Returns the type of each transition of a synthetic video (see generate_video):
+    all are cuts if fade_length is 0, otherwise they cycle through cut, dissolve, and
+    fade (to black and back). """
+    if fade_length <= 0:
+        return ['cut'] * num_cuts
+    return [TRANSITIONS[i % len(TRANSITIONS)] for i in range(num_cuts)]
+
+
+def generate_video(path, width=640, height=360, num_frames=600, num_cuts=10,
+                   framerate=30.0, seed=0, fade_length=0):
+    # type: (str, int, int, int, int, float, int, int) -> Dict[str, Any]
+    """ Writes a deterministic synthetic video (Motion JPEG in an .avi container) with
+    the given number of evenly spaced transitions. Each scene is a different random
+    pattern of smooth blobs, panning slowly so that consecutive frames are not identical.
+
+    Arguments:
+        path: Path of the video file to write.
+        width, height: Resolution of the video.
+        num_frames: Length of the video, in frames.
+        num_cuts: Number of transitions (the video has num_cuts + 1 scenes).
+        framerate: Framerate of the video.
+        seed: Seed of the random patterns of each scene.
+        fade_length: If greater than 0, the transitions cycle through cuts, dissolves,
+            and fades (see get_transitions), the latter two lasting fade_length frames
+            centered on the frame of the transition.
+
+    Returns:
+        Dict[str, Any]: Parameters of the video (path, width, height, num_frames,
+        num_cuts, framerate, seed, fade_length), the frame number of each transition
+        (cuts), and the type of each transition (transitions).
+
+    Raises:
+        ValueError: fade_length is not shorter than the scenes.
+    """
+    cv2 = import_cv2()
+    cut_frames = get_cut_frames(num_frames, num_cuts)
+    transitions = get_transitions(num_cuts, fade_length)
+    if fade_length > 0 and fade_length >= num_frames // (num_cuts + 1):
+        raise ValueError('fade_length must be shorter than the scenes.')
+    scene_starts = [0] + cut_frames
+    random_state = numpy.random.RandomState(seed)
+    # Scenes are twice the size of the video, and are panned over diagonally. Patterns
+    # are generated in order of the scenes, and only kept while required.
+    patterns = {}
+
+    def get_scene_frame(scene, frame_num):
+        if scene not in patterns:
+            pattern = random_state.randint(
+                0, 256, ((2 * height) // 32 + 1, (2 * width) // 32 + 1, 3)).astype(numpy.uint8)
+            patterns[scene] = cv2.resize(pattern, (2 * width, 2 * height),
+                                         interpolation=cv2.INTER_CUBIC)
+            patterns.pop(scene - 2, None)
+        offset = max(0, frame_num - scene_starts[scene]) % min(width, height)
+        return patterns[scene][offset:offset + height, offset:offset + width]
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), framerate, (width, height))
+    if not writer.isOpened():
+        raise IOError('Failed to open video for writing: %s' % path)
+    try:
+        for frame_num in range(num_frames):
+            scene = bisect.bisect_right(cut_frames, frame_num)
+            frame_img = get_scene_frame(scene, frame_num)
+            for i in (scene - 1, scene):
+                if not 0 <= i < num_cuts or transitions[i] == 'cut':
+                    continue
+                fade_start = cut_frames[i] - fade_length // 2
+                if not fade_start <= frame_num < fade_start + fade_length:
+                    continue
+                position = (frame_num - fade_start + 1) / (fade_length + 1.0)
+                last_img = get_scene_frame(i, frame_num)
+                next_img = get_scene_frame(i + 1, frame_num)
+                if transitions[i] == 'dissolve':
+                    frame_img = cv2.addWeighted(last_img, 1.0 - position, next_img, position, 0)
+                elif position < 0.5:
+                    frame_img = cv2.convertScaleAbs(last_img, alpha=1.0 - 2.0 * position)
+                else:
+                    frame_img = cv2.convertScaleAbs(next_img, alpha=2.0 * position - 1.0)
+            writer.write(frame_img)
+    finally:
+        writer.release()
+    return _get_video_info(path, width, height, num_frames, num_cuts, framerate, seed,
+                           fade_length)
+
+
+def _get_video_info(path, width, height, num_frames, num_cuts, framerate, seed, fade_length):
+    # type: (str, int, int, int, int, float, int, int) -> Dict[str, Any]
+    """ Returns the parameters and cuts of a synthetic video (see generate_video). """
+    return collections.OrderedDict([
+        ('path', path), ('width', width), ('height', height), ('num_frames', num_frames),
+        ('num_cuts', num_cuts), ('framerate', framerate), ('seed', seed),
+        ('fade_length', fade_length), ('cuts', get_cut_frames(num_frames, num_cuts)),
+        ('transitions', get_transitions(num_cuts, fade_length))])
+
+
+def get_synthetic_video(video_dir, width=640, height=360, num_frames=600, num_cuts=10,
+                        framerate=30.0, seed=0, fade_length=0):
+    # type: (str, int, int, int, int, float, int, int) -> Dict[str, Any]
+    """ Same as generate_video, but reuses any video in video_dir previously generated
+    with the same parameters. """
+    name = 'synthetic_%dx%d_%df_%dc_%gfps_s%d' % (
+        width, height, num_frames, num_cuts, framerate, seed)
+    if fade_length > 0:
+        name += '_fade%d' % fade_length
+    path = os.path.join(video_dir, name + '.avi')
+    if not os.path.exists(path):
+        if not os.path.exists(video_dir):
+            os.makedirs(video_dir)
+        temp_path = os.path.join(video_dir, name + '.part.avi')
+        generate_video(temp_path, width, height, num_frames, num_cuts, framerate, seed,
+                       fade_length)
+        os.replace(temp_path, path)
+    return _get_video_info(path, width, height, num_frames, num_cuts, framerate, seed,
+                           fade_length)
+
+
+##
+## Benchmark Helper Functions
+##
+
+def parse_detector_spec(spec):
+    # type: (str) -> List[Tuple[str, Dict[str, Any]]]
+    """ Parses a detector specification: the name of one or more detectors (see DETECTORS)
+    joined with +, each optionally followed by a colon and comma-separated arguments of
+    the detector (e.g. 'content:threshold=27,min_scene_len=10+hash'). Argument values are
+    parsed as JSON if possible (e.g. numbers, true/false), otherwise used as strings.
+
+    Returns:
+        List[Tuple[str, Dict[str, Any]]]: Name and arguments of each detector.
+
+    Raises:
+        ValueError: A detector is unknown, or an argument is not in the form key=value.
+    """
+    detectors = []
+    for detector_spec in spec.split('+'):
+        name, _, args = detector_spec.partition(':')
+        if name not in DETECTORS:
+            raise ValueError('Unknown detector: %s' % name)
+        kwargs = {}
+        for arg in args.split(',') if args else []:
+            key, sep, value = arg.partition('=')
+            if not sep or not key:
+                raise ValueError('Invalid argument of detector %s: %s' % (name, arg))
+            try:
+                kwargs[key] = json.loads(value)
+            except ValueError:
+                kwargs[key] = value
+        detectors.append((name, kwargs))
+    return detectors
+
+
+def create_detectors(spec, video_manager, num_threads=1):
+    # type: (str, VideoManager, int) -> List[SceneDetector]
+    """ Creates the detectors of a detector specification (see parse_detector_spec).
+
+    Raises:
+        ValueError: The specification is invalid.
+        TypeError: An argument is not supported by the detector.
+    """
+    return [DETECTORS[name](video_manager, num_threads, **kwargs)
+            for name, kwargs in parse_detector_spec(spec)]
+
+
+def get_benchmark_cases(detectors, downscales=(1,), frame_skips=(0,), modes=('sequential',),
+                        num_jobs=2):
+    # type: (Iterable[str], Iterable[int], Iterable[int], Iterable[str], int)
+    #   -> List[BenchmarkCase]
+    """ Returns a BenchmarkCase for each combination of the given detectors (see
+    parse_detector_spec), downscale factors, frame skip values, and modes (see MODES).
+    num_jobs is the number of threads, workers, or processes used in the respective
+    modes. """
+    for detector in detectors:
+        parse_detector_spec(detector)
+    for mode in modes:
+        if mode not in MODES:
+            raise ValueError('Unknown mode: %s' % mode)
+    return [BenchmarkCase(detector, downscale, frame_skip, mode,
+                          num_jobs if mode != 'sequential' else 0)
+            for detector, downscale, frame_skip, mode in itertools.product(
+                detectors, downscales, frame_skips, modes)]
+
+
+def get_case_name(case):
+    # type: (BenchmarkCase) -> str
+    """ Returns the name of a case, used to match it with the same case in a baseline. """
+    name = '%s/downscale=%d/frame_skip=%d/%s' % (
+        case.detector, case.downscale, case.frame_skip, case.mode)
+    if case.mode != 'sequential':
+        name += '=%d' % case.num_jobs
+    return name
+
+
+def run_benchmark_case(video_path, case):
+    # type: (str, BenchmarkCase) -> Dict[str, Any]
+    """ Detects scenes in the given video with the parameters of the case.
+
+    Returns:
+        Dict[str, Any]: Result of the case, with the number of frames processed, elapsed
+        time in seconds, frames per second, peak memory usage of the process in bytes
+        (or None if unavailable), the cuts detected, and the number of calls and total
+        time of each stage (see Profiler.get_stages).
+
+    Raises:
+        ValueError: The parameters of the case are not supported (e.g. frame skip with
+            a detector which requires a StatsManager).
+        TypeError: An argument of a detector is not supported.
+    """
+    profiler = Profiler()
+    num_threads = case.num_jobs if case.mode == 'threads' else 1
+    video_manager = VideoManager([video_path], profiler=profiler)
+    try:
+        video_manager.set_downscale_factor(case.downscale)
+        scene_manager = SceneManager(profiler=profiler)
+        for detector in create_detectors(case.detector, video_manager, num_threads):
+            scene_manager.add_detector(detector)
+        video_manager.start()
+        start_time = get_time()
+        num_frames = scene_manager.detect_scenes(
+            frame_source=video_manager, frame_skip=case.frame_skip, show_progress=False,
+            workers=case.num_jobs if case.mode == 'workers' else 0,
+            processes=case.num_jobs if case.mode == 'processes' else 0)
+        elapsed_time = get_time() - start_time
+        base_timecode = video_manager.get_base_timecode()
+        cuts = [cut.get_frames() for cut in scene_manager.get_cut_list(base_timecode)]
+    finally:
+        video_manager.release()
+    return collections.OrderedDict([
+        ('num_frames', num_frames),
+        ('elapsed_time', elapsed_time),
+        ('fps', num_frames / elapsed_time if elapsed_time > 0 else 0.0),
+        ('peak_memory_usage', get_peak_memory_usage()),
+        ('cuts', cuts),
+        ('stages', collections.OrderedDict([
+            (stage, {'calls': num_calls, 'total_time': total_time})
+            for stage, (num_calls, total_time) in profiler.get_stages().items()])),
+    ])
+
+
+def _run_isolated(video_path, case):
+    # type: (str, BenchmarkCase) -> Dict[str, Any]
+    """ Runs the case in a new process, so that its peak memory usage is not affected by
+    any previous cases. """
+    # Imported here as it also imports multiprocessing, which is slow to import.
+    # pylint: disable=import-outside-toplevel
+    import multiprocessing
+    # ProcessPoolExecutor only accepts a multiprocessing context on Python 3.7+.
+    with multiprocessing.get_context('spawn').Pool(processes=1) as pool:
+        return pool.apply(run_benchmark_case, (video_path, case))
+
+
+def run_benchmark(video, cases, repeat=1, isolate=True, logger=None):
+    # type: (Dict[str, Any], List[BenchmarkCase], int, bool, Optional[logging.Logger])
+    #   -> Dict[str, Any]
+    """ Runs each case on the given video, and returns the results.
+
+    Arguments:
+        video: Parameters of the video to use, as returned by generate_video.
+        cases: Cases to run (see get_benchmark_cases).
+        repeat: Number of times to run each case, keeping the fastest run.
+        isolate: If True, each run is done in a new process (so the peak memory usage of
+            each case is measured separately), otherwise in the calling process.
+        logger: Logger to report the result of each case to, if any.
+
+    Returns:
+        Dict[str, Any]: The version of PySceneDetect and its dependencies, the video
+        parameters, and a list of the results of each case (see run_benchmark_case), each
+        with its name and parameters. Cases which failed only have an error message.
+    """
+    cv2 = import_cv2()
+    results = []
+    for case in cases:
+        result = collections.OrderedDict([('name', get_case_name(case))])
+        result.update(case._asdict())
+        runs = []
+        try:
+            for _ in range(repeat):
+                runs.append(_run_isolated(video['path'], case) if isolate
+                            else run_benchmark_case(video['path'], case))
+        except Exception as ex:  # pylint: disable=broad-except
+            result['error'] = str(ex) if str(ex) else type(ex).__name__
+            if logger is not None:
+                logger.error('%s: failed: %s', result['name'], result['error'])
+        else:
+            result.update(max(runs, key=lambda run: run['fps']))
+            if logger is not None:
+                logger.info('%s: %.1f FPS', result['name'], result['fps'])
+        results.append(result)
+    return collections.OrderedDict([
+        ('version', scenedetect.__version__),
+        ('platform', collections.OrderedDict([
+            ('python', platform.python_version()),
+            ('opencv', cv2.__version__),
+            ('numpy', numpy.__version__),
+            ('system', platform.platform()),
+            ('cpu_count', os.cpu_count()),
+        ])),
+        ('video', video),
+        ('results', results),
+    ])
+
+
+def get_stage_times(result):
+    # type: (Dict[str, Any]) -> Tuple[float, float]
+    """ Returns the total time spent decoding frames (VideoManager stages), and running
+    the detectors (all other stages except SceneManager.detect_scenes) of a result. """
+    decode_time = 0.0
+    detect_time = 0.0
+    for stage, stage_info in result.get('stages', {}).items():
+        if stage.startswith('VideoManager.'):
+            decode_time += stage_info['total_time']
+        elif stage != 'SceneManager.detect_scenes':
+            detect_time += stage_info['total_time']
+    return decode_time, detect_time
+
+
+def get_report(results):
+    # type: (Dict[str, Any]) -> str
+    """ Returns a table of the FPS, peak memory usage, time spent decoding and detecting,
+    and number of cuts of each case in the results (as returned by run_benchmark). """
+    rows = [('Case', 'FPS', 'Peak RSS (MB)', 'Decode (s)', 'Detect (s)', 'Cuts')]
+    for result in results['results']:
+        if 'error' in result:
+            rows.append((result['name'], 'error', '', '', '', ''))
+            continue
+        decode_time, detect_time = get_stage_times(result)
+        peak_memory = result['peak_memory_usage']
+        rows.append((
+            result['name'], '%.1f' % result['fps'],
+            '%.1f' % (peak_memory / 1048576.0) if peak_memory is not None else 'n/a',
+            '%.3f' % decode_time, '%.3f' % detect_time, '%d' % len(result['cuts'])))
+    return format_table(rows)
+
+
+def compare_results(results, baseline, tolerance=0.1):
+    # type: (Dict[str, Any], Dict[str, Any], float) -> List[str]
+    """ Compares results against a baseline (both as returned by run_benchmark), matching
+    cases by name (cases only in one of them are ignored).
+
+    Arguments:
+        results: Results to compare.
+        baseline: Previously saved results.
+        tolerance: Fraction by which the FPS of a case may be lower, or its peak memory
+            usage higher, than that of the baseline (e.g. 0.1 for 10%).
+
+    Returns:
+        List[str]: Description of each regression: a case which is slower or uses more
+        memory than allowed by the tolerance, detects different cuts than the baseline,
+        or failed when the baseline did not.
+
+    Raises:
+        ValueError: The results and baseline were not run on the same video.
+    """
+    video_keys = ('width', 'height', 'num_frames', 'num_cuts', 'framerate', 'seed',
+                  'fade_length')
+    if any(results['video'].get(key) != baseline['video'].get(key) for key in video_keys):
+        raise ValueError('Baseline was run on a different video (%s).' % ', '.join(
+            '%s=%s' % (key, baseline['video'].get(key)) for key in video_keys))
+    baseline_results = {result['name']: result for result in baseline['results']}
+    regressions = []
+    for result in results['results']:
+        name = result['name']
+        base = baseline_results.get(name)
+        if base is None or 'error' in base:
+            continue
+        if 'error' in result:
+            regressions.append('%s: failed (%s)' % (name, result['error']))
+            continue
+        if result['fps'] < base['fps'] * (1.0 - tolerance):
+            regressions.append('%s: %.1f FPS is %.1f%% slower than baseline (%.1f FPS)' % (
+                name, result['fps'], 100.0 * (1.0 - result['fps'] / base['fps']), base['fps']))
+        peak_memory, base_peak_memory = result['peak_memory_usage'], base['peak_memory_usage']
+        if (peak_memory is not None and base_peak_memory
+                and peak_memory > base_peak_memory * (1.0 + tolerance)):
+            regressions.append('%s: peak memory %.1f MB is %.1f%% higher than baseline'
+                               ' (%.1f MB)' % (
+                                   name, peak_memory / 1048576.0,
+                                   100.0 * (peak_memory / base_peak_memory - 1.0),
+                                   base_peak_memory / 1048576.0))
+        if result['cuts'] != base['cuts']:
+            regressions.append('%s: cuts differ from baseline (%d detected, %d in baseline)' % (
+                name, len(result['cuts']), len(base['cuts'])))
+    return regressions
@@ -42,7 +42,12 @@ module and the scenedetect.cli.CliContext object.
 
 # Standard Library Imports
 from __future__ import print_function
+import json
 import logging
+import os
+import shutil
+import tempfile
+import time
 
 # Third-Party Library Imports
 import click
@@ -50,12 +55,19 @@ import click
 # PySceneDetect Library Imports
 import scenedetect
 
+from scenedetect.cli.batch import expand_input_patterns
+from scenedetect.cli.batch import get_batch_job_args
+from scenedetect.cli.batch import run_batch
+from scenedetect.cli.batch import write_batch_report
 from scenedetect.cli.context import check_split_video_requirements
 from scenedetect.cli.context import contains_sequence_or_url
 from scenedetect.cli.context import parse_timecode
 
 from scenedetect.platform import get_and_create_path
+from scenedetect.staging import StagingCache
 from scenedetect.platform import init_logger
+from scenedetect.stats_manager import ZSTD_EXTENSION
+from scenedetect.stats_manager import is_compressed_path
 logger = logging.getLogger('pyscenedetect')
 
 def get_help_command_preface(command_name='scenedetect'):
@@ -149,9 +161,53 @@ def duplicate_command(ctx, param_hint):
                              param_hint='%s command' % param_hint)
 
 
+def split_cli_args(ctx):
+    # type: (click.Context) -> Tuple[List[str], List[str]]
+    """ Splits the command-line arguments into the global options, and the commands following
+    the command of ctx (e.g. batch), which must be the first command specified. Used by
+    commands which run the following commands as separate jobs.
+
+    Raises:
+        click.BadParameter: The command is not the first one, the global -i/--input
+        option was specified, or the global -s/--stats option was specified without
+        $VIDEO_NAME (and is not overridden by a --stats option of the command).
+    """
+    command_name = ctx.command.name
+    if ctx.parent.params['input']:
+        raise click.BadParameter(
+            'The -i/--input option must be specified after the %s command.' % command_name,
+            param_hint=command_name)
+    # Every job would otherwise read and write the same stats file at the same time.
+    stats = ctx.parent.params['stats']
+    if stats is not None and '$VIDEO_NAME' not in stats and ctx.params.get('stats') is None:
+        raise click.BadParameter(
+            'The -s/--stats path must contain $VIDEO_NAME when used with the %s command'
+            ' (e.g. -s "$VIDEO_NAME.stats.csv").' % command_name, param_hint=command_name)
+    cli_args = ctx.obj.cli_args
+    _, command_args, _ = ctx.parent.command.make_parser(ctx.parent).parse_args(list(cli_args))
+    global_args = cli_args[:len(cli_args) - len(command_args)]
+    if not command_args or command_args[0] != command_name:
+        raise click.BadParameter(
+            'The %s command must be specified before any other command.' % command_name,
+            param_hint=command_name)
+    _, command_args, _ = ctx.command.make_parser(ctx).parse_args(command_args[1:])
+    return global_args, command_args
+
+
+class CliGroup(click.Group):
+    """ Chained command group of the scenedetect command, which also stores all of the
+    command-line arguments in the CliContext (used by the batch command to run the same
+    commands for each input). """
+
+    def parse_args(self, ctx, args):
+        if ctx.obj is not None:
+            ctx.obj.cli_args = list(args)
+        return super(CliGroup, self).parse_args(ctx, args)
+
+
 
 @click.group(
-    chain=True, context_settings=CLICK_CONTEXT_SETTINGS)
+    cls=CliGroup, chain=True, context_settings=CLICK_CONTEXT_SETTINGS)
 @click.option(
     '--input', '-i',
     multiple=True, required=False, metavar='VIDEO',
@@ -183,6 +239,26 @@ def duplicate_command(ctx, param_hint):
     'Skips N frames during processing (-fs 1 skips every other frame, processing 50% of the video,'
     ' -fs 2 processes 33% of the frames, -fs 3 processes 25%, etc...).'
     ' Reduces processing speed at expense of accuracy.')
+@click.option(
+    '--threads', metavar='N', show_default=True,
+    type=click.IntRange(1, None), default=1, help=
+    'Number of threads used to compute the frame metrics of detect-content, detect-adaptive,'
+    ' and detect-threshold, by splitting each frame into horizontal tiles. Mainly useful for'
+    ' high resolution videos with little or no downscaling (e.g. -d 1).')
+@click.option(
+    '--workers', metavar='N', show_default=True,
+    type=click.IntRange(0, None), default=0, help=
+    'Number of worker threads used to compute frame metrics while the next frames are'
+    ' decoded, if all detectors support it (detect-content, detect-adaptive,'
+    ' detect-threshold, detect-hash, and detect-histogram). Scenes are still detected'
+    ' in frame order, so the results are the same as with 0 (disabled).')
+@click.option(
+    '--processes', metavar='N', show_default=True,
+    type=click.IntRange(0, None), default=0, help=
+    'Number of worker processes to split the detectors between, if more than one detector'
+    ' is used. Decoded frames are shared with the workers through shared memory, and the'
+    ' results are the same as with 0 (disabled). Takes priority over --workers.'
+    ' Requires Python 3.8 or above.')
 @click.option(
     '--min-scene-len', '-m', metavar='TIMECODE',
     type=click.STRING, default='0.6s', show_default=True, help=
@@ -198,7 +274,69 @@ def duplicate_command(ctx, param_hint):
     'Path to stats file (.csv) for writing frame metrics to. If the file exists, any'
     ' metrics will be processed, otherwise a new file will be created. Can be used to determine'
     ' optimal values for various scene detector options, and to cache frame calculations in order'
-    ' to speed up multiple detection runs.')
+    ' to speed up multiple detection runs. Compressed if the path ends with .gz (or .zst, which'
+    ' requires the zstandard package). $VIDEO_NAME is replaced with the name of the input'
+    ' video.')
+@click.option(
+    '--stats-flush', metavar='SECONDS',
+    type=click.FloatRange(0.0, None), default=None, help=
+    'Write frame metrics to the -s/--stats file while processing, appending new metrics every'
+    ' SECONDS, instead of only once complete. If processing is interrupted, running the same'
+    ' command again resumes from the metrics written so far.')
+@click.option(
+    '--cache-dir', metavar='DIR', envvar='SCENEDETECT_CACHE_DIR',
+    type=click.Path(exists=False, file_okay=False, writable=True, resolve_path=False), help=
+    'Directory to cache frame metrics and detected scenes in, keyed by the content of the'
+    ' input video(s) and the detection options, so that processing the same input again'
+    ' skips detection (or reuses the frame metrics if only some detector options changed).'
+    ' Can also be set with the SCENEDETECT_CACHE_DIR environment variable.')
+@click.option(
+    '--cache-size', metavar='MB',
+    type=click.IntRange(1, None), default=1024, show_default=True, help=
+    'Maximum total size of --cache-dir in megabytes, after which the least recently used'
+    ' entries are removed.')
+@click.option(
+    '--checkpoint', metavar='JSON',
+    type=click.Path(exists=False, file_okay=True, writable=True, resolve_path=False), help=
+    'Path to periodically save the state of scene detection to (every --checkpoint-interval'
+    ' seconds), so that an interrupted run can be continued with --resume. $VIDEO_NAME is'
+    ' replaced with the name of the input video. Removed once processing is complete.'
+    ' Uses -o/--output if set.')
+@click.option(
+    '--checkpoint-interval', metavar='SECONDS',
+    type=click.FloatRange(0.1, None), default=60.0, show_default=True, help=
+    'Interval between updates of the --checkpoint file.')
+@click.option(
+    '--resume',
+    is_flag=True, flag_value=True, help=
+    'Continue scene detection from the --checkpoint file if it exists, and was saved for the'
+    ' same input and detector options.')
+@click.option(
+    '--profile',
+    is_flag=True, flag_value=True, help=
+    'Measure the time spent in each stage of processing (decoding, each detector, stats file'
+    ' loading/saving, and each output command), and print a report once complete.')
+@click.option(
+    '--profile-trace', metavar='JSON',
+    type=click.Path(exists=False, file_okay=True, writable=True, resolve_path=False), help=
+    'Path to write every profiled call to in the Chrome trace event format (viewable in'
+    ' chrome://tracing or ui.perfetto.dev). Implies --profile. Uses -o/--output if set.')
+@click.option(
+    '--metrics-jsonl', metavar='JSONL',
+    type=click.Path(exists=False, file_okay=True, writable=True, resolve_path=False), help=
+    'Path to append live metrics of scene detection to (frames decoded/cached/skipped, FPS,'
+    ' cuts found, memory usage, etc...), as one JSON object per line every'
+    ' --metrics-interval seconds. Uses -o/--output if set.')
+@click.option(
+    '--metrics-prom', metavar='PROM',
+    type=click.Path(exists=False, file_okay=True, writable=True, resolve_path=False), help=
+    'Path to write the latest live metrics of scene detection to in the Prometheus text'
+    ' format (e.g. for the node exporter textfile collector), replaced every'
+    ' --metrics-interval seconds. Uses -o/--output if set.')
+@click.option(
+    '--metrics-interval', metavar='SECONDS',
+    type=click.FloatRange(0.1, None), default=5.0, show_default=True, help=
+    'Interval between updates of --metrics-jsonl and --metrics-prom.')
 @click.option(
     '--verbosity', '-v', metavar='LEVEL',
     type=click.Choice(['none', 'debug', 'info', 'warning', 'error']), default='info', help=
@@ -215,11 +353,15 @@ def duplicate_command(ctx, param_hint):
     is_flag=True, flag_value=True, help=
     'Suppresses all output of PySceneDetect to the terminal/stdout. If a logfile is'
     ' specified, it will still be generated with the specified verbosity.')
+@click.version_option(
+    scenedetect.__version__, '--version', message='PySceneDetect %(version)s', help=
+    'Print version of PySceneDetect and exit (same as the version command).')
 @click.pass_context
 # pylint: disable=redefined-builtin
-def scenedetect_cli(ctx, input, output, framerate, downscale, frame_skip,
-                    min_scene_len, drop_short_scenes, stats,
-                    verbosity, logfile, quiet):
+def scenedetect_cli(ctx, input, output, framerate, downscale, frame_skip, threads, workers,
+                    processes, min_scene_len, drop_short_scenes, stats, stats_flush, cache_dir,
+                    cache_size, checkpoint, checkpoint_interval, resume, profile, profile_trace,
+                    metrics_jsonl, metrics_prom, metrics_interval, verbosity, logfile, quiet):
     """ For example:
 
     scenedetect -i video.mp4 -s video.stats.csv detect-content list-scenes
@@ -252,12 +394,51 @@ def scenedetect_cli(ctx, input, output, framerate, downscale, frame_skip,
             '\n  Combining the -s/--stats and -fs/--frame-skip options is not supported.',
             param_hint='frame skip + stats file')
 
+    if stats_flush is not None and stats is None:
+        ctx.obj.options_processed = False
+        raise click.BadParameter(
+            '\n  The --stats-flush option requires a -s/--stats file.',
+            param_hint='stats flush')
+
+    if processes > 0:
+        from scenedetect.platform import shared_memory  # pylint: disable=import-outside-toplevel
+        if shared_memory is None:
+            ctx.obj.options_processed = False
+            raise click.BadParameter(
+                '\n  The --processes option requires Python 3.8 or above.',
+                param_hint='processes')
+
+    if stats is not None and stats.lower().endswith(ZSTD_EXTENSION):
+        from scenedetect.platform import zstandard  # pylint: disable=import-outside-toplevel
+        if zstandard is None:
+            ctx.obj.options_processed = False
+            raise click.BadParameter(
+                '\n  The zstandard package is required for .zst stats files'
+                ' (pip install zstandard).', param_hint='stats file')
+
+    if stats_flush is not None and is_compressed_path(stats):
+        ctx.obj.options_processed = False
+        raise click.BadParameter(
+            '\n  The --stats-flush option does not support compressed stats files.',
+            param_hint='stats flush')
+
+    if resume and checkpoint is None:
+        ctx.obj.options_processed = False
+        raise click.BadParameter(
+            '\n  The --resume option requires a --checkpoint file.',
+            param_hint='resume')
+
     try:
         if ctx.obj.output_directory is not None:
             ctx.obj.logger.info('Output directory set:\n  %s', ctx.obj.output_directory)
         ctx.obj.parse_options(
             input_list=input, framerate=framerate, stats_file=stats, downscale=downscale,
-            frame_skip=frame_skip, min_scene_len=min_scene_len, drop_short_scenes=drop_short_scenes)
+            frame_skip=frame_skip, min_scene_len=min_scene_len, drop_short_scenes=drop_short_scenes,
+            num_threads=threads, num_workers=workers, num_processes=processes,
+            profile=profile, profile_trace=profile_trace, metrics_jsonl=metrics_jsonl,
+            metrics_prom=metrics_prom, metrics_interval=metrics_interval,
+            cache_dir=cache_dir, cache_size=cache_size * 1024 * 1024, stats_flush=stats_flush,
+            checkpoint=checkpoint, checkpoint_interval=checkpoint_interval, resume=resume)
 
     except Exception as ex:
         ctx.obj.logger.error('Could not parse CLI options.: %s', ex)
@@ -330,6 +511,707 @@ def version_command(ctx):
 
 
 
+@click.command('batch')
+@click.option(
+    '--input', '-i', metavar='PATTERN',
+    multiple=True, required=True, type=click.STRING, help=
+    'Input video(s), where PATTERN may contain wildcards (e.g. "videos/*.mp4",'
+    ' or "videos/**/*.mp4" to include subdirectories). Use quotes so that the pattern is not'
+    ' expanded by the shell. May be specified multiple times.')
+@click.option(
+    '--jobs', '-j', metavar='N',
+    type=click.IntRange(1, None), default=None, help=
+    'Number of videos to process in parallel, each in a separate worker process.'
+    ' [default: number of CPU cores]')
+@click.option(
+    '--output', '-o', metavar='DIR',
+    type=click.STRING, default=None, help=
+    'Output directory of each video, overriding the global -o/--output option.'
+    ' Can use $VIDEO_NAME macro (e.g. -o "output/$VIDEO_NAME").')
+@click.option(
+    '--stats', '-s', metavar='CSV',
+    type=click.STRING, default=None, help=
+    'Path to the stats file of each video, overriding the global -s/--stats option.'
+    ' Can use $VIDEO_NAME macro (e.g. -s "$VIDEO_NAME.stats.csv").')
+@click.option(
+    '--report', '-r', metavar='CSV',
+    type=click.Path(exists=False, file_okay=True, writable=True, resolve_path=False), help=
+    'Path to write a report (.csv) with the status, number of scenes, number of frames,'
+    ' and processing time of each video.')
+@click.option(
+    '--stage-dir', metavar='DIR',
+    type=click.Path(exists=False, file_okay=False, writable=True, resolve_path=True), help=
+    'If set, each video is first copied to a local scratch directory DIR (using large'
+    ' sequential reads), while the previous videos are being processed. Improves'
+    ' throughput for videos on slow or network storage.')
+@click.option(
+    '--stage-size', metavar='MB', show_default=True,
+    type=click.IntRange(1, None), default=4096, help=
+    'Maximum total size, in megabytes, of the copies in --stage-dir. The least recently'
+    ' used copies which are not being processed are removed once it is exceeded.')
+@click.option(
+    '--prefetch', metavar='N', show_default=True,
+    type=click.IntRange(0, None), default=2, help=
+    'Number of videos to copy to --stage-dir ahead of those being processed.')
+@click.pass_context
+# pylint: disable=redefined-builtin
+def batch_command(ctx, input, jobs, output, stats, report, stage_dir, stage_size, prefetch):
+    """ Run the following commands on many videos in parallel.
+
+    Must be specified before any other command, and the global -i/--input option
+    must not be set. For example, to detect scenes in all videos in a directory,
+    processing 8 videos at a time, writing the scene list of each to a CSV file:
+
+    scenedetect batch -i "videos/*.mp4" -j 8 detect-content list-scenes
+
+    Each video is processed separately (as if the scenedetect command was run
+    for each one), and a summary is displayed once all are complete. Terminal
+    output of the commands is suppressed, so the results should be written to
+    files (e.g. with list-scenes, save-images, or split-video).
+    """
+    ctx.obj.options_processed = False
+    global_args, command_args = split_cli_args(ctx)
+    if not command_args:
+        raise click.BadParameter(
+            'No commands specified to run on each video (e.g. detect-content list-scenes).',
+            param_hint='batch')
+
+    input_paths = expand_input_patterns(input)
+    if not input_paths:
+        raise click.BadParameter('No input videos found.', param_hint='batch')
+    num_workers = jobs if jobs is not None else (os.cpu_count() or 1)
+    ctx.obj.logger.info('Processing %d videos using %d worker processes...',
+                        len(input_paths), num_workers)
+
+    stager = None
+    if stage_dir is not None:
+        ctx.obj.logger.info('Staging videos to: %s', stage_dir)
+        stager = StagingCache(stage_dir, stage_size * 1024 * 1024, logger=ctx.obj.logger)
+
+    start_time = time.time()
+    try:
+        results = run_batch(
+            input_paths, lambda input_path: get_batch_job_args(
+                global_args, command_args, input_path, output, stats),
+            num_workers, ctx.obj.logger, stager, prefetch)
+    finally:
+        if stager is not None:
+            stager.close()
+    duration = time.time() - start_time
+
+    failed = [result for result in results if not result.success]
+    ctx.obj.logger.info(
+        'Processed %d videos (%d frames, %d scenes) in %.1f seconds (average %.2f videos/sec).',
+        len(results), sum([result.num_frames for result in results]),
+        sum([result.num_scenes for result in results]), duration, len(results) / duration)
+    if failed:
+        ctx.obj.logger.error('Failed to process %d of %d videos:\n%s', len(failed), len(results),
+                             '\n'.join(['  %s: %s' % (result.input, result.error)
+                                        for result in failed]))
+    if report is not None:
+        ctx.obj.logger.info('Writing batch report to: %s', report)
+        with open(get_and_create_path(report, ctx.obj.output_directory), 'wt') as report_file:
+            write_batch_report(report_file, results)
+    ctx.exit(1 if failed else 0)
+
+
+
+@click.command('serve')
+@click.option(
+    '--socket', metavar='PATH',
+    type=click.Path(exists=False, dir_okay=False, resolve_path=True), default=None, help=
+    'Path of the Unix domain socket to accept jobs on (e.g. /tmp/sd.sock).')
+@click.option(
+    '--port', '-p', metavar='PORT',
+    type=click.IntRange(1, 65535), default=None, help=
+    'TCP port to accept jobs on (from localhost only), instead of a Unix domain socket.'
+    ' Any local user can connect to the port, so clients must send the token of the server'
+    ' (see --token).')
+@click.option(
+    '--token', metavar='TOKEN', envvar='SCENEDETECT_SERVER_TOKEN',
+    type=click.STRING, default=None, help=
+    'Token clients must send to submit jobs when using --port (may also be set with the'
+    ' SCENEDETECT_SERVER_TOKEN environment variable). [default: random, printed on startup]')
+@click.option(
+    '--jobs', '-j', metavar='N',
+    type=click.IntRange(1, None), default=None, help=
+    'Number of jobs to run at the same time, each in a separate worker process. Any other'
+    ' jobs are queued in order of submission. [default: number of CPU cores]')
+@click.pass_context
+def serve_command(ctx, socket, port, token, jobs):
+    """ Run a server to process jobs from the submit command.
+
+    Keeps a pool of worker processes running, which process the jobs sent by the submit
+    command (avoiding the startup time of the scenedetect command for each video). For
+    example, to accept jobs on a Unix domain socket, running up to 4 at a time:
+
+    scenedetect serve --socket /tmp/sd.sock -j 4
+
+    The socket can only be used by the current user. Jobs run with the permissions
+    of the server, so prefer --socket over --port on shared machines.
+
+    Runs until interrupted (Ctrl+C), or stopped with the submit --shutdown option.
+    Must be the only command specified.
+    """
+    ctx.obj.options_processed = False
+    _, command_args = split_cli_args(ctx)
+    if command_args:
+        raise click.BadParameter(
+            'The serve command must be the only command specified.', param_hint='serve')
+    if (socket is None) == (port is None):
+        raise click.BadParameter(
+            'Exactly one of --socket or --port must be specified.', param_hint='serve')
+    from scenedetect.cli.serve import JobServer  # pylint: disable=import-outside-toplevel
+    num_workers = jobs if jobs is not None else (os.cpu_count() or 1)
+    try:
+        job_server = JobServer(num_workers, socket, port, ctx.obj.logger, token)
+    except (ValueError, OSError) as ex:
+        raise click.BadParameter(str(ex), param_hint='serve')
+    try:
+        job_server.start_workers()
+        ctx.obj.logger.info('Accepting jobs on %s using %d worker processes.',
+                            socket if socket is not None else '127.0.0.1:%d' % port,
+                            num_workers)
+        if token is None and job_server.token is not None:
+            ctx.obj.logger.info('Token to submit jobs with: %s', job_server.token)
+        job_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ctx.obj.logger.info('Stopping server...')
+        job_server.close()
+    ctx.exit()
+
+
+
+@click.command('submit')
+@click.option(
+    '--input', '-i', metavar='PATTERN',
+    multiple=True, required=False, type=click.STRING, help=
+    'Input video(s) to submit a job for, where PATTERN may contain wildcards (e.g.'
+    ' "videos/*.mp4"). May be specified multiple times.')
+@click.option(
+    '--socket', metavar='PATH',
+    type=click.Path(exists=False, dir_okay=False, resolve_path=True), default=None, help=
+    'Path of the Unix domain socket of the server.')
+@click.option(
+    '--port', '-p', metavar='PORT',
+    type=click.IntRange(1, 65535), default=None, help=
+    'TCP port of the server on localhost, instead of a Unix domain socket.')
+@click.option(
+    '--token', metavar='TOKEN', envvar='SCENEDETECT_SERVER_TOKEN',
+    type=click.STRING, default=None, help=
+    'Token of the server, required when using --port (may also be set with the'
+    ' SCENEDETECT_SERVER_TOKEN environment variable).')
+@click.option(
+    '--shutdown', is_flag=True, flag_value=True, help=
+    'Stop the server once all jobs are complete.')
+@click.pass_context
+# pylint: disable=redefined-builtin
+def submit_command(ctx, input, socket, port, token, shutdown):
+    """ Submit jobs to a server started with the serve command.
+
+    Must be specified before any other command, and the global -i/--input option
+    must not be set. Submits a job for each input video to run the following
+    commands, for example:
+
+    scenedetect submit --socket /tmp/sd.sock -i "videos/*.mp4" detect-content
+
+    The result of each job is printed as a JSON object (one per line) as soon as it is
+    complete, with the input video, status, number of frames, and list of scenes
+    (use -q to suppress all other output).
+    """
+    ctx.obj.options_processed = False
+    global_args, command_args = split_cli_args(ctx)
+    if (socket is None) == (port is None):
+        raise click.BadParameter(
+            'Exactly one of --socket or --port must be specified.', param_hint='submit')
+    from scenedetect.cli.serve import submit_jobs  # pylint: disable=import-outside-toplevel
+    input_paths = expand_input_patterns(input)
+    if input_paths and not command_args:
+        raise click.BadParameter(
+            'No commands specified to run on each video (e.g. detect-content list-scenes).',
+            param_hint='submit')
+    if not input_paths and not shutdown:
+        raise click.BadParameter('No input videos found.', param_hint='submit')
+
+    jobs = [get_batch_job_args(global_args, command_args, input_path)
+            for input_path in input_paths]
+    num_failed = 0
+    try:
+        for result in submit_jobs(jobs, socket, port, shutdown, token=token):
+            if result['id'] is not None:
+                result['input'] = input_paths[result['id']]
+            num_failed += 0 if result['success'] else 1
+            click.echo(json.dumps(result))
+    except (IOError, OSError) as ex:
+        raise click.BadParameter(
+            'Could not connect to server: %s' % ex, param_hint='submit')
+    if input_paths:
+        ctx.obj.logger.info('Completed %d jobs (%d failed).', len(jobs), num_failed)
+    ctx.exit(1 if num_failed else 0)
+
+
+
+@click.command('benchmark')
+@click.option(
+    '--detector', metavar='NAME',
+    multiple=True, type=click.STRING, default=('content',), show_default=True, help=
+    'Detector to benchmark: content, content-luma, adaptive, threshold, cascade, hash,'
+    ' histogram, dissolve, or motion, optionally followed by arguments of the detector'
+    ' (e.g. content:threshold=27,min_scene_len=10). Several detectors can be run together'
+    ' by joining them with + (e.g. content+hash). May be specified multiple times.')
+@click.option(
+    '--downscale', metavar='N',
+    multiple=True, type=click.IntRange(1, None), default=(1,), show_default=True, help=
+    'Downscale factor to benchmark. May be specified multiple times.')
+@click.option(
+    '--frame-skip', metavar='N',
+    multiple=True, type=click.IntRange(0, None), default=(0,), show_default=True, help=
+    'Frame skip value to benchmark. May be specified multiple times.')
+@click.option(
+    '--mode', '-m', metavar='MODE',
+    multiple=True, type=click.Choice(['sequential', 'threads', 'workers', 'processes']),
+    default=('sequential',), show_default=True, help=
+    'Execution mode to benchmark: sequential, threads (see --threads), workers (see'
+    ' --workers), or processes (see --processes). May be specified multiple times.')
+@click.option(
+    '--jobs', '-j', metavar='N',
+    type=click.IntRange(1, None), default=2, show_default=True, help=
+    'Number of threads, workers, or processes to use in the respective modes.')
+@click.option(
+    '--resolution', '-r', metavar='WxH',
+    type=click.STRING, default='640x360', show_default=True, help=
+    'Resolution of the synthetic video.')
+@click.option(
+    '--frames', '-n', metavar='N',
+    type=click.IntRange(2, None), default=600, show_default=True, help=
+    'Length of the synthetic video, in frames.')
+@click.option(
+    '--cuts', '-c', metavar='N',
+    type=click.IntRange(0, None), default=10, show_default=True, help=
+    'Number of cuts in the synthetic video, spread evenly.')
+@click.option(
+    '--video-dir', metavar='DIR',
+    type=click.Path(exists=False, file_okay=False, writable=True, resolve_path=False),
+    default=None, help=
+    'Directory to store the synthetic videos in, reusing any generated previously with'
+    ' the same parameters. [default: temporary directory]')
+@click.option(
+    '--repeat', metavar='N',
+    type=click.IntRange(1, None), default=1, show_default=True, help=
+    'Number of times to run each case, keeping the fastest run.')
+@click.option(
+    '--output', '-o', metavar='JSON',
+    type=click.Path(exists=False, file_okay=True, writable=True, resolve_path=False), help=
+    'Path to write the results to in JSON format, which can be used as a --baseline.'
+    ' Uses the global -o/--output directory if set.')
+@click.option(
+    '--baseline', '-b', metavar='JSON',
+    type=click.Path(exists=True, file_okay=True, readable=True, resolve_path=False), help=
+    'Path to previously saved results to compare against. Exits with an error if any'
+    ' case is slower, uses more memory, or detects different cuts.')
+@click.option(
+    '--tolerance', '-t', metavar='FRACTION',
+    type=click.FloatRange(0.0, None), default=0.1, show_default=True, help=
+    'Fraction by which the FPS of a case may be lower (or its peak memory usage higher)'
+    ' than the --baseline before it is reported as a regression.')
+@click.pass_context
+def benchmark_command(ctx, detector, downscale, frame_skip, mode, jobs, resolution, frames,
+                      cuts, video_dir, repeat, output, baseline, tolerance):
+    """ Measure the performance of scene detection.
+
+    Generates a synthetic video, and detects scenes in it with each combination of
+    the given detectors, downscale factors, frame skip values, and modes, reporting
+    the frames per second, peak memory usage, and time spent decoding/detecting of
+    each. For example, to compare the execution modes of the content detector, and
+    save the results:
+
+    scenedetect benchmark -m sequential -m workers -m threads -o results.json
+
+    Each case is run in a separate process. Must be the only command specified, and
+    the global -i/--input option must not be set.
+    """
+    ctx.obj.options_processed = False
+    _, command_args = split_cli_args(ctx)
+    if command_args:
+        raise click.BadParameter(
+            'The benchmark command must be the only command specified.',
+            param_hint='benchmark')
+    # pylint: disable=import-outside-toplevel
+    from scenedetect import benchmark
+    try:
+        width, height = [int(value) for value in resolution.lower().split('x')]
+        if width < 16 or height < 16:
+            raise ValueError()
+    except ValueError:
+        raise click.BadParameter(
+            'Resolution must be in the format WxH (at least 16x16).', param_hint='resolution')
+    try:
+        cases = benchmark.get_benchmark_cases(detector, downscale, frame_skip, mode, jobs)
+    except ValueError as ex:
+        raise click.BadParameter(str(ex), param_hint='detector')
+    baseline_results = None
+    if baseline is not None:
+        with open(baseline, 'r') as baseline_file:
+            baseline_results = json.load(baseline_file)
+
+    temp_dir = None
+    if video_dir is None:
+        temp_dir = tempfile.mkdtemp(prefix='scenedetect-benchmark-')
+        video_dir = temp_dir
+    try:
+        ctx.obj.logger.info('Generating %dx%d video with %d frames and %d cuts...',
+                            width, height, frames, cuts)
+        video = benchmark.get_synthetic_video(video_dir, width, height, frames, cuts)
+        ctx.obj.logger.info('Running %d cases...', len(cases))
+        results = benchmark.run_benchmark(video, cases, repeat, logger=ctx.obj.logger)
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    if temp_dir is not None:
+        results['video']['path'] = None
+    ctx.obj.logger.info('Benchmark results:\n%s', benchmark.get_report(results))
+
+    if output is not None:
+        output = get_and_create_path(output, ctx.obj.output_directory)
+        ctx.obj.logger.info('Writing benchmark results to: %s', output)
+        with open(output, 'wt') as output_file:
+            json.dump(results, output_file, indent=2)
+            output_file.write('\n')
+    failed = [result for result in results['results'] if 'error' in result]
+    regressions = []
+    if baseline_results is not None:
+        try:
+            regressions = benchmark.compare_results(results, baseline_results, tolerance)
+        except ValueError as ex:
+            raise click.BadParameter(str(ex), param_hint='baseline')
+        if regressions:
+            ctx.obj.logger.error('Found %d regressions compared to baseline:\n%s',
+                                 len(regressions), '\n'.join(
+                                     ['  %s' % regression for regression in regressions]))
+        else:
+            ctx.obj.logger.info('No regressions compared to baseline.')
+    ctx.exit(1 if failed or regressions else 0)
+
+
+
+@click.command('evaluate')
+@click.option(
+    '--ground-truth', '-g', metavar='JSON',
+    multiple=True, type=click.Path(exists=True, file_okay=True, readable=True,
+                                   resolve_path=False), help=
+    'Path to a list of videos and the frame numbers of their cuts, in the format'
+    ' [{"path": "video.mp4", "cuts": [120, 455]}, ...] (video paths are relative to the'
+    ' file). If not set, a synthetic video with cuts, dissolves, and fades is generated.'
+    ' May be specified multiple times.')
+@click.option(
+    '--detector', metavar='NAME',
+    multiple=True, type=click.STRING, default=('content',), show_default=True, help=
+    'Detector to evaluate, in the same format as the benchmark command (e.g.'
+    ' content:threshold=27 or content+hash). May be specified multiple times.')
+@click.option(
+    '--downscale', metavar='N',
+    multiple=True, type=click.IntRange(1, None), default=(1,), show_default=True, help=
+    'Downscale factor to evaluate. May be specified multiple times.')
+@click.option(
+    '--frame-skip', metavar='N',
+    multiple=True, type=click.IntRange(0, None), default=(0,), show_default=True, help=
+    'Frame skip value to evaluate. May be specified multiple times.')
+@click.option(
+    '--mode', '-m', metavar='MODE',
+    multiple=True, type=click.Choice(['sequential', 'threads', 'workers', 'processes']),
+    default=('sequential',), show_default=True, help=
+    'Execution mode to evaluate: sequential, threads, workers, or processes. The cuts'
+    ' of all modes other than sequential must be identical to those of sequential mode.'
+    ' May be specified multiple times.')
+@click.option(
+    '--jobs', '-j', metavar='N',
+    type=click.IntRange(1, None), default=2, show_default=True, help=
+    'Number of threads, workers, or processes to use in the respective modes.')
+@click.option(
+    '--reference', metavar='NAME',
+    type=click.STRING, default=None, help=
+    'Reference detector (in the same format as --detector) whose cuts those of every'
+    ' case must be identical to, in sequential mode with the same downscale factor and'
+    ' frame skip (e.g. to check that an exact optimization does not change the results).')
+@click.option(
+    '--frame-tolerance', '-t', metavar='N',
+    type=click.IntRange(0, None), default=2, show_default=True, help=
+    'Maximum distance, in frames, between a detected and an expected cut for them to'
+    ' match.')
+@click.option(
+    '--min-f1', metavar='SCORE',
+    type=click.FloatRange(0.0, 1.0), default=None, help=
+    'Minimum F1 score. Reports the fastest case with at least this score, and exits'
+    ' with an error if there are none.')
+@click.option(
+    '--resolution', '-r', metavar='WxH',
+    type=click.STRING, default='640x360', show_default=True, help=
+    'Resolution of the synthetic video.')
+@click.option(
+    '--frames', '-n', metavar='N',
+    type=click.IntRange(2, None), default=600, show_default=True, help=
+    'Length of the synthetic video, in frames.')
+@click.option(
+    '--cuts', '-c', metavar='N',
+    type=click.IntRange(0, None), default=10, show_default=True, help=
+    'Number of transitions in the synthetic video, spread evenly.')
+@click.option(
+    '--fade-length', metavar='N',
+    type=click.IntRange(0, None), default=10, show_default=True, help=
+    'Length, in frames, of the dissolves and fades in the synthetic video. If 0, all'
+    ' transitions are cuts.')
+@click.option(
+    '--video-dir', metavar='DIR',
+    type=click.Path(exists=False, file_okay=False, writable=True, resolve_path=False),
+    default=None, help=
+    'Directory to store the synthetic video in, reusing any generated previously with'
+    ' the same parameters. [default: temporary directory]')
+@click.option(
+    '--output', '-o', metavar='JSON',
+    type=click.Path(exists=False, file_okay=True, writable=True, resolve_path=False), help=
+    'Path to write the results to in JSON format, including the cuts detected in each'
+    ' video. Uses the global -o/--output directory if set.')
+@click.pass_context
+def evaluate_command(ctx, ground_truth, detector, downscale, frame_skip, mode, jobs,
+                     reference, frame_tolerance, min_f1, resolution, frames, cuts,
+                     fade_length, video_dir, output):
+    """ Measure the accuracy and speed of scene detection.
+
+    Detects scenes in videos with known cuts with each combination of the given
+    detectors, downscale factors, frame skip values, and modes, reporting the
+    precision, recall, F1 score, and frames per second of each. For example, to find
+    the fastest downscale factor with an F1 score of at least 0.9:
+
+    scenedetect evaluate -g truth.json --downscale 1 --downscale 4 --min-f1 0.9
+
+    Exits with an error if the cuts of any case differ from its reference (see
+    --mode and --reference). Must be the only command specified, and the global
+    -i/--input option must not be set.
+    """
+    ctx.obj.options_processed = False
+    _, command_args = split_cli_args(ctx)
+    if command_args:
+        raise click.BadParameter(
+            'The evaluate command must be the only command specified.',
+            param_hint='evaluate')
+    # pylint: disable=import-outside-toplevel
+    from scenedetect import benchmark
+    from scenedetect import evaluation
+    try:
+        cases = benchmark.get_benchmark_cases(detector, downscale, frame_skip, mode, jobs)
+    except ValueError as ex:
+        raise click.BadParameter(str(ex), param_hint='detector')
+    if reference is not None:
+        try:
+            benchmark.parse_detector_spec(reference)
+        except ValueError as ex:
+            raise click.BadParameter(str(ex), param_hint='reference')
+    videos = []
+    for path in ground_truth:
+        try:
+            videos += evaluation.load_ground_truth(path)
+        except ValueError as ex:
+            raise click.BadParameter('%s: %s' % (path, ex), param_hint='ground-truth')
+
+    temp_dir = None
+    try:
+        if not videos:
+            try:
+                width, height = [int(value) for value in resolution.lower().split('x')]
+                if width < 16 or height < 16:
+                    raise ValueError()
+            except ValueError:
+                raise click.BadParameter(
+                    'Resolution must be in the format WxH (at least 16x16).',
+                    param_hint='resolution')
+            if video_dir is None:
+                temp_dir = tempfile.mkdtemp(prefix='scenedetect-evaluate-')
+                video_dir = temp_dir
+            ctx.obj.logger.info(
+                'Generating %dx%d video with %d frames and %d transitions...',
+                width, height, frames, cuts)
+            try:
+                videos = [benchmark.get_synthetic_video(
+                    video_dir, width, height, frames, cuts, fade_length=fade_length)]
+            except ValueError as ex:
+                raise click.BadParameter(str(ex), param_hint='fade-length')
+        ctx.obj.logger.info('Running %d cases on %d videos...', len(cases), len(videos))
+        results = evaluation.evaluate(videos, cases, frame_tolerance, reference,
+                                      logger=ctx.obj.logger)
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    ctx.obj.logger.info('Evaluation results:\n%s', evaluation.get_report(results))
+
+    if output is not None:
+        output = get_and_create_path(output, ctx.obj.output_directory)
+        ctx.obj.logger.info('Writing evaluation results to: %s', output)
+        with open(output, 'wt') as output_file:
+            json.dump(results, output_file, indent=2)
+            output_file.write('\n')
+    failed = [result['name'] for result in results
+              if 'error' in result or result['identical'] is False]
+    if failed:
+        ctx.obj.logger.error('Cuts differ from the reference (or failed) in %d cases:\n%s',
+                             len(failed), '\n'.join(['  %s' % name for name in failed]))
+    best_case = None
+    if min_f1 is not None:
+        best_case = evaluation.get_best_case(results, min_f1)
+        if best_case is None:
+            ctx.obj.logger.error('No case has an F1 score of at least %.3f.', min_f1)
+        else:
+            ctx.obj.logger.info('Fastest case with an F1 score of at least %.3f: %s',
+                                min_f1, best_case['name'])
+    ctx.exit(1 if failed or (min_f1 is not None and best_case is None) else 0)
+
+
+
+@click.command('sweep')
+@click.option(
+    '--stats', '-s', metavar='CSV',
+    type=click.Path(exists=True, file_okay=True, readable=True, resolve_path=False),
+    required=True, help=
+    'Stats file with the frame metrics of the detector (e.g. created by'
+    ' scenedetect -i video.mp4 -s video.stats.csv detect-content).')
+@click.option(
+    '--detector', metavar='NAME',
+    type=click.Choice(['content', 'threshold', 'adaptive']), default='content',
+    show_default=True, help=
+    'Detector to sweep the parameters of: content, threshold, or adaptive.')
+@click.option(
+    '--threshold', '-t', metavar='VALUES',
+    type=click.STRING, default=None, help=
+    'Thresholds to sweep, as comma-separated values and/or ranges in the format'
+    ' START:STOP:STEP (e.g. 20:40:0.5). For the adaptive detector, this is the'
+    ' adaptive threshold. [default: 30 for content, 12 for threshold, 3 for adaptive]')
+@click.option(
+    '--min-scene-len', '-m', metavar='VALUES',
+    type=click.STRING, default='15', show_default=True, help=
+    'Minimum scene lengths to sweep, in frames.')
+@click.option(
+    '--fade-bias', '-f', metavar='VALUES',
+    type=click.STRING, default='0', show_default=True, help=
+    'Fade biases to sweep, in percent (threshold detector only).')
+@click.option(
+    '--add-last-scene', '-l',
+    is_flag=True, flag_value=True, help=
+    'Add a final scene when the video ends on a fade out (threshold detector only).')
+@click.option(
+    '--min-delta-hsv', '-d', metavar='VALUES',
+    type=click.STRING, default='15', show_default=True, help=
+    'Minimum content values to sweep (adaptive detector only).')
+@click.option(
+    '--frame-window', '-w', metavar='VALUES',
+    type=click.STRING, default='2', show_default=True, help=
+    'Window widths to sweep, in frames (adaptive detector only).')
+@click.option(
+    '--luma-only',
+    is_flag=True, flag_value=True, help=
+    'Use the metrics of the luma channel only, as computed with the -l/--luma-only'
+    ' option of the content/adaptive detector.')
+@click.option(
+    '--reference', '-r', metavar='FILE',
+    type=click.Path(exists=True, file_okay=True, readable=True, resolve_path=False), help=
+    'File with the frame numbers of the reference cuts, separated by commas or'
+    ' whitespace. If set, the precision, recall, and F1 score of each combination are'
+    ' reported, sorted by F1 score.')
+@click.option(
+    '--frame-tolerance', metavar='N',
+    type=click.IntRange(0, None), default=2, show_default=True, help=
+    'Maximum distance, in frames, between a detected and a reference cut for them to'
+    ' match.')
+@click.option(
+    '--output', '-o', metavar='CSV',
+    type=click.Path(exists=False, file_okay=True, writable=True, resolve_path=False), help=
+    'Path to write the parameters, number of scenes, accuracy, and cuts of every'
+    ' combination to in CSV format. Uses the global -o/--output directory if set.')
+@click.option(
+    '--top', metavar='N',
+    type=click.IntRange(0, None), default=20, show_default=True, help=
+    'Number of combinations to print (0 to print all).')
+@click.pass_context
+def sweep_command(ctx, stats, detector, threshold, min_scene_len, fade_bias, add_last_scene,
+                  min_delta_hsv, frame_window, luma_only, reference, frame_tolerance, output,
+                  top):
+    """ Find the cuts of many detector parameters from a stats file.
+
+    Loads the frame metrics of a detector from a stats file, and finds the cuts the
+    detector would detect with every combination of the given parameters, without
+    processing the video again. For example, to compare thresholds of the content
+    detector against a list of reference cuts:
+
+    scenedetect sweep -s video.stats.csv -t 20:40:0.5 -m 10,15 -r cuts.txt
+
+    Assumes every frame was processed (i.e. without frame skip). Must be the only
+    command specified, and the global -i/--input option must not be set.
+    """
+    ctx.obj.options_processed = False
+    _, command_args = split_cli_args(ctx)
+    if command_args:
+        raise click.BadParameter(
+            'The sweep command must be the only command specified.',
+            param_hint='sweep')
+    # pylint: disable=import-outside-toplevel
+    from scenedetect import sweep
+    from scenedetect.stats_manager import StatsFileCorrupt
+    from scenedetect.stats_manager import StatsManager
+    from scenedetect.stats_manager import open_stats_file
+    if threshold is None:
+        threshold = {'content': '30', 'threshold': '12', 'adaptive': '3'}[detector]
+    parameters = {}
+    try:
+        parameters['min_scene_lens'] = sweep.parse_sweep_values(min_scene_len, int)
+        if detector == 'threshold':
+            parameters['thresholds'] = sweep.parse_sweep_values(threshold, int)
+            parameters['fade_biases'] = [
+                value / 100.0 for value in sweep.parse_sweep_values(fade_bias)]
+            parameters['add_final_scene'] = add_last_scene
+        elif detector == 'content':
+            parameters['thresholds'] = sweep.parse_sweep_values(threshold)
+            parameters['luma_only'] = luma_only
+        else:
+            parameters['adaptive_thresholds'] = sweep.parse_sweep_values(threshold)
+            parameters['window_widths'] = sweep.parse_sweep_values(frame_window, int)
+            parameters['min_delta_hsvs'] = sweep.parse_sweep_values(min_delta_hsv)
+            parameters['luma_only'] = luma_only
+    except ValueError as ex:
+        raise click.BadParameter(str(ex), param_hint='sweep values')
+    reference_cuts = None
+    if reference is not None:
+        try:
+            with open(reference, 'r') as reference_file:
+                reference_cuts = sweep.load_cut_list(reference_file)
+        except ValueError as ex:
+            raise click.BadParameter(str(ex), param_hint='reference')
+
+    stats_manager = StatsManager()
+    ctx.obj.logger.info('Loading frame metrics from stats file: %s', os.path.basename(stats))
+    try:
+        with open_stats_file(stats, 'rt') as stats_file:
+            stats_manager.load_from_csv(stats_file)
+    except StatsFileCorrupt as ex:
+        raise click.BadParameter(str(ex), param_hint='stats')
+    start_time = time.time()
+    results = sweep.sweep(stats_manager, detector, **parameters)
+    if reference_cuts is not None:
+        sweep.add_accuracy(results, reference_cuts, frame_tolerance)
+    ctx.obj.logger.info('Swept %d parameter combinations in %.2f seconds.',
+                        len(results), time.time() - start_time)
+    ctx.obj.logger.info('Sweep results%s:\n%s',
+                        ' (sorted by F1 score)' if reference_cuts is not None else '',
+                        sweep.get_report(results, top if top > 0 else None))
+
+    if output is not None:
+        output = get_and_create_path(output, ctx.obj.output_directory)
+        ctx.obj.logger.info('Writing sweep results to: %s', output)
+        with open(output, 'wt') as output_file:
+            sweep.write_results(output_file, results)
+    ctx.exit(0)
+
+
+
 @click.command('time')
 @click.option(
     '--start', '-s', metavar='TIMECODE',
@@ -401,7 +1283,8 @@ def detect_content_command(ctx, threshold, luma_only):
     # Need to ensure that a detector is not added twice, or will cause
     # a frame metric key error when registering the detector.
     ctx.obj.add_detector(scenedetect.detectors.ContentDetector(
-        threshold=threshold, min_scene_len=min_scene_len, luma_only=luma_only))
+        threshold=threshold, min_scene_len=min_scene_len, luma_only=luma_only,
+        num_threads=ctx.obj.num_threads))
 
 
 @click.command('detect-adaptive')
@@ -456,7 +1339,168 @@ def detect_adaptive_command(ctx, threshold, min_scene_len, min_delta_hsv,
         min_scene_len=min_scene_len,
         min_delta_hsv=min_delta_hsv,
         window_width=frame_window,
-        luma_only=luma_only))
+        luma_only=luma_only,
+        num_threads=ctx.obj.num_threads))
+
+
+
+@click.command('detect-dissolve')
+@click.option(
+    '--min-dip', '-d', metavar='VAL',
+    type=click.FloatRange(0.0, 1.0), default=0.3, show_default=True, help=
+    'Minimum relative decrease (from 0.0 to 1.0) in luma variance (frame metric'
+    ' dissolve_luma_var in stats file) at the middle of a transition, compared to the'
+    ' frames at both ends of the window.')
+@click.option(
+    '--window-size', '-w', metavar='TIMECODE',
+    type=click.STRING, default="1.0s", show_default=True, help=
+    'Length of the sliding window, which should be at least as long as the transitions'
+    ' to detect. TIMECODE can be specified as exact number of frames, a time in seconds'
+    ' followed by s, or a timecode in the format HH:MM:SS or HH:MM:SS.nnn')
+@click.pass_context
+def detect_dissolve_command(ctx, min_dip, window_size):
+    """ Perform dissolve detection algorithm on input video(s).
+
+    Only detects slow transitions (dissolves and fades); use with detect-content
+    to detect fast cuts as well.
+
+    detect-content detect-dissolve
+
+    detect-dissolve --window-size 2s
+    """
+
+    window_size = parse_timecode(ctx.obj, window_size).get_frames()
+    if window_size < 3:
+        raise click.BadParameter(
+            'Window size must be at least 3 frames.', param_hint='window size')
+    min_scene_len = 0 if ctx.obj.drop_short_scenes else ctx.obj.min_scene_len
+    ctx.obj.logger.debug('Detecting dissolves, parameters:\n'
+                  '  min-dip: %.2f, window-size: %d, min-scene-len: %d',
+                  min_dip, window_size, min_scene_len)
+
+    # Initialize detector and add to scene manager.
+    # Need to ensure that a detector is not added twice, or will cause
+    # a frame metric key error when registering the detector.
+    ctx.obj.add_detector(scenedetect.detectors.DissolveDetector(
+        min_dip=min_dip, window_size=window_size, min_scene_len=min_scene_len))
+
+
+
+@click.command('detect-hash')
+@click.option(
+    '--threshold', '-t', metavar='VAL',
+    type=click.IntRange(0, 64), default=16, show_default=True, help=
+    'Threshold value (integer) that the hash_dist frame metric must exceed to trigger a new'
+    ' scene. Refers to the number of bits (out of 64) that differ between the perceptual hashes'
+    ' of adjacent frames (frame metric "hash_dist (size=8)" in stats file).')
+@click.pass_context
+def detect_hash_command(ctx, threshold):
+    """ Perform perceptual hash detection algorithm on input video(s).
+
+    detect-hash
+
+    detect-hash --threshold 20
+    """
+
+    min_scene_len = 0 if ctx.obj.drop_short_scenes else ctx.obj.min_scene_len
+    ctx.obj.logger.debug('Detecting hash, parameters:\n'
+                  '  threshold: %d, min-scene-len: %d',
+                  threshold, min_scene_len)
+
+    # Initialize detector and add to scene manager.
+    # Need to ensure that a detector is not added twice, or will cause
+    # a frame metric key error when registering the detector.
+    ctx.obj.add_detector(scenedetect.detectors.HashDetector(
+        threshold=threshold, min_scene_len=min_scene_len))
+
+
+
+@click.command('detect-histogram')
+@click.option(
+    '--threshold', '-t', metavar='VAL',
+    type=click.FloatRange(0.0, 1.0), default=0.5, show_default=True, help=
+    'Threshold value (float) that the hist_diff frame metric must exceed to trigger a new scene.'
+    ' Refers to the distance (from 0.0 to 1.0) between the YUV histograms of adjacent frames'
+    ' (frame metric "hist_diff (bins=N)" in stats file, where N is set by -b/--bins).')
+@click.option(
+    '--bins', '-b', metavar='N',
+    type=click.IntRange(2, 256), default=16, show_default=True, help=
+    'Number of histogram bins used for each of the Y, U, and V channels.')
+@click.pass_context
+def detect_histogram_command(ctx, threshold, bins):
+    """ Perform histogram detection algorithm on input video(s).
+
+    detect-histogram
+
+    detect-histogram --threshold 0.4
+    """
+
+    min_scene_len = 0 if ctx.obj.drop_short_scenes else ctx.obj.min_scene_len
+    ctx.obj.logger.debug('Detecting histogram, parameters:\n'
+                  '  threshold: %.2f, bins: %d, min-scene-len: %d',
+                  threshold, bins, min_scene_len)
+
+    # Initialize detector and add to scene manager.
+    # Need to ensure that a detector is not added twice, or will cause
+    # a frame metric key error when registering the detector.
+    ctx.obj.add_detector(scenedetect.detectors.HistogramDetector(
+        threshold=threshold, min_scene_len=min_scene_len, bins=bins))
+
+
+
+@click.command('detect-motion')
+@click.option(
+    '--threshold', '-t', metavar='VAL',
+    type=click.FLOAT, default=0.5, show_default=True, help=
+    'Threshold value (float) that the motion_val frame metric must exceed to start a new motion'
+    ' event. Refers to the average intensity of the foreground mask (0 to 255) of each frame'
+    ' (frame metric motion_val in stats file).')
+@click.option(
+    '--post-scene', '-p', metavar='TIMECODE',
+    type=click.STRING, default="1.0s", show_default=True, help=
+    'Amount of time to include in each motion event after motion stops. Any motion which'
+    ' resumes within this time is added to the same event. TIMECODE can be specified as exact'
+    ' number of frames, a time in seconds followed by s, or a timecode in the'
+    ' format HH:MM:SS or HH:MM:SS.nnn')
+@click.option(
+    '--kernel-size', '-k', metavar='N',
+    type=click.INT, default=-1, show_default=True, help=
+    'Size of the kernel used to remove noise from the foreground mask. Must be an odd integer'
+    ' greater than 1, or -1 to compute automatically based on the video resolution.')
+@click.option(
+    '--roi', '-r', metavar='X Y W H',
+    type=click.INT, nargs=4, default=None, help=
+    'Only detect motion within the given region of interest, specified as the top-left'
+    ' corner (X, Y), width, and height, in pixels of the input video.')
+@click.pass_context
+def detect_motion_command(ctx, threshold, post_scene, kernel_size, roi):
+    """ Perform motion detection algorithm on input video(s).
+
+    detect-motion
+
+    detect-motion --threshold 1.0 --roi 0 0 640 360
+    """
+
+    post_scene = parse_timecode(ctx.obj, post_scene).get_frames()
+    if kernel_size >= 0 and (kernel_size < 3 or kernel_size % 2 == 0):
+        raise click.BadParameter(
+            'Kernel size must be an odd integer greater than 1, or -1.', param_hint='kernel size')
+    if not roi:
+        roi = None
+    else:
+        # The region of interest is specified in pixels of the input video, so we
+        # need to compensate for the VideoManager's downscale factor.
+        downscale_factor = int(round(ctx.obj.video_manager.get_framesize()[0] /
+                                     ctx.obj.video_manager.get_framesize_effective()[0]))
+        roi = tuple(val // downscale_factor for val in roi)
+
+    ctx.obj.logger.debug('Detecting motion, parameters:\n'
+                  '  threshold: %.2f, post-scene: %d, kernel-size: %d, roi: %s',
+                  threshold, post_scene, kernel_size, roi)
+
+    ctx.obj.add_detector(scenedetect.detectors.MotionDetector(
+        threshold=threshold, num_frames_post_scene=post_scene,
+        kernel_size=kernel_size, roi=roi))
 
 
 
@@ -484,10 +1528,17 @@ def detect_adaptive_command(ctx, threshold, min_scene_len, min_delta_hsv,
 @click.option(
     '--block-size', '-b', metavar='N',
     type=click.IntRange(1, 128), default=8, show_default=True, help=
-    'Number of rows in image to sum per iteration (can be tuned for performance in some cases).')
+    'Stride (in rows/columns) of the pixel subsample used to estimate the frame average'
+    ' when -sm/--sample-margin is set.')
+@click.option(
+    '--sample-margin', '-sm', metavar='VAL',
+    type=click.FloatRange(0.0, 255.0), default=None, help=
+    'If set, estimates the average of each frame from a subsample of pixels, and only computes'
+    ' the exact average if the estimate is within VAL of the threshold. Significantly speeds up'
+    ' processing (ignored if a stats file or --cache-dir is specified).')
 @click.pass_context
 def detect_threshold_command(ctx, threshold, fade_bias, add_last_scene,
-                             min_percent, block_size):
+                             min_percent, block_size, sample_margin):
     """  Perform threshold detection algorithm on input video(s).
 
     detect-threshold
@@ -499,9 +1550,9 @@ def detect_threshold_command(ctx, threshold, fade_bias, add_last_scene,
 
     ctx.obj.logger.debug('Detecting threshold, parameters:\n'
                   '  threshold: %d, min-scene-len: %d, fade-bias: %d,\n'
-                  '  add-last-scene: %s, min-percent: %d, block-size: %d',
+                  '  add-last-scene: %s, min-percent: %d, block-size: %d, sample-margin: %s',
                   threshold, min_scene_len, fade_bias,
-                  'yes' if add_last_scene else 'no', min_percent, block_size)
+                  'yes' if add_last_scene else 'no', min_percent, block_size, sample_margin)
 
     # Handle case where add_last_scene is not set and is None.
     add_last_scene = True if add_last_scene else False
@@ -511,7 +1562,8 @@ def detect_threshold_command(ctx, threshold, fade_bias, add_last_scene,
     fade_bias /= 100.0
     ctx.obj.add_detector(scenedetect.detectors.ThresholdDetector(
         threshold=threshold, min_scene_len=min_scene_len, fade_bias=fade_bias,
-        add_final_scene=add_last_scene, block_size=block_size))
+        add_final_scene=add_last_scene, block_size=block_size, sample_margin=sample_margin,
+        num_threads=ctx.obj.num_threads))
 
 
 
@@ -783,6 +1835,12 @@ add_cli_command(scenedetect_cli, version_command)
 add_cli_command(scenedetect_cli, about_command)
 
 # Input Commands
+add_cli_command(scenedetect_cli, batch_command)
+add_cli_command(scenedetect_cli, serve_command)
+add_cli_command(scenedetect_cli, submit_command)
+add_cli_command(scenedetect_cli, benchmark_command)
+add_cli_command(scenedetect_cli, evaluate_command)
+add_cli_command(scenedetect_cli, sweep_command)
 add_cli_command(scenedetect_cli, time_command)
 
 # Output Commands
@@ -795,3 +1853,7 @@ add_cli_command(scenedetect_cli, split_video_command)
 add_cli_command(scenedetect_cli, detect_content_command)
 add_cli_command(scenedetect_cli, detect_threshold_command)
 add_cli_command(scenedetect_cli, detect_adaptive_command)
+add_cli_command(scenedetect_cli, detect_dissolve_command)
+add_cli_command(scenedetect_cli, detect_hash_command)
+add_cli_command(scenedetect_cli, detect_histogram_command)
+add_cli_command(scenedetect_cli, detect_motion_command)
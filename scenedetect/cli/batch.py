@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" ``scenedetect.cli.batch`` Module
+
+This file contains the implementation of the `batch` command, which runs the same
+commands (e.g. ``detect-content list-scenes``) on many input videos, each as a separate
+job in a pool of long-lived worker processes (avoiding the startup overhead of running
+the `scenedetect` command once per video).
+
+Each job runs the `scenedetect` command in-process with the global options and
+commands of the batch invocation, and its own input video. Jobs which fail do not
+affect any other jobs, and a summary of all jobs is reported once they are complete.
+"""
+
+# Standard Library Imports
+from __future__ import print_function
+import collections
+import glob
+import os
+import os.path
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import wait
+from string import Template
+
+# PySceneDetect Library Imports
+from scenedetect.platform import get_csv_writer
+
+
+# Result of a single batch job, as returned by run_batch_job.
+BatchResult = collections.namedtuple(
+    'BatchResult', ['input', 'success', 'num_scenes', 'num_frames', 'duration', 'error'])
+
+
+##
+## Batch Helper Functions
+##
+
+def expand_input_patterns(patterns):
+    # type: (List[str]) -> List[str]
+    """ Expands the given glob patterns (e.g. 'dir/*.mp4', or 'dir/**/*.mp4' to include
+    subdirectories) into a sorted list of unique file paths. Patterns which do not match
+    any files are kept as-is, so that they are reported as failed jobs. """
+    input_paths = set()
+    for pattern in patterns:
+        matches = [path for path in glob.glob(pattern, recursive=True)
+                   if os.path.isfile(path)]
+        input_paths.update(matches if matches else [pattern])
+    return sorted(input_paths)
+
+
+def get_video_name(input_path):
+    # type: (str) -> str
+    """ Returns the base name of the input path without extension, as used for the
+    $VIDEO_NAME template of the other commands. """
+    video_name = os.path.basename(input_path)
+    if video_name.rfind('.') >= 0:
+        video_name = video_name[:video_name.rfind('.')]
+    return video_name
+
+
+def get_batch_job_args(global_args, command_args, input_path,
+                       output_template=None, stats_template=None):
+    # type: (List[str], List[str], str, Optional[str], Optional[str]) -> List[str]
+    """ Returns the command-line arguments of the job for the given input.
+
+    Arguments:
+        global_args: Global options of the batch invocation (before the batch command).
+        command_args: Commands following the batch command (e.g. detect-content).
+        input_path: Input video of the job.
+        output_template: Output directory of the job, where $VIDEO_NAME is replaced
+            with the name of the input video (overrides any -o/--output in global_args).
+        stats_template: Stats file of the job, where $VIDEO_NAME is replaced with the
+            name of the input video (overrides any -s/--stats in global_args).
+
+    Returns:
+        List[str]: Arguments to pass to the scenedetect command. Terminal output of the
+        job is always suppressed (-q) since jobs run concurrently.
+    """
+    video_name = get_video_name(input_path)
+    job_args = list(global_args) + ['-q', '-i', input_path]
+    if output_template is not None:
+        job_args += ['-o', Template(output_template).safe_substitute(VIDEO_NAME=video_name)]
+    if stats_template is not None:
+        job_args += ['-s', Template(stats_template).safe_substitute(VIDEO_NAME=video_name)]
+    return job_args + list(command_args)
+
+
+def run_cli_job(job_args):
+    # type: (List[str]) -> Tuple[CliContext, Optional[str], float]
+    """ Runs the scenedetect command with the given arguments in the current process
+    (e.g. in a worker process of run_batch). Any exception raised by the command is caught,
+    and returned as the error of the job.
+
+    Returns:
+        Tuple[CliContext, Optional[str], float]: Context of the command (whose resources
+        have already been released), error message if the command failed (or None if it
+        succeeded), and duration of the command in seconds.
+    """
+    # pylint: disable=import-outside-toplevel
+    from scenedetect.cli import scenedetect_cli
+    from scenedetect.cli.context import CliContext
+
+    start_time = time.time()
+    cli_ctx = CliContext()
+    error = None
+    try:
+        # pylint: disable=unexpected-keyword-arg, no-value-for-parameter
+        scenedetect_cli.main(args=job_args, obj=cli_ctx, standalone_mode=False)
+    except SystemExit as ex:
+        if ex.code:
+            error = 'Exited with code %s.' % ex.code
+    except Exception as ex:  # pylint: disable=broad-except
+        error = str(ex) if str(ex) else type(ex).__name__
+    finally:
+        cli_ctx.cleanup()
+    if error is None and cli_ctx.num_frames_processed == 0:
+        error = 'No frames processed.'
+    return cli_ctx, error, time.time() - start_time
+
+
+def run_batch_job(input_path, job_args):
+    # type: (str, List[str]) -> BatchResult
+    """ Runs the job of a single input video of a batch (see run_cli_job). """
+    cli_ctx, error, duration = run_cli_job(job_args)
+    num_scenes = 0
+    if cli_ctx.scene_manager is not None:
+        num_scenes = len(cli_ctx.scene_manager.get_scene_list())
+    return BatchResult(input_path, error is None, num_scenes, cli_ctx.num_frames_processed,
+                       duration, error)
+
+
+def run_batch(input_paths, get_job_args, num_workers, logger=None, stager=None, prefetch=0):
+    # type: (List[str], Callable[[str], List[str]], int, Optional[logging.Logger],
+    #        Optional[StagingCache], int) -> List[BatchResult]
+    """ Runs a job for each input in a pool of num_workers processes, and returns the result
+    of each job in the same order as input_paths.
+
+    Arguments:
+        input_paths: Input video of each job.
+        get_job_args: Called with the input video path of each job (or that of its staged
+            copy) to get the arguments of the job (see get_batch_job_args).
+        num_workers: Number of jobs to run at the same time.
+        logger: Logger to report the progress of the batch to, if any.
+        stager: If set, each input is copied to local storage before running its job,
+            starting prefetch inputs ahead of the running jobs.
+        prefetch: Number of inputs to stage in addition to those of the running jobs.
+
+    If a worker process is terminated unexpectedly (e.g. a crash in a native library), the
+    pool is restarted and any unfinished jobs are retried once.
+    """
+    # Imported here as it also imports multiprocessing, which is slow to import.
+    # pylint: disable=import-outside-toplevel
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    results = [None] * len(input_paths)
+    attempts = [0] * len(input_paths)
+    queue = collections.deque(range(len(input_paths)))
+    while queue:
+        retry = []
+        with ProcessPoolExecutor(max_workers=num_workers) as pool:
+            running = {}
+            broken = False
+            while (queue and not broken) or running:
+                # Only num_workers jobs are submitted at a time, so the inputs of the next
+                # jobs can be staged while the current ones are running.
+                while queue and not broken and len(running) < num_workers:
+                    i = queue.popleft()
+                    input_path = input_paths[i]
+                    if stager is not None:
+                        try:
+                            input_path = stager.acquire(input_paths[i])
+                        except (IOError, OSError) as ex:
+                            results[i] = BatchResult(input_paths[i], False, 0, 0, 0.0,
+                                                     'Failed to stage input: %s' % ex)
+                            continue
+                        for j in list(queue)[:prefetch]:
+                            stager.stage(input_paths[j])
+                    try:
+                        future = pool.submit(run_batch_job, input_paths[i],
+                                             get_job_args(input_path))
+                    except BrokenProcessPool:
+                        if stager is not None:
+                            stager.release(input_paths[i])
+                        queue.appendleft(i)
+                        broken = True
+                        break
+                    running[future] = i
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = running.pop(future)
+                    if stager is not None:
+                        stager.release(input_paths[i])
+                    try:
+                        results[i] = future.result()
+                    except BrokenProcessPool:
+                        broken = True
+                        attempts[i] += 1
+                        if attempts[i] > 1:
+                            results[i] = BatchResult(input_paths[i], False, 0, 0, 0.0,
+                                                     'Worker process terminated unexpectedly.')
+                        else:
+                            retry.append(i)
+                        continue
+                    if logger is not None:
+                        logger.info('[%d/%d] %s: %s', len([r for r in results if r is not None]),
+                                    len(input_paths), results[i].input,
+                                    'OK' if results[i].success else 'FAILED')
+        queue.extendleft(sorted(retry, reverse=True))
+    return results
+
+
+def write_batch_report(output_csv_file, results):
+    # type: (File, List[BatchResult]) -> None
+    """ Writes the result of each job to the given file in CSV format. """
+    csv_writer = get_csv_writer(output_csv_file)
+    csv_writer.writerow(
+        ['Input', 'Status', 'Scenes', 'Frames', 'Duration (seconds)', 'Error'])
+    for result in results:
+        csv_writer.writerow([
+            result.input, 'OK' if result.success else 'FAILED', str(result.num_scenes),
+            str(result.num_frames), '%.3f' % result.duration,
+            result.error if result.error is not None else ''])
@@ -40,35 +40,32 @@ from string import Template
 
 # Third-Party Library Imports
 import click
-import cv2
 
 # PySceneDetect Library Imports
-import scenedetect.detectors
-
-from scenedetect.scene_manager import SceneManager
-from scenedetect.scene_manager import save_images
-from scenedetect.scene_manager import write_scene_list
-from scenedetect.scene_manager import write_scene_list_html
+#
+# Modules which depend on OpenCV/NumPy (e.g. scenedetect.scene_manager and
+# scenedetect.video_manager) are imported only by the methods that require them, so
+# that commands which do not process any videos (e.g. help, version) start quickly.
 
 from scenedetect.stats_manager import StatsManager
 from scenedetect.stats_manager import StatsFileCorrupt
-
-from scenedetect.video_manager import VideoManager
-from scenedetect.video_manager import VideoOpenFailure
-from scenedetect.video_manager import VideoFramerateUnavailable
-from scenedetect.video_manager import VideoParameterMismatch
-from scenedetect.video_manager import InvalidDownscaleFactor
-
-from scenedetect.video_splitter import is_mkvmerge_available
-from scenedetect.video_splitter import is_ffmpeg_available
-from scenedetect.video_splitter import split_video_mkvmerge
-from scenedetect.video_splitter import split_video_ffmpeg
+from scenedetect.stats_manager import read_stats_index
 
 from scenedetect.platform import get_cv2_imwrite_params
+from scenedetect.platform import import_cv2
 from scenedetect.platform import check_opencv_ffmpeg_dll
 from scenedetect.platform import get_and_create_path
 
 from scenedetect.frame_timecode import FrameTimecode
+from scenedetect.metrics import DEFAULT_METRICS_INTERVAL
+from scenedetect.metrics import JsonLinesSink
+from scenedetect.metrics import PrometheusTextfileSink
+from scenedetect.profiler import Profiler
+from scenedetect.profiler import profile_stage
+from scenedetect.stats_cache import DEFAULT_CACHE_SIZE
+from scenedetect.stats_cache import STATS_EXTENSION
+from scenedetect.stats_cache import StatsCache
+from scenedetect.stats_cache import get_cache_keys
 
 
 def parse_timecode(cli_ctx, value):
@@ -130,6 +127,9 @@ def check_split_video_requirements(use_mkvmerge):
 
     Raises: click.BadParameter if the proper video splitting tool cannot be found.
     """
+    # pylint: disable=import-outside-toplevel
+    from scenedetect.video_splitter import is_mkvmerge_available
+    from scenedetect.video_splitter import is_ffmpeg_available
 
     if (use_mkvmerge and not is_mkvmerge_available()) or not is_ffmpeg_available():
         error_strs = [
@@ -163,15 +163,28 @@ class CliContext(object):
     def __init__(self):
         # Properties for main scenedetect command options (-i, -s, etc...) and CliContext logic.
         self.options_processed = False          # True when CLI option parsing is complete.
+        self.cli_args = []                      # All command-line arguments (see batch)
+        self.num_frames_processed = 0           # Set after processing the input video(s).
         self.scene_manager = None               # detect-content, detect-threshold, etc...
         self.video_manager = None               # -i/--input, -d/--downscale
         self.base_timecode = None               # -f/--framerate
         self.start_frame = 0                    # time -s/--start
         self.stats_manager = None               # -s/--stats
         self.stats_file_path = None             # -s/--stats
+        self.stats_file_indexed = False         # -s/--stats (loaded by process_input)
+        self.stats_flush = None                 # --stats-flush
+        self.stats_cache = None                 # --cache-dir, --cache-size
+        self.checkpoint_path = None             # --checkpoint
+        self.checkpoint_interval = 60.0         # --checkpoint-interval
+        self.resume = False                     # --resume
         self.output_directory = None            # -o/--output
         self.quiet_mode = False                 # -q/--quiet or -v/--verbosity quiet
         self.frame_skip = 0                     # -fs/--frame-skip
+        self.num_threads = 1                    # --threads
+        self.num_workers = 0                    # --workers
+        self.num_processes = 0                  # --processes
+        self.profiler = None                    # --profile
+        self.profile_trace_path = None          # --profile-trace
         self.drop_short_scenes = False          # --drop-short-scenes
         self.min_scene_len = None               # -m/--min-scene-len
 
@@ -225,32 +238,128 @@ class CliContext(object):
         finally:
             if self.video_manager is not None:
                 self.video_manager.release()
+            # Keep the metrics streamed so far if processing was interrupted.
+            if self.stats_manager is not None and self.stats_manager.is_streaming():
+                self.stats_manager.close_stream()
 
 
     def _open_stats_file(self):
 
         if self.stats_manager is None:
-            self.stats_manager = StatsManager()
+            self.stats_manager = StatsManager(profiler=self.profiler)
 
         if self.stats_file_path is not None:
             if os.path.exists(self.stats_file_path):
-                self.logger.info('Loading frame metrics from stats file: %s',
-                             os.path.basename(self.stats_file_path))
-                try:
-                    with open(self.stats_file_path, 'rt') as stats_file:
-                        self.stats_manager.load_from_csv(stats_file)
-                except StatsFileCorrupt:
-                    error_info = (
-                        'Could not load frame metrics from stats file - file is either corrupt,'
-                        ' or not a valid PySceneDetect stats file. If the file exists, ensure that'
-                        ' it is a valid stats file CSV, otherwise delete it and run PySceneDetect'
-                        ' again to re-generate the stats file.')
-                    error_strs = [
-                        'Could not load stats file.', 'Failed to parse stats file:', error_info ]
-                    self.logger.error('\n'.join(error_strs))
-                    raise click.BadParameter(
-                        '\n  Could not load given stats file, see above output for details.',
-                        param_hint='input stats file')
+                # Stats files with an index are loaded once the frames to process are known
+                # (e.g. from the time command), so only the rows of those frames are read.
+                if read_stats_index(self.stats_file_path) is not None:
+                    self.stats_file_indexed = True
+                else:
+                    self._load_stats_file()
+
+
+    def _load_stats_file(self, start_frame=None, end_frame=None):
+        # type: (Optional[int], Optional[int]) -> None
+        """ Loads the metrics of the given range of frames (or all frames) from the stats
+        file set by -s/--stats (see StatsManager.load_range).
+
+        Raises:
+            click.BadParameter: The stats file is corrupt.
+        """
+        self.logger.info('Loading frame metrics from stats file: %s',
+                         os.path.basename(self.stats_file_path))
+        try:
+            self.stats_manager.load_range(self.stats_file_path, start_frame, end_frame)
+        except StatsFileCorrupt:
+            error_info = (
+                'Could not load frame metrics from stats file - file is either corrupt,'
+                ' or not a valid PySceneDetect stats file. If the file exists, ensure that'
+                ' it is a valid stats file CSV, otherwise delete it and run PySceneDetect'
+                ' again to re-generate the stats file.')
+            error_strs = [
+                'Could not load stats file.', 'Failed to parse stats file:', error_info ]
+            self.logger.error('\n'.join(error_strs))
+            raise click.BadParameter(
+                '\n  Could not load given stats file, see above output for details.',
+                param_hint='input stats file')
+
+
+    def _get_cache_keys(self):
+        # type: () -> Tuple[Optional[str], Optional[str]]
+        """ Returns the key of the frame metrics and the key of the detected scenes of the
+        input (see stats_cache.get_cache_keys), or None for both if it could not be read. """
+        _, start_time, end_time = self.video_manager.get_duration()
+        try:
+            return get_cache_keys(
+                self.video_manager.get_video_paths(), start_time.get_frames(),
+                end_time.get_frames(), self.video_manager.get_downscale_factor(),
+                self.scene_manager.get_detectors(), self.frame_skip)
+        except (IOError, OSError) as ex:
+            self.logger.warning('Could not read input: %s', ex)
+            return None, None
+
+
+    def _load_cache(self):
+        # type: () -> Tuple[Optional[str], Optional[str], Optional[Dict[str, Any]]]
+        """ Looks up the input in the cache set by --cache-dir, loading any cached frame
+        metrics into the StatsManager if the detected scenes are not cached.
+
+        Returns:
+            Tuple of the key of the frame metrics, the key of the detected scenes (both None
+            if the input could not be read), and the detected scenes if cached (see
+            SceneManager.get_results), or None otherwise.
+        """
+        stats_key, results_key = self._get_cache_keys()
+        if results_key is None:
+            self.logger.warning('Not using cache.')
+            return None, None, None
+        results = self.stats_cache.load_results(results_key)
+        if results is None and self.stats_manager is not None:
+            # Frame metrics loaded from the cache still need to be saved to the stats
+            # file if -s/--stats is set (e.g. if it does not exist yet).
+            if self.stats_cache.load_stats(
+                    stats_key, self.stats_manager,
+                    reset_save_required=self.stats_file_path is None):
+                self.logger.info('Loaded frame metrics from cache.')
+        return stats_key, results_key, results
+
+
+    def _set_checkpoint(self, results_key):
+        # type: (Optional[str]) -> None
+        """ Sets the checkpoint file of the SceneManager from the --checkpoint and
+        --checkpoint-interval options, and loads it if --resume is set. The key of the
+        detected scenes (see _get_cache_keys) identifies the input of the checkpoint. """
+        if not self.scene_manager.supports_checkpoints() or self.frame_skip > 0 or (
+                self.num_processes > 0):
+            self.logger.warning(
+                'Not saving checkpoints, not supported by the detectors or options used.')
+            return
+        if results_key is None:
+            _, results_key = self._get_cache_keys()
+            if results_key is None:
+                self.logger.warning('Not saving checkpoints.')
+                return
+        self.scene_manager.set_checkpoint(
+            self.checkpoint_path, self.checkpoint_interval, key=results_key)
+        if self.resume and os.path.exists(self.checkpoint_path):
+            self.scene_manager.load_checkpoint(self.checkpoint_path, key=results_key)
+
+
+    def _save_cache(self, stats_key, results_key):
+        # type: (str, str) -> None
+        """ Saves the frame metrics (if updated) and the detected scenes to the cache
+        set by --cache-dir. """
+        try:
+            if self.stats_manager is not None and (
+                    self.stats_manager.is_save_required()
+                    or not os.path.exists(self.stats_cache.get_path(stats_key, STATS_EXTENSION))):
+                self.stats_cache.save_stats(
+                    stats_key, self.stats_manager, self.video_manager.get_base_timecode())
+            self.stats_cache.save_results(results_key, self.scene_manager.get_results())
+        except (IOError, OSError) as ex:
+            self.logger.warning('Failed to save results to cache: %s', ex)
+        else:
+            self.logger.debug('Saved results to cache: %s', self.stats_cache.cache_dir)
 
 
     def process_input(self):
@@ -263,6 +372,14 @@ class CliContext(object):
         if not self.options_processed:
             self.logger.debug('Skipping processing, CLI options were not parsed successfully.')
             return
+        # pylint: disable=import-outside-toplevel
+        from scenedetect.scene_manager import save_images
+        from scenedetect.scene_manager import write_scene_list
+        from scenedetect.scene_manager import write_scene_list_html
+        from scenedetect.video_splitter import split_video_mkvmerge
+        from scenedetect.video_splitter import split_video_ffmpeg
+        cv2 = import_cv2()
+
         self.check_input_open()
         assert self.scene_manager.get_num_detectors() >= 0
         if self.scene_manager.get_num_detectors() == 0:
@@ -280,15 +397,42 @@ class CliContext(object):
                 'As a workaround, consider re-encoding the source material before processing.\n'
                 'For details, see https://github.com/Breakthrough/PySceneDetect/issues/86')
 
+        # Handle -s/--stats option, if only the frames to process are loaded from it.
+        if self.stats_file_indexed:
+            _, start_time, end_time = self.video_manager.get_duration()
+            self._load_stats_file(start_time.get_frames(), end_time.get_frames() + 1)
+
         # Handle scene detection commands (detect-content, detect-threshold, etc...).
         self.video_manager.start()
 
         start_time = time.time()
         self.logger.info('Detecting scenes...')
 
-        num_frames = self.scene_manager.detect_scenes(
-            frame_source=self.video_manager, frame_skip=self.frame_skip,
-            show_progress=not self.quiet_mode)
+        # Handle --cache-dir option.
+        stats_key, results_key, results = None, None, None
+        if self.stats_cache is not None:
+            stats_key, results_key, results = self._load_cache()
+
+        if results is not None:
+            self.logger.info('Loaded detected scenes from cache.')
+            self.scene_manager.set_results(results)
+            num_frames = results['num_frames']
+        else:
+            # Handle --checkpoint and --resume options.
+            if self.checkpoint_path is not None:
+                self._set_checkpoint(results_key)
+            # Handle --stats-flush option.
+            if self.stats_flush is not None:
+                self.logger.info('Streaming frame metrics to stats file: %s',
+                                 os.path.basename(self.stats_file_path))
+                self.stats_manager.start_stream(
+                    self.stats_file_path, self.video_manager.get_base_timecode(),
+                    flush_interval=self.stats_flush)
+            num_frames = self.scene_manager.detect_scenes(
+                frame_source=self.video_manager, frame_skip=self.frame_skip,
+                show_progress=not self.quiet_mode, workers=self.num_workers,
+                processes=self.num_processes)
+        self.num_frames_processed = num_frames
 
         # Handle case where video fails with multiple audio tracks (#179).
         # TODO: Using a different video backend as per #213 may also resolve this issue,
@@ -304,19 +448,25 @@ class CliContext(object):
                 'For details, see https://pyscenedetect.readthedocs.io/en/latest/faq/')
             return
 
-        duration = time.time() - start_time
-        self.logger.info('Processed %d frames in %.1f seconds (average %.2f FPS).',
-                     num_frames, duration, float(num_frames)/duration)
+        if results is None:
+            duration = time.time() - start_time
+            self.logger.info('Processed %d frames in %.1f seconds (average %.2f FPS).',
+                         num_frames, duration, float(num_frames)/duration)
+
+        if results_key is not None and results is None:
+            self._save_cache(stats_key, results_key)
 
         # Handle -s/--statsfile option.
-        if self.stats_file_path is not None:
+        if self.stats_manager is not None and self.stats_manager.is_streaming():
+            self.stats_manager.close_stream()
+            self.logger.info('Saved frame metrics to stats file: %s',
+                             os.path.basename(self.stats_file_path))
+        elif self.stats_file_path is not None:
             if self.stats_manager.is_save_required():
-                with open(self.stats_file_path, 'wt') as stats_file:
-                    self.logger.info('Saving frame metrics to stats file: %s',
+                self.logger.info('Saving frame metrics to stats file: %s',
                                  os.path.basename(self.stats_file_path))
-                    base_timecode = self.video_manager.get_base_timecode()
-                    self.stats_manager.save_to_csv(
-                        stats_file, base_timecode)
+                base_timecode = self.video_manager.get_base_timecode()
+                self.stats_manager.save_to_path(self.stats_file_path, base_timecode)
             else:
                 self.logger.debug('No frame metrics updated, skipping update of the stats file.')
 
@@ -354,7 +504,8 @@ class CliContext(object):
                 self.scene_list_directory if self.scene_list_directory is not None
                 else self.output_directory)
             self.logger.info('Writing scene list to CSV file:\n  %s', scene_list_path)
-            with open(scene_list_path, 'wt') as scene_list_file:
+            with open(scene_list_path, 'wt') as scene_list_file, profile_stage(
+                    self.profiler, 'write_scene_list'):
                 write_scene_list(
                     output_csv_file=scene_list_file,
                     scene_list=scene_list,
@@ -386,19 +537,20 @@ class CliContext(object):
             if self.image_directory is not None:
                 image_output_dir = self.image_directory
 
-            image_filenames = save_images(
-                scene_list=scene_list,
-                video_manager=self.video_manager,
-                num_images=self.num_images,
-                frame_margin=self.frame_margin,
-                image_extension=self.image_extension,
-                encoder_param=self.image_param,
-                image_name_template=self.image_name_format,
-                output_dir=image_output_dir,
-                show_progress=not self.quiet_mode,
-                scale=self.scale,
-                height=self.height,
-                width=self.width)
+            with profile_stage(self.profiler, 'save_images'):
+                image_filenames = save_images(
+                    scene_list=scene_list,
+                    video_manager=self.video_manager,
+                    num_images=self.num_images,
+                    frame_margin=self.frame_margin,
+                    image_extension=self.image_extension,
+                    encoder_param=self.image_param,
+                    image_name_template=self.image_name_format,
+                    output_dir=image_output_dir,
+                    show_progress=not self.quiet_mode,
+                    scale=self.scale,
+                    height=self.height,
+                    width=self.width)
 
         # Handle export-html command.
         if self.export_html:
@@ -413,10 +565,11 @@ class CliContext(object):
             self.logger.info('Exporting to html file:\n %s:', html_path)
             if not self.html_include_images:
                 image_filenames = None
-            write_scene_list_html(html_path, scene_list, cut_list,
-                                  image_filenames=image_filenames,
-                                  image_width=self.image_width,
-                                  image_height=self.image_height)
+            with profile_stage(self.profiler, 'export_html'):
+                write_scene_list_html(html_path, scene_list, cut_list,
+                                      image_filenames=image_filenames,
+                                      image_width=self.image_width,
+                                      image_height=self.image_height)
 
         # Handle split-video command.
         if self.split_video:
@@ -436,17 +589,26 @@ class CliContext(object):
                 else self.output_directory)
             # Ensure the appropriate tool is available before handling split-video.
             check_split_video_requirements(self.split_mkvmerge)
-            if self.split_mkvmerge:
-                split_video_mkvmerge(video_paths, scene_list, output_path_template, video_name,
-                                     suppress_output=self.quiet_mode or self.split_quiet)
-            else:
-                split_video_ffmpeg(video_paths, scene_list, output_path_template,
-                                   video_name, arg_override=self.split_args,
-                                   hide_progress=self.quiet_mode,
-                                   suppress_output=self.quiet_mode or self.split_quiet)
+            with profile_stage(self.profiler, 'split_video'):
+                if self.split_mkvmerge:
+                    split_video_mkvmerge(video_paths, scene_list, output_path_template,
+                                         video_name,
+                                         suppress_output=self.quiet_mode or self.split_quiet)
+                else:
+                    split_video_ffmpeg(video_paths, scene_list, output_path_template,
+                                       video_name, arg_override=self.split_args,
+                                       hide_progress=self.quiet_mode,
+                                       suppress_output=self.quiet_mode or self.split_quiet)
             if scene_list:
                 self.logger.info('Video splitting completed, individual scenes written to disk.')
 
+        # Handle --profile and --profile-trace options.
+        if self.profiler is not None:
+            self.logger.info('Profile of processing stages:\n%s', self.profiler.get_report())
+            if self.profile_trace_path is not None:
+                self.logger.info('Writing profile trace to: %s', self.profile_trace_path)
+                with open(self.profile_trace_path, 'wt') as trace_file:
+                    self.profiler.save_trace(trace_file)
 
 
     def check_input_open(self):
@@ -480,6 +642,13 @@ class CliContext(object):
 
 
     def _init_video_manager(self, input_list, framerate, downscale):
+        # pylint: disable=import-outside-toplevel
+        from scenedetect.video_manager import VideoManager
+        from scenedetect.video_manager import VideoOpenFailure
+        from scenedetect.video_manager import VideoFramerateUnavailable
+        from scenedetect.video_manager import VideoParameterMismatch
+        from scenedetect.video_manager import InvalidDownscaleFactor
+        cv2 = import_cv2()
 
         self.base_timecode = None
 
@@ -487,7 +656,8 @@ class CliContext(object):
         video_manager_initialized = False
         try:
             self.video_manager = VideoManager(
-                video_files=input_list, framerate=framerate, logger=self.logger)
+                video_files=input_list, framerate=framerate, logger=self.logger,
+                profiler=self.profiler)
             video_manager_initialized = True
             self.base_timecode = self.video_manager.get_base_timecode()
             self.video_manager.set_downscale_factor(downscale)
@@ -537,8 +707,15 @@ class CliContext(object):
 
 
     def parse_options(self, input_list, framerate, stats_file, downscale, frame_skip,
-                      min_scene_len, drop_short_scenes):
-        # type: (List[str], float, str, int, int) -> None
+                      min_scene_len, drop_short_scenes, num_threads=1, num_workers=0,
+                      num_processes=0, profile=False, profile_trace=None, metrics_jsonl=None,
+                      metrics_prom=None, metrics_interval=DEFAULT_METRICS_INTERVAL,
+                      cache_dir=None, cache_size=DEFAULT_CACHE_SIZE, stats_flush=None,
+                      checkpoint=None, checkpoint_interval=60.0,
+                      resume=False):
+        # type: (List[str], float, str, int, int, str, bool, int, int, int, bool,
+        #        Optional[str], Optional[str], Optional[str], float, Optional[str],
+        #        int, Optional[float], Optional[str], float, bool) -> None
         """ Parse Options: Parses all global options/arguments passed to the main
         scenedetect command, before other sub-commands (e.g. this function processes
         the [options] when calling scenedetect [options] [commands [command options]].
@@ -555,6 +732,16 @@ class CliContext(object):
         self.logger.debug('Parsing program options.')
 
         self.frame_skip = frame_skip
+        self.stats_flush = stats_flush
+        self.checkpoint_interval = checkpoint_interval
+        self.resume = resume
+        self.num_threads = num_threads
+        self.num_workers = num_workers
+        self.num_processes = num_processes
+
+        if profile or profile_trace is not None:
+            self.profiler = Profiler(record_trace=profile_trace is not None)
+            self.profile_trace_path = get_and_create_path(profile_trace, self.output_directory)
 
         video_manager_initialized = self._init_video_manager(
             input_list=input_list, framerate=framerate, downscale=downscale)
@@ -565,13 +752,40 @@ class CliContext(object):
             self.logger.info('VideoManager not initialized.')
         else:
             self.logger.debug('VideoManager initialized.')
-            self.stats_file_path = get_and_create_path(stats_file, self.output_directory)
+            if stats_file is not None:
+                self.stats_file_path = get_and_create_path(
+                    Template(stats_file).safe_substitute(
+                        VIDEO_NAME=self.video_manager.get_video_name()),
+                    self.output_directory)
             if self.stats_file_path is not None:
                 self.check_input_open()
                 self._open_stats_file()
+            if cache_dir is not None:
+                self.stats_cache = StatsCache(cache_dir, cache_size, logger=self.logger)
+                # Frame metrics can only be cached if every frame is processed.
+                if frame_skip == 0 and self.stats_manager is None:
+                    self.stats_manager = StatsManager(profiler=self.profiler)
+            if checkpoint is not None:
+                self.checkpoint_path = get_and_create_path(
+                    Template(checkpoint).safe_substitute(
+                        VIDEO_NAME=self.video_manager.get_video_name()),
+                    self.output_directory)
 
         # Init SceneManager.
-        self.scene_manager = SceneManager(self.stats_manager)
+        # pylint: disable=import-outside-toplevel
+        from scenedetect.scene_manager import SceneManager
+        self.scene_manager = SceneManager(self.stats_manager, self.profiler)
+
+        # Add metrics hooks if --metrics-jsonl/--metrics-prom are specified.
+        video_name = os.path.basename(input_list[0])
+        if metrics_jsonl is not None:
+            self.scene_manager.add_metrics_hook(JsonLinesSink(
+                get_and_create_path(metrics_jsonl, self.output_directory),
+                fields={'video': video_name}), metrics_interval)
+        if metrics_prom is not None:
+            self.scene_manager.add_metrics_hook(PrometheusTextfileSink(
+                get_and_create_path(metrics_prom, self.output_directory),
+                labels={'video': video_name}), metrics_interval)
 
         self.drop_short_scenes = drop_short_scenes
         self.min_scene_len = parse_timecode(self, min_scene_len)
@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" ``scenedetect.cli.serve`` Module
+
+This file contains the implementation of the `serve` and `submit` commands. The `serve`
+command runs a :py:class:`JobServer`, which keeps a pool of warm worker processes (with
+all libraries already imported), and runs jobs submitted over a Unix domain socket (or
+a TCP port on localhost). The `submit` command is a thin client which sends jobs to a
+running server, and prints the result of each job as soon as it is complete.
+
+Each job is a list of arguments to the `scenedetect` command, and is run exactly as if
+the command was invoked with them (see :py:func:`scenedetect.cli.batch.run_cli_job`).
+
+Requests and results are sent as JSON objects, one per line. A client sends one or more
+requests on a connection, then closes the sending side of it. Requests are of the form::
+
+    {"id": 1, "args": ["-i", "video.mp4", "detect-content"], "cwd": "/home/user",
+     "token": "..."}
+
+where ``cwd`` (optional) is the directory relative paths in ``args`` refer to, or::
+
+    {"command": "shutdown", "token": "..."}
+
+to stop the server. The Unix domain socket is only accessible by the user running the
+server (created with 0600 permissions), but any local user can connect to the TCP port,
+so when listening on a TCP port every request must include the ``token`` of the server
+(which is generated randomly if not specified). Note that jobs run with the permissions
+of the server, and can read and write any files the server can.
+
+The result of each job is sent back once it is complete (in order of completion, not
+submission), in the form::
+
+    {"id": 1, "success": true, "error": null, "num_frames": 300, "duration": 0.8,
+     "scenes": [{"start_frame": 0, "end_frame": 90, "start_time": "00:00:00.000",
+                 "end_time": "00:00:03.000"}, ...]}
+"""
+
+# Standard Library Imports
+from __future__ import print_function
+import hmac
+import json
+import logging
+import os
+import os.path
+import socket
+import secrets
+import socketserver
+import stat
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+# PySceneDetect Library Imports
+from scenedetect.cli.batch import run_cli_job
+
+
+##
+## Job Server Helper Functions
+##
+
+def warm_worker():
+    # type: () -> int
+    """ Imports all libraries required to run jobs (called once in each worker process
+    when the server starts). Returns the process ID of the worker. """
+    # pylint: disable=import-outside-toplevel, unused-import
+    import scenedetect.cli
+    import scenedetect.detectors
+    import scenedetect.scene_manager
+    import scenedetect.video_manager
+    import scenedetect.video_splitter
+    return os.getpid()
+
+
+def run_server_job(job_args, cwd=None):
+    # type: (List[str], Optional[str]) -> dict
+    """ Runs the scenedetect command with the given arguments in the current process (called
+    in the worker processes of a JobServer), with terminal output suppressed.
+
+    Arguments:
+        job_args: Arguments of the scenedetect command.
+        cwd: Directory to run the job in (relative paths in job_args refer to), if any.
+            The working directory of the worker process is restored once the job is
+            complete, since worker processes are reused for the jobs of other clients.
+
+    Returns:
+        dict: Result of the job (success, error, num_frames, duration, scenes).
+    """
+    original_cwd = os.getcwd()
+    try:
+        if cwd is not None:
+            os.chdir(cwd)
+        cli_ctx, error, duration = run_cli_job(['-q'] + list(job_args))
+    finally:
+        os.chdir(original_cwd)
+    scenes = []
+    if error is None and cli_ctx.scene_manager is not None:
+        scene_list = cli_ctx.scene_manager.get_scene_list()
+        if cli_ctx.drop_short_scenes and cli_ctx.min_scene_len > 0:
+            scene_list = [scene for scene in scene_list
+                          if (scene[1] - scene[0]) >= cli_ctx.min_scene_len]
+        scenes = [{'start_frame': start.get_frames(), 'end_frame': end.get_frames(),
+                   'start_time': start.get_timecode(), 'end_time': end.get_timecode()}
+                  for start, end in scene_list]
+    return {'success': error is None, 'error': error,
+            'num_frames': cli_ctx.num_frames_processed, 'duration': duration,
+            'scenes': scenes}
+
+
+def submit_jobs(jobs, socket_path=None, port=None, shutdown=False, cwd=None, token=None):
+    # type: (List[List[str]], Optional[str], Optional[int], bool, Optional[str],
+    #     Optional[str]) -> Iterable[dict]
+    """ Submits jobs to a running JobServer, and yields the result of each job as soon as
+    it is complete.
+
+    Arguments:
+        jobs: Arguments of the scenedetect command of each job.
+        socket_path: Path of the Unix domain socket of the server.
+        port: TCP port of the server on localhost (if socket_path is not set).
+        shutdown: If True, requests the server to stop once all jobs are submitted.
+        cwd: Directory relative paths in the job arguments refer to
+            [default: current working directory].
+        token: Token of the server (required if the server listens on a TCP port).
+
+    Yields:
+        dict: Result of each job (see run_server_job), in order of completion, with the
+        index of the job in jobs as its id.
+
+    Raises:
+        IOError/OSError: Could not connect to the server.
+    """
+    if cwd is None:
+        cwd = os.getcwd()
+    if socket_path is not None:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(socket_path)
+    else:
+        client = socket.create_connection(('127.0.0.1', port))
+    try:
+        with client.makefile('w', encoding='utf-8') as request_file:
+            for job_id, job_args in enumerate(jobs):
+                request = {'id': job_id, 'args': list(job_args), 'cwd': cwd}
+                if token is not None:
+                    request['token'] = token
+                request_file.write(json.dumps(request) + '\n')
+            if shutdown:
+                request = {'command': 'shutdown'}
+                if token is not None:
+                    request['token'] = token
+                request_file.write(json.dumps(request) + '\n')
+        client.shutdown(socket.SHUT_WR)
+        with client.makefile('r', encoding='utf-8') as result_file:
+            for line in result_file:
+                if line.strip():
+                    yield json.loads(line)
+    finally:
+        client.close()
+
+
+##
+## JobServer Class Implementation
+##
+
+class _JobRequestHandler(socketserver.StreamRequestHandler):
+    """ Handles a single client connection of a JobServer. """
+
+    def handle(self):
+        job_server = self.server.job_server
+        futures = {}
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line.decode('utf-8'))
+                if not job_server.check_token(request.get('token')):
+                    # Stop reading requests from unauthenticated clients.
+                    self._write_result({'id': None, 'success': False,
+                                        'error': 'Invalid token.'})
+                    break
+                if request.get('command') == 'shutdown':
+                    threading.Thread(target=job_server.shutdown).start()
+                    continue
+                job_id = request.get('id')
+                future = job_server.submit(request['args'], request.get('cwd'))
+            except (ValueError, KeyError, TypeError) as ex:
+                self._write_result({'id': None, 'success': False,
+                                    'error': 'Invalid request: %s' % ex})
+                continue
+            futures[future] = job_id
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                job_server.restart_pool()
+                result = {'success': False, 'error': 'Worker process terminated unexpectedly.'}
+            except Exception as ex:  # pylint: disable=broad-except
+                result = {'success': False, 'error': str(ex) if str(ex) else type(ex).__name__}
+            result['id'] = futures[future]
+            self._write_result(result)
+
+    def _write_result(self, result):
+        # type: (dict) -> None
+        self.wfile.write((json.dumps(result) + '\n').encode('utf-8'))
+        self.wfile.flush()
+
+
+class JobServer(object):
+    """ Runs scenedetect jobs submitted over a Unix domain socket or a localhost TCP port
+    in a pool of warm worker processes (see the module documentation for the protocol).
+
+    Jobs from all clients share the same pool, so at most num_workers jobs run at the same
+    time, and any others are queued in order of submission.
+
+    The Unix domain socket is created with 0600 permissions (only the user running the
+    server can submit jobs). Any local user can connect to the TCP port, so requests
+    received over TCP must include the token of the server.
+    """
+
+    def __init__(self, num_workers, socket_path=None, port=None, logger=None, token=None):
+        # type: (int, Optional[str], Optional[int], Optional[logging.Logger], Optional[str])
+        #     -> None
+        """
+        Arguments:
+            num_workers: Number of jobs to run at the same time, each in a worker process.
+            socket_path: Path of the Unix domain socket to listen on. Any existing socket
+                at this path is replaced.
+            port: TCP port to listen on (on localhost only), if socket_path is not set.
+            logger: Logger to use, if any.
+            token: Token clients must include in each request. If None, a random token
+                is generated when listening on a TCP port (see the token attribute), and
+                no token is required on a Unix domain socket.
+
+        Raises:
+            ValueError: Neither socket_path nor port are set, or Unix domain sockets are
+                not supported on this platform.
+        """
+        if socket_path is None and port is None:
+            raise ValueError('Either socket_path or port must be set.')
+        if socket_path is not None and not hasattr(socket, 'AF_UNIX'):
+            raise ValueError('Unix domain sockets are not supported on this platform.')
+        self.num_workers = num_workers
+        self.socket_path = socket_path
+        self._logger = logger if logger is not None else logging.getLogger('pyscenedetect')
+        self._pool_lock = threading.Lock()
+        self._pool = None
+        self._num_jobs = 0
+        if token is None and socket_path is None:
+            token = secrets.token_urlsafe(16)
+        self.token = token
+        if socket_path is not None:
+            if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+                os.remove(socket_path)
+            # Create the socket accessible by the current user only (0600).
+            original_umask = os.umask(0o177)
+            try:
+                self._server = socketserver.ThreadingUnixStreamServer(
+                    socket_path, _JobRequestHandler, bind_and_activate=True)
+            finally:
+                os.umask(original_umask)
+        else:
+            self._server = socketserver.ThreadingTCPServer(
+                ('127.0.0.1', port), _JobRequestHandler, bind_and_activate=True)
+        # Wait for the jobs of all connected clients when the server is closed.
+        self._server.daemon_threads = False
+        self._server.block_on_close = True
+        self._server.job_server = self
+        self.address = self._server.server_address
+
+
+    def check_token(self, token):
+        # type: (Optional[str]) -> bool
+        """ Returns True if the given token of a request is valid (or if no token is
+        required), False otherwise. """
+        if self.token is None:
+            return True
+        if not isinstance(token, str):
+            return False
+        return hmac.compare_digest(token.encode('utf-8'), self.token.encode('utf-8'))
+
+
+    def start_workers(self):
+        # type: () -> None
+        """ Starts all worker processes, and waits for them to be ready to run jobs. """
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.num_workers)
+            pool = self._pool
+        futures = [pool.submit(warm_worker) for _ in range(self.num_workers)]
+        pids = set([future.result() for future in futures])
+        self._logger.debug('Started %d worker processes.', len(pids))
+
+
+    def restart_pool(self):
+        # type: () -> None
+        """ Replaces the pool of worker processes if any of them were terminated
+        unexpectedly (e.g. a crash in a native library). """
+        with self._pool_lock:
+            # pylint: disable=protected-access
+            if self._pool is not None and self._pool._broken:
+                self._logger.warning('Worker process terminated unexpectedly, restarting pool.')
+                self._pool.shutdown(wait=False)
+                self._pool = ProcessPoolExecutor(max_workers=self.num_workers)
+
+
+    def submit(self, job_args, cwd=None):
+        # type: (List[str], Optional[str]) -> concurrent.futures.Future
+        """ Queues a job to run in the worker processes.
+
+        Returns:
+            Future of the result of the job (see run_server_job).
+        """
+        if not isinstance(job_args, list) or not all(
+                [isinstance(arg, str) for arg in job_args]):
+            raise TypeError('args must be a list of strings')
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.num_workers)
+            self._num_jobs += 1
+            self._logger.debug('Job %d: %s', self._num_jobs, ' '.join(job_args))
+            try:
+                return self._pool.submit(run_server_job, job_args, cwd)
+            except BrokenProcessPool:
+                self._pool.shutdown(wait=False)
+                self._pool = ProcessPoolExecutor(max_workers=self.num_workers)
+                return self._pool.submit(run_server_job, job_args, cwd)
+
+
+    def serve_forever(self):
+        # type: () -> None
+        """ Handles client connections until shutdown is called (or a shutdown request is
+        received from a client). """
+        self._server.serve_forever()
+
+
+    def shutdown(self):
+        # type: () -> None
+        """ Stops serve_forever (must be called from another thread). """
+        self._server.shutdown()
+
+
+    def close(self):
+        # type: () -> None
+        """ Closes the server socket, and waits for the jobs of all connected clients to
+        complete (and their results to be sent). """
+        self._server.server_close()
+        if self.socket_path is not None and os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+        self._logger.debug('Processed %d jobs.', self._num_jobs)
@@ -40,9 +40,11 @@ modules (i.e. from scenedetect.detectors import ContentDetector).
 from scenedetect.detectors.content_detector import ContentDetector
 from scenedetect.detectors.threshold_detector import ThresholdDetector
 from scenedetect.detectors.adaptive_detector import AdaptiveDetector
-
-# Algorithms being ported:
-#from scenedetect.detectors.motion_detector import MotionDetector
+from scenedetect.detectors.cascade_detector import CascadeDetector
+from scenedetect.detectors.hash_detector import HashDetector
+from scenedetect.detectors.histogram_detector import HistogramDetector
+from scenedetect.detectors.motion_detector import MotionDetector
+from scenedetect.detectors.dissolve_detector import DissolveDetector
 
 
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
@@ -63,27 +65,4 @@ from scenedetect.detectors.adaptive_detector import AdaptiveDetector
 #        super(EdgeDetector, self).__init__()
 #                                                                             #
 #                                                                             #
-# class DissolveDetector(SceneDetector):
-#    """Detects slow fades (dissolve cuts) via changes in the HSV colour space.
-#
-#    Detects slow fades only; to detect fast cuts between content scenes, the
-#    ContentDetector should be used instead.
-#    """
-#
-#    def __init__(self):
-#        super(DissolveDetector, self).__init__()
-#                                                                             #
-#                                                                             #
-# class HistogramDetector(SceneDetector):
-#    """Detects fast cuts via histogram changes between sequential frames.
-#
-#    Detects fast cuts between content (using histogram deltas, much like the
-#    ContentDetector uses HSV colourspace deltas), as well as both fades and
-#    cuts to/from black (using a threshold, much like the ThresholdDetector).
-#    """
-#
-#    def __init__(self):
-#        super(DissolveDetector, self).__init__()
-#                                                                             #
-#                                                                             #
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
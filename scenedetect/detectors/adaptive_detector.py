@@ -46,10 +46,13 @@ class AdaptiveDetector(ContentDetector):
     """
 
     ADAPTIVE_RATIO_KEY_TEMPLATE = "adaptive_ratio{luma_only} (w={window_width})"
+    METRIC_INDEPENDENT_PARAMETERS = ContentDetector.METRIC_INDEPENDENT_PARAMETERS | frozenset(
+        ['adaptive_threshold', 'min_delta_hsv'])
 
     def __init__(self, video_manager, adaptive_threshold=3.0,
-                 luma_only=False, min_scene_len=15, min_delta_hsv=15.0, window_width=2):
-        super(AdaptiveDetector, self).__init__()
+                 luma_only=False, min_scene_len=15, min_delta_hsv=15.0, window_width=2,
+                 num_threads=1):
+        super(AdaptiveDetector, self).__init__(luma_only=luma_only, num_threads=num_threads)
         self.video_manager = video_manager
         self.min_scene_len = min_scene_len  # minimum length of any given scene, in frames (int) or FrameTimecode
         self.adaptive_threshold = adaptive_threshold
@@ -91,14 +94,31 @@ class AdaptiveDetector(ContentDetector):
         """
 
         # Call the process_frame function of ContentDetector but ignore any
-        # returned cuts
-        if self.is_processing_required(frame_num):
-            super(AdaptiveDetector, self).process_frame(
-                frame_num=frame_num, frame_img=frame_img)
+        # returned cuts. This is done even if the frame metrics already exist, so
+        # that ContentDetector can keep track of the previous frame if required.
+        super(AdaptiveDetector, self).process_frame(
+            frame_num=frame_num, frame_img=frame_img)
 
         return []
 
 
+    def decide_frame(self, frame_num, metrics):
+        # type: (int, Dict[str, Optional[float]]) -> List[int]
+        """ Cuts are only detected in post_process, once the metrics of all frames are known.
+
+        Returns:
+            Empty list
+        """
+        return []
+
+
+    def get_state(self):
+        # type: () -> Optional[Dict[str, Any]]
+        """ Not supported, as cuts are detected in post_process from the metrics of all
+        frames (processing is resumed by loading them from a stats file instead). """
+        return None
+
+
     def get_content_val(self, frame_num):
         """
         Returns the average content change for a frame.
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" ``scenedetect.detectors.cascade_detector`` Module
+
+This module implements the :py:class:`CascadeDetector`, which runs a very cheap
+"gate" computation (the colour difference between tiny thumbnails of adjacent frames)
+on every frame, and only computes the metrics of the wrapped (more expensive) detector
+on frames where the gate score exceeds a set threshold.
+
+This detector is currently only available from the Python API.
+"""
+
+# Third-Party Library Imports
+import cv2
+
+# PySceneDetect Library Imports
+from scenedetect.scene_detector import SceneDetector
+from scenedetect.detectors.content_detector import ContentDetector
+from scenedetect.detectors.hash_detector import HashDetector
+from scenedetect.detectors.histogram_detector import HistogramDetector
+
+
+##
+## CascadeDetector Helper Functions
+##
+
+def compute_thumbnail(frame, thumbnail_width):
+    # type: (numpy.ndarray, int) -> numpy.ndarray
+    """Computes a tiny thumbnail of a BGR frame.
+
+    The frame is resized using area interpolation (averaging all source pixels) so
+    that noise has little effect on the result, preserving the frame's aspect ratio.
+
+    Returns:
+        BGR numpy.ndarray with a width of thumbnail_width.
+    """
+    height, width = frame.shape[:2]
+    thumbnail_height = max(1, int(round(height * thumbnail_width / float(width))))
+    return cv2.resize(
+        frame, (thumbnail_width, thumbnail_height), interpolation=cv2.INTER_AREA)
+
+
+def compute_gate_score(thumbnail, last_thumbnail):
+    # type: (numpy.ndarray, numpy.ndarray) -> float
+    """Computes the gate score of two thumbnails (see compute_thumbnail): the largest
+    average absolute difference of any of the B, G, and R channels, so that cuts which
+    change the colours but not the brightness of a frame are not missed.
+
+    Returns:
+        Gate score from 0.0 to 255.0.
+    """
+    return max(cv2.mean(cv2.absdiff(thumbnail, last_thumbnail))[:3])
+
+
+##
+## CascadeDetector Class Implementation
+##
+
+class CascadeDetector(SceneDetector):
+    """Gates an expensive detector behind a cheap thumbnail difference.
+
+    The average difference of each colour channel between tiny thumbnails of adjacent
+    frames is computed for every frame, the largest of which is the gate score. If it is
+    below gate_threshold, the frame is considered to not be a cut, and the wrapped
+    detector is told so directly (by deciding the frame without any metrics) instead of
+    computing its metrics. Frames at or above gate_threshold are
+    scored by the wrapped detector as normal, with the metrics stored in the StatsManager.
+
+    Only detectors which score the difference between adjacent frames, and which can
+    decide a frame without its metrics, can be wrapped (see SUPPORTED_DETECTORS);
+    subclasses of these (e.g. AdaptiveDetector) may not meet these requirements. The
+    wrapped detector's metrics are only stored for frames which passed the gate, which
+    are marked with a value of 0.0 for the cascade_skipped metric (1.0 otherwise), so
+    statsfiles generated using a CascadeDetector only have exact metrics.
+
+    Attributes:
+        detector:  SceneDetector to run on frames which pass the gate.
+        gate_threshold:  Minimum average difference (0-255) of any colour channel between
+            the thumbnails of adjacent frames required to run the wrapped detector. Should be set
+            conservatively (i.e. well below the wrapped detector's threshold).
+        thumbnail_width:  Width, in pixels, of the thumbnails used to compute the gate.
+    """
+
+    GATE_SCORE_KEY = 'cascade_gate'
+    SKIPPED_KEY = 'cascade_skipped'
+    # The parameters of the wrapped detector are checked separately.
+    METRIC_INDEPENDENT_PARAMETERS = frozenset(['gate_threshold'])
+    # Types of detectors which can be wrapped by a CascadeDetector (exact types only).
+    SUPPORTED_DETECTORS = (ContentDetector, HashDetector, HistogramDetector)
+
+    def __init__(self, detector, gate_threshold=5.0, thumbnail_width=64):
+        # type: (SceneDetector, float, int) -> None
+        """
+        Raises:
+            TypeError: The detector is not one of SUPPORTED_DETECTORS.
+        """
+        super(CascadeDetector, self).__init__()
+        if type(detector) not in CascadeDetector.SUPPORTED_DETECTORS:
+            raise TypeError('CascadeDetector cannot wrap a %s (must be one of: %s).' % (
+                type(detector).__name__, ', '.join(
+                    [cls.__name__ for cls in CascadeDetector.SUPPORTED_DETECTORS])))
+        self.detector = detector
+        self.gate_threshold = gate_threshold
+        self.thumbnail_width = thumbnail_width
+        self.last_thumbnail = None
+        # Previous frame (not copied, see process_frame), and the result of the wrapped
+        # detector's prepare_frame for it (only computed if it passed the gate).
+        self.last_frame = None
+        self.last_data = None
+
+
+    @property
+    def stats_manager(self):
+        # type: () -> Optional[StatsManager]
+        """ StatsManager used by both the CascadeDetector and the wrapped detector. """
+        return self.detector.stats_manager
+
+
+    @stats_manager.setter
+    def stats_manager(self, stats_manager):
+        # type: (Optional[StatsManager]) -> None
+        self.detector.stats_manager = stats_manager
+
+
+    def get_metrics(self):
+        # type: () -> List[str]
+        """ Combines the wrapped detector's metric keys with the CascadeDetector ones. """
+        return self.detector.get_metrics() + [
+            CascadeDetector.GATE_SCORE_KEY, CascadeDetector.SKIPPED_KEY]
+
+
+    def stats_manager_required(self):
+        # type: () -> bool
+        """ Overload to indicate that this detector requires a StatsManager only if the
+        wrapped detector does.
+
+        Returns:
+            bool: Result of stats_manager_required of the wrapped detector.
+        """
+        return self.detector.stats_manager_required()
+
+
+    def is_processing_required(self, frame_num):
+        # type: (int) -> bool
+        return self.detector.is_processing_required(frame_num)
+
+
+    def process_frame(self, frame_num, frame_img):
+        # type: (int, Optional[numpy.ndarray]) -> List[int]
+        """ Computes the gate score for the given frame, and only computes the wrapped
+        detector's metrics if it is at or above gate_threshold. The wrapped detector then
+        decides the frame using these metrics (without any if below gate_threshold).
+
+        The frame is not copied: it is only read again (to be prepared for the wrapped
+        detector) when processing the next frame, if that one passes the gate. The frame
+        must thus not be modified until the next frame is processed, which is the case
+        for frames read from a VideoManager, and in processes mode (see
+        :py:mod:`scenedetect.frame_buffer`).
+
+        Arguments:
+            frame_num (int): Frame number of frame that is being passed.
+            frame_img (Optional[numpy.ndarray]): Decoded frame image (numpy.ndarray) to perform
+                scene detection on. Can be None *only* if the self.is_processing_required()
+                method returns False.
+
+        Returns:
+            List[int]: List of frames where scene cuts have been detected, as returned
+            by the wrapped detector.
+        """
+        metric_keys = self.detector.get_metrics()
+        if frame_img is None or not self.detector.is_processing_required(frame_num):
+            # The wrapped detector's metrics are already known (e.g. from a statsfile).
+            metrics = dict(zip(metric_keys, self.stats_manager.get_metrics(
+                frame_num, metric_keys)))
+            self._set_last_frame(frame_img, None)
+            return self.detector.decide_frame(frame_num, metrics)
+
+        thumbnail = compute_thumbnail(frame_img, self.thumbnail_width)
+        gate_score = None
+        if self.last_thumbnail is not None:
+            gate_score = compute_gate_score(thumbnail, self.last_thumbnail)
+
+        curr_data = None
+        skipped = gate_score is not None and gate_score < self.gate_threshold
+        if skipped:
+            metrics = {}
+        else:
+            curr_data = self.detector.prepare_frame(frame_img)
+            last_data = self.last_data
+            if last_data is None and self.last_frame is not None:
+                last_data = self.detector.prepare_frame(self.last_frame)
+            metrics = self.detector.score_frame(frame_num, curr_data, last_data)
+
+        if self.stats_manager is not None:
+            stored_metrics = dict(metrics)
+            if gate_score is not None:
+                stored_metrics[CascadeDetector.GATE_SCORE_KEY] = gate_score
+                stored_metrics[CascadeDetector.SKIPPED_KEY] = 1.0 if skipped else 0.0
+            self.stats_manager.set_metrics(frame_num, stored_metrics)
+
+        self._set_last_frame(frame_img, curr_data, thumbnail)
+        return self.detector.decide_frame(frame_num, metrics)
+
+
+    def _set_last_frame(self, frame_img, frame_data, thumbnail=None):
+        # type: (Optional[numpy.ndarray], Any, Optional[numpy.ndarray]) -> None
+        """ Keeps the given frame (and its thumbnail) to compare the next frame with. """
+        if frame_img is not None and thumbnail is None:
+            thumbnail = compute_thumbnail(frame_img, self.thumbnail_width)
+        self.last_thumbnail = thumbnail
+        self.last_frame = frame_img
+        self.last_data = frame_data
+
+
+    def get_state(self):
+        # type: () -> Optional[Dict[str, Any]]
+        """ Returns the state of the wrapped detector, if it can be saved. """
+        detector_state = self.detector.get_state()
+        if detector_state is None:
+            return None
+        return {'detector': detector_state}
+
+
+    def set_state(self, state):
+        # type: (Dict[str, Any]) -> None
+        self.detector.set_state(state['detector'])
+
+
+    def post_process(self, frame_num):
+        # type: (int) -> List[int]
+        """ Returns any remaining cuts from the wrapped detector. """
+        return self.detector.post_process(frame_num)
@@ -40,8 +40,61 @@ import cv2
 
 # PySceneDetect Library Imports
 from scenedetect.scene_detector import SceneDetector
+from scenedetect.thread_pool import map_tiles
 
 
+##
+## ContentDetector Helper Functions
+##
+
+def compute_luma(frame):
+    # type: (numpy.ndarray) -> numpy.ndarray
+    """Computes the luma/brightness plane of a BGR frame.
+
+    The result is identical to the V channel of an 8-bit HSV conversion (i.e. the
+    maximum of the B, G, and R values of each pixel), but does not require computing
+    the hue or saturation channels.
+
+    Returns:
+        Single channel numpy.ndarray of the same height and width as the input frame.
+    """
+    blue, green, red = cv2.split(frame)
+    return cv2.max(cv2.max(blue, green), red)
+
+
+def compute_hsv_deltas(curr_hsv, last_hsv):
+    # type: (List[numpy.ndarray], List[numpy.ndarray]) -> List[float]
+    """Computes the average absolute difference of each channel of two split HSV frames.
+
+    Returns:
+        List of the average change in hue, saturation, and value (luma), respectively.
+    """
+    curr_hsv = [x.astype(numpy.int32) for x in curr_hsv]
+    last_hsv = [x.astype(numpy.int32) for x in last_hsv]
+    delta_hsv = [0, 0, 0]
+    for i in range(3):
+        num_pixels = curr_hsv[i].shape[0] * curr_hsv[i].shape[1]
+        delta_hsv[i] = numpy.sum(
+            numpy.abs(curr_hsv[i] - last_hsv[i])) / float(num_pixels)
+    return delta_hsv
+
+
+def compute_luma_delta(curr_luma, last_luma):
+    # type: (numpy.ndarray, numpy.ndarray) -> float
+    """Computes the average absolute difference between two luma planes (see compute_luma).
+
+    Returns:
+        Average change in luma, identical to the change in value (delta_lum) computed
+        from the HSV frames.
+    """
+    num_pixels = curr_luma.shape[0] * curr_luma.shape[1]
+    return numpy.sum(cv2.absdiff(curr_luma, last_luma)) / float(num_pixels)
+
+
+##
+## ContentDetector Class Implementation
+##
+
 class ContentDetector(SceneDetector):
     """Detects fast cuts using changes in colour and intensity between frames.
 
@@ -53,18 +106,30 @@ class ContentDetector(SceneDetector):
     FRAME_SCORE_KEY = 'content_val'
     DELTA_H_KEY, DELTA_S_KEY, DELTA_V_KEY = ('delta_hue', 'delta_sat', 'delta_lum')
     METRIC_KEYS = [FRAME_SCORE_KEY, DELTA_H_KEY, DELTA_S_KEY, DELTA_V_KEY]
+    METRIC_INDEPENDENT_PARAMETERS = frozenset(['threshold', 'min_scene_len'])
 
 
-    def __init__(self, threshold=30.0, min_scene_len=15, luma_only=False):
-        # type: (float, Union[int, FrameTimecode]) -> None
+    def __init__(self, threshold=30.0, min_scene_len=15, luma_only=False, num_threads=1):
+        # type: (float, Union[int, FrameTimecode], bool, int) -> None
         super(ContentDetector, self).__init__()
         self.threshold = threshold
         # Minimum length of any given scene, in frames (int) or FrameTimecode
         self.min_scene_len = min_scene_len
         self.luma_only = luma_only
+        # If > 1, the HSV conversion and deltas are computed on horizontal tiles of each
+        # frame in parallel. In this case, last_hsv is a single HSV image (not split).
+        self.num_threads = num_threads
         self.last_frame = None
         self.last_scene_cut = None
         self.last_hsv = None
+        self.last_luma = None
+        # Metric keys required to skip processing a given frame. In luma_only mode,
+        # only delta_lum is computed, and the remaining metrics are left absent.
+        self._required_metric_keys = (
+            [ContentDetector.DELTA_V_KEY] if luma_only else ContentDetector.METRIC_KEYS)
+        # Metric compared against the threshold to detect cuts.
+        self._score_metric_key = (
+            ContentDetector.DELTA_V_KEY if luma_only else ContentDetector.FRAME_SCORE_KEY)
 
 
     def get_metrics(self):
@@ -73,29 +138,81 @@ class ContentDetector(SceneDetector):
 
     def is_processing_required(self, frame_num):
         return self.stats_manager is None or (
-            not self.stats_manager.metrics_exist(frame_num, ContentDetector.METRIC_KEYS))
+            not self.stats_manager.metrics_exist(frame_num, self._required_metric_keys))
 
 
     def calculate_frame_score(self, frame_num, curr_hsv, last_hsv):
         # type: (int, List[numpy.ndarray], List[numpy.ndarray]) -> float
-        curr_hsv = [x.astype(numpy.int32) for x in curr_hsv]
-        last_hsv = [x.astype(numpy.int32) for x in last_hsv]
-        delta_hsv = [0, 0, 0, 0]
-        for i in range(3):
-            num_pixels = curr_hsv[i].shape[0] * curr_hsv[i].shape[1]
-            delta_hsv[i] = numpy.sum(
-                numpy.abs(curr_hsv[i] - last_hsv[i])) / float(num_pixels)
+        return self._set_frame_score(frame_num, *compute_hsv_deltas(curr_hsv, last_hsv))
+
 
-        delta_hsv[3] = sum(delta_hsv[0:3]) / 3.0
-        delta_h, delta_s, delta_v, delta_content = delta_hsv
+    def calculate_frame_score_tiled(self, frame_num, frame_img, last_hsv):
+        # type: (int, numpy.ndarray, numpy.ndarray) -> Tuple[float, numpy.ndarray]
+        """ Tile-parallel variant of calculate_frame_score, used when num_threads > 1.
 
+        The frame is converted to HSV and compared with last_hsv in horizontal tiles on a
+        persistent thread pool. The per-tile sums of each channel's absolute difference are
+        integers, so reducing them yields exactly the same metrics as calculate_frame_score.
+
+        Arguments:
+            frame_num (int): Frame number of the current frame.
+            frame_img (numpy.ndarray): Current frame (BGR).
+            last_hsv (numpy.ndarray): HSV image of the previous frame.
+
+        Returns:
+            Tuple[float, numpy.ndarray]: Frame score, and the HSV image of the current frame.
+        """
+        curr_hsv = numpy.empty(frame_img.shape, dtype=numpy.uint8)
+
+        def _process_tile(rows):
+            cv2.cvtColor(frame_img[rows], cv2.COLOR_BGR2HSV, dst=curr_hsv[rows])
+            return cv2.sumElems(cv2.absdiff(curr_hsv[rows], last_hsv[rows]))[:3]
+
+        tile_sums = map_tiles(_process_tile, frame_img.shape[0], self.num_threads)
+        num_pixels = float(frame_img.shape[0] * frame_img.shape[1])
+        delta_hsv = [sum(tile[i] for tile in tile_sums) / num_pixels for i in range(3)]
+        return self._set_frame_score(frame_num, *delta_hsv), curr_hsv
+
+
+    def _set_frame_score(self, frame_num, delta_h, delta_s, delta_v):
+        # type: (int, float, float, float) -> float
+        """ Stores the HSV deltas and content score of the frame in the StatsManager (if any),
+        returning the frame score used for cut detection. """
+        metrics = self._get_frame_metrics(delta_h, delta_s, delta_v)
         if self.stats_manager is not None:
-            self.stats_manager.set_metrics(frame_num, {
-                self.FRAME_SCORE_KEY: delta_content,
-                self.DELTA_H_KEY: delta_h,
-                self.DELTA_S_KEY: delta_s,
-                self.DELTA_V_KEY: delta_v})
-        return delta_content if not self.luma_only else delta_v
+            self.stats_manager.set_metrics(frame_num, metrics)
+        return metrics[self._score_metric_key]
+
+
+    def _get_frame_metrics(self, delta_h, delta_s, delta_v):
+        # type: (float, float, float) -> Dict[str, float]
+        """ Returns the metrics of a frame given the average change in each HSV channel. """
+        return {
+            self.FRAME_SCORE_KEY: (delta_h + delta_s + delta_v) / 3.0,
+            self.DELTA_H_KEY: delta_h,
+            self.DELTA_S_KEY: delta_s,
+            self.DELTA_V_KEY: delta_v}
+
+
+    def calculate_luma_score(self, frame_num, curr_luma, last_luma):
+        # type: (int, numpy.ndarray, numpy.ndarray) -> float
+        """ Luma-only variant of calculate_frame_score, used when luma_only is set.
+
+        Only the delta_lum metric is computed and stored; the hue, saturation, and
+        content_val metrics are left absent for the given frame.
+
+        Arguments:
+            frame_num (int): Frame number of the current frame.
+            curr_luma (numpy.ndarray): Luma plane of the current frame (see compute_luma).
+            last_luma (numpy.ndarray): Luma plane of the previous frame.
+
+        Returns:
+            float: Average change in luma between the two frames (delta_lum).
+        """
+        delta_v = compute_luma_delta(curr_luma, last_luma)
+        if self.stats_manager is not None:
+            self.stats_manager.set_metrics(frame_num, {self.DELTA_V_KEY: delta_v})
+        return delta_v
 
 
     def process_frame(self, frame_num, frame_img):
@@ -117,6 +234,7 @@ class ContentDetector(SceneDetector):
 
         cut_list = []
         _unused = ''
+        curr_luma = None
 
         # Initialize last scene cut point at the beginning of the frames of interest.
         if self.last_scene_cut is None:
@@ -127,11 +245,25 @@ class ContentDetector(SceneDetector):
             # We obtain the change in average of HSV (frame_score), (h)ue only,
             # (s)aturation only, and (l)uminance only.  These are refered to in a statsfile
             # as their respective metric keys.
-            metric_key = (ContentDetector.DELTA_V_KEY if self.luma_only
-                          else ContentDetector.FRAME_SCORE_KEY)
+            metric_key = self._score_metric_key
             if (self.stats_manager is not None and
                     self.stats_manager.metrics_exist(frame_num, [metric_key])):
                 frame_score = self.stats_manager.get_metrics(frame_num, [metric_key])[0]
+                # Any cached planes are no longer from the previous frame.
+                self.last_hsv = None
+                self.last_luma = None
+            elif self.luma_only:
+                curr_luma = compute_luma(frame_img)
+                last_luma = self.last_luma
+                if last_luma is None:
+                    last_luma = compute_luma(self.last_frame)
+                frame_score = self.calculate_luma_score(frame_num, curr_luma, last_luma)
+            elif self.num_threads > 1:
+                last_hsv = self.last_hsv
+                if last_hsv is None:
+                    last_hsv = cv2.cvtColor(self.last_frame, cv2.COLOR_BGR2HSV)
+                frame_score, self.last_hsv = self.calculate_frame_score_tiled(
+                    frame_num, frame_img, last_hsv)
             else:
                 curr_hsv = cv2.split(cv2.cvtColor(frame_img, cv2.COLOR_BGR2HSV))
                 last_hsv = self.last_hsv
@@ -142,12 +274,7 @@ class ContentDetector(SceneDetector):
 
                 self.last_hsv = curr_hsv
 
-            # We consider any frame over the threshold a new scene, but only if
-            # the minimum scene length has been reached (otherwise it is ignored).
-            if frame_score >= self.threshold and (
-                    (frame_num - self.last_scene_cut) >= self.min_scene_len):
-                cut_list.append(frame_num)
-                self.last_scene_cut = frame_num
+            cut_list = self.decide_frame(frame_num, {metric_key: frame_score})
 
             if self.last_frame is not None and self.last_frame is not _unused:
                 del self.last_frame
@@ -155,14 +282,71 @@ class ContentDetector(SceneDetector):
         # If we have the next frame computed, don't copy the current frame
         # into last_frame since we won't use it on the next call anyways.
         if (self.stats_manager is not None and
-                self.stats_manager.metrics_exist(frame_num+1, self.get_metrics())):
+                self.stats_manager.metrics_exist(frame_num+1, self._required_metric_keys)):
+            self.last_frame = _unused
+            self.last_luma = None
+        elif self.luma_only:
+            # Only the luma plane is required for the next frame, so we avoid
+            # copying the whole frame and keep just that plane instead.
             self.last_frame = _unused
+            self.last_luma = curr_luma if curr_luma is not None else compute_luma(frame_img)
         else:
             self.last_frame = frame_img.copy()
 
         return cut_list
 
 
+    def is_pipeline_supported(self):
+        # type: () -> bool
+        return True
+
+
+    def prepare_frame(self, frame_img):
+        # type: (numpy.ndarray) -> Union[numpy.ndarray, List[numpy.ndarray]]
+        """ Returns the luma plane of the frame if luma_only is set, otherwise the split
+        HSV channels of the frame. """
+        if self.luma_only:
+            return compute_luma(frame_img)
+        return cv2.split(cv2.cvtColor(frame_img, cv2.COLOR_BGR2HSV))
+
+
+    def score_frame(self, frame_num, curr_data, last_data):
+        # type: (int, Any, Optional[Any]) -> Dict[str, float]
+        """ Computes the same metrics as process_frame, using the luma planes or HSV
+        channels returned by prepare_frame. """
+        if last_data is None:
+            return {}
+        if self.luma_only:
+            return {self.DELTA_V_KEY: compute_luma_delta(curr_data, last_data)}
+        return self._get_frame_metrics(*compute_hsv_deltas(curr_data, last_data))
+
+
+    def decide_frame(self, frame_num, metrics):
+        # type: (int, Dict[str, Optional[float]]) -> List[int]
+        """ Detects a cut if the frame score exceeds the threshold. """
+        # Initialize last scene cut point at the beginning of the frames of interest.
+        if self.last_scene_cut is None:
+            self.last_scene_cut = frame_num
+        frame_score = metrics.get(self._score_metric_key)
+        # We consider any frame over the threshold a new scene, but only if
+        # the minimum scene length has been reached (otherwise it is ignored).
+        if frame_score is not None and frame_score >= self.threshold and (
+                (frame_num - self.last_scene_cut) >= self.min_scene_len):
+            self.last_scene_cut = frame_num
+            return [frame_num]
+        return []
+
+
+    def get_state(self):
+        # type: () -> Optional[Dict[str, Any]]
+        return {'last_scene_cut': self.last_scene_cut}
+
+
+    def set_state(self, state):
+        # type: (Dict[str, Any]) -> None
+        self.last_scene_cut = state['last_scene_cut']
+
+
     #def post_process(self, frame_num):
     #    """ TODO: Based on the parameters passed to the ContentDetector constructor,
     #        ensure that the last scene meets the minimum length requirement,
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" ``scenedetect.detectors.dissolve_detector`` Module
+
+This module implements the :py:class:`DissolveDetector`, which detects slow
+transitions (dissolves and fades) between scenes using the characteristic dip in
+the variance of the frame luma over the length of the transition.
+
+This detector is available from the command-line interface by using the
+`detect-dissolve` command.
+"""
+
+# Standard Library Imports
+from collections import deque
+
+# Third-Party Library Imports
+import cv2
+import numpy
+
+# PySceneDetect Library Imports
+from scenedetect.scene_detector import SceneDetector
+from scenedetect.detectors.content_detector import ContentDetector
+from scenedetect.detectors.content_detector import compute_luma
+from scenedetect.detectors.content_detector import compute_luma_delta
+from scenedetect.video_manager import compute_downscale_factor
+
+
+##
+## DissolveDetector Class Implementation
+##
+
+class DissolveDetector(SceneDetector):
+    """Detects slow fades (dissolve cuts) via changes in the luma variance of frames.
+
+    During a dissolve, each frame is a weighted average of two uncorrelated scenes, so
+    the variance of the luma drops to a minimum around the middle of the transition,
+    while adjacent frames keep changing gradually. The luma mean/variance and frame
+    difference of the last window_size frames are kept in a fixed-size ring buffer,
+    and a cut is placed at the frame with the lowest variance once it reaches the
+    center of the window, if the variance dips by at least min_dip (relative to both
+    ends of the window) and every frame around it differs by at least min_delta.
+
+    Detects slow fades only; to detect fast cuts between content scenes, the
+    ContentDetector should be used as well. The frame difference is stored as the
+    delta_lum metric, computed exactly as by the ContentDetector, so it is only computed
+    once if both detectors are used (in any order).
+
+    Attributes:
+        min_dip:  Minimum relative decrease (from 0.0 to 1.0) in luma variance at the
+            middle of a transition, compared to the frames at both ends of the window.
+        window_size:  Number of frames in the sliding window, which should be at least
+            as long as the transitions to detect. Cuts are detected window_size / 2
+            frames after they occur.
+        min_scene_len:  FrameTimecode object or integer greater than 0 of the
+            minimum length, in frames, of a scene (or subsequent scene cut).
+        min_delta:  Minimum average change in luma (0-255) between adjacent frames
+            around the middle of a transition.
+        subsample:  Stride (in rows/columns) used to subsample frames before computing
+            statistics. If None, it is computed automatically from the frame width.
+    """
+
+    # The statistics depend on the subsampling of each frame, so the subsample stride is
+    # part of the metric keys (omitted if computed automatically). The frame difference is
+    # computed on the full frame, exactly as the delta_lum metric of the ContentDetector.
+    LUMA_MEAN_KEY_TEMPLATE = 'dissolve_luma_mean{subsample}'
+    LUMA_VAR_KEY_TEMPLATE = 'dissolve_luma_var{subsample}'
+    DELTA_KEY = ContentDetector.DELTA_V_KEY
+    METRIC_INDEPENDENT_PARAMETERS = frozenset(
+        ['min_dip', 'window_size', 'min_scene_len', 'min_delta'])
+
+
+    def __init__(self, min_dip=0.3, window_size=30, min_scene_len=15, min_delta=0.5,
+                 subsample=None):
+        # type: (float, int, Union[int, FrameTimecode], float, Optional[int]) -> None
+        super(DissolveDetector, self).__init__()
+        if window_size < 3:
+            raise ValueError('window_size must be at least 3 frames.')
+        self.min_dip = min_dip
+        self.window_size = window_size
+        # Minimum length of any given scene, in frames (int) or FrameTimecode
+        self.min_scene_len = min_scene_len
+        self.min_delta = min_delta
+        self.subsample = subsample
+        self.last_luma = None
+        self.last_scene_cut = None
+        # Ring buffer of (frame_num, luma_mean, luma_var, delta) for the last window_size frames.
+        self._window = deque(maxlen=window_size)
+        # Subsample stride used, computed from the first frame if subsample is None.
+        self._subsample = subsample
+        key_suffix = '' if subsample is None else ' (subsample=%d)' % subsample
+        self._luma_mean_key = DissolveDetector.LUMA_MEAN_KEY_TEMPLATE.format(subsample=key_suffix)
+        self._luma_var_key = DissolveDetector.LUMA_VAR_KEY_TEMPLATE.format(subsample=key_suffix)
+
+
+    def get_metrics(self):
+        return [self._luma_mean_key, self._luma_var_key, DissolveDetector.DELTA_KEY]
+
+
+    def is_processing_required(self, frame_num):
+        return self.stats_manager is None or not (
+            self.stats_manager.metrics_exist(frame_num, self.get_metrics()))
+
+
+    def _get_stored_delta(self, frame_num):
+        # type: (int) -> Optional[float]
+        """ Returns the frame difference stored in the StatsManager for the given frame
+        (computed by either the DissolveDetector or a ContentDetector). """
+        if self.stats_manager.metrics_exist(frame_num, [DissolveDetector.DELTA_KEY]):
+            return self.stats_manager.get_metrics(frame_num, [DissolveDetector.DELTA_KEY])[0]
+        return None
+
+
+    def _get_subsample(self, frame_img):
+        # type: (numpy.ndarray) -> int
+        """ Returns the subsample stride to compute the luma statistics of frames with. """
+        if self._subsample is None:
+            self._subsample = compute_downscale_factor(frame_img.shape[1])
+        return self._subsample
+
+
+    def process_frame(self, frame_num, frame_img):
+        # type: (int, Optional[numpy.ndarray]) -> List[int]
+        """ Adds the luma statistics of the given frame to the sliding window, and checks
+        if the frame at the center of the window is the middle of a slow transition.
+
+        Arguments:
+            frame_num (int): Frame number of frame that is being passed.
+            frame_img (Optional[numpy.ndarray]): Decoded frame image (numpy.ndarray) to perform
+                scene detection on. Can be None *only* if the self.is_processing_required()
+                method returns False.
+
+        Returns:
+            List[int]: List of frames where scene cuts have been detected. There may be 0
+            or more frames in the list, and not necessarily the same as frame_num.
+        """
+        # Initialize last scene cut point at the beginning of the frames of interest.
+        if self.last_scene_cut is None:
+            self.last_scene_cut = frame_num
+
+        # Luma plane of the full frame, only computed if the frame difference is required.
+        curr_luma = None
+        metric_dict = {}
+
+        delta = None
+        if self.stats_manager is not None:
+            delta = self._get_stored_delta(frame_num)
+        if delta is None and self.last_luma is not None:
+            curr_luma = compute_luma(frame_img)
+            delta = compute_luma_delta(curr_luma, self.last_luma)
+            metric_dict[DissolveDetector.DELTA_KEY] = delta
+
+        if self.stats_manager is not None and self.stats_manager.metrics_exist(
+                frame_num, [self._luma_mean_key, self._luma_var_key]):
+            luma_mean, luma_var = self.stats_manager.get_metrics(
+                frame_num, [self._luma_mean_key, self._luma_var_key])
+        else:
+            subsample = self._get_subsample(frame_img)
+            if curr_luma is not None:
+                luma = numpy.ascontiguousarray(curr_luma[::subsample, ::subsample])
+            else:
+                luma = compute_luma(frame_img[::subsample, ::subsample])
+            mean, stddev = cv2.meanStdDev(luma)
+            luma_mean, luma_var = float(mean[0][0]), float(stddev[0][0]) ** 2
+            metric_dict[self._luma_mean_key] = luma_mean
+            metric_dict[self._luma_var_key] = luma_var
+
+        if self.stats_manager is not None and metric_dict:
+            self.stats_manager.set_metrics(frame_num, metric_dict)
+
+        # The previous luma plane is only required if the next frame's delta is unknown.
+        if self.stats_manager is not None and self._get_stored_delta(frame_num + 1) is not None:
+            self.last_luma = None
+        else:
+            if curr_luma is None and frame_img is not None:
+                curr_luma = compute_luma(frame_img)
+            self.last_luma = curr_luma
+
+        self._window.append((frame_num, luma_mean, luma_var, delta))
+        return self._detect_dissolve()
+
+
+    def _detect_dissolve(self):
+        # type: () -> List[int]
+        """ Checks if the frame at the center of the sliding window is the middle (lowest
+        luma variance) of a slow transition.
+
+        Returns:
+            List[int]: List containing the center frame if it is the middle of a transition,
+            otherwise an empty list.
+        """
+        if len(self._window) < self.window_size:
+            return []
+        center = self.window_size // 2
+        frame_num, _, center_var, _ = self._window[center]
+        edge_var = min(self._window[0][2], self._window[-1][2])
+        if center_var > edge_var * (1.0 - self.min_dip):
+            return []
+        if any(luma_var < center_var for _, _, luma_var, _ in self._window):
+            return []
+        # Adjacent frames around the middle of a transition must be changing gradually.
+        if any(delta is None or delta < self.min_delta
+               for _, _, _, delta in list(self._window)[center - 1:center + 2]):
+            return []
+        if (frame_num - self.last_scene_cut) < self.min_scene_len:
+            return []
+        self.last_scene_cut = frame_num
+        return [frame_num]
+
+
+    def get_state(self):
+        # type: () -> Optional[Dict[str, Any]]
+        """ Includes the luma statistics of the frames in the sliding window. """
+        return {'last_scene_cut': self.last_scene_cut,
+                'window': [list(entry) for entry in self._window]}
+
+
+    def set_state(self, state):
+        # type: (Dict[str, Any]) -> None
+        self.last_scene_cut = state['last_scene_cut']
+        self._window = deque([tuple(entry) for entry in state['window']],
+                             maxlen=self.window_size)
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" ``scenedetect.detectors.hash_detector`` Module
+
+This module implements the :py:class:`HashDetector`, which computes a perceptual
+(difference) hash of each frame, and triggers a scene cut when the Hamming distance
+between the hashes of adjacent frames exceeds a set threshold.
+
+This detector is available from the command-line interface by using the
+`detect-hash` command.
+"""
+
+# Third-Party Library Imports
+import numpy
+import cv2
+
+# PySceneDetect Library Imports
+from scenedetect.scene_detector import SceneDetector
+
+
+##
+## HashDetector Helper Functions
+##
+
+def compute_frame_hash(frame, hash_size=8):
+    # type: (numpy.ndarray, int) -> int
+    """Computes the difference hash (dHash) of a BGR frame.
+
+    The frame is downscaled to a (hash_size + 1) x hash_size greyscale image, and each
+    bit of the hash is set if a pixel is brighter than its left neighbour.
+
+    Returns:
+        Integer of hash_size * hash_size bits (64 bits by default) representing the frame.
+    """
+    thumbnail = cv2.cvtColor(
+        cv2.resize(frame, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA),
+        cv2.COLOR_BGR2GRAY)
+    hash_bits = numpy.packbits(thumbnail[:, 1:] > thumbnail[:, :-1])
+    return int.from_bytes(hash_bits.tobytes(), 'big')
+
+
+def hash_distance(hash_a, hash_b):
+    # type: (int, int) -> int
+    """Computes the Hamming distance (number of differing bits) between two frame hashes."""
+    return bin(hash_a ^ hash_b).count('1')
+
+
+##
+## HashDetector Class Implementation
+##
+
+class HashDetector(SceneDetector):
+    """Detects fast cuts using the Hamming distance between perceptual hashes of frames.
+
+    Much cheaper to compute than the ContentDetector, as each frame is reduced to a tiny
+    greyscale image before any processing. The raw hash of each frame is stored as an
+    integer metric in the StatsManager, so only the hash of the previous frame needs to
+    be kept in memory between frames.
+
+    Attributes:
+        threshold:  Minimum Hamming distance (from 0 to hash_size * hash_size) between
+            the hashes of adjacent frames to trigger a new scene.
+        min_scene_len:  FrameTimecode object or integer greater than 0 of the
+            minimum length, in frames, of a scene (or subsequent scene cut).
+        hash_size:  Size of the hash, which has a total of hash_size * hash_size bits.
+    """
+
+    # Hashes of different sizes cannot be compared, so the size is part of the metric keys.
+    HASH_KEY_TEMPLATE = 'hash_val (size={hash_size})'
+    DISTANCE_KEY_TEMPLATE = 'hash_dist (size={hash_size})'
+    METRIC_INDEPENDENT_PARAMETERS = frozenset(['threshold', 'min_scene_len'])
+
+
+    def __init__(self, threshold=16, min_scene_len=15, hash_size=8):
+        # type: (int, Union[int, FrameTimecode], int) -> None
+        super(HashDetector, self).__init__()
+        self.threshold = threshold
+        # Minimum length of any given scene, in frames (int) or FrameTimecode
+        self.min_scene_len = min_scene_len
+        self.hash_size = hash_size
+        self.last_hash = None
+        self.last_scene_cut = None
+        self._hash_key = HashDetector.HASH_KEY_TEMPLATE.format(hash_size=hash_size)
+        self._distance_key = HashDetector.DISTANCE_KEY_TEMPLATE.format(hash_size=hash_size)
+
+
+    def get_metrics(self):
+        return [self._hash_key, self._distance_key]
+
+
+    def is_processing_required(self, frame_num):
+        # The distance can always be computed from the stored hashes, so the frame is
+        # only required if its hash is not already in the StatsManager.
+        return self.stats_manager is None or (
+            not self.stats_manager.metrics_exist(frame_num, [self._hash_key]))
+
+
+    def process_frame(self, frame_num, frame_img):
+        # type: (int, Optional[numpy.ndarray]) -> List[int]
+        """ Computes the hash of the given frame, and compares it with the previous one.
+
+        Arguments:
+            frame_num (int): Frame number of frame that is being passed.
+            frame_img (Optional[numpy.ndarray]): Decoded frame image (numpy.ndarray) to perform
+                scene detection on. Can be None *only* if the self.is_processing_required()
+                method returns False.
+
+        Returns:
+            List[int]: List of frames where scene cuts have been detected. There may be 0
+            or more frames in the list, and not necessarily the same as frame_num.
+        """
+        if (self.stats_manager is not None and
+                self.stats_manager.metrics_exist(frame_num, [self._hash_key])):
+            curr_hash = int(self.stats_manager.get_metrics(frame_num, [self._hash_key])[0])
+        else:
+            curr_hash = self.prepare_frame(frame_img)
+            if self.stats_manager is not None:
+                self.stats_manager.set_metrics(frame_num, {self._hash_key: curr_hash})
+
+        metrics = {self._hash_key: curr_hash}
+        if (self.stats_manager is not None and
+                self.stats_manager.metrics_exist(frame_num, [self._distance_key])):
+            metrics[self._distance_key] = self.stats_manager.get_metrics(
+                frame_num, [self._distance_key])[0]
+
+        return self.decide_frame(frame_num, metrics)
+
+
+    def is_pipeline_supported(self):
+        # type: () -> bool
+        return True
+
+
+    def prepare_frame(self, frame_img):
+        # type: (numpy.ndarray) -> int
+        """ Computes the hash of the given frame. """
+        return compute_frame_hash(frame_img, self.hash_size)
+
+
+    def score_frame(self, frame_num, curr_data, last_data):
+        # type: (int, int, Optional[int]) -> Dict[str, int]
+        """ Returns the hash of the frame, and the distance from the previous one if known. """
+        metrics = {self._hash_key: curr_data}
+        if last_data is not None:
+            metrics[self._distance_key] = hash_distance(curr_data, last_data)
+        return metrics
+
+
+    def decide_frame(self, frame_num, metrics):
+        # type: (int, Dict[str, Optional[int]]) -> List[int]
+        """ Compares the hash distance of the given frame with the threshold. If the distance
+        is not in metrics, it is computed from the previous hash and set in the StatsManager.
+        """
+        cut_list = []
+
+        # Initialize last scene cut point at the beginning of the frames of interest.
+        if self.last_scene_cut is None:
+            self.last_scene_cut = frame_num
+
+        curr_hash = metrics.get(self._hash_key)
+        if curr_hash is None:
+            return cut_list
+        curr_hash = int(curr_hash)
+
+        # We can only start detecting once we have a hash to compare with.
+        if self.last_hash is not None:
+            frame_score = metrics.get(self._distance_key)
+            if frame_score is None:
+                frame_score = hash_distance(curr_hash, self.last_hash)
+                if self.stats_manager is not None:
+                    self.stats_manager.set_metrics(
+                        frame_num, {self._distance_key: frame_score})
+
+            # We consider any frame over the threshold a new scene, but only if
+            # the minimum scene length has been reached (otherwise it is ignored).
+            if frame_score >= self.threshold and (
+                    (frame_num - self.last_scene_cut) >= self.min_scene_len):
+                cut_list.append(frame_num)
+                self.last_scene_cut = frame_num
+
+        self.last_hash = curr_hash
+
+        return cut_list
+
+
+    def get_state(self):
+        # type: () -> Optional[Dict[str, Any]]
+        return {'last_scene_cut': self.last_scene_cut}
+
+
+    def set_state(self, state):
+        # type: (Dict[str, Any]) -> None
+        self.last_scene_cut = state['last_scene_cut']
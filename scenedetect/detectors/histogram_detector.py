@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" ``scenedetect.detectors.histogram_detector`` Module
+
+This module implements the :py:class:`HistogramDetector`, which compares the
+colour histograms of adjacent frames against a set threshold, which if exceeded,
+triggers a scene cut.
+
+This detector is available from the command-line interface by using the
+`detect-histogram` command.
+"""
+
+# Third-Party Library Imports
+import cv2
+
+# PySceneDetect Library Imports
+from scenedetect.scene_detector import SceneDetector
+from scenedetect.video_manager import compute_downscale_factor
+
+
+##
+## HistogramDetector Helper Functions
+##
+
+def compute_frame_histogram(frame, bins=16, subsample=None):
+    # type: (numpy.ndarray, int, Optional[int]) -> numpy.ndarray
+    """Computes the normalized 3D YUV histogram of a BGR frame.
+
+    Arguments:
+        frame: Frame to compute the histogram of.
+        bins: Number of bins used for each of the Y, U, and V channels.
+        subsample: Only every N-th row/column of the frame is used to compute the
+            histogram. If None, N is computed automatically based on the frame width
+            (see :py:func:`scenedetect.video_manager.compute_downscale_factor`).
+
+    Returns:
+        Float32 numpy.ndarray of shape (bins, bins, bins), summing to 1.0.
+    """
+    if subsample is None:
+        subsample = compute_downscale_factor(frame.shape[1])
+    if subsample > 1:
+        frame = frame[::subsample, ::subsample, :]
+    yuv = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV)
+    hist = cv2.calcHist([yuv], [0, 1, 2], None, [bins] * 3, [0, 256] * 3)
+    return cv2.normalize(hist, hist, alpha=1.0, norm_type=cv2.NORM_L1)
+
+
+##
+## HistogramDetector Class Implementation
+##
+
+class HistogramDetector(SceneDetector):
+    """Detects fast cuts via histogram changes between sequential frames.
+
+    The difference between frames is the Bhattacharyya distance between their YUV
+    histograms, from 0.0 (identical histograms) to 1.0 (no overlap). Since histograms
+    do not depend on where pixels are located within the frame, this is more robust
+    to camera/object motion than the ContentDetector. Only the histogram of the
+    previous frame is kept in memory, rather than the full frame.
+
+    Attributes:
+        threshold:  Distance (from 0.0 to 1.0) between the histograms of adjacent
+            frames that must be exceeded to trigger a new scene.
+        min_scene_len:  FrameTimecode object or integer greater than 0 of the
+            minimum length, in frames, of a scene (or subsequent scene cut).
+        bins:  Number of histogram bins for each of the Y, U, and V channels.
+        subsample:  Stride (in rows/columns) used to subsample frames before computing
+            histograms. If None, it is computed automatically from the frame width.
+    """
+
+    # The distance depends on the number of bins and the subsampling of each frame, so both
+    # are part of the metric key (subsample is omitted if computed automatically).
+    FRAME_SCORE_KEY_TEMPLATE = 'hist_diff (bins={bins}{subsample})'
+    METRIC_INDEPENDENT_PARAMETERS = frozenset(['threshold', 'min_scene_len'])
+
+
+    def __init__(self, threshold=0.5, min_scene_len=15, bins=16, subsample=None):
+        # type: (float, Union[int, FrameTimecode], int, Optional[int]) -> None
+        super(HistogramDetector, self).__init__()
+        self.threshold = threshold
+        # Minimum length of any given scene, in frames (int) or FrameTimecode
+        self.min_scene_len = min_scene_len
+        self.bins = bins
+        self.subsample = subsample
+        self.last_hist = None
+        self.last_scene_cut = None
+        self._frame_score_key = HistogramDetector.FRAME_SCORE_KEY_TEMPLATE.format(
+            bins=bins, subsample='' if subsample is None else ' subsample=%d' % subsample)
+
+
+    def get_metrics(self):
+        return [self._frame_score_key]
+
+
+    def is_processing_required(self, frame_num):
+        return self.stats_manager is None or (
+            not self.stats_manager.metrics_exist(frame_num, [self._frame_score_key]))
+
+
+    def process_frame(self, frame_num, frame_img):
+        # type: (int, Optional[numpy.ndarray]) -> List[int]
+        """ Computes the histogram of the given frame, and compares it with the previous one.
+
+        Arguments:
+            frame_num (int): Frame number of frame that is being passed.
+            frame_img (Optional[numpy.ndarray]): Decoded frame image (numpy.ndarray) to perform
+                scene detection on. Can be None *only* if the self.is_processing_required()
+                method returns False.
+
+        Returns:
+            List[int]: List of frames where scene cuts have been detected. There may be 0
+            or more frames in the list, and not necessarily the same as frame_num.
+        """
+        curr_hist = None
+        if (self.stats_manager is not None and
+                self.stats_manager.metrics_exist(frame_num, [self._frame_score_key])):
+            metrics = {self._frame_score_key: self.stats_manager.get_metrics(
+                frame_num, [self._frame_score_key])[0]}
+        else:
+            curr_hist = self.prepare_frame(frame_img)
+            metrics = self.score_frame(frame_num, curr_hist, self.last_hist)
+            if self.stats_manager is not None and metrics:
+                self.stats_manager.set_metrics(frame_num, metrics)
+
+        cut_list = self.decide_frame(frame_num, metrics)
+
+        # If the next frame's score is already known, the current histogram is not needed.
+        if (self.stats_manager is not None and
+                self.stats_manager.metrics_exist(frame_num + 1, [self._frame_score_key])):
+            curr_hist = None
+        elif curr_hist is None and frame_img is not None:
+            curr_hist = self.prepare_frame(frame_img)
+        self.last_hist = curr_hist
+
+        return cut_list
+
+
+    def is_pipeline_supported(self):
+        # type: () -> bool
+        return True
+
+
+    def prepare_frame(self, frame_img):
+        # type: (numpy.ndarray) -> numpy.ndarray
+        """ Computes the histogram of the given frame. """
+        return compute_frame_histogram(frame_img, self.bins, self.subsample)
+
+
+    def score_frame(self, frame_num, curr_data, last_data):
+        # type: (int, numpy.ndarray, Optional[numpy.ndarray]) -> Dict[str, float]
+        """ Compares the histogram of the given frame with the previous one. """
+        # We can only start detecting once we have a histogram to compare with.
+        if last_data is None:
+            return {}
+        return {self._frame_score_key: cv2.compareHist(
+            last_data, curr_data, cv2.HISTCMP_BHATTACHARYYA)}
+
+
+    def decide_frame(self, frame_num, metrics):
+        # type: (int, Dict[str, Optional[float]]) -> List[int]
+        """ Compares the histogram distance of the given frame with the threshold. """
+        cut_list = []
+
+        # Initialize last scene cut point at the beginning of the frames of interest.
+        if self.last_scene_cut is None:
+            self.last_scene_cut = frame_num
+
+        # We consider any frame over the threshold a new scene, but only if
+        # the minimum scene length has been reached (otherwise it is ignored).
+        frame_score = metrics.get(self._frame_score_key)
+        if frame_score is not None and frame_score >= self.threshold and (
+                (frame_num - self.last_scene_cut) >= self.min_scene_len):
+            cut_list.append(frame_num)
+            self.last_scene_cut = frame_num
+
+        return cut_list
+
+
+    def get_state(self):
+        # type: () -> Optional[Dict[str, Any]]
+        return {'last_scene_cut': self.last_scene_cut}
+
+
+    def set_state(self, state):
+        # type: (Dict[str, Any]) -> None
+        self.last_scene_cut = state['last_scene_cut']
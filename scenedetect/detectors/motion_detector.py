@@ -34,16 +34,41 @@ This detector is available from the command-line interface by using the
 """
 
 # Third-Party Library Imports
+import numpy
 import cv2
 
 # PySceneDetect Library Imports
 from scenedetect.scene_detector import SparseSceneDetector
+from scenedetect.video_manager import compute_downscale_factor
+
+
+##
+## MotionDetector Helper Functions
+##
+
+def compute_kernel_size(frame_width):
+    # type: (int) -> int
+    """ Computes the default morphological opening kernel size for frames of the given
+    width (in pixels, before any downscaling), from 3 for small frames up to 7.
+    """
+    if frame_width >= 1200:
+        return 7
+    if frame_width >= 600:
+        return 5
+    return 3
+
+
+##
+## MotionDetector Class Implementation
+##
 
 class MotionDetector(SparseSceneDetector):
     """Detects motion events in scenes containing a static background.
 
     Uses background subtraction followed by noise removal (via morphological
     opening) to generate a frame score compared against the set threshold.
+    Frames are converted to grayscale and subsampled before any processing, so
+    only the background model of the downscaled frame is kept in memory.
 
     Attributes:
         threshold:  floating point value compared to each frame's score, which
@@ -55,59 +80,166 @@ class MotionDetector(SparseSceneDetector):
         kernel_size:  Size of morphological opening kernel for noise removal.
             Setting to -1 (default) will auto-compute based on video resolution
             (typically 3 for SD, 5-7 for HD). Must be an odd integer > 1.
+        downscale:  Only every N-th row/column of each frame is processed. Setting
+            to None (default) will auto-compute based on video resolution (see
+            :py:func:`scenedetect.video_manager.compute_downscale_factor`).
+        roi:  Optional region of interest to detect motion in, either as a tuple of
+            (x, y, width, height) in frame pixels, or a numpy.ndarray mask the same
+            size as the frames (where only non-zero pixels are considered).
     """
-    def __init__(self, threshold = 0.50, num_frames_post_scene = 30,
-                 kernel_size = -1):
+
+    FRAME_SCORE_KEY = 'motion_val'
+    METRIC_KEYS = [FRAME_SCORE_KEY]
+    METRIC_INDEPENDENT_PARAMETERS = frozenset(['threshold', 'num_frames_post_scene'])
+
+
+    def __init__(self, threshold=0.50, num_frames_post_scene=30,
+                 kernel_size=-1, downscale=None, roi=None):
+        # type: (float, int, int, Optional[int], Optional[Union[Tuple[int, int, int, int],
+        #        numpy.ndarray]]) -> None
         """Initializes motion-based scene detector object."""
-        # TODO: Requires porting to v0.5 API.
-        raise NotImplementedError()
-        """
+        super(MotionDetector, self).__init__()
+        if not threshold > 0.0:
+            raise ValueError('threshold must be > 0.0.')
+        if kernel_size >= 0 and (kernel_size < 3 or kernel_size % 2 == 0):
+            raise ValueError('kernel_size must be an odd integer > 1, or -1 for auto.')
         self.threshold = float(threshold)
         self.num_frames_post_scene = int(num_frames_post_scene)
-
         self.kernel_size = int(kernel_size)
-        if self.kernel_size < 0:
-            # Set kernel size when process_frame first runs based on
-            # video resolution (480p = 3x3, 720p = 5x5, 1080p = 7x7).
-            pass
-
-        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
-            detectShadows = False )
-
-        self.last_frame_score = 0.0
+        self.downscale = downscale
+        self.roi = roi
+
+        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(detectShadows=False)
+        # Set when process_frame first runs, based on the video resolution (the downscale
+        # factor and kernel size are resolved here if set to auto).
+        self._frame_size = None
+        self._downscale = None
+        self._kernel_size = None
+        self._kernel = None
+        self._mask = None
 
         self.in_motion_event = False
         self.first_motion_frame_index = -1
         self.last_motion_frame_index = -1
+
+
+    def __getstate__(self):
+        # type: () -> Dict[str, Any]
+        """ Excludes the background model, which cannot be pickled, when passed to a
+        detector worker process (see scenedetect.frame_buffer). """
+        state = self.__dict__.copy()
+        del state['bg_subtractor']
+        return state
+
+
+    def __setstate__(self, state):
+        # type: (Dict[str, Any]) -> None
+        """ Restores the state of a pickled detector with a new background model, which
+        is initialized by the next frame. """
+        self.__dict__.update(state)
+        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(detectShadows=False)
+        self._kernel = None
+
+
+    def get_metrics(self):
+        return MotionDetector.METRIC_KEYS
+
+
+    def is_processing_required(self, frame_num):
+        # type: (int) -> bool
+        """ Always returns True, as every frame is required to update the background model. """
+        return True
+
+
+    def _init_processing(self, frame_img):
+        # type: (numpy.ndarray) -> None
+        """ Computes the downscale factor, kernel, and ROI mask for the given frame size. """
+        self._frame_size = frame_img.shape[:2]
+        self._downscale = self.downscale
+        if self._downscale is None:
+            self._downscale = compute_downscale_factor(frame_img.shape[1])
+        self._kernel_size = self.kernel_size
+        if self._kernel_size < 0:
+            self._kernel_size = compute_kernel_size(frame_img.shape[1])
+        self._kernel = numpy.ones((self._kernel_size, self._kernel_size), numpy.uint8)
+        downscale = self._downscale
+        height, width = frame_img[::downscale, ::downscale].shape[:2]
+        self._mask = None
+        if isinstance(self.roi, numpy.ndarray):
+            self._mask = (self.roi[::downscale, ::downscale] > 0).astype(numpy.uint8)
+        elif self.roi is not None:
+            x, y, roi_width, roi_height = self.roi
+            self._mask = numpy.zeros((height, width), numpy.uint8)
+            self._mask[y // downscale:(y + roi_height) // downscale,
+                       x // downscale:(x + roi_width) // downscale] = 1
+
+
+    def calculate_frame_score(self, frame_img):
+        # type: (numpy.ndarray) -> float
+        """ Applies background subtraction and noise removal to the given frame.
+
+        Returns:
+            float: Average intensity (0 to 255) of the foreground mask of the frame, only
+            considering pixels within the region of interest (if set).
         """
+        # The background model is reset if the frame size changes (e.g. if the detector is
+        # reused on another video).
+        first_frame = self._kernel is None or frame_img.shape[:2] != self._frame_size
+        if first_frame:
+            if self._kernel is not None:
+                self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(detectShadows=False)
+            self._init_processing(frame_img)
+        frame_grayscale = cv2.cvtColor(
+            frame_img[::self._downscale, ::self._downscale], cv2.COLOR_BGR2GRAY)
+        fg_mask = self.bg_subtractor.apply(frame_grayscale)
+        # The first frame only initializes the background model (otherwise the entire
+        # frame would be considered foreground).
+        if first_frame:
+            return 0.0
+        filtered_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, self._kernel)
+        if self._mask is None:
+            return cv2.mean(filtered_mask)[0]
+        return cv2.mean(filtered_mask, mask=self._mask)[0]
+
 
     def process_frame(self, frame_num, frame_img):
-        # TODO.
+        # type: (int, numpy.ndarray) -> List[Tuple[int, int]]
+        """ Updates the background model with the given frame, and detects the start or
+        end of any motion events.
+
+        Arguments:
+            frame_num (int): Frame number of frame that is being passed.
+            frame_img (numpy.ndarray): Decoded frame image (numpy.ndarray) to perform
+                motion detection on.
+
+        Returns:
+            List[Tuple[int, int]]: List of (start, end) frame pairs of any motion events
+            which have ended, where end is the first frame after the event.
         """
-        frame_grayscale = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        masked_frame = self.bg_subtractor.apply(frame_grayscale)
+        event_list = []
+        frame_score = self.calculate_frame_score(frame_img)
+        if self.stats_manager is not None:
+            self.stats_manager.set_metrics(frame_num, {
+                MotionDetector.FRAME_SCORE_KEY: frame_score})
 
-        kernel = numpy.ones((self.kernel_size, self.kernel_size), numpy.uint8)
-        filtered_frame = cv2.morphologyEx(fgmask, cv2.MORPH_OPEN, kernel)
+        if frame_score >= self.threshold:
+            if not self.in_motion_event:
+                self.in_motion_event = True
+                self.first_motion_frame_index = frame_num
+            self.last_motion_frame_index = frame_num
+        elif self.in_motion_event and (
+                frame_num - self.last_motion_frame_index > self.num_frames_post_scene):
+            event_list.append((self.first_motion_frame_index, frame_num))
+            self.in_motion_event = False
+
+        return event_list
 
-        frame_score = numpy.sum(filtered_frame) / float(
-            filtered_frame.shape[0] * filtered_frame.shape[1] )
-        """
-        return []
 
     def post_process(self, frame_num):
+        # type: (int) -> List[Tuple[int, int]]
         """Writes the last scene if the video ends while in a motion event.
         """
-
-        # If the last fade detected was a fade out, we add a corresponding new
-        # scene break to indicate the end of the scene.  This is only done for
-        # fade-outs, as a scene cut is already added when a fade-in is found.
-        """
         if self.in_motion_event:
-            # Write new scene based on first and last motion event frames.
-            pass
-        return self.in_motion_event
-        """
+            self.in_motion_event = False
+            return [(self.first_motion_frame_index, frame_num)]
         return []
-
-
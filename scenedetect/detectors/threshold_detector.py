@@ -34,32 +34,57 @@ This detector is available from the command-line interface by using the
 `detect-threshold` command.
 """
 
+# Standard Library Imports
+import logging
+
 # Third-Party Library Imports
 import numpy
 
 # PySceneDetect Library Imports
 from scenedetect.scene_detector import SceneDetector
+from scenedetect.thread_pool import map_tiles
+
 
+logger = logging.getLogger('pyscenedetect')
 
 ##
 ## ThresholdDetector Helper Functions
 ##
 
-def compute_frame_average(frame):
+def compute_frame_average(frame, num_threads=1):
     """Computes the average pixel value/intensity for all pixels in a frame.
 
     The value is computed by adding up the 8-bit R, G, and B values for
     each pixel, and dividing by the number of pixels multiplied by 3.
 
+    If num_threads > 1, the sum is computed on horizontal tiles of the frame in
+    parallel; as the partial sums are integers, the result is exactly the same.
+
     Returns:
         Floating point value representing average pixel intensity.
     """
     num_pixel_values = float(
         frame.shape[0] * frame.shape[1] * frame.shape[2])
+    if num_threads > 1:
+        pixel_sum = sum(map_tiles(
+            lambda rows: numpy.sum(frame[rows, :, :]), frame.shape[0], num_threads))
+        return pixel_sum / num_pixel_values
     avg_pixel_value = numpy.sum(frame[:, :, :]) / num_pixel_values
     return avg_pixel_value
 
 
+def estimate_frame_average(frame, stride):
+    """Estimates the average pixel value/intensity of a frame from a subsample of pixels.
+
+    Only every stride-th row and column of the frame is considered, which reduces the
+    number of pixels summed by a factor of stride^2 compared to compute_frame_average.
+
+    Returns:
+        Floating point value representing the estimated average pixel intensity.
+    """
+    return compute_frame_average(frame[::stride, ::stride, :])
+
+
 ##
 ## ThresholdDetector Class Implementation
 ##
@@ -81,15 +106,26 @@ class ThresholdDetector(SceneDetector):
             right at the position where the threshold is passed).
         add_final_scene:  Boolean indicating if the video ends on a fade-out to
             generate an additional scene at this timecode.
-        block_size:  Number of rows in the image to sum per iteration (can be
-            tuned to increase performance in some cases; should be computed
-            programmatically in the future).
+        block_size:  Stride, in rows/columns, of the pixel subsample used to
+            estimate the frame average when sample_margin is set.
+        sample_margin:  If set, enables fast mode, where the frame average is first
+            estimated from a subsample of pixels, and the exact average is only computed
+            if the estimate is within sample_margin of the threshold. Fast mode is not
+            used if a StatsManager is set, as the cached frame metrics must be exact
+            (a warning is logged in that case).
+        num_threads:  Number of threads used to compute the exact frame average, by
+            splitting each frame into horizontal tiles.
     """
 
     THRESHOLD_VALUE_KEY = 'delta_rgb'
+    # Fast mode (block_size and sample_margin) is not used with a StatsManager, so the
+    # stored frame metrics are always exact.
+    METRIC_INDEPENDENT_PARAMETERS = frozenset([
+        'threshold', 'min_scene_len', 'fade_bias', 'add_final_scene', 'block_size',
+        'sample_margin'])
 
     def __init__(self, threshold=12, min_scene_len=15, fade_bias=0.0,
-                 add_final_scene=False, block_size=8):
+                 add_final_scene=False, block_size=8, sample_margin=None, num_threads=1):
         """Initializes threshold-based scene detector object."""
 
         super(ThresholdDetector, self).__init__()
@@ -107,7 +143,29 @@ class ThresholdDetector(SceneDetector):
             'type': None        # type of fade, can be either 'in' or 'out'
         }
         self.block_size = block_size
+        self.sample_margin = sample_margin
+        self.num_threads = num_threads
         self._metric_keys = [ThresholdDetector.THRESHOLD_VALUE_KEY]
+        self._stats_manager = None
+
+
+    @property
+    def stats_manager(self):
+        # type: () -> Optional[StatsManager]
+        """ StatsManager used by the detector. Fast mode is disabled while it is set. """
+        return self._stats_manager
+
+
+    @stats_manager.setter
+    def stats_manager(self, stats_manager):
+        # type: (Optional[StatsManager]) -> None
+        # Fast mode is decided here (when the StatsManager is attached, e.g. by
+        # SceneManager.add_detector), so prepare_frame has no side effects.
+        self._stats_manager = stats_manager
+        if stats_manager is not None and self.sample_margin is not None:
+            logger.warning(
+                'Sample margin is ignored (fast mode disabled), as frame metrics are'
+                ' stored in a StatsManager (e.g. stats file or cache) and must be exact.')
 
 
     def get_metrics(self):
@@ -127,17 +185,6 @@ class ThresholdDetector(SceneDetector):
             or more frames in the list, and not necessarily the same as frame_num.
         """
 
-        # Initialize last scene cut point at the beginning of the frames of interest.
-        if self.last_scene_cut is None:
-            self.last_scene_cut = frame_num
-
-        # Compare the # of pixels under threshold in current_frame & last_frame.
-        # If absolute value of pixel intensity delta is above the threshold,
-        # then we trigger a new scene cut/break.
-
-        # List of cuts to return.
-        cut_list = []
-
         # The metric used here to detect scene breaks is the percent of pixels
         # less than or equal to the threshold; however, since this differs on
         # user-supplied values, we supply the average pixel intensity as this
@@ -147,11 +194,57 @@ class ThresholdDetector(SceneDetector):
             frame_avg = self.stats_manager.get_metrics(
                 frame_num, self._metric_keys)[0]
         else:
-            frame_avg = compute_frame_average(frame_img)
+            frame_avg = self.prepare_frame(frame_img)
             if self.stats_manager is not None:
                 self.stats_manager.set_metrics(
                     frame_num, {self._metric_keys[0]: frame_avg})
 
+        return self.decide_frame(frame_num, {self._metric_keys[0]: frame_avg})
+
+
+    def is_pipeline_supported(self):
+        # type: () -> bool
+        return True
+
+
+    def prepare_frame(self, frame_img):
+        # type: (numpy.ndarray) -> float
+        """ Computes the average pixel intensity of the frame, or an estimate of it if
+        sample_margin is set and there is no StatsManager. """
+        if self.sample_margin is not None and self.stats_manager is None:
+            # The estimate can only be used for the cut decision if it's far enough
+            # from the threshold, otherwise we fall back to the exact average.
+            frame_avg = estimate_frame_average(frame_img, self.block_size)
+            if abs(frame_avg - self.threshold) > self.sample_margin:
+                return frame_avg
+        return compute_frame_average(frame_img, self.num_threads)
+
+
+    def score_frame(self, frame_num, curr_data, last_data):
+        # type: (int, float, Optional[float]) -> Dict[str, float]
+        """ Returns the average pixel intensity of the frame (from prepare_frame). """
+        return {self._metric_keys[0]: curr_data}
+
+
+    def decide_frame(self, frame_num, metrics):
+        # type: (int, Dict[str, Optional[float]]) -> List[int]
+        """ Detects fades in/out based on the average pixel intensity of the frame. """
+
+        # Initialize last scene cut point at the beginning of the frames of interest.
+        if self.last_scene_cut is None:
+            self.last_scene_cut = frame_num
+
+        # Compare the # of pixels under threshold in current_frame & last_frame.
+        # If absolute value of pixel intensity delta is above the threshold,
+        # then we trigger a new scene cut/break.
+
+        # List of cuts to return.
+        cut_list = []
+
+        frame_avg = metrics.get(self._metric_keys[0])
+        if frame_avg is None:
+            return cut_list
+
         if self.processed_frame:
             if self.last_fade['type'] == 'in' and frame_avg < self.threshold:
                 # Just faded out of a scene, wait for next fade in.
@@ -179,6 +272,19 @@ class ThresholdDetector(SceneDetector):
         return cut_list
 
 
+    def get_state(self):
+        # type: () -> Optional[Dict[str, Any]]
+        return {'last_scene_cut': self.last_scene_cut, 'processed_frame': self.processed_frame,
+                'last_fade': dict(self.last_fade)}
+
+
+    def set_state(self, state):
+        # type: (Dict[str, Any]) -> None
+        self.last_scene_cut = state['last_scene_cut']
+        self.processed_frame = state['processed_frame']
+        self.last_fade = dict(state['last_fade'])
+
+
     def post_process(self, frame_num):
         """Writes a final scene cut if the last detected fade was a fade-out.
 
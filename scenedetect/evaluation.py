@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" ``scenedetect.evaluation`` Module
+
+This module implements the `evaluate` command, which measures the accuracy and speed of
+detector configurations, to quantify the trade-off made by options which improve
+performance at the expense of accuracy (e.g. downscaling, frame skip, or cascades).
+
+Each configuration (a :py:class:`BenchmarkCase <scenedetect.benchmark.BenchmarkCase>`)
+is run on videos with known cuts: either given in a ground truth file (see
+:py:func:`load_ground_truth`), or synthetic videos with cuts, dissolves, and fades
+(see :py:func:`generate_video <scenedetect.benchmark.generate_video>`). The cuts
+detected are matched to the known cuts within a tolerance of a number of frames, to
+compute the precision, recall, and F1 score of each configuration.
+
+Execution modes which should produce the same results (e.g. ``workers``) are also
+checked against the sequential mode, or against a given reference detector (e.g. to
+check that an exact optimization of a detector does not change its results).
+"""
+
+# Standard Library Imports
+import collections
+import json
+import os.path
+
+# PySceneDetect Library Imports
+from scenedetect.benchmark import get_case_name
+from scenedetect.benchmark import run_benchmark_case
+from scenedetect.platform import format_table
+
+
+##
+## Ground Truth
+##
+
+def load_ground_truth(path):
+    # type: (str) -> List[Dict[str, Any]]
+    """ Loads a ground truth file in JSON format, consisting of a list of objects with
+    the path of a video (relative to the ground truth file, if not absolute), and the
+    frame number of each cut in it, for example::
+
+        [{"path": "video1.mp4", "cuts": [120, 455, 812]},
+         {"path": "video2.mp4", "cuts": []}]
+
+    Returns:
+        List[Dict[str, Any]]: Path and cuts of each video.
+
+    Raises:
+        ValueError: The file is not in the expected format.
+    """
+    with open(path, 'r') as ground_truth_file:
+        videos = json.load(ground_truth_file)
+    if not isinstance(videos, list) or not all(
+            isinstance(video, dict) and 'path' in video and 'cuts' in video
+            for video in videos):
+        raise ValueError('Ground truth must be a list of objects with a path and cuts.')
+    base_dir = os.path.dirname(os.path.abspath(path))
+    return [collections.OrderedDict([
+        ('path', os.path.join(base_dir, video['path'])),
+        ('cuts', sorted(int(cut) for cut in video['cuts']))]) for video in videos]
+
+
+##
+## Accuracy Metrics
+##
+
+def match_cuts(detected_cuts, expected_cuts, tolerance=0):
+    # type: (List[int], List[int], int) -> Tuple[int, int, int]
+    """ Matches each detected cut to at most one expected cut within tolerance frames, in
+    order of the cuts.
+
+    Returns:
+        Tuple[int, int, int]: Number of true positives (matched detected cuts), false
+        positives (unmatched detected cuts), and false negatives (unmatched expected
+        cuts).
+    """
+    detected_cuts = sorted(detected_cuts)
+    expected_cuts = sorted(expected_cuts)
+    true_positives = 0
+    i = 0
+    for expected_cut in expected_cuts:
+        # Skip detected cuts too early to match this or any later expected cut.
+        while i < len(detected_cuts) and detected_cuts[i] < expected_cut - tolerance:
+            i += 1
+        if i < len(detected_cuts) and detected_cuts[i] <= expected_cut + tolerance:
+            true_positives += 1
+            i += 1
+    return (true_positives, len(detected_cuts) - true_positives,
+            len(expected_cuts) - true_positives)
+
+
+def get_accuracy(true_positives, false_positives, false_negatives):
+    # type: (int, int, int) -> Tuple[float, float, float]
+    """ Returns the precision, recall, and F1 score of the given counts. Precision
+    (recall) is 1.0 if no cuts were detected (expected). """
+    detected = true_positives + false_positives
+    expected = true_positives + false_negatives
+    precision = true_positives / float(detected) if detected else 1.0
+    recall = true_positives / float(expected) if expected else 1.0
+    f1_score = (2.0 * precision * recall / (precision + recall)
+                if precision + recall > 0 else 0.0)
+    return precision, recall, f1_score
+
+
+##
+## Evaluation
+##
+
+def evaluate(videos, cases, tolerance=2, reference=None, logger=None):
+    # type: (List[Dict[str, Any]], List[BenchmarkCase], int, Optional[str],
+    #        Optional[logging.Logger]) -> List[Dict[str, Any]]
+    """ Runs each case on each video, and measures its accuracy and speed.
+
+    Arguments:
+        videos: Path and expected cuts of each video (see load_ground_truth, or
+            generate_video for synthetic videos).
+        cases: Detector configurations to evaluate (see get_benchmark_cases).
+        tolerance: Maximum distance, in frames, between a detected and an expected cut
+            for them to match.
+        reference: If set, the detector specification (see parse_detector_spec) all
+            cases must produce identical cuts to (with the same downscale factor and
+            frame skip, in sequential mode). Otherwise, cases in any other mode than
+            sequential must produce identical cuts to the same case in sequential mode.
+        logger: Logger to report the result of each case to, if any.
+
+    Returns:
+        List[Dict[str, Any]]: The name and parameters of each case, with its precision,
+        recall, F1 score, frames per second (over all videos), and whether its cuts are
+        identical to the reference (None if it is the reference). The cuts and counts
+        of true/false positives and false negatives of each video are also included.
+        Cases which failed only have an error message.
+    """
+    # Cuts detected by each case in each video, to reuse for the reference cases.
+    case_cuts = {}
+
+    def run_case(case):
+        runs = []
+        for video in videos:
+            run = run_benchmark_case(video['path'], case)
+            case_cuts[(case, video['path'])] = run['cuts']
+            runs.append(run)
+        return runs
+
+    results = []
+    for case in cases:
+        result = collections.OrderedDict([('name', get_case_name(case))])
+        result.update(case._asdict())
+        reference_case = case._replace(mode='sequential', num_jobs=0)
+        if reference is not None:
+            reference_case = reference_case._replace(detector=reference)
+        try:
+            runs = run_case(case)
+            identical = None
+            if reference_case != case:
+                identical = True
+                for video in videos:
+                    if (reference_case, video['path']) not in case_cuts:
+                        run_case(reference_case)
+                    identical = identical and (
+                        case_cuts[(reference_case, video['path'])]
+                        == case_cuts[(case, video['path'])])
+        except Exception as ex:  # pylint: disable=broad-except
+            result['error'] = str(ex) if str(ex) else type(ex).__name__
+            if logger is not None:
+                logger.error('%s: failed: %s', result['name'], result['error'])
+            results.append(result)
+            continue
+
+        video_results = []
+        for video, run in zip(videos, runs):
+            true_positives, false_positives, false_negatives = match_cuts(
+                run['cuts'], video['cuts'], tolerance)
+            video_results.append(collections.OrderedDict([
+                ('path', video['path']), ('cuts', run['cuts']),
+                ('true_positives', true_positives), ('false_positives', false_positives),
+                ('false_negatives', false_negatives)]))
+        precision, recall, f1_score = get_accuracy(*[
+            sum(video_result[key] for video_result in video_results)
+            for key in ('true_positives', 'false_positives', 'false_negatives')])
+        num_frames = sum(run['num_frames'] for run in runs)
+        elapsed_time = sum(run['elapsed_time'] for run in runs)
+        result.update([
+            ('precision', precision), ('recall', recall), ('f1_score', f1_score),
+            ('fps', num_frames / elapsed_time if elapsed_time > 0 else 0.0),
+            ('identical', identical), ('videos', video_results)])
+        if logger is not None:
+            logger.info('%s: F1 %.3f, %.1f FPS', result['name'], f1_score, result['fps'])
+        results.append(result)
+    return results
+
+
+def get_best_case(results, min_f1_score):
+    # type: (List[Dict[str, Any]], float) -> Optional[Dict[str, Any]]
+    """ Returns the fastest result (as returned by evaluate) with an F1 score of at least
+    min_f1_score, or None if there are none. """
+    candidates = [result for result in results
+                  if 'error' not in result and result['f1_score'] >= min_f1_score]
+    return max(candidates, key=lambda result: result['fps']) if candidates else None
+
+
+def get_report(results):
+    # type: (List[Dict[str, Any]]) -> str
+    """ Returns a table of the precision, recall, F1 score, FPS, and whether the cuts are
+    identical to the reference of each result (as returned by evaluate). """
+    rows = [('Case', 'Precision', 'Recall', 'F1', 'FPS', 'Identical')]
+    for result in results:
+        if 'error' in result:
+            rows.append((result['name'], 'error', '', '', '', ''))
+            continue
+        identical = result['identical']
+        rows.append((
+            result['name'], '%.3f' % result['precision'], '%.3f' % result['recall'],
+            '%.3f' % result['f1_score'], '%.1f' % result['fps'],
+            '-' if identical is None else 'yes' if identical else 'NO'))
+    return format_table(rows)
@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" ``scenedetect.frame_buffer`` Module
+
+This module contains the :py:class:`SharedFrameBuffer` class, a ring buffer of decoded
+frames in shared memory, which allows the :py:class:`SceneManager
+<scenedetect.scene_manager.SceneManager>` to run groups of detectors in separate worker
+processes (see the `processes` argument of :py:meth:`SceneManager.detect_scenes
+<scenedetect.scene_manager.SceneManager.detect_scenes>`).
+
+The process decoding the video copies each frame into the next slot of the buffer, and
+only sends the frame number and slot index to the workers, which read the frame in place.
+Frames are never pickled. Requires Python 3.8 or above (multiprocessing.shared_memory).
+"""
+
+# Standard Library Imports
+import multiprocessing
+import os
+import queue
+import traceback
+
+# Third-Party Library Imports
+import numpy
+
+# PySceneDetect Library Imports
+from scenedetect.platform import shared_memory
+from scenedetect.scene_detector import SparseSceneDetector
+
+
+# Default number of frames which can be held in a SharedFrameBuffer.
+DEFAULT_NUM_SLOTS = 8
+
+
+##
+## SharedFrameBuffer Class Implementation
+##
+
+class SharedFrameBuffer(object):
+    """ Ring buffer of frames of the same shape and dtype in a shared memory block.
+
+    The process which creates the buffer owns it, and must call unlink() once all
+    processes are done with it. Other processes attach to it by name with attach().
+    """
+
+    def __init__(self, shape, dtype, num_slots=DEFAULT_NUM_SLOTS, name=None):
+        # type: (Tuple[int, ...], Union[str, numpy.dtype], int, Optional[str]) -> None
+        """
+        Arguments:
+            shape: Shape of each frame.
+            dtype: Data type of each frame.
+            num_slots: Number of frames which can be held in the buffer.
+            name: Name of an existing buffer to attach to. If None, a new shared
+                memory block is created.
+
+        Raises:
+            ImportError: multiprocessing.shared_memory is not available (Python < 3.8).
+        """
+        if shared_memory is None:
+            raise ImportError('SharedFrameBuffer requires Python 3.8 or above.')
+        self.shape = tuple(shape)
+        self.dtype = numpy.dtype(dtype)
+        self.num_slots = num_slots
+        frame_size = int(numpy.prod(self.shape)) * self.dtype.itemsize
+        if name is None:
+            self._shared_memory = shared_memory.SharedMemory(
+                create=True, size=max(1, frame_size * num_slots))
+        else:
+            self._shared_memory = shared_memory.SharedMemory(name=name)
+        self._slots = numpy.ndarray(
+            (num_slots,) + self.shape, dtype=self.dtype, buffer=self._shared_memory.buf)
+
+
+    @staticmethod
+    def attach(name, shape, dtype, num_slots):
+        # type: (str, Tuple[int, ...], Union[str, numpy.dtype], int) -> SharedFrameBuffer
+        """ Attaches to an existing SharedFrameBuffer (see the get_info method). """
+        return SharedFrameBuffer(shape, dtype, num_slots, name)
+
+
+    def get_info(self):
+        # type: () -> Tuple[str, Tuple[int, ...], str, int]
+        """ Returns the name, shape, dtype, and number of slots of the buffer, in the
+        order expected by the attach method. """
+        return (self._shared_memory.name, self.shape, self.dtype.str, self.num_slots)
+
+
+    def get_frame(self, slot):
+        # type: (int) -> numpy.ndarray
+        """ Returns the frame in the given slot, as a view of the shared memory block
+        (i.e. without copying it). The view must not be used after the slot is reused. """
+        return self._slots[slot]
+
+
+    def put_frame(self, slot, frame_img):
+        # type: (int, numpy.ndarray) -> None
+        """ Copies the given frame into the given slot.
+
+        Raises:
+            ValueError: The frame does not match the shape of the buffer.
+        """
+        if frame_img.shape != self.shape:
+            raise ValueError('Frame size %s does not match frame buffer size %s.' % (
+                frame_img.shape, self.shape))
+        numpy.copyto(self._slots[slot], frame_img)
+
+
+    def close(self):
+        # type: () -> None
+        """ Closes access to the shared memory block from this process. """
+        self._slots = None
+        self._shared_memory.close()
+
+
+    def unlink(self):
+        # type: () -> None
+        """ Closes and destroys the shared memory block. Only called by the owner. """
+        self.close()
+        self._shared_memory.unlink()
+
+
+##
+## DetectorWorkerPool Class Implementation
+##
+
+class DetectorWorkerPool(object):
+    """ Runs groups of detectors in worker processes, each processing every frame passed
+    to put_frame via a SharedFrameBuffer.
+
+    Worker processes are never forked from the calling process, which may be running other
+    threads (e.g. the thread pools of :py:mod:`scenedetect.thread_pool`) holding locks
+    that would never be released in a forked child. They are started from a forkserver
+    process where supported, or spawned otherwise, so the detectors (and StatsManager)
+    are pickled and passed to each worker. The detector objects of the calling process
+    are not modified; the results of each group are returned by the finish method.
+    """
+
+    def __init__(self, detector_groups, stats_manager=None, num_slots=DEFAULT_NUM_SLOTS):
+        # type: (List[List[SceneDetector]], Optional[StatsManager], int) -> None
+        """
+        Arguments:
+            detector_groups: List of the detectors to run in each worker process.
+            stats_manager: StatsManager used by the detectors, if any.
+            num_slots: Number of frames in the SharedFrameBuffer (at least 2, as each worker
+                holds the previous frame until it is done with the next one).
+
+        Raises:
+            ImportError: Python 3.8 or above is required.
+            ValueError: num_slots is less than 2.
+        """
+        if shared_memory is None:
+            raise ImportError('DetectorWorkerPool requires Python 3.8 or above.')
+        if num_slots < 2:
+            raise ValueError('num_slots must be at least 2.')
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+        else:
+            context = multiprocessing.get_context('spawn')
+        if os.name == 'posix':
+            # Start the resource tracker before the workers so they share it with this
+            # process, otherwise the frame buffer is destroyed when the first worker exits.
+            from multiprocessing import resource_tracker
+            resource_tracker.ensure_running()
+        self._num_slots = num_slots
+        self._next_slot = 0
+        self._frame_buffer = None
+        # List of (process, frame queue, free slot semaphore, result queue) tuples.
+        self._workers = []
+        for detectors in detector_groups:
+            frame_queue = context.Queue()
+            free_slots = context.Semaphore(num_slots)
+            result_queue = context.Queue()
+            process = context.Process(
+                target=run_detector_group,
+                args=(detectors, stats_manager, frame_queue, free_slots, result_queue))
+            process.daemon = True
+            process.start()
+            self._workers.append((process, frame_queue, free_slots, result_queue))
+
+
+    def put_frame(self, frame_num, frame_img):
+        # type: (int, Optional[numpy.ndarray]) -> None
+        """ Passes a frame to all workers, copying it into the next slot of the frame
+        buffer (waiting until all workers are done with the slot) if it is not None.
+
+        Raises:
+            RuntimeError: A worker process failed.
+            ValueError: The frame size changed.
+        """
+        slot = -1
+        if frame_img is not None:
+            if self._frame_buffer is None:
+                self._frame_buffer = SharedFrameBuffer(
+                    frame_img.shape, frame_img.dtype, self._num_slots)
+                for _, frame_queue, _, _ in self._workers:
+                    frame_queue.put(('init', self._frame_buffer.get_info()))
+            slot = self._next_slot
+            for worker in self._workers:
+                self._acquire_slot(worker)
+            self._frame_buffer.put_frame(slot, frame_img)
+            self._next_slot = (slot + 1) % self._num_slots
+        for _, frame_queue, _, _ in self._workers:
+            frame_queue.put(('frame', frame_num, slot))
+
+
+    def finish(self, frame_num):
+        # type: (int) -> List[Tuple[List[int], List[Tuple[int, int]], Dict[int, Dict[str, Any]]]]
+        """ Calls post_process on all detectors with the given frame number, and waits
+        for the workers to exit.
+
+        Returns:
+            List of the (cut list, event list, metrics) of each detector group, where
+            metrics maps frame numbers to the metrics of the group's detectors.
+
+        Raises:
+            RuntimeError: A worker process failed.
+        """
+        for _, frame_queue, _, _ in self._workers:
+            frame_queue.put(('end', frame_num))
+        results = [self._get_result(worker) for worker in self._workers]
+        for process, _, _, _ in self._workers:
+            process.join()
+        return results
+
+
+    def close(self):
+        # type: () -> None
+        """ Terminates any remaining workers, and destroys the frame buffer. """
+        for process, _, _, _ in self._workers:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        self._workers = []
+        if self._frame_buffer is not None:
+            self._frame_buffer.unlink()
+            self._frame_buffer = None
+
+
+    def _acquire_slot(self, worker):
+        # type: (Tuple[multiprocessing.Process, multiprocessing.Queue,
+        #        multiprocessing.Semaphore, multiprocessing.Queue]) -> None
+        """ Waits until the worker is done with the next slot of the frame buffer. """
+        process, _, free_slots, result_queue = worker
+        while not free_slots.acquire(timeout=0.1):
+            # A worker only puts a result before the end message if it failed.
+            if not process.is_alive() or not result_queue.empty():
+                self._get_result(worker)
+                raise RuntimeError('Detector worker process exited unexpectedly.')
+
+
+    def _get_result(self, worker):
+        # type: (Tuple[multiprocessing.Process, multiprocessing.Queue,
+        #        multiprocessing.Semaphore, multiprocessing.Queue])
+        #   -> Tuple[List[int], List[Tuple[int, int]], Dict[int, Dict[str, Any]]]
+        """ Waits for the result of the worker.
+
+        Raises:
+            RuntimeError: The worker failed, or exited without a result.
+        """
+        process, _, _, result_queue = worker
+        while True:
+            try:
+                cut_list, event_list, metrics, error = result_queue.get(timeout=0.1)
+                break
+            except queue.Empty:
+                if not process.is_alive() and result_queue.empty():
+                    raise RuntimeError('Detector worker process exited unexpectedly.')
+        if error is not None:
+            raise RuntimeError('Detector worker process failed:\n%s' % error)
+        return cut_list, event_list, metrics
+
+
+##
+## Detector Worker Process
+##
+
+def run_detector_group(detectors, stats_manager, frame_queue, free_slots, result_queue):
+    # type: (List[SceneDetector], Optional[StatsManager], multiprocessing.Queue,
+    #        multiprocessing.Semaphore, multiprocessing.Queue) -> None
+    """ Entry point of the worker processes started by SceneManager.detect_scenes.
+
+    Processes frames with the given detectors until an end message is received, then
+    puts a tuple of (cut list, event list, metrics, error) in result_queue, where metrics
+    maps frame numbers to the metrics of the detectors, and error is None or a string
+    with the traceback of any exception raised while processing.
+
+    Messages in frame_queue are tuples of either ('init', buffer_info) where buffer_info
+    is the result of SharedFrameBuffer.get_info(), ('frame', frame_num, slot) where slot
+    is -1 if the frame was not decoded, or ('end', frame_num) where frame_num is the
+    frame number passed to post_process. Each slot is released to free_slots once the
+    next frame has been processed by all detectors.
+    """
+    frame_buffer = None
+    cut_list = []
+    event_list = []
+    first_frame = None
+    last_slot = -1
+    try:
+        while True:
+            message = frame_queue.get()
+            if message[0] == 'init':
+                frame_buffer = SharedFrameBuffer.attach(*message[1])
+                continue
+            elif message[0] == 'end':
+                end_frame = message[1]
+                break
+            _, frame_num, slot = message
+            if first_frame is None:
+                first_frame = frame_num
+            frame_img = frame_buffer.get_frame(slot) if slot >= 0 else None
+            for detector in detectors:
+                if isinstance(detector, SparseSceneDetector):
+                    event_list += detector.process_frame(frame_num, frame_img)
+                else:
+                    cut_list += detector.process_frame(frame_num, frame_img)
+            # Detectors make a copy of any frames they need to keep, other than the previous
+            # frame (see CascadeDetector), so each slot is reused once all of them are done
+            # with the next frame.
+            frame_img = None
+            if last_slot >= 0:
+                free_slots.release()
+            last_slot = slot
+
+        for detector in detectors:
+            if isinstance(detector, SparseSceneDetector):
+                event_list += detector.post_process(end_frame)
+            else:
+                cut_list += detector.post_process(end_frame)
+
+        metrics = {}
+        if stats_manager is not None and first_frame is not None:
+            metric_keys = [key for detector in detectors for key in detector.get_metrics()]
+            for frame_num in range(first_frame, end_frame):
+                frame_metrics = {
+                    key: value for key, value in zip(
+                        metric_keys, stats_manager.get_metrics(frame_num, metric_keys))
+                    if value is not None}
+                if frame_metrics:
+                    metrics[frame_num] = frame_metrics
+        result_queue.put((cut_list, event_list, metrics, None))
+
+    except Exception:   # pylint: disable=broad-except
+        result_queue.put(([], [], {}, traceback.format_exc()))
+
+    finally:
+        if frame_buffer is not None:
+            frame_buffer.close()
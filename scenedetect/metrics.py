@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" ``scenedetect.metrics`` Module
+
+This module contains the sinks and helper classes for the metrics hooks of the
+:py:class:`SceneManager <scenedetect.scene_manager.SceneManager>`, which publish live
+counters of a call to :py:meth:`detect_scenes
+<scenedetect.scene_manager.SceneManager.detect_scenes>` (e.g. frames decoded, frames
+served from the StatsManager cache, current FPS, cuts found, and memory usage) at a
+set interval. This allows monitoring long-running detections (e.g. to detect stalls,
+or measure the throughput of each video) without parsing the progress bar.
+
+A metrics hook is any callable taking a dict mapping each name in :py:data:`METRICS`
+to its current value. Two sinks are included: :py:class:`JsonLinesSink`, which
+appends each update to a file as a JSON object, and :py:class:`PrometheusTextfileSink`,
+which writes the latest update to a file in the Prometheus text exposition format
+(e.g. for the textfile collector of the Prometheus node exporter).
+
+Usage example::
+
+    scene_manager = SceneManager()
+    scene_manager.add_metrics_hook(JsonLinesSink('metrics.jsonl'), interval=10.0)
+    scene_manager.add_metrics_hook(
+        PrometheusTextfileSink('scenedetect.prom', labels={'video': 'video.mp4'}))
+"""
+
+# Standard Library Imports
+import collections
+import json
+import os
+import os.path
+import time
+
+# PySceneDetect Library Imports
+from scenedetect.platform import get_memory_usage
+from scenedetect.profiler import get_time
+
+
+# Default interval, in seconds, between updates of each metrics hook.
+DEFAULT_METRICS_INTERVAL = 5.0
+
+# Name, Prometheus metric name, Prometheus metric type, and description of each metric.
+METRICS = [
+    ('timestamp', 'last_update_timestamp_seconds', 'gauge',
+     'Time of the update, in seconds since the epoch.'),
+    ('elapsed_time', 'elapsed_seconds', 'gauge',
+     'Time since detection started, in seconds.'),
+    ('frames_read', 'frames_read_total', 'counter',
+     'Frames read from the frame source (decoded, cached, or skipped).'),
+    ('frames_decoded', 'frames_decoded_total', 'counter',
+     'Frames decoded and processed by the detectors.'),
+    ('frames_cached', 'frames_cached_total', 'counter',
+     'Frames not decoded, as their metrics were already in the StatsManager.'),
+    ('frames_skipped', 'frames_skipped_total', 'counter',
+     'Frames not decoded due to frame_skip.'),
+    ('total_frames', 'frames_expected', 'gauge',
+     'Number of frames to read, or 0 if unknown.'),
+    ('fps', 'frames_per_second', 'gauge',
+     'Frames read per second since the previous update.'),
+    ('average_fps', 'average_frames_per_second', 'gauge',
+     'Frames read per second since detection started.'),
+    ('queue_depth', 'queue_depth', 'gauge',
+     'Frames waiting for their metrics to be computed (with workers only).'),
+    ('num_cuts', 'cuts', 'gauge',
+     'Cuts and events detected so far.'),
+    ('memory_usage', 'memory_usage_bytes', 'gauge',
+     'Resident set size of the process in bytes (peak size if current is unavailable).'),
+    ('finished', 'finished', 'gauge',
+     '1 if detection is complete, 0 otherwise.'),
+]
+
+
+##
+## Metrics Helper Functions
+##
+
+def _escape_label_value(value):
+    # type: (Any) -> str
+    """ Escapes a Prometheus label value (backslashes, double quotes, and newlines). """
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+##
+## MetricsTracker Class Implementation
+##
+
+class MetricsTracker(object):
+    """ Tracks the counters of a single call to SceneManager.detect_scenes, and publishes
+    them to each metrics hook once its interval has elapsed.
+
+    Updates are published from the thread calling detect_scenes, so a stall (e.g. in
+    decoding) also stops the updates, which can be detected by the age of the last one.
+    """
+
+    def __init__(self, hooks, total_frames):
+        # type: (List[Tuple[Callable[[Dict[str, Any]], None], float]], int) -> None
+        """
+        Arguments:
+            hooks: List of (callback, interval in seconds) of each metrics hook.
+            total_frames: Expected number of frames to read, or 0 if unknown.
+        """
+        self.frames_decoded = 0
+        self.frames_cached = 0
+        self._hooks = list(hooks)
+        self._total_frames = total_frames
+        self._start_time = get_time()
+        self._next_times = [self._start_time + interval for _, interval in self._hooks]
+        self._next_time = min(self._next_times) if self._next_times else None
+        self._last_time = self._start_time
+        self._last_frames_read = 0
+
+
+    def update(self, frames_read, queue_depth, num_cuts):
+        # type: (int, int, int) -> None
+        """ Publishes the metrics to each hook whose interval has elapsed since it was
+        last updated. Called after each frame is read.
+
+        Arguments:
+            frames_read: Number of frames read from the frame source so far.
+            queue_depth: Number of frames waiting to be processed.
+            num_cuts: Number of cuts and events detected so far.
+        """
+        curr_time = get_time()
+        if self._next_time is None or curr_time < self._next_time:
+            return
+        metrics = self.get_metrics(frames_read, queue_depth, num_cuts, curr_time=curr_time)
+        for i, (callback, interval) in enumerate(self._hooks):
+            if curr_time >= self._next_times[i]:
+                callback(metrics)
+                # Skip any missed updates rather than publishing them all at once.
+                self._next_times[i] = max(self._next_times[i] + interval, curr_time)
+        self._next_time = min(self._next_times)
+
+
+    def finish(self, frames_read, num_cuts):
+        # type: (int, int) -> None
+        """ Publishes the final metrics to all hooks once detection is complete. """
+        metrics = self.get_metrics(frames_read, 0, num_cuts, finished=True)
+        for callback, _ in self._hooks:
+            callback(metrics)
+
+
+    def get_metrics(self, frames_read, queue_depth, num_cuts, finished=False, curr_time=None):
+        # type: (int, int, int, bool, Optional[float]) -> Dict[str, Any]
+        """ Returns the current value of each metric (see METRICS), and starts measuring
+        the FPS of the next update. """
+        if curr_time is None:
+            curr_time = get_time()
+        elapsed_time = curr_time - self._start_time
+        interval_time = curr_time - self._last_time
+        fps = ((frames_read - self._last_frames_read) / interval_time
+               if interval_time > 0 else 0.0)
+        self._last_time = curr_time
+        self._last_frames_read = frames_read
+        return collections.OrderedDict([
+            ('timestamp', time.time()),
+            ('elapsed_time', elapsed_time),
+            ('frames_read', frames_read),
+            ('frames_decoded', self.frames_decoded),
+            ('frames_cached', self.frames_cached),
+            ('frames_skipped', frames_read - self.frames_decoded - self.frames_cached),
+            ('total_frames', self._total_frames),
+            ('fps', fps),
+            ('average_fps', frames_read / elapsed_time if elapsed_time > 0 else 0.0),
+            ('queue_depth', queue_depth),
+            ('num_cuts', num_cuts),
+            ('memory_usage', get_memory_usage()),
+            ('finished', 1 if finished else 0),
+        ])
+
+
+##
+## Metrics Sinks
+##
+
+class JsonLinesSink(object):
+    """ Metrics hook which appends each update to a file as a JSON object on its own
+    line, including any extra fields passed to the constructor (e.g. the video name). """
+
+    def __init__(self, path, fields=None):
+        # type: (str, Optional[Dict[str, Any]]) -> None
+        """
+        Arguments:
+            path: Path of the file to append updates to (created if it does not exist).
+            fields: Extra fields to include in each update.
+        """
+        self.path = path
+        self.fields = dict(fields) if fields else {}
+
+
+    def __call__(self, metrics):
+        # type: (Dict[str, Any]) -> None
+        update = collections.OrderedDict(self.fields)
+        update.update(metrics)
+        # The file is reopened for each update so it can be rotated while in use.
+        with open(self.path, 'a') as metrics_file:
+            metrics_file.write(json.dumps(update) + '\n')
+
+
+class PrometheusTextfileSink(object):
+    """ Metrics hook which writes the latest update to a file in the Prometheus text
+    exposition format, replacing the file atomically so that readers (e.g. the textfile
+    collector of the Prometheus node exporter) never see a partially written file.
+
+    Metric names are prefixed (scenedetect_ by default), and any metrics without a value
+    (e.g. memory_usage when unavailable) are omitted.
+    """
+
+    def __init__(self, path, labels=None, prefix='scenedetect_'):
+        # type: (str, Optional[Dict[str, str]], str) -> None
+        """
+        Arguments:
+            path: Path of the file to write (usually ending in .prom).
+            labels: Labels to add to each metric (e.g. {'video': 'video.mp4'}).
+            prefix: Prefix of the name of each metric.
+        """
+        self.path = path
+        self.labels = dict(labels) if labels else {}
+        self.prefix = prefix
+
+
+    def get_text(self, metrics):
+        # type: (Dict[str, Any]) -> str
+        """ Returns the given metrics in the Prometheus text exposition format. """
+        label_str = ''
+        if self.labels:
+            label_str = '{%s}' % ','.join(
+                '%s="%s"' % (name, _escape_label_value(value))
+                for name, value in sorted(self.labels.items()))
+        lines = []
+        for key, metric_name, metric_type, description in METRICS:
+            value = metrics.get(key)
+            if value is None:
+                continue
+            metric_name = self.prefix + metric_name
+            lines.append('# HELP %s %s' % (metric_name, description))
+            lines.append('# TYPE %s %s' % (metric_name, metric_type))
+            lines.append('%s%s %s' % (metric_name, label_str, repr(value)))
+        return '\n'.join(lines) + '\n'
+
+
+    def __call__(self, metrics):
+        # type: (Dict[str, Any]) -> None
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as metrics_file:
+            metrics_file.write(self.get_text(metrics))
+        os.replace(temp_path, self.path)
+
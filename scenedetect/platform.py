@@ -39,8 +39,14 @@ respectively) as scenedetect.platform.queue.
 
 For OpenCV 2.x, the scenedetect.platform module also makes a copy of the
 OpenCV VideoCapture property constants from the cv2.cv namespace directly
-to the cv2 namespace.  This ensures that the cv2 API is consistent
-with those changes made to it in OpenCV 3.0 and above.
+to the cv2 namespace (when OpenCV is first imported with import_cv2).  This
+ensures that the cv2 API is consistent with those changes made to it in
+OpenCV 3.0 and above.
+
+OpenCV, tqdm, zstandard, and the shared_memory module are only imported when first
+required (scenedetect.platform.tqdm, scenedetect.platform.zstandard, and
+scenedetect.platform.shared_memory are imported on first access), so that importing
+this module remains fast.
 
 This module also includes an alias for the unicode/string types in Python 2/3
 as STRING_TYPE intended to help with parsing string types from the CLI parser.
@@ -63,9 +69,6 @@ import struct
 import subprocess
 import sys
 
-# Third-Party Library Imports
-import cv2
-
 
 # pylint: disable=unused-import
 # pylint: disable=no-member
@@ -74,10 +77,64 @@ import cv2
 ## tqdm Library (scenedetect.platform.tqdm will be tqdm object or None)
 ##
 
-try:
-    from tqdm import tqdm
-except ImportError:
-    tqdm = None
+def _import_tqdm():
+    # type: () -> Optional[type]
+    try:
+        from tqdm import tqdm  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        tqdm = None
+    return tqdm
+
+
+##
+## multiprocessing.shared_memory Module (Python 3.8+, otherwise None)
+##
+
+def _import_shared_memory():
+    # type: () -> Optional[module]
+    try:
+        from multiprocessing import shared_memory  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        shared_memory = None
+    return shared_memory
+
+
+##
+## zstandard Library (scenedetect.platform.zstandard will be zstandard module or None)
+##
+
+def _import_zstandard():
+    # type: () -> Optional[module]
+    try:
+        import zstandard  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        zstandard = None
+    return zstandard
+
+
+# Attributes of this module which are imported on first access (see __getattr__).
+_LAZY_IMPORTS = {
+    'tqdm': _import_tqdm,
+    'shared_memory': _import_shared_memory,
+    'zstandard': _import_zstandard,
+}
+
+
+def __getattr__(name):
+    # type: (str) -> Any
+    """ Imports the tqdm library/shared_memory module/zstandard library on first access of
+    scenedetect.platform.tqdm/shared_memory/zstandard, respectively. """
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError("module 'scenedetect.platform' has no attribute '%s'" % name)
+    value = _LAZY_IMPORTS[name]()
+    globals()[name] = value
+    return value
+
+# Module-level __getattr__ requires Python 3.7+, so import everything up front otherwise.
+if sys.version_info < (3, 7):
+    tqdm = _import_tqdm()
+    shared_memory = _import_shared_memory()
+    zstandard = _import_zstandard()
 
 # pylint: enable=unused-import
 
@@ -96,18 +153,30 @@ else:
 # pylint: enable=invalid-name, undefined-variable
 
 
-# Compatibility fix for OpenCV v2.x (copies CAP_PROP_* properties from the
-# cv2.cv namespace to the cv2 namespace, as the cv2.cv namespace was removed
-# with the release of OpenCV 3.0).
-if not 'CAP_PROP_FPS' in dir(cv2):
-    cv2.CAP_PROP_FRAME_WIDTH = cv2.cv.CV_CAP_PROP_FRAME_WIDTH
-    cv2.CAP_PROP_FRAME_HEIGHT = cv2.cv.CV_CAP_PROP_FRAME_HEIGHT
-    cv2.CAP_PROP_FPS = cv2.cv.CV_CAP_PROP_FPS
-    cv2.CAP_PROP_POS_MSEC = cv2.cv.CV_CAP_PROP_POS_MSEC
-    cv2.CAP_PROP_POS_FRAMES = cv2.cv.CV_CAP_PROP_POS_FRAMES
-    cv2.CAP_PROP_FRAME_COUNT = cv2.cv.CV_CAP_PROP_FRAME_COUNT
-    cv2.CAP_PROP_FOURCC = cv2.cv.CV_CAP_PROP_FOURCC
-    cv2.INTER_CUBIC = cv2.cv.INTER_CUBIC
+##
+## OpenCV Library
+##
+
+def import_cv2():
+    # type: () -> module
+    """ Imports and returns the cv2 module (OpenCV). Should be used instead of importing
+    cv2 directly by any module which can be imported without processing any videos.
+
+    Also applies a compatibility fix for OpenCV v2.x (copies CAP_PROP_* properties from the
+    cv2.cv namespace to the cv2 namespace, as the cv2.cv namespace was removed
+    with the release of OpenCV 3.0).
+    """
+    import cv2  # pylint: disable=import-outside-toplevel
+    if not 'CAP_PROP_FPS' in dir(cv2):
+        cv2.CAP_PROP_FRAME_WIDTH = cv2.cv.CV_CAP_PROP_FRAME_WIDTH
+        cv2.CAP_PROP_FRAME_HEIGHT = cv2.cv.CV_CAP_PROP_FRAME_HEIGHT
+        cv2.CAP_PROP_FPS = cv2.cv.CV_CAP_PROP_FPS
+        cv2.CAP_PROP_POS_MSEC = cv2.cv.CV_CAP_PROP_POS_MSEC
+        cv2.CAP_PROP_POS_FRAMES = cv2.cv.CV_CAP_PROP_POS_FRAMES
+        cv2.CAP_PROP_FRAME_COUNT = cv2.cv.CV_CAP_PROP_FRAME_COUNT
+        cv2.CAP_PROP_FOURCC = cv2.cv.CV_CAP_PROP_FOURCC
+        cv2.INTER_CUBIC = cv2.cv.INTER_CUBIC
+    return cv2
 
 
 def get_aspect_ratio(cap, epsilon=0.01):
@@ -125,6 +194,7 @@ def get_aspect_ratio(cap, epsilon=0.01):
         if for some reason the numerator/denominator returned is zero
         (can happen if the video was not opened correctly).
     """
+    cv2 = import_cv2()
     if not 'CAP_PROP_SAR_NUM' in dir(cv2):
         return 1.0
     num = cap.get(cv2.CAP_PROP_SAR_NUM)
@@ -157,6 +227,7 @@ def check_opencv_ffmpeg_dll():
         where DLL_NAME is the name of the expected DLL file that OpenCV requires.
         On Non-Windows platforms, DLL_NAME will be a blank string.
     """
+    cv2 = import_cv2()
     if platform.system() == 'Windows' and (
             cv2.__version__[0].isdigit() and cv2.__version__.find('.') > 0):
         is_64_bit_str = '_64' if struct.calcsize("P") == 8 else ''
@@ -183,6 +254,7 @@ def get_cv2_imwrite_params():
             compression parameter (e.g. 'jpg' -> cv2.IMWRITE_JPEG_QUALITY,
             'png' -> cv2.IMWRITE_PNG_COMPRESSION)..
     """
+    cv2 = import_cv2()
 
     def _get_cv2_param(param_name):
         # type: (str) -> Union[int, None]
@@ -254,6 +326,63 @@ def get_and_create_path(file_path, output_directory=None):
     return file_path
 
 
+##
+## Memory Usage
+##
+
+def get_memory_usage():
+    # type: () -> Optional[int]
+    """ Returns the resident set size (RSS), in bytes, of the current process.
+
+    The current RSS is only available on Linux (from /proc/self/statm). On other POSIX
+    systems, the peak RSS of the process is returned instead, and on Windows, None.
+    """
+    try:
+        with open('/proc/self/statm', 'r') as statm_file:
+            return int(statm_file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError, IndexError, AttributeError):
+        pass
+    return get_peak_memory_usage()
+
+
+def get_peak_memory_usage():
+    # type: () -> Optional[int]
+    """ Returns the peak resident set size (RSS), in bytes, of the current process, or
+    None if unavailable (e.g. on Windows). """
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, and in kilobytes on other systems.
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+##
+## Text Tables (for reports of the profiler, benchmark, evaluate, and sweep commands)
+##
+
+def format_table(rows, num_left_columns=1):
+    # type: (List[Sequence[str]], int) -> str
+    """ Formats rows of strings as a plain text table, with each column padded to the
+    width of its longest value, and a line separating the header from the other rows.
+
+    Arguments:
+        rows: Header row followed by the other rows, each with the same number of values.
+        num_left_columns: Number of columns (from the first) which are left-justified.
+            Any other columns are right-justified.
+
+    Returns:
+        str: The table, with lines separated by newlines (without a trailing newline).
+    """
+    widths = [max([len(row[i]) for row in rows]) for i in range(len(rows[0]))]
+    lines = ['  '.join([
+        value.ljust(width) if i < num_left_columns else value.rjust(width)
+        for i, (value, width) in enumerate(zip(row, widths))]) for row in rows]
+    lines.insert(1, '-' * len(lines[0]))
+    return '\n'.join(lines)
+
+
 ##
 ## Logging
 ##
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" ``scenedetect.profiler`` Module
+
+This module contains the :py:class:`Profiler` class, which records the time spent in
+each stage of processing a video (e.g. decoding frames, computing the metrics of each
+detector, loading/saving statsfiles), to find out whether a slow run is bound by
+decoding, detection, or I/O.
+
+A Profiler is passed to the objects to profile, which record the time of each stage:
+
+ * :py:class:`VideoManager <scenedetect.video_manager.VideoManager>`:
+   ``VideoManager.grab`` and ``VideoManager.retrieve`` (downscaling only creates a
+   strided view of each frame, so its cost is part of the stages using the frame)
+ * :py:class:`SceneManager <scenedetect.scene_manager.SceneManager>`: the
+   ``process_frame`` and ``post_process`` methods of each detector (e.g.
+   ``ContentDetector.process_frame``), or the ``prepare_frame``, ``score_frame``, and
+   ``decide_frame`` methods in pipeline mode, as well as ``SceneManager.detect_scenes``
+ * :py:class:`StatsManager <scenedetect.stats_manager.StatsManager>`:
+   ``StatsManager.load`` and ``StatsManager.save``
+
+Any other code can be profiled with :py:meth:`Profiler.stage` (e.g. calls to
+:py:func:`save_images <scenedetect.scene_manager.save_images>`). When no Profiler is
+set (the default), the only overhead is checking if one was set.
+
+Usage example::
+
+    profiler = Profiler()
+    video_manager = VideoManager([video_path], profiler=profiler)
+    scene_manager = SceneManager(profiler=profiler)
+    ...
+    print(profiler.get_report())
+"""
+
+# Standard Library Imports
+import collections
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+# PySceneDetect Library Imports
+from scenedetect.platform import format_table
+
+
+##
+## Profiler Helper Functions
+##
+
+# Returns the current time in seconds, used as the start/end time of each stage.
+get_time = time.perf_counter
+
+
+def profiled(stage):
+    # type: (str) -> Callable
+    """ Decorator which records the time of each call to a method as the given stage, if
+    the _profiler attribute of the object the method is called on is set. """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            # pylint: disable=protected-access
+            profiler = self._profiler
+            if profiler is None:
+                return method(self, *args, **kwargs)
+            start_time = get_time()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                profiler.add_time(stage, start_time)
+        return wrapper
+    return decorator
+
+
+@contextlib.contextmanager
+def _null_stage():
+    # type: () -> Iterator[None]
+    yield
+
+
+def profile_stage(profiler, stage):
+    # type: (Optional[Profiler], str) -> ContextManager
+    """ Returns a context manager which records the time spent in its body as the given
+    stage of profiler (see Profiler.stage), or does nothing if profiler is None. """
+    if profiler is None:
+        return _null_stage()
+    return profiler.stage(stage)
+
+
+##
+## Profiler Class Implementation
+##
+
+class Profiler(object):
+    """ Records the number of calls and total time of each stage of processing, and
+    optionally each call (to write a trace viewable in e.g. chrome://tracing).
+
+    Stages may be recorded from multiple threads (e.g. in pipeline mode), in which case
+    the total time of all stages may exceed the elapsed time.
+    """
+
+    def __init__(self, record_trace=False):
+        # type: (bool) -> None
+        """
+        Arguments:
+            record_trace: If True, also records the start and end time of each call (see
+                save_trace), which requires memory for every call (several per frame).
+        """
+        self.record_trace = record_trace
+        self._lock = threading.Lock()
+        self._start_time = get_time()
+        self._calls = collections.OrderedDict()
+        self._trace_events = []
+
+
+    def reset(self):
+        # type: () -> None
+        """ Removes all recorded stages, and restarts the elapsed time. """
+        with self._lock:
+            self._start_time = get_time()
+            self._calls.clear()
+            self._trace_events = []
+
+
+    def add_time(self, stage, start_time, end_time=None):
+        # type: (str, float, Optional[float]) -> None
+        """ Records a call of the given stage.
+
+        Arguments:
+            stage: Name of the stage (e.g. 'VideoManager.grab').
+            start_time: Time the call started at (from get_time()).
+            end_time: Time the call ended at (from get_time()), or None for the current time.
+        """
+        if end_time is None:
+            end_time = get_time()
+        with self._lock:
+            num_calls, total_time = self._calls.get(stage, (0, 0.0))
+            self._calls[stage] = (num_calls + 1, total_time + (end_time - start_time))
+            if self.record_trace:
+                self._trace_events.append(
+                    (stage, start_time, end_time, threading.current_thread().ident))
+
+
+    @contextlib.contextmanager
+    def stage(self, stage):
+        # type: (str) -> Iterator[None]
+        """ Context manager which records the time spent in its body as the given stage.
+
+        Usage example::
+
+            with profiler.stage('save_images'):
+                save_images(scene_list, video_manager)
+        """
+        start_time = get_time()
+        try:
+            yield
+        finally:
+            self.add_time(stage, start_time)
+
+
+    def get_elapsed_time(self):
+        # type: () -> float
+        """ Returns the time, in seconds, since the Profiler was created (or reset). """
+        return get_time() - self._start_time
+
+
+    def get_stages(self):
+        # type: () -> Dict[str, Tuple[int, float]]
+        """ Returns the number of calls and total time (in seconds) of each stage, in the
+        order each stage was first recorded. """
+        with self._lock:
+            return collections.OrderedDict(self._calls)
+
+
+    def get_report(self):
+        # type: () -> str
+        """ Returns a table of the number of calls, total time, average time per call, and
+        percent of the elapsed time of each stage. """
+        elapsed_time = self.get_elapsed_time()
+        rows = [('Stage', 'Calls', 'Total (s)', 'Average (ms)', 'Elapsed %')]
+        for stage, (num_calls, total_time) in self.get_stages().items():
+            rows.append((
+                stage, '%d' % num_calls, '%.3f' % total_time,
+                '%.3f' % (1000.0 * total_time / num_calls),
+                '%.1f' % (100.0 * total_time / elapsed_time if elapsed_time > 0 else 0.0)))
+        table = format_table(rows)
+        return '\n'.join([table, '-' * table.index('\n'), 'Elapsed time: %.3f s' % elapsed_time])
+
+
+    def save_trace(self, output_file):
+        # type: (File) -> None
+        """ Writes all calls recorded (if record_trace is True) in the Chrome trace event
+        format (JSON), which can be viewed in chrome://tracing or https://ui.perfetto.dev.
+
+        Arguments:
+            output_file: A file handle opened in write mode (e.g. open('...', 'w')).
+        """
+        pid = os.getpid()
+        with self._lock:
+            trace_events = list(self._trace_events)
+            start_time = self._start_time
+        thread_ids = {}
+        events = []
+        for stage, stage_start, stage_end, thread_ident in trace_events:
+            events.append({
+                'name': stage,
+                'cat': stage.split('.')[0],
+                'ph': 'X',
+                'ts': round((stage_start - start_time) * 1000000.0, 3),
+                'dur': round((stage_end - stage_start) * 1000000.0, 3),
+                'pid': pid,
+                'tid': thread_ids.setdefault(thread_ident, len(thread_ids)),
+            })
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, output_file)
@@ -50,6 +50,12 @@ class SceneDetector(object):
     """ Optional :py:class:`StatsManager <scenedetect.stats_manager.StatsManager>` to
     use for caching frame metrics to and from."""
 
+    METRIC_INDEPENDENT_PARAMETERS = frozenset()
+    """ Names of the parameters (attributes) of the detector which only affect how cuts are
+    detected from its frame metrics (e.g. the threshold), and not the values of the metrics.
+    Cached frame metrics are reused when only these parameters change (see
+    :py:func:`get_metric_config <scenedetect.stats_cache.get_metric_config>`)."""
+
     def is_processing_required(self, frame_num):
         # type: (int) -> bool
         """ Is Processing Required: Test if all calculations for a given frame are already done.
@@ -114,6 +120,100 @@ class SceneDetector(object):
         return []
 
 
+    def is_pipeline_supported(self):
+        # type: () -> bool
+        """ Pipeline Supported: Prototype indicating if the detector implements the
+        prepare_frame, score_frame, and decide_frame methods, which allows the SceneManager
+        to compute frame metrics on a pool of worker threads (see the `workers` argument of
+        :py:meth:`SceneManager.detect_scenes
+        <scenedetect.scene_manager.SceneManager.detect_scenes>`).
+
+        Returns:
+            bool: True if the detector can be used in pipeline mode, False otherwise.
+        """
+        return False
+
+
+    def prepare_frame(self, frame_img):
+        # type: (numpy.ndarray) -> Any
+        """ Prepare Frame: Computes any data required from a single frame by score_frame
+        (e.g. the frame converted to another colour space).
+
+        Called from worker threads in pipeline mode, so must not modify the detector's state.
+
+        Prototype method, no actual processing.
+
+        Returns:
+            Any: Data computed from the frame, passed to score_frame.
+        """
+        return None
+
+
+    def score_frame(self, frame_num, curr_data, last_data):
+        # type: (int, Any, Optional[Any]) -> Dict[str, float]
+        """ Score Frame: Computes the metrics of a frame from the data returned by
+        prepare_frame for the frame, and for the previous frame.
+
+        Called from worker threads in pipeline mode, so must not modify the detector's state.
+
+        Prototype method, no actual processing.
+
+        Arguments:
+            frame_num (int): Frame number of frame that is being scored.
+            curr_data (Any): Result of prepare_frame for the frame.
+            last_data (Optional[Any]): Result of prepare_frame for the previous frame, or
+                None if this is the first frame (or the previous frame was not decoded).
+
+        Returns:
+            Dict[str, float]: Metric keys and values of the frame.
+        """
+        return {}
+
+
+    def decide_frame(self, frame_num, metrics):
+        # type: (int, Dict[str, Optional[float]]) -> List[int]
+        """ Decide Frame: Detects any scene changes using the metrics of a frame.
+
+        Called in frame order in pipeline mode, with either the metrics returned by
+        score_frame, or those already stored in the StatsManager (missing metrics are None).
+
+        Prototype method, no actual detection.
+
+        Returns:
+            List[int]: List of frame numbers of cuts to be added to the cutting list.
+        """
+        return []
+
+
+    def get_state(self):
+        # type: () -> Optional[Dict[str, Any]]
+        """ Get State: Returns the state of the detector required to continue detecting
+        scenes after the last frame processed (e.g. the frame of the last cut), so that
+        processing can be resumed from a checkpoint (see :py:meth:`SceneManager.set_checkpoint
+        <scenedetect.scene_manager.SceneManager.set_checkpoint>`).
+
+        Data computed from the previous frame (e.g. its histogram) is not included, as the
+        SceneManager passes the previous frame to process_frame again before calling
+        set_state when resuming.
+
+        Prototype method, indicating that checkpoints are not supported.
+
+        Returns:
+            Optional[Dict[str, Any]]: JSON serializable state of the detector, or None if
+            the state of the detector cannot be saved.
+        """
+        return None
+
+
+    def set_state(self, state):
+        # type: (Dict[str, Any]) -> None
+        """ Set State: Restores the state returned by get_state.
+
+        Prototype method, no state to restore.
+        """
+        pass
+
+
 class SparseSceneDetector(SceneDetector):
     """ Base class to inheret from when implementing a sparse scene detection algorithm.
 
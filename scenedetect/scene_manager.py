@@ -50,8 +50,13 @@ threshold values (or other algorithm options) are used.
 # Standard Library Imports
 from __future__ import print_function
 from string import Template
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+import json
 import math
 import logging
+import os
 
 # Third-Party Library Imports
 import cv2
@@ -59,11 +64,17 @@ import numpy as np
 from scenedetect.platform import tqdm
 from scenedetect.platform import get_and_create_path
 from scenedetect.platform import get_aspect_ratio
+from scenedetect.platform import shared_memory
 
 # PySceneDetect Library Imports
 from scenedetect.frame_timecode import FrameTimecode
+from scenedetect.frame_buffer import DetectorWorkerPool
+from scenedetect.metrics import DEFAULT_METRICS_INTERVAL
+from scenedetect.metrics import MetricsTracker
 from scenedetect.platform import get_csv_writer
 from scenedetect.platform import get_cv2_imwrite_params
+from scenedetect.profiler import get_time
+from scenedetect.stats_cache import get_detector_config
 from scenedetect.stats_manager import StatsManager
 from scenedetect.stats_manager import FrameMetricRegistered
 from scenedetect.scene_detector import SparseSceneDetector
@@ -74,6 +85,12 @@ from scenedetect.thirdparty.simpletable import SimpleTableRow, SimpleTable, HTML
 
 logger = logging.getLogger('pyscenedetect')
 
+# Default interval, in seconds, between checkpoints (see SceneManager.set_checkpoint).
+DEFAULT_CHECKPOINT_INTERVAL = 60.0
+
+# Version of the format of checkpoint files. Checkpoints of other versions are ignored.
+CHECKPOINT_VERSION = 1
+
 
 ##
 ## SceneManager Helper Functions
@@ -449,10 +466,21 @@ class SceneManager(object):
     scene detection calculations, making subsequent calls to :py:meth:`detect_scenes` much faster,
     allowing the cached values to be saved/loaded to/from disk, and also manually determining
     the optimal threshold values or other options for various detection algorithms.
+
+    Can also optionally take a :py:class:`Profiler <scenedetect.profiler.Profiler>` to record
+    the time spent in each method of each detector (e.g. ``ContentDetector.process_frame``).
+
+    Metrics hooks (see :py:meth:`add_metrics_hook`) can be added to monitor the progress
+    of :py:meth:`detect_scenes` (see :py:mod:`scenedetect.metrics`).
+
+    The state of :py:meth:`detect_scenes` can be saved to a checkpoint file periodically
+    (see :py:meth:`set_checkpoint`), and restored with :py:meth:`load_checkpoint` to resume
+    processing from the last checkpoint (e.g. after the process was interrupted).
     """
 
-    def __init__(self, stats_manager=None):
-        # type: (Optional[StatsManager])
+    def __init__(self, stats_manager=None, profiler=None):
+        # type: (Optional[StatsManager], Optional[Profiler])
+        self._profiler = profiler
         self._cutting_list = []
         self._event_list = []
         self._detector_list = []
@@ -461,6 +489,169 @@ class SceneManager(object):
         self._num_frames = 0
         self._start_frame = 0
         self._base_timecode = None
+        self._metrics_hooks = []
+        self._checkpoint_path = None
+        self._checkpoint_interval = DEFAULT_CHECKPOINT_INTERVAL
+        self._checkpoint_key = None
+        self._checkpoint_detectors = None
+        self._resume_checkpoint = None
+
+
+    def add_metrics_hook(self, callback, interval=DEFAULT_METRICS_INTERVAL):
+        # type: (Callable[[Dict[str, Any]], None], float) -> None
+        """ Adds a metrics hook, which is called with the current metrics of detect_scenes
+        (see :py:data:`scenedetect.metrics.METRICS`) every interval seconds while it is
+        running, and once more when it completes (with `finished` set to 1).
+
+        Arguments:
+            callback: Called with a dict mapping the name of each metric to its value,
+                e.g. :py:class:`JsonLinesSink <scenedetect.metrics.JsonLinesSink>` or
+                :py:class:`PrometheusTextfileSink
+                <scenedetect.metrics.PrometheusTextfileSink>`.
+            interval: Minimum time, in seconds, between calls to the callback.
+        """
+        if interval <= 0:
+            raise ValueError('interval must be greater than 0.')
+        self._metrics_hooks.append((callback, interval))
+
+
+    def remove_metrics_hook(self, callback):
+        # type: (Callable[[Dict[str, Any]], None]) -> None
+        """ Removes a metrics hook added via add_metrics_hook. """
+        self._metrics_hooks = [
+            (hook, interval) for hook, interval in self._metrics_hooks if hook != callback]
+
+
+    def set_checkpoint(self, path, interval=DEFAULT_CHECKPOINT_INTERVAL, key=None):
+        # type: (Optional[str], float, Optional[str]) -> None
+        """ Sets the file to save the state of detect_scenes to every interval seconds, so
+        that processing can be resumed from it with load_checkpoint. The file is removed
+        once detect_scenes completes.
+
+        Checkpoints are only saved if all detectors support them (see
+        :py:meth:`supports_checkpoints`), and `frame_skip` and `processes` are 0.
+
+        Arguments:
+            path: Path of the checkpoint file, or None to disable checkpoints.
+            interval: Minimum time, in seconds, between checkpoints.
+            key: Identifies the input (e.g. a hash of its contents), so that checkpoints
+                of another input are not loaded (see load_checkpoint).
+        """
+        if interval <= 0:
+            raise ValueError('interval must be greater than 0.')
+        self._checkpoint_path = path
+        self._checkpoint_interval = interval
+        self._checkpoint_key = key
+
+
+    def supports_checkpoints(self):
+        # type: () -> bool
+        """ Returns True if the state of all detectors can be saved to a checkpoint (see
+        :py:meth:`SceneDetector.get_state <scenedetect.scene_detector.SceneDetector.get_state>`),
+        False otherwise. """
+        return all(detector.get_state() is not None
+                   for detector in self._detector_list + self._sparse_detector_list)
+
+
+    def load_checkpoint(self, path, key=None):
+        # type: (str, Optional[str]) -> Optional[int]
+        """ Loads a checkpoint saved by detect_scenes (see set_checkpoint), so that the next
+        call to detect_scenes restores the cuts, events, and state of each detector, seeks
+        the frame source to the frame of the checkpoint, and continues from there.
+
+        The detectors must be added (with the same parameters) before calling this method.
+
+        Arguments:
+            path: Path of the checkpoint file.
+            key: If set, the checkpoint is only loaded if it was saved with the same key.
+
+        Returns:
+            Optional[int]: Frame number processing will be resumed from, or None if the file
+            does not exist or is not a checkpoint of the same input and detectors.
+        """
+        try:
+            with open(path, 'rt') as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+        except (IOError, OSError):
+            return None
+        except ValueError:
+            logger.warning('Ignoring corrupt checkpoint file: %s', path)
+            return None
+        if (not isinstance(checkpoint, dict)
+                or checkpoint.get('version') != CHECKPOINT_VERSION
+                or checkpoint.get('key') != key
+                or checkpoint.get('detectors') != self._get_detector_configs()):
+            logger.warning('Ignoring checkpoint of a different input or detectors: %s', path)
+            return None
+        self._resume_checkpoint = checkpoint
+        return checkpoint['frame']
+
+
+    def _get_detector_configs(self):
+        # type: () -> List[str]
+        """ Returns the parameters of each detector (see stats_cache.get_detector_config),
+        which must be the same to resume from a checkpoint. """
+        return [get_detector_config(detector)
+                for detector in self._detector_list + self._sparse_detector_list]
+
+
+    def _save_checkpoint(self, frame_num):
+        # type: (int) -> None
+        """ Saves the state of detect_scenes before processing the given frame to the
+        checkpoint file, replacing it only once written. """
+        detectors = self._detector_list + self._sparse_detector_list
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'key': self._checkpoint_key,
+            'detectors': self._checkpoint_detectors,
+            'start_frame': self._start_frame,
+            'frame': frame_num,
+            'cuts': list(self._cutting_list),
+            'events': [[start, end] for start, end in self._event_list],
+            'states': [detector.get_state() for detector in detectors],
+        }
+        temp_path = self._checkpoint_path + '.tmp'
+        with open(temp_path, 'wt') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+        os.replace(temp_path, self._checkpoint_path)
+        logger.debug('Saved checkpoint at frame %d.', frame_num)
+
+
+    def _restore_checkpoint(self, frame_source, checkpoint, process_previous=True):
+        # type: (VideoManager, Dict[str, Any], bool) -> Optional[numpy.ndarray]
+        """ Seeks the frame source to the frame before the checkpoint, and restores the
+        state of the SceneManager and each detector after passing that frame to them (so
+        any data the detectors derive from the previous frame is restored as well).
+
+        Arguments:
+            frame_source: Frame source passed to detect_scenes.
+            checkpoint: Checkpoint loaded by load_checkpoint.
+            process_previous: If False, the frame before the checkpoint is not passed to
+                the detectors (in pipeline mode, it is passed to prepare_frame instead).
+
+        Returns:
+            Optional[numpy.ndarray]: The frame before the checkpoint, if any.
+        """
+        frame_num = checkpoint['frame']
+        frame_im = None
+        if frame_num > self._start_frame:
+            if hasattr(frame_source, 'seek'):
+                frame_source.seek(self._base_timecode + (frame_num - 1))
+            else:
+                frame_source.set(cv2.CAP_PROP_POS_FRAMES, frame_num - 1)
+            ret_val, frame_im = frame_source.read()
+            if not ret_val:
+                frame_im = None
+            elif process_previous:
+                self._process_frame(frame_num - 1, frame_im)
+        self._cutting_list = list(checkpoint['cuts'])
+        self._event_list = [(start, end) for start, end in checkpoint['events']]
+        for detector, state in zip(
+                self._detector_list + self._sparse_detector_list, checkpoint['states']):
+            detector.set_state(state)
+        self._num_frames = frame_num - self._start_frame
+        logger.info('Resuming from checkpoint at frame %d.', frame_num)
+        return frame_im
 
 
     def add_detector(self, detector):
@@ -497,7 +688,13 @@ class SceneManager(object):
     def get_num_detectors(self):
         # type: () -> int
         """ Gets number of registered scene detectors added via add_detector. """
-        return len(self._detector_list)
+        return len(self._detector_list) + len(self._sparse_detector_list)
+
+
+    def get_detectors(self):
+        # type: () -> List[SceneDetector]
+        """ Gets all registered scene detectors added via add_detector. """
+        return self._detector_list + self._sparse_detector_list
 
 
     def clear(self):
@@ -524,6 +721,38 @@ class SceneManager(object):
         self._sparse_detector_list.clear()
 
 
+    def get_results(self):
+        # type: () -> Dict[str, Any]
+        """ Returns the results of the last call to detect_scenes, which can be restored
+        with set_results (e.g. to cache them, see :py:mod:`scenedetect.stats_cache`).
+
+        Returns:
+            Dict[str, Any]: The framerate, start frame, and number of frames processed,
+            the frame numbers of all cuts, and the start/end frame numbers of all events,
+            all of which are JSON serializable.
+        """
+        return {
+            'framerate': (self._base_timecode.get_framerate()
+                          if self._base_timecode is not None else None),
+            'start_frame': self._start_frame,
+            'num_frames': self._num_frames,
+            'cuts': self._get_cutting_list(),
+            'events': [[start, end] for start, end in self._event_list],
+        }
+
+
+    def set_results(self, results):
+        # type: (Dict[str, Any]) -> None
+        """ Restores the results of a previous call to detect_scenes (see get_results),
+        as if detect_scenes had been called instead. """
+        self._base_timecode = (FrameTimecode(timecode=0, fps=results['framerate'])
+                               if results['framerate'] is not None else None)
+        self._start_frame = results['start_frame']
+        self._num_frames = results['num_frames']
+        self._cutting_list = list(results['cuts'])
+        self._event_list = [(start, end) for start, end in results['events']]
+
+
     def get_scene_list(self, base_timecode=None):
         # type: (FrameTimecode) -> List[Tuple[FrameTimecode, FrameTimecode]]
         """ Returns a list of tuples of start/end FrameTimecodes for each detected scene.
@@ -541,6 +770,9 @@ class SceneManager(object):
             base_timecode = self._base_timecode
         if base_timecode is None:
             return []
+        # If only sparse detectors were used, the scene list consists of only the events.
+        if self._sparse_detector_list and not self._detector_list:
+            return sorted(self.get_event_list(base_timecode))
         return sorted(self.get_event_list(base_timecode) + get_scenes_from_cuts(
             self.get_cut_list(base_timecode), base_timecode,
             self._num_frames, self._start_frame))
@@ -578,6 +810,13 @@ class SceneManager(object):
         return sorted(list(set(self._cutting_list)))
 
 
+    def _get_num_cuts(self):
+        # type: () -> int
+        """ Returns the number of unique scene cuts and events detected so far (as reported
+        by get_cut_list and get_event_list). """
+        return len(set(self._cutting_list)) + len(self._event_list)
+
+
     def get_event_list(self, base_timecode=None):
         # type: (FrameTimecode) -> List[FrameTimecode]
         """ Returns a list of FrameTimecode pairs of the detected scenes by all sparse detectors.
@@ -597,16 +836,35 @@ class SceneManager(object):
                 for start, end in self._event_list]
 
 
+    def _profile_call(self, detector, method_name, *args):
+        # type(SceneDetector, str, ...) -> Any
+        """ Calls the given method of a detector, recording its time in the Profiler
+        under the name of the detector class and method (e.g. ContentDetector.process_frame).
+        Must only be called if a Profiler was set. """
+        start_time = get_time()
+        try:
+            return getattr(detector, method_name)(*args)
+        finally:
+            self._profiler.add_time(
+                '%s.%s' % (type(detector).__name__, method_name), start_time)
+
+
     def _process_frame(self, frame_num, frame_im, callback=None):
         # type(int, numpy.ndarray) -> None
         """ Adds any cuts detected with the current frame to the cutting list. """
         for detector in self._detector_list:
-            cuts = detector.process_frame(frame_num, frame_im)
+            if self._profiler is None:
+                cuts = detector.process_frame(frame_num, frame_im)
+            else:
+                cuts = self._profile_call(detector, 'process_frame', frame_num, frame_im)
             if cuts and callback:
                 callback(frame_im, frame_num)
             self._cutting_list += cuts
         for detector in self._sparse_detector_list:
-            events = detector.process_frame(frame_num, frame_im)
+            if self._profiler is None:
+                events = detector.process_frame(frame_num, frame_im)
+            else:
+                events = self._profile_call(detector, 'process_frame', frame_num, frame_im)
             if events and callback:
                 callback(frame_im, frame_num)
             self._event_list += events
@@ -617,6 +875,11 @@ class SceneManager(object):
         """ Is Processing Required: Returns True if frame metrics not in StatsManager,
         False otherwise.
         """
+        # Sparse detectors (e.g. MotionDetector) may require every frame regardless
+        # of which metrics the dense detectors have stored.
+        if any([detector.is_processing_required(frame_num)
+                for detector in self._sparse_detector_list]):
+            return True
         return all([detector.is_processing_required(frame_num) for detector in self._detector_list])
 
 
@@ -624,13 +887,124 @@ class SceneManager(object):
         # type(int, numpy.ndarray) -> None
         """ Adds any remaining cuts to the cutting list after processing the last frame. """
         for detector in self._detector_list:
-            self._cutting_list += detector.post_process(frame_num)
+            if self._profiler is None:
+                self._cutting_list += detector.post_process(frame_num)
+            else:
+                self._cutting_list += self._profile_call(detector, 'post_process', frame_num)
+        for detector in self._sparse_detector_list:
+            if self._profiler is None:
+                self._event_list += detector.post_process(frame_num)
+            else:
+                self._event_list += self._profile_call(detector, 'post_process', frame_num)
+
+
+    def _is_pipeline_supported(self):
+        # type() -> bool
+        """ Is Pipeline Supported: Returns True if all detectors can be run in pipeline
+        mode, False otherwise (sparse detectors are never run in pipeline mode).
+        """
+        return bool(self._detector_list) and not self._sparse_detector_list and all(
+            [detector.is_pipeline_supported() for detector in self._detector_list])
+
+
+    def _score_frame(self, frame_num, frame_im, required, prepared, last_prepared):
+        # type(int, Optional[numpy.ndarray], List[bool], Future, Optional[Future])
+        #   -> List[Optional[Dict[str, float]]]
+        """ Computes the data (see SceneDetector.prepare_frame) and metrics of a frame for
+        each detector. Called from a worker thread in pipeline mode.
+
+        The data of the frame is published through prepared as soon as it is computed, so
+        that the next frame can be scored while this one is still being scored. Only the
+        data of the previous frame (last_prepared) is waited for, not its metrics.
+
+        Returns:
+            List of the metrics of each detector (or None if processing was not required,
+            in which case they are already in the StatsManager).
+        """
+        try:
+            curr_data = [None] * len(self._detector_list)
+            if frame_im is not None and self._profiler is None:
+                curr_data = [detector.prepare_frame(frame_im)
+                             for detector in self._detector_list]
+            elif frame_im is not None:
+                curr_data = [self._profile_call(detector, 'prepare_frame', frame_im)
+                             for detector in self._detector_list]
+        except BaseException as ex:
+            prepared.set_exception(ex)
+            raise
+        prepared.set_result(curr_data)
+        # Jobs are started in the order they were submitted, so the previous frame's job
+        # has either published its data, or is preparing it in another worker.
+        last_data = [None] * len(self._detector_list)
+        if last_prepared is not None:
+            last_data = last_prepared.result()
+        metrics = [None] * len(self._detector_list)
+        for i, detector in enumerate(self._detector_list):
+            if required[i] and curr_data[i] is not None and self._profiler is None:
+                metrics[i] = detector.score_frame(frame_num, curr_data[i], last_data[i])
+            elif required[i] and curr_data[i] is not None:
+                metrics[i] = self._profile_call(
+                    detector, 'score_frame', frame_num, curr_data[i], last_data[i])
+        return metrics
+
+
+    def _decide_frame(self, frame_num, frame_im, metrics, callback=None):
+        # type(int, Optional[numpy.ndarray], List[Optional[Dict[str, float]]]) -> None
+        """ Stores the metrics computed by _score_frame, and adds any cuts detected with
+        them to the cutting list. Must be called in frame order. """
+        for detector, detector_metrics in zip(self._detector_list, metrics):
+            if detector_metrics is None:
+                detector_metrics = {}
+                if self._stats_manager is not None:
+                    metric_keys = detector.get_metrics()
+                    detector_metrics = dict(zip(metric_keys, self._stats_manager.get_metrics(
+                        frame_num, metric_keys)))
+            elif detector_metrics and self._stats_manager is not None:
+                self._stats_manager.set_metrics(frame_num, detector_metrics)
+            if self._profiler is None:
+                cuts = detector.decide_frame(frame_num, detector_metrics)
+            else:
+                cuts = self._profile_call(detector, 'decide_frame', frame_num, detector_metrics)
+            if cuts and callback:
+                callback(frame_im, frame_num)
+            self._cutting_list += cuts
+
+
+    def _decide_pending_frames(self, pending_frames, max_pending, callback=None):
+        # type(Deque[Tuple[int, Optional[numpy.ndarray], Future]], int) -> None
+        """ Calls _decide_frame for each pending frame in order, until the first frame
+        which has not been scored yet (waiting for it if more than max_pending frames
+        are pending).
+        """
+        while pending_frames and (
+                pending_frames[0][2].done() or len(pending_frames) > max_pending):
+            frame_num, frame_im, job = pending_frames.popleft()
+            self._decide_frame(frame_num, frame_im, job.result(), callback)
+
+
+    def _merge_worker_results(self, results):
+        # type(List[Tuple[List[int], List[Tuple[int, int]], Dict[int, Dict[str, Any]]]]) -> None
+        """ Adds the cuts, events, and any new metrics from the detector worker processes
+        (see DetectorWorkerPool.finish) to the cutting list, event list, and StatsManager. """
+        for cut_list, event_list, metrics in results:
+            self._cutting_list += cut_list
+            self._event_list += event_list
+            if self._stats_manager is None:
+                continue
+            for frame_num, frame_metrics in metrics.items():
+                # Only set new metrics so that loaded statsfiles aren't marked as updated.
+                new_metrics = {
+                    key: value for key, value in frame_metrics.items()
+                    if not self._stats_manager.metrics_exist(frame_num, [key])}
+                if new_metrics:
+                    self._stats_manager.set_metrics(frame_num, new_metrics)
+
 
     def detect_scenes(self, frame_source, end_time=None, frame_skip=0,
-                      show_progress=True, callback=None):
+                      show_progress=True, callback=None, workers=0, processes=0):
         # type: (VideoManager, Union[int, FrameTimecode],
         #        Optional[Union[int, FrameTimecode]], Optional[bool],
-        #        Optional[Callable[numpy.ndarray]) -> int
+        #        Optional[Callable[numpy.ndarray], Optional[int], Optional[int]) -> int
         """ Perform scene detection on the given frame_source using the added SceneDetectors.
 
         Blocks until all frames in the frame_source have been processed. Results can
@@ -656,15 +1030,39 @@ class SceneManager(object):
                 each scene/event detected.  Note that the signature of the callback will
                 undergo breaking changes in v0.6 to provide more context to the callback
                 (detector type, event type, etc... - see #177 for further details).
+            workers (int): If greater than 0, and all detectors support it (see
+                :py:meth:`SceneDetector.is_pipeline_supported
+                <scenedetect.scene_detector.SceneDetector.is_pipeline_supported>`),
+                frame metrics are computed on a pool of this many worker threads while
+                the next frames are decoded. Cuts are still detected in frame order, so
+                the results are identical to the default (sequential) mode.
+            processes (int): If greater than 0, the detectors are split into this many
+                groups, each run in a separate worker process (takes priority over
+                `workers`). Decoded frames are passed to the workers through a ring
+                buffer in shared memory (see :py:mod:`scenedetect.frame_buffer`), and
+                the cuts and metrics of all groups are merged once processing is
+                complete. The detector objects themselves are not updated in this mode,
+                and `callback` must be None. Requires Python 3.8 or above. If a Profiler
+                was set, the time of each detector is not recorded in this mode, only the
+                time to pass frames to the workers and wait for their results.
         Returns:
             int: Number of frames read and processed from the frame source.
         Raises:
             ValueError: `frame_skip` **must** be 0 (the default) if the SceneManager
-                was constructed with a StatsManager object.
+                was constructed with a StatsManager object, and `callback` must be
+                None if `processes` is greater than 0.
+            ImportError: `processes` is greater than 0, and Python 3.8 or above is not
+                being used.
+            RuntimeError: A detector worker process failed (if `processes` > 0).
         """
 
         if frame_skip > 0 and self._stats_manager is not None:
             raise ValueError('frame_skip must be 0 when using a StatsManager.')
+        if processes > 0 and callback is not None:
+            raise ValueError('callback must be None when processes > 0.')
+        if processes > 0 and shared_memory is None:
+            raise ImportError('processes > 0 requires Python 3.8 or above.')
+        detect_start_time = get_time()
 
         start_frame = 0
         curr_frame = 0
@@ -703,8 +1101,60 @@ class SceneManager(object):
                 total=total_frames,
                 unit='frames',
                 dynamic_ncols=True)
+        metrics_tracker = None
+        if self._metrics_hooks:
+            metrics_tracker = MetricsTracker(self._metrics_hooks, total_frames)
+        # In pipeline mode, the metrics of each frame are computed by the worker threads,
+        # and cuts are detected from them in the main thread in frame order.
+        pipeline = None
+        pending_frames = deque()
+        last_prepared = None
+        # In multiprocess mode, all frames are passed to groups of detectors running in
+        # worker processes, and the results are merged after the last frame.
+        worker_pool = None
+        if processes > 0:
+            detectors = self._detector_list + self._sparse_detector_list
+            worker_pool = DetectorWorkerPool(
+                [detectors[i::processes] for i in range(min(processes, len(detectors)))],
+                self._stats_manager)
+        elif workers > 0 and self._is_pipeline_supported():
+            pipeline = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix='scenedetect-pipeline')
+        # If the frame metrics are being streamed to a stats file, new metrics are flushed
+        # periodically while processing, and once complete (or interrupted).
+        stats_stream = None
+        if self._stats_manager is not None and self._stats_manager.is_streaming():
+            stats_stream = self._stats_manager
+        # Checkpoints are saved from the main thread, once all previous frames are decided.
+        checkpoint = self._resume_checkpoint
+        self._resume_checkpoint = None
+        save_checkpoints = (self._checkpoint_path is not None and frame_skip == 0
+                            and worker_pool is None and self.supports_checkpoints())
+        if save_checkpoints:
+            # Parameters are recorded before processing, as some detectors also store
+            # their state in public attributes.
+            self._checkpoint_detectors = self._get_detector_configs()
+        last_checkpoint_time = get_time()
+
         try:
 
+            if checkpoint is not None and (
+                    checkpoint['start_frame'] != start_frame or frame_skip > 0
+                    or worker_pool is not None):
+                logger.warning('Cannot resume from checkpoint with a different start frame,'
+                               ' or if frame_skip or processes is set.')
+            elif checkpoint is not None:
+                last_frame_im = self._restore_checkpoint(
+                    frame_source, checkpoint, process_previous=pipeline is None)
+                curr_frame = checkpoint['frame']
+                if pipeline is not None and last_frame_im is not None:
+                    last_prepared = Future()
+                    pipeline.submit(
+                        self._score_frame, curr_frame - 1, last_frame_im,
+                        [False] * len(self._detector_list), last_prepared, None)
+                if progress_bar:
+                    progress_bar.update(curr_frame - start_frame)
+
             while True:
                 if end_frame is not None and curr_frame >= end_frame:
                     break
@@ -720,7 +1170,30 @@ class SceneManager(object):
 
                 if not ret_val:
                     break
-                self._process_frame(self._num_frames + start_frame, frame_im, callback)
+                if metrics_tracker is not None and frame_im is None:
+                    metrics_tracker.frames_cached += 1
+                elif metrics_tracker is not None:
+                    metrics_tracker.frames_decoded += 1
+                if worker_pool is not None and self._profiler is None:
+                    worker_pool.put_frame(self._num_frames + start_frame, frame_im)
+                elif worker_pool is not None:
+                    # Includes the time waiting for the workers to free a slot.
+                    put_start_time = get_time()
+                    worker_pool.put_frame(self._num_frames + start_frame, frame_im)
+                    self._profiler.add_time('DetectorWorkerPool.put_frame', put_start_time)
+                elif pipeline is None:
+                    self._process_frame(self._num_frames + start_frame, frame_im, callback)
+                else:
+                    frame_num = self._num_frames + start_frame
+                    required = [detector.is_processing_required(frame_num)
+                                for detector in self._detector_list]
+                    prepared = Future()
+                    job = pipeline.submit(
+                        self._score_frame, frame_num, frame_im, required, prepared,
+                        last_prepared)
+                    last_prepared = prepared
+                    pending_frames.append((frame_num, frame_im if callback else None, job))
+                    self._decide_pending_frames(pending_frames, 2 * workers, callback)
 
                 curr_frame += 1
                 self._num_frames += 1
@@ -736,13 +1209,45 @@ class SceneManager(object):
                         if progress_bar:
                             progress_bar.update(1)
 
-            self._post_process(curr_frame)
+                if metrics_tracker is not None:
+                    metrics_tracker.update(
+                        curr_frame - start_frame, len(pending_frames), self._get_num_cuts())
+                if stats_stream is not None:
+                    stats_stream.flush_stream(force=False)
+                if save_checkpoints and (
+                        get_time() - last_checkpoint_time >= self._checkpoint_interval):
+                    self._save_checkpoint(pending_frames[0][0] if pending_frames else curr_frame)
+                    last_checkpoint_time = get_time()
+
+            if worker_pool is not None:
+                finish_start_time = get_time()
+                self._merge_worker_results(worker_pool.finish(curr_frame))
+                if self._profiler is not None:
+                    self._profiler.add_time('DetectorWorkerPool.finish', finish_start_time)
+            else:
+                self._decide_pending_frames(pending_frames, 0, callback)
+                self._post_process(curr_frame)
 
             num_frames = curr_frame - start_frame
+            if self._checkpoint_path is not None and os.path.exists(self._checkpoint_path):
+                os.remove(self._checkpoint_path)
+            if metrics_tracker is not None:
+                metrics_tracker.finish(
+                    num_frames, self._get_num_cuts())
 
         finally:
 
+            if pipeline is not None:
+                pipeline.shutdown()
+            if worker_pool is not None:
+                worker_pool.close()
+            if stats_stream is not None:
+                stats_stream.flush_stream()
+
             if progress_bar:
                 progress_bar.close()
 
+            if self._profiler is not None:
+                self._profiler.add_time('SceneManager.detect_scenes', detect_start_time)
+
         return num_frames
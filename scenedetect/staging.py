@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" ``scenedetect.staging`` Module
+
+This module contains the :py:class:`StagingCache` class, which copies input videos
+from slow storage (e.g. network file systems) to a local scratch directory in the
+background, using large sequential reads. This allows the next input videos to be
+copied while the current one is being processed (e.g. by the `batch` command), so
+that the VideoManager only ever reads from local storage.
+"""
+
+# Standard Library Imports
+import collections
+import hashlib
+import logging
+import os
+import os.path
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Default size, in bytes, of each read when copying input files.
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+##
+## StagingCache Helper Functions
+##
+
+def _remove_empty_dir(path):
+    # type: (str) -> None
+    """ Removes the given directory if it is empty. """
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass
+
+
+##
+## StagingCache Class Implementation
+##
+
+class StagingCache(object):
+    """ Copies input files to a scratch directory in background threads, evicting the
+    least recently used copies once the total size of all copies exceeds a set limit.
+
+    Staged copies keep the file name of the input (in a subdirectory of the scratch
+    directory unique to each input), so names derived from it (e.g. $VIDEO_NAME) are
+    not affected. Copies in use (see acquire/release) are never evicted, so the size
+    limit may be exceeded if all copies are in use.
+    """
+
+    def __init__(self, scratch_dir, max_size, num_threads=1, chunk_size=DEFAULT_CHUNK_SIZE,
+                 logger=None):
+        # type: (str, int, int, int, Optional[logging.Logger]) -> None
+        """
+        Arguments:
+            scratch_dir: Local directory to store copies of the input files in.
+            max_size: Maximum total size, in bytes, of all copies.
+            num_threads: Number of files to copy at the same time.
+            chunk_size: Size, in bytes, of each read from the input files.
+            logger: Logger to use, if any.
+        """
+        self.scratch_dir = scratch_dir
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self._logger = logger if logger is not None else logging.getLogger('pyscenedetect')
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=num_threads, thread_name_prefix='scenedetect-staging')
+        # Maps input paths to the Future of their staged copy, in least to most recently
+        # used order, and the number of users of each copy.
+        self._staged = collections.OrderedDict()
+        self._sizes = {}
+        self._ref_counts = collections.Counter()
+
+
+    def get_staged_path(self, path):
+        # type: (str) -> str
+        """ Returns the path of the staged copy of the given input file. """
+        path_hash = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.scratch_dir, path_hash, os.path.basename(path))
+
+
+    def get_total_size(self):
+        # type: () -> int
+        """ Returns the total size, in bytes, of all staged (or currently staging) copies. """
+        with self._lock:
+            return sum(self._sizes.values())
+
+
+    def stage(self, path):
+        # type: (str) -> concurrent.futures.Future
+        """ Starts copying the given input file in the background, if it was not already.
+
+        Returns:
+            Future of the path of the staged copy. The result raises any IOError/OSError
+            raised when copying the file.
+        """
+        with self._lock:
+            if path in self._staged:
+                self._staged.move_to_end(path)
+                return self._staged[path]
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = 0
+            self._evict(size)
+            self._sizes[path] = size
+            future = self._executor.submit(self._copy, path, self.get_staged_path(path))
+            self._staged[path] = future
+            return future
+
+
+    def acquire(self, path):
+        # type: (str) -> str
+        """ Waits for the given input file to be staged (starting to copy it if required),
+        and marks the copy as in use until release is called.
+
+        Returns:
+            str: Path of the staged copy.
+
+        Raises:
+            IOError/OSError: The file could not be copied.
+        """
+        future = self.stage(path)
+        try:
+            staged_path = future.result()
+        except Exception:
+            # Remove the failed copy so that staging is retried the next time.
+            with self._lock:
+                if self._staged.get(path) is future:
+                    del self._staged[path]
+                    del self._sizes[path]
+            raise
+        with self._lock:
+            self._ref_counts[path] += 1
+        return staged_path
+
+
+    def release(self, path):
+        # type: (str) -> None
+        """ Marks the staged copy of the given input file as no longer in use by the caller
+        of acquire, allowing it to be evicted. """
+        with self._lock:
+            self._ref_counts[path] -= 1
+            if self._ref_counts[path] <= 0:
+                del self._ref_counts[path]
+            self._evict(0)
+
+
+    def close(self):
+        # type: () -> None
+        """ Waits for any copies in progress, then removes all staged copies. """
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for path in list(self._staged):
+                self._remove(path)
+            self._ref_counts.clear()
+
+
+    def _copy(self, path, staged_path):
+        # type: (str, str) -> str
+        """ Copies the input file to the staged path using large sequential reads. """
+        staged_dir = os.path.dirname(staged_path)
+        if not os.path.exists(staged_dir):
+            os.makedirs(staged_dir)
+        temp_path = staged_path + '.part'
+        try:
+            with open(path, 'rb') as src_file, open(temp_path, 'wb') as dst_file:
+                shutil.copyfileobj(src_file, dst_file, self.chunk_size)
+            os.replace(temp_path, staged_path)
+        except:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            _remove_empty_dir(staged_dir)
+            raise
+        self._logger.debug('Staged input file: %s', path)
+        return staged_path
+
+
+    def _evict(self, required_size):
+        # type: (int) -> None
+        """ Removes the least recently used copies which are not in use or in progress,
+        until there is enough space for required_size bytes. Lock must be held. """
+        total_size = sum(self._sizes.values())
+        for path in list(self._staged):
+            if total_size + required_size <= self.max_size:
+                break
+            if self._ref_counts[path] > 0 or not self._staged[path].done():
+                continue
+            total_size -= self._sizes[path]
+            self._remove(path)
+
+
+    def _remove(self, path):
+        # type: (str) -> None
+        """ Removes the staged copy of the given input file. Lock must be held. """
+        future = self._staged.pop(path)
+        del self._sizes[path]
+        staged_path = self.get_staged_path(path)
+        if future.done() and future.exception() is None and os.path.exists(staged_path):
+            os.remove(staged_path)
+            _remove_empty_dir(os.path.dirname(staged_path))
+            self._logger.debug('Evicted staged input file: %s', path)
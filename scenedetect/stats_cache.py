@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" ``scenedetect.stats_cache`` Module
+
+This module contains the :py:class:`StatsCache` class, which stores the frame metrics
+of a :py:class:`StatsManager <scenedetect.stats_manager.StatsManager>` and the results
+of :py:meth:`SceneManager.detect_scenes
+<scenedetect.scene_manager.SceneManager.detect_scenes>` in a cache directory, so that
+processing the same input again (e.g. in a later stage of a workflow) reuses them
+without requiring a stats file to be managed for each input.
+
+Entries are addressed by a key derived from the content of the input videos (a hash of
+their size and of a few chunks of each, see :py:func:`get_content_hash`), rather than
+their path, so renamed or copied inputs are still found. The key of the frame metrics
+also includes the frame range, downscale factor, metric keys of the detectors, and the
+parameters of each detector which may affect the values of its metrics (see
+:py:func:`get_metric_config`), and the key of the results also includes all parameters
+of each detector (see :py:func:`get_detector_config`) and the frame skip. The least
+recently used entries are removed once the total size of the cache exceeds a set limit.
+
+The cache is used by the command-line interface when the ``--cache-dir`` option (or
+the ``SCENEDETECT_CACHE_DIR`` environment variable) is set.
+"""
+
+# Standard Library Imports
+import hashlib
+import json
+import logging
+import os
+import os.path
+import tempfile
+
+# PySceneDetect Library Imports
+from scenedetect.frame_timecode import FrameTimecode
+from scenedetect.stats_manager import StatsFileCorrupt
+
+
+# Environment variable the command-line interface reads the cache directory from, if
+# the --cache-dir option is not set.
+CACHE_DIR_ENV_VAR = 'SCENEDETECT_CACHE_DIR'
+
+# Default maximum total size, in bytes, of all entries in the cache.
+DEFAULT_CACHE_SIZE = 1024 * 1024 * 1024
+
+# Size, in bytes, of each chunk of the input hashed by get_content_hash.
+PARTIAL_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Version of the format of the cache keys and entries. Changing it invalidates all
+# existing entries (which are then evicted over time).
+CACHE_VERSION = 2
+
+# Attributes of detectors which do not affect their results, and are thus excluded from
+# the keys of cached results (e.g. the number of threads to compute the metrics with).
+_RESULT_INDEPENDENT_ATTRIBUTES = frozenset(['num_threads'])
+
+STATS_EXTENSION = '.stats.csv'
+RESULTS_EXTENSION = '.results.json'
+
+
+##
+## StatsCache Helper Functions
+##
+
+def get_content_hash(path, chunk_size=PARTIAL_HASH_CHUNK_SIZE):
+    # type: (str, int) -> str
+    """ Returns a hash of the size of the file and of the chunk_size bytes at its
+    start, middle, and end, which identifies its content without reading all of it.
+
+    Raises:
+        IOError/OSError: The file could not be read.
+    """
+    content_hash = hashlib.sha1()
+    size = os.path.getsize(path)
+    content_hash.update(str(size).encode('ascii'))
+    with open(path, 'rb') as input_file:
+        for offset in sorted(set([0, max(0, size // 2 - chunk_size // 2),
+                                  max(0, size - chunk_size)])):
+            input_file.seek(offset)
+            content_hash.update(input_file.read(chunk_size))
+    return content_hash.hexdigest()
+
+
+def _get_config_value(value, metrics_only):
+    # type: (Any, bool) -> Optional[str]
+    """ Returns the value of a detector attribute as included in get_detector_config,
+    or None if the attribute is not a parameter of the detector. """
+    # pylint: disable=import-outside-toplevel
+    from scenedetect.scene_detector import SceneDetector
+    if isinstance(value, FrameTimecode):
+        return repr(value.get_frames())
+    if isinstance(value, (bool, int, float, str)):
+        return repr(value)
+    if isinstance(value, (list, tuple)) and all(
+            isinstance(item, (bool, int, float, str)) for item in value):
+        return repr(list(value))
+    if isinstance(value, SceneDetector):
+        return _get_config(value, metrics_only)
+    return None
+
+
+def _get_config(detector, metrics_only):
+    # type: (SceneDetector, bool) -> str
+    """ Returns the name of the detector class with the values of its parameters (see
+    get_detector_config), other than its METRIC_INDEPENDENT_PARAMETERS if metrics_only
+    is True. """
+    # pylint: disable=import-outside-toplevel
+    from scenedetect.scene_detector import SceneDetector
+    state = detector.get_state()
+    excluded_attributes = _RESULT_INDEPENDENT_ATTRIBUTES
+    if metrics_only:
+        excluded_attributes = excluded_attributes | detector.METRIC_INDEPENDENT_PARAMETERS
+    config = []
+    for name, value in sorted(vars(detector).items()):
+        # Wrapped detectors are always included (excluding their own state), even if
+        # their state is part of the state of the detector (e.g. CascadeDetector).
+        if (name.startswith('_') or name in excluded_attributes
+                or (state is not None and name in state
+                    and not isinstance(value, SceneDetector))):
+            continue
+        value = _get_config_value(value, metrics_only)
+        if value is not None:
+            config.append('%s=%s' % (name, value))
+    return '%s(%s)' % (type(detector).__name__, ', '.join(config))
+
+
+def get_detector_config(detector):
+    # type: (SceneDetector) -> str
+    """ Returns the name of the detector class with the values of its parameters, i.e.
+    its public attributes of simple types (numbers, strings, lists of those, frame
+    timecodes, and other detectors), set when the detector is constructed. Attributes
+    which are part of the state of the detector (see SceneDetector.get_state) are
+    excluded. """
+    return _get_config(detector, False)
+
+
+def get_metric_config(detector):
+    # type: (SceneDetector) -> str
+    """ Returns the parameters of the detector (see get_detector_config) which may affect
+    the values of its frame metrics, i.e. excluding those which only affect how cuts are
+    detected from the metrics (e.g. the threshold), as declared by each detector in its
+    METRIC_INDEPENDENT_PARAMETERS (see SceneDetector). """
+    return _get_config(detector, True)
+
+
+def get_cache_keys(video_paths, start_frame, end_frame, downscale_factor, detectors,
+                   frame_skip=0):
+    # type: (List[str], int, Optional[int], int, List[SceneDetector], int) -> Tuple[str, str]
+    """ Returns the keys of the frame metrics and of the results of processing the given
+    input videos with the given detectors.
+
+    Arguments:
+        video_paths: Paths of the input videos (see VideoManager.get_video_paths).
+        start_frame, end_frame: Frame range processed (end_frame may be None).
+        downscale_factor: Downscale factor of the frames processed.
+        detectors: Detectors used (see SceneManager.add_detector).
+        frame_skip: Frame skip used (only affects the results).
+
+    Returns:
+        Tuple[str, str]: Key of the frame metrics, and key of the results.
+
+    Raises:
+        IOError/OSError: An input video could not be read.
+    """
+    metric_keys = sorted(set(
+        metric_key for detector in detectors for metric_key in detector.get_metrics()))
+    stats_key = json.dumps([
+        CACHE_VERSION, [get_content_hash(path) for path in video_paths],
+        start_frame, end_frame, downscale_factor, metric_keys,
+        sorted(set(get_metric_config(detector) for detector in detectors))])
+    results_key = json.dumps([
+        stats_key, [get_detector_config(detector) for detector in detectors], frame_skip])
+    return (hashlib.sha1(stats_key.encode('utf-8')).hexdigest(),
+            hashlib.sha1(results_key.encode('utf-8')).hexdigest())
+
+
+##
+## StatsCache Class Implementation
+##
+
+class StatsCache(object):
+    """ Stores frame metrics and detection results in a directory, keyed by get_cache_keys.
+
+    Entries are written atomically, so several processes may share a cache directory.
+    Reading an entry updates its modification time, which is used to evict the least
+    recently used entries once the total size of the directory exceeds max_size.
+    """
+
+    def __init__(self, cache_dir, max_size=DEFAULT_CACHE_SIZE, logger=None):
+        # type: (str, int, Optional[logging.Logger]) -> None
+        """
+        Arguments:
+            cache_dir: Directory to store entries in (created if it does not exist).
+            max_size: Maximum total size, in bytes, of all entries.
+            logger: Logger to use, if any.
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._logger = logger if logger is not None else logging.getLogger('pyscenedetect')
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+
+    def get_path(self, key, extension):
+        # type: (str, str) -> str
+        """ Returns the path of the entry with the given key and extension. """
+        return os.path.join(self.cache_dir, key + extension)
+
+
+    def load_stats(self, key, stats_manager, reset_save_required=True):
+        # type: (str, StatsManager, bool) -> bool
+        """ Loads the frame metrics with the given key into the StatsManager.
+
+        Returns:
+            bool: True if the entry was found and loaded, False otherwise.
+        """
+        path = self.get_path(key, STATS_EXTENSION)
+        try:
+            with open(path, 'rt') as stats_file:
+                stats_manager.load_from_csv(stats_file, reset_save_required)
+        except (IOError, OSError):
+            return False
+        except StatsFileCorrupt:
+            self._logger.warning('Removing corrupt stats cache entry: %s', path)
+            self._remove(path)
+            return False
+        self._touch(path)
+        return True
+
+
+    def save_stats(self, key, stats_manager, base_timecode):
+        # type: (str, StatsManager, FrameTimecode) -> None
+        """ Saves the frame metrics of the StatsManager with the given key. """
+        self._write(key, STATS_EXTENSION, lambda output_file: stats_manager.save_to_csv(
+            output_file, base_timecode))
+
+
+    def load_results(self, key):
+        # type: (str) -> Optional[Dict[str, Any]]
+        """ Returns the detection results (see SceneManager.get_results) with the given
+        key, or None if they are not cached. """
+        path = self.get_path(key, RESULTS_EXTENSION)
+        try:
+            with open(path, 'rt') as results_file:
+                results = json.load(results_file)
+        except (IOError, OSError):
+            return None
+        except ValueError:
+            self._logger.warning('Removing corrupt results cache entry: %s', path)
+            self._remove(path)
+            return None
+        self._touch(path)
+        return results
+
+
+    def save_results(self, key, results):
+        # type: (str, Dict[str, Any]) -> None
+        """ Saves the detection results (see SceneManager.get_results) with the given key. """
+        self._write(key, RESULTS_EXTENSION,
+                    lambda output_file: json.dump(results, output_file))
+
+
+    def get_entries(self):
+        # type: () -> List[Tuple[str, int, float]]
+        """ Returns the path, size, and last access time of each entry, from the least to
+        the most recently used. """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith((STATS_EXTENSION, RESULTS_EXTENSION)):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+
+    def get_total_size(self):
+        # type: () -> int
+        """ Returns the total size, in bytes, of all entries. """
+        return sum(size for _, size, _ in self.get_entries())
+
+
+    def evict(self):
+        # type: () -> int
+        """ Removes the least recently used entries until the total size of all entries
+        is at most max_size.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        entries = self.get_entries()
+        total_size = sum(size for _, size, _ in entries)
+        num_removed = 0
+        for path, size, _ in entries:
+            if total_size <= self.max_size:
+                break
+            self._remove(path)
+            total_size -= size
+            num_removed += 1
+        if num_removed:
+            self._logger.debug('Evicted %d stats cache entries.', num_removed)
+        return num_removed
+
+
+    def _write(self, key, extension, write_entry):
+        # type: (str, str, Callable[[File], None]) -> None
+        """ Writes an entry to a temporary file with write_entry, then moves it into place
+        (so that concurrent readers never see a partially written entry), and evicts the
+        least recently used entries if required. """
+        fd, temp_path = tempfile.mkstemp(prefix='.' + key, suffix='.tmp', dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, 'wt') as output_file:
+                write_entry(output_file)
+            os.replace(temp_path, self.get_path(key, extension))
+        except:
+            self._remove(temp_path)
+            raise
+        self.evict()
+
+
+    def _touch(self, path):
+        # type: (str) -> None
+        """ Marks the entry as the most recently used. """
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+
+    def _remove(self, path):
+        # type: (str) -> None
+        """ Removes the entry, if another process has not already. """
+        try:
+            os.remove(path)
+        except OSError:
+            pass
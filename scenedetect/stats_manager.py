@@ -43,15 +43,41 @@ for video files.  See the :py:meth:`save_to_csv() <StatsManager.save_to_csv>` an
 The :py:class:`StatsManager` can also be used to cache the calculation results of the scene
 detectors being used, speeding up subsequent scene detection runs using the same pair of
 :py:class:`SceneManager<scenedetect.scene_manager.SceneManager>`/:py:class:`StatsManager` objects.
+
+Stats files are compressed with gzip or Zstandard if their path ends with ``.gz`` or
+``.zst``, respectively (see :py:func:`open_stats_file`). Rows are formatted and parsed in
+large chunks rather than one at a time, as stats files of long videos can have millions
+of rows.
+
+Stats files saved with :py:meth:`StatsManager.save_to_path` also have an index (see
+:py:func:`write_stats_index`), so that the metrics of only a range of frames can be
+loaded with :py:meth:`StatsManager.load_range` (e.g. to process a few minutes of a long
+video), and saved back to the same file by replacing only the rows of that range.
+
+For long videos, the frame metrics can also be :py:meth:`streamed <StatsManager.start_stream>`
+to a stats file while scenes are being detected, appending the metrics computed since the
+last flush every few seconds. If processing is interrupted, the stats file holds all metrics
+computed up to the last flush (loading it ignores a partially written last row), so the
+next run only has to process the remaining frames.
 """
 
 # Standard Library Imports
 from __future__ import print_function
+import bisect
+import gzip
+import io
+import json
 import logging
+import os
+import re
+import shutil
+from itertools import repeat
 
 # PySceneDetect Library Imports
 from scenedetect.platform import get_csv_reader
 from scenedetect.platform import get_csv_writer
+from scenedetect.profiler import get_time
+from scenedetect.profiler import profiled
 
 # pylint: disable=useless-super-delegation
 
@@ -64,6 +90,256 @@ logger = logging.getLogger('pyscenedetect')
 COLUMN_NAME_FRAME_NUMBER = "Frame Number"
 COLUMN_NAME_TIMECODE = "Timecode"
 
+# Default interval, in seconds, between flushes of streamed frame metrics (see
+# StatsManager.start_stream).
+DEFAULT_STREAM_FLUSH_INTERVAL = 5.0
+
+# Number of rows formatted and written at a time when saving a stats file.
+WRITE_CHUNK_SIZE = 10000
+
+# Extensions of stats files compressed with gzip and Zstandard (see open_stats_file).
+GZIP_EXTENSION = '.gz'
+ZSTD_EXTENSION = '.zst'
+
+# Extension of the index of a stats file, appended to its path (see write_stats_index).
+STATS_INDEX_EXTENSION = '.idx'
+# Number of rows between entries of the index of a stats file.
+STATS_INDEX_INTERVAL = 1000
+# Version of the format of stats file indexes. Indexes of other versions are ignored.
+STATS_INDEX_VERSION = 1
+
+# Matches a value which would require quoting in a CSV file.
+_CSV_QUOTE_REQUIRED = re.compile('[,"\r\n]')
+# Matches an integer (see parse_metric) in values joined by null characters.
+_INTEGER_VALUE = re.compile(r'(?:^|\x00)\s*[+-]?\d+(?:_\d+)*\s*(?:\x00|$)')
+
+
+##
+## StatsManager Helper Functions
+##
+
+def parse_metric(metric_str):
+    # type: (str) -> Union[int, float]
+    """ Parses a frame metric value read from a stats file.
+
+    Integer metrics (e.g. frame hashes) are kept as integers so that values wider than
+    the precision of a float are preserved exactly, otherwise the value is parsed as a float.
+
+    Raises:
+        ValueError: metric_str is not a valid integer or floating-point value.
+    """
+    try:
+        return int(metric_str)
+    except ValueError:
+        return float(metric_str)
+
+
+def parse_metrics(metric_strs):
+    # type: (Sequence[str]) -> List[Union[None, int, float]]
+    """ Parses a column of frame metric values read from a stats file (see parse_metric),
+    where missing values (empty or 'None') are returned as None.
+
+    Columns of only integers or only floating-point values are parsed at once, otherwise
+    each value is parsed separately.
+
+    Raises:
+        ValueError: A value is not a valid integer or floating-point value.
+    """
+    if not metric_strs.count('') and not metric_strs.count('None'):
+        try:
+            return list(map(int, metric_strs))
+        except ValueError:
+            pass
+        # Floating-point values always include a decimal point or exponent, so the
+        # column is only searched for integers if some values have no decimal point.
+        joined = '\x00'.join(metric_strs)
+        if joined.count('.') == len(metric_strs) or not _INTEGER_VALUE.search(joined):
+            try:
+                return list(map(float, metric_strs))
+            except ValueError:
+                pass
+    metrics = []
+    for metric_str in metric_strs:
+        if not metric_str or metric_str == 'None':
+            metrics.append(None)
+            continue
+        try:
+            metrics.append(parse_metric(metric_str))
+        except ValueError:
+            raise ValueError('Corrupted value in stats file: %s' % metric_str)
+    return metrics
+
+
+def get_timecodes(frame_numbers, framerate):
+    # type: (List[int], float) -> List[str]
+    """ Returns the timecode of each frame number at the given framerate, the same as
+    FrameTimecode.get_timecode() (i.e. HH:MM:SS.nnn), computed for all frames at once. """
+    # pylint: disable=import-outside-toplevel
+    import numpy
+    seconds = numpy.array(frame_numbers, dtype=numpy.int64).astype(numpy.float64) / framerate
+    hours = numpy.trunc(seconds / 3600.0)
+    seconds -= hours * 3600.0
+    minutes = numpy.trunc(seconds / 60.0)
+    seconds -= minutes * 60.0
+    # Formatting with 3 decimal places rounds the same as round(seconds, 3).
+    return ['%02d:%02d:%06.3f' % timecode for timecode in zip(
+        hours.tolist(), minutes.tolist(), seconds.tolist())]
+
+
+def is_compressed_path(path):
+    # type: (str) -> bool
+    """ Returns True if the stats file at the given path is compressed (see open_stats_file). """
+    return path.lower().endswith((GZIP_EXTENSION, ZSTD_EXTENSION))
+
+
+def open_stats_file(path, mode='rt'):
+    # type: (str, str) -> File
+    """ Opens the stats file at the given path in text mode ('rt' or 'wt'), compressed with
+    gzip if the path ends with .gz (e.g. video.stats.csv.gz), or with Zstandard if the path
+    ends with .zst, otherwise the same as open(path, mode).
+
+    Raises:
+        ImportError: The path ends with .zst, and the zstandard package is not installed.
+    """
+    if path.lower().endswith(GZIP_EXTENSION):
+        return gzip.open(path, mode)
+    if path.lower().endswith(ZSTD_EXTENSION):
+        from scenedetect.platform import zstandard  # pylint: disable=import-outside-toplevel
+        if zstandard is None:
+            raise ImportError(
+                'The zstandard package is required for .zst stats files'
+                ' (pip install zstandard).')
+        return zstandard.open(path, mode)
+    return open(path, mode)
+
+
+def get_complete_lines(csv_file):
+    # type: (File [r]) -> Iterator[str]
+    """ Yields each line of the given file, except a last line which is not terminated by a
+    newline (i.e. a row which was only partially written when a stats file being streamed
+    was interrupted, see StatsManager.start_stream). """
+    last_line = None
+    for line in csv_file:
+        if last_line is not None:
+            yield last_line
+        last_line = line
+    if last_line is not None:
+        if last_line.endswith('\n'):
+            yield last_line
+        else:
+            logger.warning('Ignoring incomplete last row of stats file.')
+
+
+def read_stats_text(csv_file):
+    # type: (Union[File [r], Iterable[str]]) -> str
+    """ Returns the contents of the given stats file (or lines of one), excluding a last
+    line which is not terminated by a newline (see get_complete_lines). """
+    if not hasattr(csv_file, 'read'):
+        return ''.join(line if line.endswith('\n') else line + '\n' for line in csv_file)
+    text = csv_file.read()
+    if text and not text.endswith('\n'):
+        logger.warning('Ignoring incomplete last row of stats file.')
+        text = text[:text.rfind('\n') + 1]
+    return text
+
+
+def get_csv_columns(lines, num_cols):
+    # type: (List[str], int) -> List[List[str]]
+    """ Returns the values of each column of the given lines of a CSV file (without
+    newlines), which must not have any quoted values. All lines are split at once.
+
+    Raises:
+        ValueError: A line does not have num_cols values.
+    """
+    if list(map(str.count, lines, repeat(','))).count(num_cols - 1) != len(lines):
+        raise ValueError('Wrong number of columns.')
+    values = ','.join(lines).split(',')
+    return [values[i::num_cols] for i in range(num_cols)]
+
+
+def write_stats_index(path, interval=STATS_INDEX_INTERVAL, entries=None):
+    # type: (str, int, Optional[List[Tuple[int, int]]]) -> bool
+    """ Writes the index of the stats file at the given path (to the same path followed by
+    .idx), which records the byte offset of the row of every interval-th frame, so that
+    the metrics of a range of frames can be loaded without reading the whole file (see
+    StatsManager.load_range). Rows must be sorted by frame number, as written by
+    StatsManager.save_to_csv.
+
+    Arguments:
+        path: Path of the stats file (which must not be compressed).
+        interval: Number of rows between entries of the index.
+        entries: Frame number and byte offset of each entry, if already known (otherwise
+            the stats file is read to find them).
+
+    Returns:
+        bool: True if the index was written, False if the stats file has no header, or
+        ends with an incomplete row.
+    """
+    with open(path, 'rb') as stats_file:
+        header = stats_file.readline()
+        if not StatsManager.valid_header(header.decode('utf-8').rstrip('\r\n').split(',')):
+            # Backwards compatibility for previous versions of statsfile
+            # which included an additional header row.
+            header += stats_file.readline()
+        data_offset = len(header)
+        if entries is None:
+            entries = []
+            offset = data_offset
+            line = b'\n'
+            try:
+                for i, line in enumerate(stats_file):
+                    if i % interval == 0:
+                        entries.append((int(line[:line.index(b',')]), offset))
+                    offset += len(line)
+            except ValueError:
+                return False
+            if not line.endswith(b'\n'):
+                return False
+    if not header.endswith(b'\n'):
+        return False
+    stat = os.stat(path)
+    index = {
+        'version': STATS_INDEX_VERSION,
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'data_offset': data_offset,
+        'frames': [frame_number for frame_number, _ in entries],
+        'offsets': [offset for _, offset in entries],
+    }
+    with open(path + STATS_INDEX_EXTENSION, 'wt') as index_file:
+        json.dump(index, index_file)
+    return True
+
+
+def read_stats_index(path):
+    # type: (str) -> Optional[Dict[str, Any]]
+    """ Returns the index of the stats file at the given path (see write_stats_index), or
+    None if it has no index, or the index is out of date (i.e. the stats file was modified
+    after the index was written). """
+    if is_compressed_path(path):
+        return None
+    try:
+        with open(path + STATS_INDEX_EXTENSION, 'rt') as index_file:
+            index = json.load(index_file)
+        stat = os.stat(path)
+    except (IOError, OSError, ValueError):
+        return None
+    if (not isinstance(index, dict) or index.get('version') != STATS_INDEX_VERSION
+            or index.get('size') != stat.st_size or index.get('mtime') != stat.st_mtime_ns):
+        return None
+    return index
+
+
+def copy_file_range(src_file, dst_file, length):
+    # type: (File [rb], File [wb], int) -> None
+    """ Copies length bytes from the current position of src_file to dst_file. """
+    while length > 0:
+        data = src_file.read(min(length, 1024 * 1024))
+        if not data:
+            raise IOError('Unexpected end of file.')
+        dst_file.write(data)
+        length -= len(data)
+
 
 ##
 ## StatsManager Exceptions
@@ -132,14 +408,44 @@ class StatsManager(object):
     which owns the given StatsManager instance.
     """
 
-    def __init__(self):
-        # type: ()
+    def __init__(self, profiler=None):
+        # type: (Optional[Profiler])
+        """
+        Arguments:
+            profiler: If set, records the time spent loading and saving stats files
+                (see :py:mod:`scenedetect.profiler`).
+        """
         # Frame metrics is a dict of frame (int): metric_dict (Dict[str, float])
         # of each frame metric key and the value it represents (usually float).
         self._frame_metrics = dict()        # Dict[FrameTimecode, Dict[str, float]]
         self._registered_metrics = set()    # Set of frame metric keys.
         self._loaded_metrics = set()        # Metric keys loaded from stats file.
         self._metrics_updated = False       # Flag indicating if metrics require saving.
+        self._profiler = profiler
+        # Part of the stats file the metrics were loaded from, if only the rows of a range
+        # of frames were loaded (see load_range).
+        self._loaded_range = None
+        # Streaming state (see start_stream). Frame numbers are appended to _dirty_frames
+        # (from any thread) when their metrics are set, and written on the next flush.
+        self._stream_file = None
+        self._stream_path = None
+        self._stream_keys = None
+        self._stream_base_timecode = None
+        self._stream_flush_interval = DEFAULT_STREAM_FLUSH_INTERVAL
+        self._stream_last_flush = 0.0
+        self._stream_last_frame = -1
+        self._stream_sorted = True
+        self._dirty_frames = []
+
+
+    def __getstate__(self):
+        # type: () -> Dict[str, Any]
+        """ Excludes the stream (which can only be written by the process that started it)
+        and the Profiler when passed to a detector worker process (see
+        scenedetect.frame_buffer). """
+        state = self.__dict__.copy()
+        state.update(_stream_file=None, _dirty_frames=[], _profiler=None)
+        return state
 
 
     def register_metrics(self, metric_keys):
@@ -189,6 +495,8 @@ class StatsManager(object):
         """
         for metric_key in metric_kv_dict:
             self._set_metric(frame_number, metric_key, metric_kv_dict[metric_key])
+        if self._stream_file is not None:
+            self._dirty_frames.append(frame_number)
 
 
     def metrics_exist(self, frame_number, metric_keys):
@@ -201,6 +509,14 @@ class StatsManager(object):
         return all([self._metric_exists(frame_number, metric_key) for metric_key in metric_keys])
 
 
+    def get_frame_numbers(self, metric_keys=None):
+        # type: (Optional[List[str]]) -> List[int]
+        """ Get Frame Numbers: Returns the frame numbers which have any metrics set (or all
+        of the given metric keys set, if metric_keys is not None), in ascending order. """
+        return sorted(frame_number for frame_number in self._frame_metrics
+                      if metric_keys is None or self.metrics_exist(frame_number, metric_keys))
+
+
     def is_save_required(self):
         # type: () -> bool
         """ Is Save Required: Checks if the stats have been updated since loading.
@@ -212,6 +528,7 @@ class StatsManager(object):
         return self._metrics_updated
 
 
+    @profiled('StatsManager.save')
     def save_to_csv(self, csv_file, base_timecode, force_save=True):
         # type: (File [w], FrameTimecode, bool) -> None
         """ Save To CSV: Saves all frame metrics stored in the StatsManager to a CSV file.
@@ -237,22 +554,209 @@ class StatsManager(object):
         if ((self.is_save_required() or force_save) and
                 self._registered_metrics and self._frame_metrics):
             # Header rows.
-            metric_keys = sorted(list(self._registered_metrics.union(self._loaded_metrics)))
+            metric_keys = self._get_metric_keys()
             csv_writer.writerow(
                 [COLUMN_NAME_FRAME_NUMBER, COLUMN_NAME_TIMECODE] + metric_keys)
             frame_keys = sorted(self._frame_metrics.keys())
             logger.info("Writing %d frames to CSV...", len(frame_keys))
-            for frame_key in frame_keys:
-                frame_timecode = base_timecode + frame_key
-                csv_writer.writerow(
-                    [frame_timecode.get_frames(), frame_timecode.get_timecode()] +
-                    [str(metric) for metric in self.get_metrics(frame_key, metric_keys)])
+            self._write_rows(csv_file, frame_keys, metric_keys, base_timecode)
         else:
             if not self._registered_metrics:
                 raise NoMetricsRegistered()
             if not self._frame_metrics:
                 raise NoMetricsSet()
 
+    def load_range(self, path, start_frame=None, end_frame=None, reset_save_required=True):
+        # type: (str, Optional[int], Optional[int], bool) -> Optional[int]
+        """ Load Range: Loads the metrics of frames from start_frame up to (but not including)
+        end_frame from the stats file at the given path.
+
+        If the stats file has an index (see write_stats_index, and save_to_path), only the
+        rows from the index entry before start_frame up to the entry after end_frame are
+        read, otherwise the whole file is loaded (see load_from_csv). Saving to the same
+        path with save_to_path then only replaces the rows which were loaded.
+
+        Arguments:
+            path: Path of the stats file (see open_stats_file).
+            start_frame: First frame to load, or None to load from the first frame.
+            end_frame: Frame after the last frame to load, or None to load to the last frame.
+            reset_save_required: If True, clears the flag indicating that a save is required.
+
+        Returns:
+            int or None: Number of rows read, or None if the file was blank.
+
+        Raises:
+            StatsFileCorrupt: Stats file is corrupt and can't be loaded, or wrong file
+                was specified.
+        """
+        index = read_stats_index(path)
+        if index is None or self._frame_metrics or self._loaded_range is not None:
+            with open_stats_file(path, 'rt') as stats_file:
+                return self.load_from_csv(stats_file, reset_save_required)
+        frames, offsets = index['frames'], index['offsets']
+        # Rows from the last entry at or before start_frame, up to the first entry at or
+        # after end_frame (the start/end of the data if there is no such entry).
+        start = bisect.bisect_right(frames, start_frame) - 1 if start_frame is not None else 0
+        end = bisect.bisect_left(frames, end_frame) if end_frame is not None else len(frames)
+        start = max(start, 0)
+        start_offset = offsets[start] if start > 0 else index['data_offset']
+        end_offset = offsets[end] if end < len(frames) else index['size']
+        with open(path, 'rb') as stats_file:
+            header = stats_file.read(index['data_offset'])
+            stats_file.seek(start_offset)
+            data = stats_file.read(end_offset - start_offset)
+        num_frames = self.load_from_csv(
+            io.StringIO((header + data).decode('utf-8').replace('\r\n', '\n')),
+            reset_save_required)
+        logger.debug('Loaded bytes %d-%d of %d from stats file.',
+                     start_offset, end_offset, index['size'])
+        self._loaded_range = {
+            'path': os.path.abspath(path),
+            'size': index['size'],
+            'mtime': index['mtime'],
+            'data_offset': index['data_offset'],
+            'start_offset': start_offset,
+            'end_offset': end_offset,
+            'start_frame': frames[start] if start > 0 else None,
+            'end_frame': frames[end] if end < len(frames) else None,
+            'frames': frames,
+            'offsets': offsets,
+        }
+        return num_frames
+
+
+    def save_to_path(self, path, base_timecode, force_save=True):
+        # type: (str, FrameTimecode, bool) -> None
+        """ Save To Path: Saves all frame metrics stored in the StatsManager to the stats file
+        at the given path (see open_stats_file and save_to_csv), and writes its index (see
+        write_stats_index) unless compressed.
+
+        If only a range of frames was loaded from the same file (see load_range), and all
+        metrics are of frames in that range, only the rows of that range are replaced. The
+        rest of the file is left in place if the range extends to the end of the file,
+        otherwise it is copied as-is (without being loaded).
+
+        Raises:
+            NoMetricsRegistered, NoMetricsSet: See save_to_csv.
+        """
+        if self._loaded_range is not None and self._is_range_save_possible(path, base_timecode):
+            if not self._registered_metrics:
+                raise NoMetricsRegistered()
+            if self.is_save_required() or force_save:
+                self._save_range(base_timecode)
+            return
+        # The whole stats file is rewritten, so any rows which were not loaded are required.
+        self._load_remaining()
+        with open_stats_file(path, 'wt') as stats_file:
+            self.save_to_csv(stats_file, base_timecode, force_save)
+        if not is_compressed_path(path):
+            write_stats_index(path)
+
+
+    def start_stream(self, path, base_timecode, flush_interval=DEFAULT_STREAM_FLUSH_INTERVAL):
+        # type: (str, FrameTimecode, float) -> None
+        """ Start Stream: Writes all frame metrics stored in the StatsManager to a new stats
+        file at the given path, then appends the metrics of each frame set afterwards (e.g.
+        by detect_scenes) every flush_interval seconds, until close_stream is called.
+
+        If processing is interrupted, the stats file contains all metrics up to the last
+        flush, and can be loaded with load_from_csv to resume processing from it. Metrics
+        must be registered (i.e. all detectors added) before the stream is started.
+
+        Arguments:
+            path: Path of the stats file. Any existing file is replaced only once all
+                metrics stored in the StatsManager have been written (e.g. after loading
+                them from the same file, to resume processing).
+            base_timecode: The base_timecode obtained from the frame source VideoManager.
+            flush_interval: Minimum time in seconds between flushes of new metrics
+                (see flush_stream).
+
+        Raises:
+            NoMetricsRegistered: No frame metrics have been registered to save.
+            ValueError: The stats file is compressed (see open_stats_file).
+            IOError/OSError: The stats file could not be written.
+        """
+        if not self._registered_metrics:
+            raise NoMetricsRegistered()
+        if is_compressed_path(path):
+            raise ValueError('Compressed stats files cannot be streamed.')
+        self.close_stream()
+        # The whole stats file is rewritten, so any rows which were not loaded are required.
+        self._load_remaining()
+        self._stream_keys = self._get_metric_keys()
+        self._stream_path = path
+        self._stream_base_timecode = base_timecode
+        self._stream_flush_interval = flush_interval
+        self._rewrite_stream()
+        self._stream_file = open(path, 'at')
+        self._stream_last_flush = get_time()
+        self._stream_sorted = True
+        self._stream_last_frame = max(self._frame_metrics) if self._frame_metrics else -1
+        self._dirty_frames = []
+
+
+    def is_streaming(self):
+        # type: () -> bool
+        """ Is Streaming: Returns True if a stream was started by start_stream and not
+        yet closed with close_stream, False otherwise. """
+        return self._stream_file is not None
+
+
+    @profiled('StatsManager.stream')
+    def flush_stream(self, force=True):
+        # type: (bool) -> int
+        """ Flush Stream: Appends the metrics of all frames set since the last flush to the
+        stats file of the stream (see start_stream), and flushes it.
+
+        Arguments:
+            force: If False, only flushes if at least flush_interval seconds have passed
+                since the last flush (so this may be called after each frame).
+
+        Returns:
+            int: Number of rows written.
+        """
+        if self._stream_file is None:
+            return 0
+        if not force and get_time() - self._stream_last_flush < self._stream_flush_interval:
+            return 0
+        # Frames may be appended from other threads while the stream is being flushed,
+        # so only those appended so far are removed.
+        num_dirty = len(self._dirty_frames)
+        frame_numbers = sorted(set(self._dirty_frames[:num_dirty]))
+        del self._dirty_frames[:num_dirty]
+        if frame_numbers and frame_numbers[0] <= self._stream_last_frame:
+            # Rows of frames updated after they were written are appended again (the last
+            # row of each frame wins when loading), so the stream must be compacted.
+            self._stream_sorted = False
+        if frame_numbers:
+            self._stream_last_frame = max(self._stream_last_frame, frame_numbers[-1])
+        self._write_rows(self._stream_file, frame_numbers, self._stream_keys,
+                         self._stream_base_timecode)
+        self._stream_file.flush()
+        self._stream_last_flush = get_time()
+        return len(frame_numbers)
+
+
+    def close_stream(self):
+        # type: () -> None
+        """ Close Stream: Flushes and closes the stream started by start_stream, if any.
+
+        If any frames were updated after they were written, or written out of order, the
+        stats file is rewritten so that it is the same as if written by save_to_csv.
+        """
+        if self._stream_file is None:
+            return
+        try:
+            self.flush_stream()
+        finally:
+            self._stream_file.close()
+            self._stream_file = None
+        if not self._stream_sorted:
+            logger.debug('Compacting streamed stats file.')
+            self._rewrite_stream()
+        self._metrics_updated = False
+
+
     @staticmethod
     def valid_header(row):
         # type: (List[str]) -> bool
@@ -270,6 +774,7 @@ class StatsManager(object):
             return False
         return True
 
+    @profiled('StatsManager.load')
     def load_from_csv(self, csv_file, reset_save_required=True):
         # type: (File [r], Optional[bool] -> int
         """ Load From CSV: Loads all metrics stored in a CSV file into the StatsManager instance.
@@ -286,20 +791,32 @@ class StatsManager(object):
             StatsFileCorrupt: Stats file is corrupt and can't be loaded, or wrong file
                 was specified.
         """
-        csv_reader = get_csv_reader(csv_file)
+        text = read_stats_text(csv_file)
+        # Files with quoted values are parsed with a csv.reader, otherwise all rows are
+        # split at once.
+        rows = None
+        if '"' in text or '\r' in text:
+            rows = list(get_csv_reader(io.StringIO(text)))
+        else:
+            lines = text.split('\n')[:-1]
+        num_rows = len(rows) if rows is not None else len(lines)
         num_cols = None
         num_metrics = None
         num_frames = None
         # First Row: Frame Num, Timecode, [metrics...]
-        try:
-            row = next(csv_reader)
-            # Backwards compatibility for previous versions of statsfile
-            # which included an additional header row.
-            if not self.valid_header(row):
-                row = next(csv_reader)
-        except StopIteration:
+        header_rows = rows[:2] if rows is not None else [line.split(',') for line in lines[:2]]
+        if not header_rows:
             # If the file is blank or we couldn't decode anything, assume the file was empty.
             return None
+        row = header_rows[0]
+        # Backwards compatibility for previous versions of statsfile
+        # which included an additional header row.
+        num_header_rows = 1
+        if not self.valid_header(row):
+            if len(header_rows) < 2:
+                return None
+            row = header_rows[1]
+            num_header_rows = 2
         if not self.valid_header(row):
             raise StatsFileCorrupt()
         num_cols = len(row)
@@ -307,25 +824,224 @@ class StatsManager(object):
         if not num_metrics > 0:
             raise StatsFileCorrupt('No metrics defined in CSV file.')
         self._loaded_metrics = row[2:]
-        num_frames = 0
-        for row in csv_reader:
-            metric_dict = {}
-            if not len(row) == num_cols:
-                raise StatsFileCorrupt('Wrong number of columns detected in stats file row.')
-            for i, metric_str in enumerate(row[2:]):
-                if metric_str and metric_str != 'None':
-                    try:
-                        metric_dict[self._loaded_metrics[i]] = float(metric_str)
-                    except ValueError:
-                        raise StatsFileCorrupt('Corrupted value in stats file: %s' % metric_str)
-            self.set_metrics(int(row[0]), metric_dict)
-            num_frames += 1
+        num_frames = num_rows - num_header_rows
+        if num_frames > 0:
+            if rows is not None:
+                if any(len(row) != num_cols for row in rows[num_header_rows:]):
+                    raise StatsFileCorrupt(
+                        'Wrong number of columns detected in stats file row.')
+                columns = list(zip(*rows[num_header_rows:]))
+            else:
+                try:
+                    columns = get_csv_columns(lines[num_header_rows:], num_cols)
+                except ValueError:
+                    raise StatsFileCorrupt(
+                        'Wrong number of columns detected in stats file row.')
+            rows, lines, text = None, None, None
+            self._set_columns(columns[0], self._loaded_metrics, columns[2:])
         logger.info('Loaded %d metrics for %d frames.', num_metrics, num_frames)
         if reset_save_required:
             self._metrics_updated = False
         return num_frames
 
 
+    def _is_range_save_possible(self, path, base_timecode):
+        # type: (str, FrameTimecode) -> bool
+        """ Returns True if saving to the given path only requires replacing the rows of the
+        range loaded by load_range (see save_to_path). """
+        loaded_range = self._loaded_range
+        if os.path.abspath(path) != loaded_range['path'] or (
+                self._get_metric_keys() != list(self._loaded_metrics)):
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_size != loaded_range['size'] or stat.st_mtime_ns != loaded_range['mtime']:
+            return False
+        if not self._frame_metrics:
+            return True
+        first_frame = base_timecode.get_frames() + min(self._frame_metrics)
+        last_frame = base_timecode.get_frames() + max(self._frame_metrics)
+        return ((loaded_range['start_frame'] is None or first_frame >= loaded_range['start_frame'])
+                and (loaded_range['end_frame'] is None or last_frame < loaded_range['end_frame']))
+
+
+    @profiled('StatsManager.save')
+    def _save_range(self, base_timecode):
+        # type: (FrameTimecode) -> None
+        """ Replaces the rows of the range loaded by load_range with those of all frame
+        metrics, and updates the index of the stats file. """
+        loaded_range = self._loaded_range
+        path = loaded_range['path']
+        start_offset, end_offset = loaded_range['start_offset'], loaded_range['end_offset']
+        frame_keys = sorted(self._frame_metrics)
+        rows = io.StringIO()
+        self._write_rows(rows, frame_keys, self._get_metric_keys(), base_timecode)
+        rows = rows.getvalue()
+        if os.linesep != '\n':
+            rows = rows.replace('\n', os.linesep)
+        rows = rows.encode('utf-8')
+        logger.info('Writing %d frames to CSV...', len(frame_keys))
+        if end_offset == loaded_range['size']:
+            # The range extends to the end of the file, so the rest is left in place.
+            with open(path, 'r+b') as stats_file:
+                stats_file.seek(start_offset)
+                stats_file.write(rows)
+                stats_file.truncate()
+        else:
+            temp_path = path + '.tmp'
+            try:
+                with open(path, 'rb') as stats_file, open(temp_path, 'wb') as temp_file:
+                    copy_file_range(stats_file, temp_file, start_offset)
+                    temp_file.write(rows)
+                    stats_file.seek(end_offset)
+                    shutil.copyfileobj(stats_file, temp_file)
+                os.replace(temp_path, path)
+            except:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+        # Index entries before the range are unchanged, those after it are moved by the
+        # difference in size of the range, and those of the range are replaced.
+        frames, offsets = loaded_range['frames'], loaded_range['offsets']
+        entries = [(frame, offset) for frame, offset in zip(frames, offsets)
+                   if offset < start_offset]
+        row_offset = start_offset
+        for i, row in enumerate(rows.split(b'\n')[:-1]):
+            if i % STATS_INDEX_INTERVAL == 0:
+                entries.append((base_timecode.get_frames() + frame_keys[i], row_offset))
+            row_offset += len(row) + 1
+        size_change = len(rows) - (end_offset - start_offset)
+        entries += [(frame, offset + size_change) for frame, offset in zip(frames, offsets)
+                    if offset >= end_offset]
+        write_stats_index(path, entries=entries)
+        index = read_stats_index(path)
+        loaded_range.update(
+            size=index['size'], mtime=index['mtime'], end_offset=start_offset + len(rows),
+            frames=index['frames'], offsets=index['offsets'])
+
+
+    def _load_remaining(self):
+        # type: () -> None
+        """ Loads the rows of the stats file which were not loaded by load_range, except
+        those of frames which already have metrics. """
+        loaded_range = self._loaded_range
+        if loaded_range is None:
+            return
+        self._loaded_range = None
+        stat = os.stat(loaded_range['path'])
+        with open(loaded_range['path'], 'rb') as stats_file:
+            if stat.st_size != loaded_range['size'] or stat.st_mtime_ns != loaded_range['mtime']:
+                # The file was modified after loading, so all of it is loaded again.
+                data = stats_file.read()
+            else:
+                data = stats_file.read(loaded_range['start_offset'])
+                stats_file.seek(loaded_range['end_offset'])
+                data += stats_file.read()
+        remaining = StatsManager()
+        remaining.load_from_csv(io.StringIO(data.decode('utf-8').replace('\r\n', '\n')))
+        for frame_number, metric_dict in remaining._frame_metrics.items():
+            if frame_number not in self._frame_metrics:
+                self._frame_metrics[frame_number] = metric_dict
+        logger.debug('Loaded remaining %d frames from stats file.', len(remaining._frame_metrics))
+
+
+    def _get_metric_keys(self):
+        # type: () -> List[str]
+        """ Returns the keys of all registered/loaded metrics, in the order they are saved. """
+        return sorted(list(self._registered_metrics.union(self._loaded_metrics)))
+
+
+    def _write_rows(self, csv_file, frame_numbers, metric_keys, base_timecode):
+        # type: (File [w], List[int], List[str], FrameTimecode) -> None
+        """ Writes a row with the given metrics of each frame to csv_file, the same as
+        a csv.writer would. Each chunk of WRITE_CHUNK_SIZE rows is formatted one column at
+        a time, and written at once. """
+        csv_writer = get_csv_writer(csv_file)
+        for start in range(0, len(frame_numbers), WRITE_CHUNK_SIZE):
+            chunk = frame_numbers[start:start + WRITE_CHUNK_SIZE]
+            frames = [base_timecode.get_frames() + frame_key for frame_key in chunk]
+            columns = [list(map(str, frames)),
+                       get_timecodes(frames, base_timecode.get_framerate())]
+            chunk_metrics = [self._frame_metrics.get(frame_key, {}) for frame_key in chunk]
+            quote_required = False
+            for metric_key in metric_keys:
+                column = [metrics.get(metric_key) for metrics in chunk_metrics]
+                columns.append(list(map(str, column)))
+                if str in set(map(type, column)) and _CSV_QUOTE_REQUIRED.search(
+                        '\x00'.join(columns[-1])):
+                    quote_required = True
+            if quote_required:
+                csv_writer.writerows(zip(*columns))
+            else:
+                csv_file.write('\n'.join(map(','.join, zip(*columns))) + '\n')
+
+
+    def _rewrite_stream(self):
+        # type: () -> None
+        """ Writes all frame metrics to the stats file of the stream, replacing it only
+        once complete (so an interrupted rewrite never loses metrics already saved). """
+        temp_path = self._stream_path + '.tmp'
+        try:
+            with open(temp_path, 'wt') as temp_file:
+                csv_writer = get_csv_writer(temp_file)
+                csv_writer.writerow(
+                    [COLUMN_NAME_FRAME_NUMBER, COLUMN_NAME_TIMECODE] + self._stream_keys)
+                self._write_rows(temp_file, sorted(self._frame_metrics), self._stream_keys,
+                                 self._stream_base_timecode)
+            os.replace(temp_path, self._stream_path)
+        except:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+    def _set_columns(self, frame_column, metric_keys, metric_columns):
+        # type: (Sequence[str], List[str], List[Sequence[str]]) -> None
+        """ Parses the given columns of frame numbers and metric values read from a stats
+        file, and sets the metrics of each frame (the same as calling set_metrics for each).
+
+        Raises:
+            StatsFileCorrupt: A frame number or metric value is not valid.
+        """
+        try:
+            frame_numbers = list(map(int, frame_column))
+        except ValueError:
+            raise StatsFileCorrupt('Corrupted frame number in stats file.')
+        # The metrics of each frame are created from the columns without missing values
+        # at once, then those of the other columns are added one at a time.
+        dense_keys, dense_columns, sparse_columns = [], [], []
+        for metric_key, column in zip(metric_keys, metric_columns):
+            try:
+                metric_values = parse_metrics(column)
+            except ValueError as ex:
+                raise StatsFileCorrupt(str(ex))
+            if column.count('') or column.count('None'):
+                sparse_columns.append((metric_key, metric_values))
+            else:
+                dense_keys.append(metric_key)
+                dense_columns.append(metric_values)
+        if dense_columns:
+            row_metrics = [dict(zip(dense_keys, row)) for row in zip(*dense_columns)]
+        else:
+            row_metrics = [{} for _ in frame_numbers]
+        for metric_key, metric_values in sparse_columns:
+            for metric_dict, metric_value in zip(row_metrics, metric_values):
+                if metric_value is not None:
+                    metric_dict[metric_key] = metric_value
+        for frame_number, metric_dict in zip(frame_numbers, row_metrics):
+            if not metric_dict:
+                continue
+            self._metrics_updated = True
+            if frame_number in self._frame_metrics:
+                self._frame_metrics[frame_number].update(metric_dict)
+            else:
+                self._frame_metrics[frame_number] = metric_dict
+        if self._stream_file is not None:
+            self._dirty_frames.extend(frame_numbers)
+
+
     def _get_metric(self, frame_number, metric_key):
         # type: (int, str) -> Union[None, int, float, str]
         if self._metric_exists(frame_number, metric_key):
@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" ``scenedetect.sweep`` Module
+
+This module implements the `sweep` command, which finds the cuts each combination of
+parameters (e.g. threshold and minimum scene length) of a detector would produce, using
+only the frame metrics cached in a :py:class:`StatsManager
+<scenedetect.stats_manager.StatsManager>` (e.g. loaded from a stats file), without
+processing the video again.
+
+The frame metrics are loaded into NumPy arrays once, and the cut decisions of the
+:py:class:`ContentDetector <scenedetect.detectors.content_detector.ContentDetector>`,
+:py:class:`ThresholdDetector <scenedetect.detectors.threshold_detector.ThresholdDetector>`,
+and :py:class:`AdaptiveDetector <scenedetect.detectors.adaptive_detector.AdaptiveDetector>`
+are evaluated on the whole arrays for each combination. The cuts are identical to those
+the detector would produce with the same parameters (when processing every frame from
+the start to the end frame), so hundreds of combinations can be compared in seconds,
+either by the number of scenes, or the accuracy against a reference cut list (see
+:py:func:`add_accuracy`).
+
+Usage example::
+
+    stats_manager = StatsManager()
+    with open('video.stats.csv', 'r') as stats_file:
+        stats_manager.load_from_csv(stats_file)
+    results = sweep_content(stats_manager, thresholds=[20, 25, 30], min_scene_lens=[10, 15])
+    print(get_report(results))
+"""
+
+# Standard Library Imports
+import collections
+
+# Third-Party Library Imports
+import numpy
+
+# PySceneDetect Library Imports
+from scenedetect.detectors.adaptive_detector import AdaptiveDetector
+from scenedetect.detectors.content_detector import ContentDetector
+from scenedetect.detectors.threshold_detector import ThresholdDetector
+from scenedetect.evaluation import get_accuracy
+from scenedetect.evaluation import match_cuts
+from scenedetect.platform import format_table
+from scenedetect.platform import get_csv_writer
+
+
+# Detectors which can be swept (see sweep).
+SWEEP_DETECTORS = ('content', 'threshold', 'adaptive')
+
+
+##
+## Sweep Helper Functions
+##
+
+def parse_sweep_values(spec, value_type=float):
+    # type: (str, type) -> List[Union[int, float]]
+    """ Parses a comma-separated list of values and/or inclusive ranges in the form
+    START:STOP:STEP (e.g. '10,20:30:2.5' is [10, 20, 22.5, 25, 27.5, 30]).
+
+    Raises:
+        ValueError: The specification is invalid, or a range is empty.
+    """
+    values = []
+    for item in spec.split(','):
+        parts = item.split(':')
+        if len(parts) == 1:
+            values.append(value_type(parts[0]))
+            continue
+        if len(parts) != 3:
+            raise ValueError('Ranges must be in the format START:STOP:STEP: %s' % item)
+        start, stop, step = [value_type(part) for part in parts]
+        if step <= 0 or stop < start:
+            raise ValueError('Invalid range: %s' % item)
+        # Values are computed from the start of the range (and rounded) to avoid
+        # accumulating floating-point errors over the range.
+        num_values = int(round((stop - start) / float(step), 9)) + 1
+        values += [value_type(round(start + i * step, 9)) for i in range(num_values)]
+    return values
+
+
+def get_metric_array(stats_manager, metric_key, start_frame, end_frame):
+    # type: (StatsManager, str, int, int) -> numpy.ndarray
+    """ Returns the values of a metric from start_frame up to (but not including)
+    end_frame as an array of floats, where frames without the metric are NaN. """
+    values = numpy.full(max(0, end_frame - start_frame), numpy.nan)
+    for frame_num in stats_manager.get_frame_numbers([metric_key]):
+        if start_frame <= frame_num < end_frame:
+            values[frame_num - start_frame] = stats_manager.get_metrics(
+                frame_num, [metric_key])[0]
+    return values
+
+
+def get_frame_range(stats_manager, metric_key, first_offset=0):
+    # type: (StatsManager, str, int) -> Tuple[int, int]
+    """ Returns the start and end frame of the metric in the StatsManager: the first
+    frame with the metric plus first_offset, and the frame after the last one. Metrics
+    comparing a frame to the previous one (e.g. content_val) are not set on the first
+    frame processed, so the default start frame of those is one frame earlier. """
+    frame_numbers = stats_manager.get_frame_numbers([metric_key])
+    if not frame_numbers:
+        return 0, 0
+    return max(0, frame_numbers[0] + first_offset), frame_numbers[-1] + 1
+
+
+def _select_cuts(candidates, last_cut, min_scene_len):
+    # type: (numpy.ndarray, Optional[int], int) -> List[int]
+    """ Returns the indices of the candidate frames (sorted in ascending order) which
+    are at least min_scene_len frames after the last selected cut (or last_cut for the
+    first one, if not None), in the same order as detectors select them. """
+    selected = []
+    i = 0 if last_cut is None else int(numpy.searchsorted(candidates, last_cut + min_scene_len))
+    while i < len(candidates):
+        selected.append(i)
+        # Jump directly to the next candidate far enough from this cut.
+        i = max(i + 1, int(numpy.searchsorted(candidates, candidates[i] + min_scene_len)))
+    return selected
+
+
+def _get_result(detector, parameters, cuts):
+    # type: (str, List[Tuple[str, Any]], List[int]) -> Dict[str, Any]
+    """ Returns the result of a parameter combination of a sweep. """
+    result = collections.OrderedDict([('detector', detector)])
+    result.update(parameters)
+    result['num_scenes'] = len(cuts) + 1
+    result['cuts'] = cuts
+    return result
+
+
+##
+## Detector Sweeps
+##
+
+def sweep_content(stats_manager, thresholds=(30.0,), min_scene_lens=(15,), luma_only=False,
+                  start_frame=None, end_frame=None):
+    # type: (StatsManager, Iterable[float], Iterable[int], bool, Optional[int],
+    #        Optional[int]) -> List[Dict[str, Any]]
+    """ Returns the cuts the ContentDetector would detect with each combination of the
+    given thresholds and minimum scene lengths (in frames).
+
+    Arguments:
+        stats_manager: StatsManager with the content_val metric of each frame (or
+            delta_lum if luma_only is True).
+        thresholds, min_scene_lens: Values of each parameter of the detector to sweep.
+        luma_only: Whether the metrics were computed with luma_only set.
+        start_frame: First frame processed by the detector (see get_frame_range).
+        end_frame: Frame after the last one processed by the detector.
+
+    Returns:
+        List[Dict[str, Any]]: The detector, parameters, number of scenes (num_scenes),
+        and cuts of each combination.
+    """
+    metric_key = ContentDetector.DELTA_V_KEY if luma_only else ContentDetector.FRAME_SCORE_KEY
+    default_start, default_end = get_frame_range(stats_manager, metric_key, -1)
+    start_frame = default_start if start_frame is None else start_frame
+    end_frame = default_end if end_frame is None else end_frame
+    scores = get_metric_array(stats_manager, metric_key, start_frame, end_frame)
+    frames = numpy.arange(start_frame, end_frame)
+    results = []
+    for threshold in thresholds:
+        # Frames without the metric are NaN, which never exceed the threshold.
+        candidates = frames[scores >= threshold]
+        for min_scene_len in min_scene_lens:
+            cuts = candidates[_select_cuts(candidates, start_frame, min_scene_len)]
+            results.append(_get_result('content', [
+                ('threshold', threshold), ('min_scene_len', min_scene_len)],
+                                       cuts.tolist()))
+    return results
+
+
+def sweep_threshold(stats_manager, thresholds=(12,), min_scene_lens=(15,), fade_biases=(0.0,),
+                    add_final_scene=False, start_frame=None, end_frame=None):
+    # type: (StatsManager, Iterable[int], Iterable[int], Iterable[float], bool,
+    #        Optional[int], Optional[int]) -> List[Dict[str, Any]]
+    """ Returns the cuts the ThresholdDetector would detect with each combination of the
+    given thresholds, minimum scene lengths (in frames), and fade biases.
+
+    Arguments:
+        stats_manager: StatsManager with the delta_rgb metric of each frame.
+        thresholds, min_scene_lens, fade_biases: Values of each parameter of the
+            detector to sweep. Thresholds are truncated to integers, as by the detector.
+        add_final_scene: Value of the add_final_scene parameter of the detector.
+        start_frame: First frame processed by the detector (see get_frame_range).
+        end_frame: Frame after the last one processed by the detector.
+
+    Returns:
+        List[Dict[str, Any]]: The detector, parameters, number of scenes (num_scenes),
+        and cuts of each combination.
+    """
+    metric_key = ThresholdDetector.THRESHOLD_VALUE_KEY
+    default_start, default_end = get_frame_range(stats_manager, metric_key)
+    start_frame = default_start if start_frame is None else start_frame
+    end_frame = default_end if end_frame is None else end_frame
+    values = get_metric_array(stats_manager, metric_key, start_frame, end_frame)
+    # Frames without the metric do not change the state of the detector.
+    valid = ~numpy.isnan(values)
+    frames = numpy.arange(start_frame, end_frame)[valid]
+    values = values[valid]
+    results = []
+    for threshold in thresholds:
+        threshold = int(threshold)
+        below = values < threshold
+        # Each change of state is a fade out (to below the threshold) or a fade in. The
+        # fade out before each fade in is the previous change, or frame 0 if the first
+        # frame is below the threshold.
+        changes = numpy.flatnonzero(below[1:] != below[:-1]) + 1
+        change_frames = frames[changes]
+        fade_ins = numpy.flatnonzero(~below[changes])
+        fade_in_frames = change_frames[fade_ins]
+        fade_out_frames = numpy.where(
+            fade_ins > 0, change_frames[numpy.maximum(fade_ins - 1, 0)], 0)
+        ends_below = len(below) > 0 and bool(below[-1])
+        last_fade_out = int(change_frames[-1]) if len(changes) > 0 else 0
+        for min_scene_len in min_scene_lens:
+            selected = _select_cuts(fade_in_frames, start_frame, min_scene_len)
+            last_scene_cut = int(fade_in_frames[selected[-1]]) if selected else start_frame
+            for fade_bias in fade_biases:
+                cuts = []
+                for i in selected:
+                    f_in, f_out = int(fade_in_frames[i]), int(fade_out_frames[i])
+                    cuts.append(int((f_in + f_out + int(fade_bias * (f_in - f_out))) / 2))
+                if (add_final_scene and ends_below
+                        and end_frame - last_scene_cut >= min_scene_len):
+                    cuts.append(last_fade_out)
+                results.append(_get_result('threshold', [
+                    ('threshold', threshold), ('min_scene_len', min_scene_len),
+                    ('fade_bias', fade_bias)], cuts))
+    return results
+
+
+def sweep_adaptive(stats_manager, adaptive_thresholds=(3.0,), min_scene_lens=(15,),
+                   window_widths=(2,), min_delta_hsvs=(15.0,), luma_only=False,
+                   start_frame=None, end_frame=None):
+    # type: (StatsManager, Iterable[float], Iterable[int], Iterable[int], Iterable[float],
+    #        bool, Optional[int], Optional[int]) -> List[Dict[str, Any]]
+    """ Returns the cuts the AdaptiveDetector would detect with each combination of the
+    given adaptive thresholds, minimum scene lengths (in frames), window widths, and
+    minimum content values (min_delta_hsv).
+
+    Arguments:
+        stats_manager: StatsManager with the content_val metric of each frame (or
+            delta_lum if luma_only is True). The adaptive_ratio metrics are not used.
+        adaptive_thresholds, min_scene_lens, window_widths, min_delta_hsvs: Values of
+            each parameter of the detector to sweep.
+        luma_only: Whether the metrics were computed with luma_only set.
+        start_frame: Start frame of the video (see get_frame_range).
+        end_frame: End frame of the video.
+
+    Returns:
+        List[Dict[str, Any]]: The detector, parameters, number of scenes (num_scenes),
+        and cuts of each combination.
+    """
+    metric_key = ContentDetector.DELTA_V_KEY if luma_only else ContentDetector.FRAME_SCORE_KEY
+    default_start, default_end = get_frame_range(stats_manager, metric_key, -1)
+    start_frame = default_start if start_frame is None else start_frame
+    end_frame = default_end if end_frame is None else end_frame
+    content_vals = get_metric_array(stats_manager, metric_key, start_frame, end_frame)
+    results = []
+    for window_width in window_widths:
+        # Indices of the frames which have window_width frames on each side.
+        indices = numpy.arange(window_width + 1, len(content_vals) - window_width)
+        frames = indices + start_frame
+        curr_vals = content_vals[indices]
+        # The neighbouring values are added in the same order as by the detector, so
+        # that the average is exactly the same.
+        denominator = numpy.zeros(len(indices))
+        for offset in range(-window_width, window_width + 1):
+            if offset != 0:
+                denominator = denominator + content_vals[indices + offset]
+        denominator = denominator / (2.0 * window_width)
+        denominator_is_zero = numpy.abs(denominator) < 0.00001
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            ratios = curr_vals / numpy.where(denominator_is_zero, 1.0, denominator)
+        for min_delta_hsv in min_delta_hsvs:
+            above_min_delta = curr_vals >= min_delta_hsv
+            adaptive_ratios = numpy.where(
+                denominator_is_zero, numpy.where(above_min_delta, 255.0, 0.0), ratios)
+            for adaptive_threshold in adaptive_thresholds:
+                candidates = frames[(adaptive_ratios >= adaptive_threshold) & above_min_delta]
+                for min_scene_len in min_scene_lens:
+                    cuts = candidates[_select_cuts(candidates, None, min_scene_len)]
+                    results.append(_get_result('adaptive', [
+                        ('adaptive_threshold', adaptive_threshold),
+                        ('min_scene_len', min_scene_len), ('window_width', window_width),
+                        ('min_delta_hsv', min_delta_hsv)], cuts.tolist()))
+    return results
+
+
+def sweep(stats_manager, detector, start_frame=None, end_frame=None, **parameters):
+    # type: (StatsManager, str, Optional[int], Optional[int], **Any) -> List[Dict[str, Any]]
+    """ Calls sweep_content, sweep_threshold, or sweep_adaptive for the given detector
+    (see SWEEP_DETECTORS) with the given parameters.
+
+    Raises:
+        ValueError: The detector can not be swept.
+    """
+    sweep_functions = {
+        'content': sweep_content, 'threshold': sweep_threshold, 'adaptive': sweep_adaptive}
+    if detector not in sweep_functions:
+        raise ValueError('Unknown detector: %s' % detector)
+    return sweep_functions[detector](
+        stats_manager, start_frame=start_frame, end_frame=end_frame, **parameters)
+
+
+##
+## Sweep Results
+##
+
+def load_cut_list(input_file):
+    # type: (File) -> List[int]
+    """ Reads a list of cuts from the given file, as frame numbers separated by commas
+    and/or whitespace (e.g. one per line).
+
+    Raises:
+        ValueError: The file contains a value which is not a frame number.
+    """
+    return sorted(int(value) for value in input_file.read().replace(',', ' ').split())
+
+
+def add_accuracy(results, reference_cuts, tolerance=0):
+    # type: (List[Dict[str, Any]], List[int], int) -> None
+    """ Adds the precision, recall, and F1 score of the cuts of each result (as returned
+    by sweep) compared to the reference cuts, within tolerance frames (see
+    :py:func:`match_cuts <scenedetect.evaluation.match_cuts>`). """
+    for result in results:
+        precision, recall, f1_score = get_accuracy(
+            *match_cuts(result['cuts'], reference_cuts, tolerance))
+        result['precision'] = precision
+        result['recall'] = recall
+        result['f1_score'] = f1_score
+
+
+def get_parameter_names(results):
+    # type: (List[Dict[str, Any]]) -> List[str]
+    """ Returns the names of the swept parameters of the results (as returned by sweep). """
+    if not results:
+        return []
+    names = list(results[0].keys())
+    return names[names.index('detector') + 1:names.index('num_scenes')]
+
+
+def write_results(output_csv_file, results):
+    # type: (File, List[Dict[str, Any]]) -> None
+    """ Writes the parameters, number of scenes, accuracy (if added, see add_accuracy),
+    and cuts of each result (as returned by sweep) to the given file in CSV format. The
+    cuts are written as a space-separated list of frame numbers. """
+    csv_writer = get_csv_writer(output_csv_file)
+    accuracy_keys = ['precision', 'recall', 'f1_score'] if (
+        results and 'f1_score' in results[0]) else []
+    keys = ['detector'] + get_parameter_names(results) + ['num_scenes'] + accuracy_keys
+    csv_writer.writerow(keys + ['cuts'])
+    for result in results:
+        csv_writer.writerow([str(result[key]) for key in keys] + [
+            ' '.join(str(cut) for cut in result['cuts'])])
+
+
+def get_report(results, max_rows=None):
+    # type: (List[Dict[str, Any]], Optional[int]) -> str
+    """ Returns a table of the parameters, number of scenes, and accuracy (if added, see
+    add_accuracy) of the results (as returned by sweep), sorted by F1 score if added.
+    If max_rows is set, only the first max_rows results are included. """
+    has_accuracy = bool(results) and 'f1_score' in results[0]
+    if has_accuracy:
+        # Sorting is stable, so results with the same F1 score keep the sweep order.
+        results = sorted(results, key=lambda result: -result['f1_score'])
+    names = get_parameter_names(results)
+    rows = [tuple(names) + ('Scenes',) + (('Precision', 'Recall', 'F1') if has_accuracy else ())]
+    for result in results[:max_rows]:
+        row = tuple('%g' % result[name] for name in names) + ('%d' % result['num_scenes'],)
+        if has_accuracy:
+            row += tuple('%.3f' % result[key] for key in ('precision', 'recall', 'f1_score'))
+        rows.append(row)
+    return format_table(rows, num_left_columns=0)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" ``scenedetect.thread_pool`` Module
+
+This module contains the persistent thread pools used to parallelize frame metric
+computations *within* a single frame, by splitting the frame into horizontal tiles.
+Per-tile partial results (e.g. integer sums) are reduced in the calling thread, so
+the final metric values are exactly the same as computing them on the whole frame.
+
+The OpenCV and NumPy operations used by the detectors release the GIL, so tiles are
+processed concurrently even though a thread pool is used.
+"""
+
+# Standard Library Imports
+from concurrent.futures import ThreadPoolExecutor
+
+
+##
+## Thread Pool Helper Functions
+##
+
+# Thread pools created by get_thread_pool, keyed by the number of threads.
+_THREAD_POOLS = {}
+
+
+def get_thread_pool(num_threads):
+    # type: (int) -> ThreadPoolExecutor
+    """ Returns the persistent thread pool with the given number of threads, creating it
+    if it does not exist yet. Pools are shared by all callers, and live until exit.
+    """
+    if num_threads not in _THREAD_POOLS:
+        _THREAD_POOLS[num_threads] = ThreadPoolExecutor(
+            max_workers=num_threads, thread_name_prefix='scenedetect')
+    return _THREAD_POOLS[num_threads]
+
+
+def get_tile_slices(height, num_tiles):
+    # type: (int, int) -> List[slice]
+    """ Partitions the rows of a frame of the given height into at most num_tiles
+    horizontal tiles of (approximately) equal height.
+
+    Returns:
+        List[slice]: List of slices of rows, covering every row exactly once.
+    """
+    num_tiles = max(1, min(num_tiles, height))
+    bounds = [(height * i) // num_tiles for i in range(num_tiles + 1)]
+    return [slice(bounds[i], bounds[i + 1]) for i in range(num_tiles)]
+
+
+def map_tiles(func, height, num_threads):
+    # type: (Callable[[slice], Any], int, int) -> List[Any]
+    """ Calls func with the slice of rows of each horizontal tile of a frame, using the
+    persistent thread pool with num_threads threads (one tile per thread).
+
+    If num_threads is 1, func is called once with a slice of all rows in the current
+    thread, avoiding any thread pool overhead.
+
+    Returns:
+        List[Any]: Results of func for each tile, in order from the top of the frame.
+    """
+    if num_threads <= 1:
+        return [func(slice(0, height))]
+    return list(get_thread_pool(num_threads).map(func, get_tile_slices(height, num_threads)))
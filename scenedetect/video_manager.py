@@ -53,13 +53,15 @@ import os
 import os.path
 import math
 
-# Third-Party Library Imports
-import cv2
-
 # PySceneDetect Library Imports
 from scenedetect.platform import logger as default_logger
+from scenedetect.platform import import_cv2
 from scenedetect.platform import STRING_TYPE
 from scenedetect.frame_timecode import FrameTimecode, MINIMUM_FRAMES_PER_SECOND_FLOAT
+from scenedetect.profiler import get_time
+
+# Third-Party Library Imports
+cv2 = import_cv2()
 
 ##
 ## VideoManager Exceptions
@@ -336,8 +338,8 @@ class VideoManager(object):
     """ Provides a cv2.VideoCapture-like interface to a set of one or more video files,
     or a single device ID. Supports seeking and setting end time/duration. """
 
-    def __init__(self, video_files, framerate=None, logger=default_logger):
-        # type: (List[str], Optional[float])
+    def __init__(self, video_files, framerate=None, logger=default_logger, profiler=None):
+        # type: (List[str], Optional[float], Optional[logging.Logger], Optional[Profiler])
         """ VideoManager Constructor Method (__init__)
 
         Arguments:
@@ -346,6 +348,9 @@ class VideoManager(object):
             framerate (float, optional): Framerate to assume when storing FrameTimecodes.
                 If not set (i.e. is None), it will be deduced from the first open capture
                 in video_files, else raises a VideoFramerateUnavailable exception.
+            logger (logging.Logger, optional): Logger to use, if any.
+            profiler (Profiler, optional): If set, records the time spent grabbing,
+                retrieving, and downscaling frames (see :py:mod:`scenedetect.profiler`).
 
         Raises:
             ValueError: No video file(s) specified, or invalid/multiple device IDs specified.
@@ -370,6 +375,7 @@ class VideoManager(object):
         self._curr_cap, self._curr_cap_idx = None, None
         self._video_file_paths = video_files
         self._logger = logger
+        self._profiler = profiler
         if self._logger is not None:
             self._logger.info(
                 'Loaded %d video%s, framerate: %.3f FPS, resolution: %d x %d',
@@ -381,6 +387,16 @@ class VideoManager(object):
         self._first_cap_len = self.get_base_timecode() + get_num_frames([self._cap_list[0]])
 
 
+    def __getstate__(self):
+        # type: () -> Dict[str, Any]
+        """ Excludes the open videos and the Profiler when passed to a detector worker
+        process (see scenedetect.frame_buffer), so only the properties of the videos (e.g.
+        get_duration) can be used by the copy. """
+        state = self.__dict__.copy()
+        state.update(_cap_list=[], _curr_cap=None, _last_frame=None, _profiler=None)
+        return state
+
+
     def set_downscale_factor(self, downscale_factor=None):
         # type: (Optional[int]) -> None
         """ Set Downscale Factor - sets the downscale/subsample factor of returned frames.
@@ -405,6 +421,13 @@ class VideoManager(object):
                 self._downscale_factor, effective_framesize[0], effective_framesize[1])
 
 
+    def get_downscale_factor(self):
+        # type: () -> int
+        """ Get Downscale Factor - returns the current downscale factor (see
+        set_downscale_factor), where 1 indicates no downscaling. """
+        return self._downscale_factor
+
+
     def get_num_videos(self):
         # type: () -> int
         """ Get Number of Videos - returns the length of the internal capture list,
@@ -726,7 +749,7 @@ class VideoManager(object):
         grabbed = False
         if self._curr_cap is not None and not self._end_of_video:
             while not grabbed:
-                grabbed = self._curr_cap.grab()
+                grabbed = self._grab_cap()
                 if not grabbed and not self._get_next_cap():
                     break
         if self._end_time is not None and self._curr_time > self._end_time:
@@ -760,7 +783,7 @@ class VideoManager(object):
         retrieved = False
         if self._curr_cap is not None and not self._end_of_video:
             while not retrieved:
-                retrieved, self._last_frame = self._curr_cap.retrieve()
+                retrieved, self._last_frame = self._retrieve_cap()
                 if not retrieved and not self._get_next_cap():
                     break
                 if self._downscale_factor > 1:
@@ -789,11 +812,11 @@ class VideoManager(object):
 
         read_frame = False
         if self._curr_cap is not None and not self._end_of_video:
-            read_frame, self._last_frame = self._curr_cap.read()
+            read_frame, self._last_frame = self._read_cap()
 
             # Switch to the next capture when the current one is over
             if not read_frame and self._get_next_cap():
-                read_frame, self._last_frame = self._curr_cap.read()
+                read_frame, self._last_frame = self._read_cap()
 
             # Downscale frame if there was any
             if read_frame and self._downscale_factor > 1:
@@ -810,6 +833,39 @@ class VideoManager(object):
         return (read_frame, self._last_frame)
 
 
+    def _grab_cap(self):
+        # type: () -> bool
+        """ Grabs the next frame from the current capture. """
+        if self._profiler is None:
+            return self._curr_cap.grab()
+        start_time = get_time()
+        grabbed = self._curr_cap.grab()
+        self._profiler.add_time('VideoManager.grab', start_time)
+        return grabbed
+
+
+    def _retrieve_cap(self):
+        # type: () -> Tuple[bool, Union[None, numpy.ndarray]]
+        """ Retrieves the last grabbed frame from the current capture. """
+        if self._profiler is None:
+            return self._curr_cap.retrieve()
+        start_time = get_time()
+        retrieved, frame_im = self._curr_cap.retrieve()
+        self._profiler.add_time('VideoManager.retrieve', start_time)
+        return retrieved, frame_im
+
+
+    def _read_cap(self):
+        # type: () -> Tuple[bool, Union[None, numpy.ndarray]]
+        """ Reads the next frame from the current capture. When profiling, grabs and
+        retrieves the frame separately (as VideoCapture.read does) to time each. """
+        if self._profiler is None:
+            return self._curr_cap.read()
+        if not self._grab_cap():
+            return False, None
+        return self._retrieve_cap()
+
+
     def _get_next_cap(self):
         # type: () -> bool
         self._curr_cap = None
@@ -34,9 +34,8 @@ import sys
 from setuptools import setup
 
 
-# TODO: Come up with plan/time for deprecation of Python 2.7.
-if sys.version_info < (2, 7) or (sys.version_info >= (3, 0) and sys.version_info < (3, 3)):
-    print('PySceneDetect requires at least Python 2.7 or 3.3 to run.')
+if sys.version_info < (3, 6):
+    print('PySceneDetect requires at least Python 3.6 to run.')
     sys.exit(1)
 
 
@@ -83,6 +82,7 @@ setup(
     extras_require=get_extra_requires(),
     setup_requires=['pytest-runner'],
     tests_require=['pytest'],
+    python_requires='>=3.6',
     packages=['scenedetect',
               'scenedetect.cli',
               'scenedetect.detectors',
@@ -100,13 +100,12 @@ setup(
         'Intended Audience :: System Administrators',
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
-        'Programming Language :: Python :: 2',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3 :: Only',
         'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
         'Topic :: Multimedia :: Video',
         'Topic :: Multimedia :: Video :: Conversion',
         'Topic :: Multimedia :: Video :: Non-Linear Editor',
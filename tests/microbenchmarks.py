@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+""" PySceneDetect Micro-Benchmarks
+
+This file contains timeit-based benchmarks of the hot paths of PySceneDetect, run in
+isolation on synthetic frames/data (no video files are required). The results can be
+saved as a baseline, and later runs compared against it to prove speedups or catch
+regressions, e.g. from the root of the repository:
+
+    python -m tests.microbenchmarks --save baseline.json
+    (make changes...)
+    python -m tests.microbenchmarks --compare baseline.json
+
+Only benchmarks whose names contain any of the -k/--filter patterns are run if set
+(e.g. -k StatsManager). Run with --help for all options.
+
+When run as part of the standard test suite, each benchmark is only run once (without
+timing it) to check that it still works.
+"""
+
+# pylint: disable=protected-access, invalid-name
+
+from __future__ import print_function
+import argparse
+import collections
+import io
+import json
+import platform
+import sys
+import timeit
+
+import cv2
+import numpy
+
+from scenedetect.detectors.content_detector import ContentDetector
+from scenedetect.detectors.threshold_detector import compute_frame_average
+from scenedetect.frame_timecode import FrameTimecode
+from scenedetect.scene_manager import get_scenes_from_cuts
+from scenedetect.scene_manager import write_scene_list
+from scenedetect.stats_manager import StatsManager
+
+
+# Frame sizes (width, height) used by the benchmarks of per-frame functions.
+FRAME_SIZES = [(320, 180), (1280, 720), (1920, 1080)]
+
+# Number of frames of the StatsManager benchmarks.
+NUM_STATS_FRAMES = 10000
+
+# Number of scenes of the scene list benchmarks.
+NUM_SCENES = 100000
+
+# Default fraction by which a benchmark may be slower than the baseline.
+DEFAULT_TOLERANCE = 0.1
+
+# Maps the name of each benchmark to a function which prepares its data, and returns
+# the function to time (called without arguments).
+BENCHMARKS = collections.OrderedDict()
+
+
+def benchmark(name):
+    """ Decorator which registers a benchmark setup function under the given name. """
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+def get_random_frames(width, height, num_frames=2, seed=0):
+    # type: (int, int, int, int) -> List[numpy.ndarray]
+    """ Returns num_frames deterministic random BGR frames of the given size. """
+    random_state = numpy.random.RandomState(seed)
+    return [random_state.randint(0, 256, (height, width, 3)).astype(numpy.uint8)
+            for _ in range(num_frames)]
+
+
+def get_stats_manager(num_frames=NUM_STATS_FRAMES):
+    # type: (int) -> StatsManager
+    """ Returns a StatsManager with the metrics of ContentDetector set for num_frames. """
+    stats_manager = StatsManager()
+    stats_manager.register_metrics(ContentDetector.METRIC_KEYS)
+    random_state = numpy.random.RandomState(0)
+    for frame_num, values in enumerate(random_state.random_sample((num_frames, 4)) * 255.0):
+        stats_manager.set_metrics(
+            frame_num, dict(zip(ContentDetector.METRIC_KEYS, values.tolist())))
+    return stats_manager
+
+
+##
+## Benchmarks
+##
+
+def _register_frame_benchmarks(width, height):
+    # type: (int, int) -> None
+    """ Registers the benchmarks of per-frame functions for the given frame size. """
+    size = '%dx%d' % (width, height)
+
+    @benchmark('ContentDetector.calculate_frame_score[%s]' % size)
+    def setup_calculate_frame_score():
+        detector = ContentDetector()
+        curr_hsv, last_hsv = [cv2.split(cv2.cvtColor(frame, cv2.COLOR_BGR2HSV))
+                              for frame in get_random_frames(width, height)]
+        return lambda: detector.calculate_frame_score(1, curr_hsv, last_hsv)
+
+    @benchmark('ContentDetector.process_frame[%s]' % size)
+    def setup_process_frame():
+        detector = ContentDetector()
+        frames = get_random_frames(width, height)
+        state = {'frame_num': 0}
+        def process_frame():
+            state['frame_num'] += 1
+            detector.process_frame(state['frame_num'], frames[state['frame_num'] % 2])
+        return process_frame
+
+    @benchmark('compute_frame_average[%s]' % size)
+    def setup_compute_frame_average():
+        frame = get_random_frames(width, height, num_frames=1)[0]
+        return lambda: compute_frame_average(frame)
+
+
+for _width, _height in FRAME_SIZES:
+    _register_frame_benchmarks(_width, _height)
+
+
+@benchmark('StatsManager.set_metrics[%d frames]' % NUM_STATS_FRAMES)
+def setup_set_metrics():
+    values = get_stats_manager()._frame_metrics
+    def set_metrics():
+        stats_manager = StatsManager()
+        for frame_num in range(NUM_STATS_FRAMES):
+            stats_manager.set_metrics(frame_num, values[frame_num])
+    return set_metrics
+
+
+@benchmark('StatsManager.metrics_exist[%d frames]' % NUM_STATS_FRAMES)
+def setup_metrics_exist():
+    stats_manager = get_stats_manager()
+    def metrics_exist():
+        for frame_num in range(NUM_STATS_FRAMES):
+            stats_manager.metrics_exist(frame_num, ContentDetector.METRIC_KEYS)
+    return metrics_exist
+
+
+@benchmark('StatsManager.save_to_csv[%d frames]' % NUM_STATS_FRAMES)
+def setup_save_to_csv():
+    stats_manager = get_stats_manager()
+    base_timecode = FrameTimecode(0, fps=30.0)
+    return lambda: stats_manager.save_to_csv(io.StringIO(), base_timecode)
+
+
+@benchmark('StatsManager.load_from_csv[%d frames]' % NUM_STATS_FRAMES)
+def setup_load_from_csv():
+    csv_file = io.StringIO()
+    get_stats_manager().save_to_csv(csv_file, FrameTimecode(0, fps=30.0))
+    csv_data = csv_file.getvalue()
+    return lambda: StatsManager().load_from_csv(io.StringIO(csv_data))
+
+
+@benchmark('FrameTimecode(frames)')
+def setup_timecode_from_frames():
+    return lambda: FrameTimecode(123456, fps=29.97)
+
+
+@benchmark('FrameTimecode(seconds)')
+def setup_timecode_from_seconds():
+    return lambda: FrameTimecode(4119.3, fps=29.97)
+
+
+@benchmark('FrameTimecode(timecode)')
+def setup_timecode_from_timecode():
+    return lambda: FrameTimecode('01:08:39.300', fps=29.97)
+
+
+@benchmark('FrameTimecode.__add__')
+def setup_timecode_add():
+    timecode = FrameTimecode(123456, fps=29.97)
+    return lambda: timecode + 100
+
+
+@benchmark('FrameTimecode.__lt__')
+def setup_timecode_lt():
+    timecode, other = FrameTimecode(123456, fps=29.97), FrameTimecode(123457, fps=29.97)
+    return lambda: timecode < other
+
+
+@benchmark('FrameTimecode.get_timecode')
+def setup_get_timecode():
+    timecode = FrameTimecode(123456, fps=29.97)
+    return timecode.get_timecode
+
+
+@benchmark('get_scenes_from_cuts[%d scenes]' % NUM_SCENES)
+def setup_get_scenes_from_cuts():
+    base_timecode = FrameTimecode(0, fps=30.0)
+    cut_list = [base_timecode + 10 * (i + 1) for i in range(NUM_SCENES - 1)]
+    return lambda: get_scenes_from_cuts(cut_list, base_timecode, 10 * NUM_SCENES)
+
+
+@benchmark('write_scene_list[%d scenes]' % NUM_SCENES)
+def setup_write_scene_list():
+    base_timecode = FrameTimecode(0, fps=30.0)
+    cut_list = [base_timecode + 10 * (i + 1) for i in range(NUM_SCENES - 1)]
+    scene_list = get_scenes_from_cuts(cut_list, base_timecode, 10 * NUM_SCENES)
+    return lambda: write_scene_list(io.StringIO(), scene_list, cut_list=cut_list)
+
+
+##
+## Benchmark Runner
+##
+
+def get_benchmark_names(patterns=None):
+    # type: (Optional[List[str]]) -> List[str]
+    """ Returns the names of all benchmarks containing any of the given patterns. """
+    return [name for name in BENCHMARKS
+            if not patterns or any(pattern in name for pattern in patterns)]
+
+
+def run_benchmark(name, repeat=5, min_time=0.2):
+    # type: (str, int, float) -> float
+    """ Returns the minimum time, in seconds, of a single call of the given benchmark
+    over repeat runs, each calling it enough times to take at least min_time seconds. """
+    timer = timeit.Timer(BENCHMARKS[name]())
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 10 if number < 1000 else 2
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def compare_results(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    # type: (Dict[str, float], Dict[str, float], float) -> List[Tuple[str, float, str]]
+    """ Returns the ratio of the time of each benchmark to that of the baseline (if it is
+    in the baseline), and whether it is faster, slower, or within the tolerance. """
+    comparison = []
+    for name, time_taken in results.items():
+        if name not in baseline:
+            continue
+        ratio = time_taken / baseline[name]
+        status = 'ok'
+        if ratio > 1.0 + tolerance:
+            status = 'SLOWER'
+        elif ratio < 1.0 - tolerance:
+            status = 'faster'
+        comparison.append((name, ratio, status))
+    return comparison
+
+
+def format_time(seconds):
+    # type: (float) -> str
+    """ Formats a duration with an appropriate unit (ns, us, ms, or s). """
+    for unit, scale in (('ns', 1e-9), ('us', 1e-6), ('ms', 1e-3)):
+        if seconds < 1000.0 * scale:
+            return '%.1f %s' % (seconds / scale, unit)
+    return '%.2f s' % seconds
+
+
+def main(args=None):
+    # type: (Optional[List[str]]) -> int
+    """ Runs the micro-benchmarks from the command line. Returns 1 if any benchmark is
+    slower than the --compare baseline, 0 otherwise. """
+    parser = argparse.ArgumentParser(description='Run PySceneDetect micro-benchmarks.')
+    parser.add_argument('-k', '--filter', action='append', metavar='PATTERN',
+                        help='Only run benchmarks whose name contains PATTERN.')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Number of runs of each benchmark (default: 5).')
+    parser.add_argument('--save', metavar='JSON', help='Save the results as a baseline.')
+    parser.add_argument('--compare', metavar='JSON', help='Compare against a baseline.')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Fraction by which a benchmark may be slower than the'
+                        ' baseline (default: %s).' % DEFAULT_TOLERANCE)
+    args = parser.parse_args(args)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as baseline_file:
+            baseline = json.load(baseline_file)['results']
+    results = collections.OrderedDict()
+    for name in get_benchmark_names(args.filter):
+        results[name] = run_benchmark(name, repeat=args.repeat)
+        line = '%-50s %12s' % (name, format_time(results[name]))
+        if baseline is not None and name in baseline:
+            _, ratio, status = compare_results(
+                {name: results[name]}, baseline, args.tolerance)[0]
+            line += '  %12s  %6.2fx  %s' % (format_time(baseline[name]), ratio, status)
+        print(line)
+        sys.stdout.flush()
+
+    if args.save:
+        with open(args.save, 'w') as output_file:
+            json.dump({
+                'platform': {
+                    'python': platform.python_version(),
+                    'opencv': cv2.__version__,
+                    'numpy': numpy.__version__,
+                    'system': platform.platform(),
+                },
+                'results': results,
+            }, output_file, indent=2)
+    if baseline is not None:
+        slower = [name for name, _, status in compare_results(
+            results, baseline, args.tolerance) if status == 'SLOWER']
+        print('%d of %d benchmarks slower than baseline.' % (len(slower), len(results)))
+        return 1 if slower else 0
+    return 0
+
+
+def test_microbenchmarks():
+    """ Test that each micro-benchmark runs (once, without timing it). """
+    for name in get_benchmark_names():
+        BENCHMARKS[name]()()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
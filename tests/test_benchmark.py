@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+""" PySceneDetect scenedetect.benchmark Tests
+
+This file includes unit tests for the scenedetect.benchmark module, which implements
+the benchmark command (measuring performance on synthetic videos).
+"""
+
+# Standard project pylint disables for unit tests using pytest.
+# pylint: disable=no-self-use, protected-access, multiple-statements, invalid-name
+# pylint: disable=redefined-outer-name
+
+
+import copy
+
+import pytest
+
+from scenedetect.benchmark import compare_results
+from scenedetect.benchmark import get_benchmark_cases
+from scenedetect.benchmark import get_synthetic_video
+from scenedetect.benchmark import run_benchmark
+
+
+def test_benchmark(tmp_path):
+    """ Test that the cuts of a synthetic video are detected in each mode, and that
+    regressions are found when comparing against a faster baseline. """
+    video = get_synthetic_video(str(tmp_path), width=160, height=96, num_frames=90,
+                                num_cuts=2)
+    assert video['cuts'] == [30, 60]
+    assert get_synthetic_video(str(tmp_path), width=160, height=96, num_frames=90,
+                               num_cuts=2) == video
+    with pytest.raises(ValueError):
+        get_benchmark_cases(['content+unknown'])
+
+    cases = get_benchmark_cases(['content', 'content+hash', 'adaptive'], frame_skips=[0, 1],
+                                modes=['sequential', 'workers'])
+    results = run_benchmark(video, cases, isolate=False)
+    assert len(results['results']) == 12
+    for result in results['results']:
+        if result['detector'] == 'adaptive' and result['frame_skip'] > 0:
+            # Adaptive detector requires a StatsManager, so frame skip is not supported.
+            assert 'error' in result
+            continue
+        assert result['cuts'] == video['cuts']
+        assert result['num_frames'] == 90 and result['fps'] > 0
+        assert result['stages']['SceneManager.detect_scenes']['calls'] == 1
+
+    assert compare_results(results, results) == []
+    baseline = copy.deepcopy(results)
+    baseline['results'][0]['fps'] *= 2.0
+    baseline['results'][1]['cuts'] = [30]
+    regressions = compare_results(results, baseline, tolerance=0.1)
+    assert len(regressions) == 2
+    assert regressions[0].startswith(results['results'][0]['name'])
+    assert regressions[1].startswith(results['results'][1]['name'])
+    baseline['video']['num_frames'] = 120
+    with pytest.raises(ValueError):
+        compare_results(results, baseline)
+
+
+def test_benchmark_isolated(tmp_path):
+    """ Test running benchmark cases in a new process, including a case which fails. """
+    video = get_synthetic_video(str(tmp_path), width=160, height=96, num_frames=90,
+                                num_cuts=2)
+    cases = get_benchmark_cases(['content', 'adaptive'], frame_skips=[1], modes=['sequential'])
+    results = run_benchmark(video, cases, isolate=True)
+    assert len(results['results']) == 2
+    assert results['results'][0]['cuts'] == video['cuts']
+    assert 'error' in results['results'][1]
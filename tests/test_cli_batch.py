@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+""" PySceneDetect scenedetect.cli.batch Tests
+
+This file includes unit tests for the scenedetect.cli.batch module, which implements
+the batch command (processing many input videos using a pool of worker processes).
+"""
+
+# Standard project pylint disables for unit tests using pytest.
+# pylint: disable=no-self-use, protected-access, multiple-statements, invalid-name
+# pylint: disable=redefined-outer-name
+
+
+import os
+
+import cv2
+import numpy
+
+from scenedetect.cli.batch import expand_input_patterns
+from scenedetect.cli.batch import get_batch_job_args
+from scenedetect.cli.batch import run_batch
+from scenedetect.cli.batch import run_cli_job
+
+
+def test_batch_job_args(tmp_path):
+    """ Test glob expansion of inputs, and templating of the arguments of each job. """
+    for name in ['b.mp4', 'a.mp4', 'c.txt']:
+        (tmp_path / name).write_text('')
+    pattern = str(tmp_path / '*.mp4')
+    missing = str(tmp_path / 'missing.mp4')
+    assert expand_input_patterns([pattern, pattern, missing]) == [
+        str(tmp_path / 'a.mp4'), str(tmp_path / 'b.mp4'), missing]
+    assert get_batch_job_args(
+        ['-d', '2'], ['detect-content', 'list-scenes'], 'dir/video.mp4',
+        output_template='out/$VIDEO_NAME', stats_template='$VIDEO_NAME.csv') == [
+            '-d', '2', '-q', '-i', 'dir/video.mp4', '-o', 'out/video',
+            '-s', 'video.csv', 'detect-content', 'list-scenes']
+
+
+def test_batch_stats_path():
+    """ Test that a global -s/--stats path shared by every job of a batch is rejected. """
+    _, error, _ = run_cli_job(['-s', 'video.csv', 'batch', '-i', 'video.mp4', 'detect-content'])
+    assert error is not None and '$VIDEO_NAME' in error
+
+
+def test_run_batch(tmp_path):
+    """ Test that each job of a batch writes its own output, and that failed jobs do not
+    affect other jobs. """
+    video_path = str(tmp_path / 'video.avi')
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'MJPG'), 30.0, (64, 48))
+    for frame_num in range(60):
+        writer.write(numpy.full((48, 64, 3), 0 if frame_num < 30 else 255, numpy.uint8))
+    writer.release()
+    missing_path = str(tmp_path / 'missing.avi')
+
+    results = run_batch(
+        [video_path, missing_path], lambda path: get_batch_job_args(
+            [], ['detect-content', 'list-scenes'], path, str(tmp_path / 'out' / '$VIDEO_NAME')),
+        2)
+    assert [result.input for result in results] == [video_path, missing_path]
+    assert results[0].success and results[0].error is None
+    assert results[0].num_frames == 60 and results[0].num_scenes == 2
+    assert not results[1].success and results[1].error
+    assert os.path.exists(str(tmp_path / 'out' / 'video' / 'video-Scenes.csv'))
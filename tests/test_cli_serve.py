@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+""" PySceneDetect scenedetect.cli.serve Tests
+
+This file includes unit tests for the scenedetect.cli.serve module, which implements
+the serve and submit commands (processing jobs in a pool of warm worker processes).
+"""
+
+# Standard project pylint disables for unit tests using pytest.
+# pylint: disable=no-self-use, protected-access, multiple-statements, invalid-name
+# pylint: disable=redefined-outer-name
+
+
+import os
+import socket
+import stat
+import threading
+
+import pytest
+
+from scenedetect.benchmark import get_synthetic_video
+from scenedetect.cli.serve import JobServer
+from scenedetect.cli.serve import run_server_job
+from scenedetect.cli.serve import submit_jobs
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='requires Unix domain sockets')
+def test_job_server(tmp_path):
+    """ Test submitting jobs to a JobServer over a Unix domain socket, including a job
+    which fails, and stopping the server from the client. """
+    video = get_synthetic_video(str(tmp_path), width=160, height=90, num_frames=60, num_cuts=1)
+    socket_path = str(tmp_path / 'server.sock')
+
+    job_server = JobServer(2, socket_path=socket_path)
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+    assert job_server.token is None
+    job_server.start_workers()
+    server_thread = threading.Thread(target=job_server.serve_forever)
+    server_thread.start()
+    try:
+        results = list(submit_jobs(
+            [['-i', os.path.basename(video['path']), 'detect-content'],
+             ['-i', 'missing.avi', 'detect-content']],
+            socket_path=socket_path, shutdown=True, cwd=str(tmp_path)))
+        server_thread.join(timeout=30)
+        assert not server_thread.is_alive()
+    finally:
+        job_server.shutdown()
+        job_server.close()
+    assert not os.path.exists(socket_path)
+
+    results = sorted(results, key=lambda result: result['id'])
+    assert [result['id'] for result in results] == [0, 1]
+    assert results[0]['success'] and results[0]['num_frames'] == 60
+    assert [scene['start_frame'] for scene in results[0]['scenes']] == [0] + video['cuts']
+    assert not results[1]['success'] and results[1]['error']
+
+
+def test_job_server_tcp_token():
+    """ Test that requests received over TCP are rejected without the token of the server. """
+    job_server = JobServer(1, port=0)
+    assert job_server.token
+    port = job_server.address[1]
+    server_thread = threading.Thread(target=job_server.serve_forever)
+    server_thread.start()
+    try:
+        results = list(submit_jobs([['version']], port=port, shutdown=True, token='invalid'))
+        assert [result['error'] for result in results] == ['Invalid token.']
+        assert server_thread.is_alive()
+        results = list(submit_jobs([['version']], port=port, shutdown=True,
+                                   token=job_server.token))
+        # The job itself is run (and fails, since it processes no video).
+        assert [result['id'] for result in results] == [0]
+        assert results[0]['error'] != 'Invalid token.'
+        server_thread.join(timeout=30)
+        assert not server_thread.is_alive()
+    finally:
+        job_server.shutdown()
+        job_server.close()
+
+
+def test_run_server_job_restores_cwd(tmp_path):
+    """ Test that running a job in another directory restores the working directory of the
+    worker process, so jobs without a cwd are not affected by previous jobs. """
+    original_cwd = os.getcwd()
+    result = run_server_job(['-i', 'missing.avi', 'detect-content'], cwd=str(tmp_path))
+    assert not result['success']
+    assert os.getcwd() == original_cwd
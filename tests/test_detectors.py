@@ -35,14 +35,28 @@ test case material.
 # pylint: disable=no-self-use, protected-access, multiple-statements, invalid-name
 # pylint: disable=redefined-outer-name
 
+# Third-Party Library Imports
+import cv2
+import numpy
+import pytest
+
 # PySceneDetect Library Imports
 from scenedetect.scene_manager import SceneManager
 from scenedetect.frame_timecode import FrameTimecode
 from scenedetect.video_manager import VideoManager
 from scenedetect.stats_manager import StatsManager
+from scenedetect.stats_manager import FrameMetricRegistered
 from scenedetect.detectors import ContentDetector
 from scenedetect.detectors import ThresholdDetector
 from scenedetect.detectors import AdaptiveDetector
+from scenedetect.detectors import CascadeDetector
+from scenedetect.detectors import HashDetector
+from scenedetect.detectors import HistogramDetector
+from scenedetect.detectors import MotionDetector
+from scenedetect.detectors import DissolveDetector
+from scenedetect.detectors.content_detector import compute_luma
+from scenedetect.detectors.threshold_detector import compute_frame_average
+from scenedetect.detectors.threshold_detector import estimate_frame_average
 
 
 # Test case ground truth format: (threshold, [scene start frame])
@@ -59,6 +73,26 @@ def create_detector(detector_type, video_manager):
     return detector_type()
 
 
+def get_synthetic_scenes(num_scenes=3):
+    # type: (int) -> List[numpy.ndarray]
+    """ Returns num_scenes smooth random frames, each to be used as the content of a
+    synthetic scene. """
+    rng = numpy.random.RandomState(0)
+    return [cv2.normalize(
+        cv2.GaussianBlur(rng.randint(0, 256, (72, 128, 3)).astype(numpy.uint8), (0, 0), 4),
+        None, 0, 255, cv2.NORM_MINMAX) for _ in range(num_scenes)]
+
+
+def get_synthetic_cut_frames(num_scenes=3, scene_len=20):
+    # type: (int, int) -> List[numpy.ndarray]
+    """ Returns the frames of num_scenes synthetic scenes of scene_len frames each, with
+    hard cuts between them (at frames scene_len, 2 * scene_len, ...), and slight motion
+    within each scene. """
+    scenes = get_synthetic_scenes(num_scenes)
+    return [numpy.roll(scenes[i // scene_len], i % 3, axis=1)
+            for i in range(num_scenes * scene_len)]
+
+
 
 def test_content_detector(test_movie_clip):
     """ Test SceneManager with VideoManager and ContentDetector. """
@@ -181,3 +215,336 @@ def test_detectors_with_stats(test_video_file):
 
         finally:
             vm.release()
+
+
+def test_content_detector_luma_only():
+    """ Test ContentDetector luma_only fast path against the full HSV computation. """
+    rng = numpy.random.RandomState(0)
+    frames = [rng.randint(0, 256, (72, 128, 3)).astype(numpy.uint8) for _ in range(3)]
+    for frame in frames:
+        assert numpy.array_equal(
+            compute_luma(frame), cv2.split(cv2.cvtColor(frame, cv2.COLOR_BGR2HSV))[2])
+
+    stats = StatsManager()
+    detector = ContentDetector(luma_only=True)
+    detector.stats_manager = stats
+    for frame_num, frame in enumerate(frames):
+        detector.process_frame(frame_num, frame)
+
+    curr_hsv = cv2.split(cv2.cvtColor(frames[2], cv2.COLOR_BGR2HSV))
+    last_hsv = cv2.split(cv2.cvtColor(frames[1], cv2.COLOR_BGR2HSV))
+    expected = ContentDetector(luma_only=True).calculate_frame_score(2, curr_hsv, last_hsv)
+    assert stats.get_metrics(2, [ContentDetector.DELTA_V_KEY])[0] == expected
+    # Only delta_lum should be computed in luma_only mode.
+    assert not stats.metrics_exist(2, [ContentDetector.FRAME_SCORE_KEY])
+    assert not detector.is_processing_required(2)
+
+
+def test_threshold_detector_sample_margin():
+    """ Test ThresholdDetector fast mode yields the same cuts as the exact frame average. """
+    rng = numpy.random.RandomState(0)
+    frame = rng.randint(0, 256, (72, 128, 3)).astype(numpy.uint8)
+    # Fade out to black then back in, with a cut to black in between.
+    levels = [1.0] * 20 + [1.0 - 0.1 * i for i in range(10)] + [0.0] * 10 + (
+        [0.1 * i for i in range(10)] + [1.0] * 20 + [0.0] * 5 + [1.0] * 20)
+    frames = [(frame * level).astype(numpy.uint8) for level in levels]
+
+    cut_lists = []
+    for sample_margin in [None, 4.0]:
+        detector = ThresholdDetector(sample_margin=sample_margin)
+        cut_list = []
+        for frame_num, frame_img in enumerate(frames):
+            cut_list += detector.process_frame(frame_num, frame_img)
+        cut_lists.append(cut_list)
+    assert cut_lists[0]
+    assert cut_lists[0] == cut_lists[1]
+
+
+def test_threshold_detector_sample_margin_near_threshold(caplog):
+    """ Test ThresholdDetector fast mode on a slow fade through the threshold, where the
+    estimate of each frame average is close to the threshold, and that fast mode is
+    disabled (with a warning) if a StatsManager is set. """
+    rng = numpy.random.RandomState(0)
+    frame = rng.randint(0, 256, (72, 128, 3)).astype(numpy.uint8)
+    threshold = 12
+    # Average intensity steps by ~0.25 around the threshold while fading out and in.
+    levels = [(threshold + 0.25 * i) / compute_frame_average(frame) for i in range(-20, 21)]
+    levels = levels[::-1] + levels[1:]
+    frames = [numpy.round(frame * level).astype(numpy.uint8) for level in levels]
+
+    cut_lists = []
+    for sample_margin in [None, 1.0]:
+        detector = ThresholdDetector(threshold=threshold, min_scene_len=5,
+                                     sample_margin=sample_margin)
+        cut_list = []
+        for frame_num, frame_img in enumerate(frames):
+            cut_list += detector.process_frame(frame_num, frame_img)
+        cut_lists.append(cut_list)
+    assert len(cut_lists[0]) == 1
+    assert cut_lists[0] == cut_lists[1]
+    # Frames with an estimate close to the threshold must use the exact average, and any
+    # estimate used must be on the same side of the threshold as the exact average.
+    detector = ThresholdDetector(threshold=threshold, sample_margin=1.0)
+    num_exact = 0
+    for frame_img in frames:
+        frame_avg = compute_frame_average(frame_img)
+        estimate = estimate_frame_average(frame_img, detector.block_size)
+        if abs(estimate - threshold) <= detector.sample_margin:
+            assert detector.prepare_frame(frame_img) == frame_avg
+            num_exact += 1
+        else:
+            assert detector.prepare_frame(frame_img) == estimate
+            assert (estimate < threshold) == (frame_avg < threshold)
+    assert 0 < num_exact < len(frames)
+
+    detector = ThresholdDetector(threshold=threshold, sample_margin=1.0)
+    detector.stats_manager = StatsManager()
+    assert detector.prepare_frame(frames[0]) == compute_frame_average(frames[0])
+    assert 'fast mode disabled' in caplog.text
+
+
+def test_cascade_detector():
+    """ Test CascadeDetector yields the same cuts as the wrapped detector, while only
+    computing the metrics of frames which are not obviously not cuts. """
+    frames = get_synthetic_cut_frames()
+
+    for detector_type in [ContentDetector, HashDetector, HistogramDetector]:
+        cut_lists = []
+        for detector in [detector_type(), CascadeDetector(detector_type())]:
+            stats = StatsManager()
+            detector.stats_manager = stats
+            cut_list = []
+            for frame_num, frame_img in enumerate(frames):
+                cut_list += detector.process_frame(frame_num, frame_img)
+            cut_lists.append(cut_list)
+        assert cut_lists[0] == [20, 40]
+        assert cut_lists[0] == cut_lists[1]
+        # A StatsManager is only required if the wrapped detector requires one.
+        detector = CascadeDetector(detector_type())
+        assert not detector.stats_manager_required()
+        assert [cut for frame_num, frame_img in enumerate(frames)
+                for cut in detector.process_frame(frame_num, frame_img)] == [20, 40]
+
+    # Cuts must be computed exactly, and no metrics of the wrapped detector are stored for
+    # frames which were skipped (so the statsfile can be reused by other detectors).
+    score_key = ContentDetector.FRAME_SCORE_KEY
+    cascade_stats = StatsManager()
+    detector = CascadeDetector(ContentDetector(), gate_threshold=8.0)
+    detector.stats_manager = cascade_stats
+    for frame_num, frame_img in enumerate(frames):
+        detector.process_frame(frame_num, frame_img)
+    content_stats = StatsManager()
+    detector = ContentDetector()
+    detector.stats_manager = content_stats
+    for frame_num, frame_img in enumerate(frames):
+        detector.process_frame(frame_num, frame_img)
+    for frame_num in [20, 40]:
+        assert cascade_stats.get_metrics(frame_num, [CascadeDetector.SKIPPED_KEY])[0] == 0.0
+        assert cascade_stats.get_metrics(frame_num, [score_key]) == (
+            content_stats.get_metrics(frame_num, [score_key]))
+    assert cascade_stats.get_metrics(10, [CascadeDetector.SKIPPED_KEY])[0] == 1.0
+    assert not cascade_stats.metrics_exist(10, [score_key])
+
+    # A ContentDetector using the same StatsManager must only compute the missing metrics.
+    detector = ContentDetector()
+    detector.stats_manager = cascade_stats
+    cut_list = []
+    for frame_num, frame_img in enumerate(frames):
+        cut_list += detector.process_frame(frame_num, frame_img)
+    assert cut_list == [20, 40]
+    assert cascade_stats.get_metrics(10, [score_key]) == (
+        content_stats.get_metrics(10, [score_key]))
+
+    # Cuts which change the colours but not the brightness of frames must not be skipped.
+    texture = get_synthetic_scenes(1)[0] // 8
+    frames = [texture + numpy.array(colour, dtype=numpy.uint8) for colour in
+              [(0, 0, 200)] * 20 + [(0, 102, 0)] * 20]
+    assert abs(cv2.cvtColor(frames[0], cv2.COLOR_BGR2GRAY).mean()
+               - cv2.cvtColor(frames[-1], cv2.COLOR_BGR2GRAY).mean()) < 1.0
+    for detector in [ContentDetector(), CascadeDetector(ContentDetector())]:
+        detector.stats_manager = StatsManager()
+        cut_list = []
+        for frame_num, frame_img in enumerate(frames):
+            cut_list += detector.process_frame(frame_num, frame_img)
+        assert cut_list == [20]
+
+    with pytest.raises(TypeError):
+        CascadeDetector(ThresholdDetector())
+    # Subclasses (e.g. AdaptiveDetector, which detects cuts in post_process) are rejected.
+    with pytest.raises(TypeError):
+        CascadeDetector(AdaptiveDetector(video_manager=None))
+
+
+def test_hash_detector():
+    """ Test HashDetector detects hard cuts, and yields the same cuts using stored metrics. """
+    frames = get_synthetic_cut_frames()
+
+    stats = StatsManager()
+    cut_lists = []
+    for use_frames in [True, False]:
+        detector = HashDetector()
+        detector.stats_manager = stats
+        cut_list = []
+        for frame_num, frame_img in enumerate(frames):
+            assert detector.is_processing_required(frame_num) == use_frames
+            cut_list += detector.process_frame(frame_num, frame_img if use_frames else None)
+        cut_lists.append(cut_list)
+    assert cut_lists[0] == [20, 40]
+    assert cut_lists[0] == cut_lists[1]
+    assert isinstance(stats.get_metrics(10, [detector.get_metrics()[0]])[0], int)
+    # Hashes of a different size must not be reused.
+    detector = HashDetector(hash_size=16)
+    detector.stats_manager = stats
+    assert detector.get_metrics() == ['hash_val (size=16)', 'hash_dist (size=16)']
+    assert detector.is_processing_required(10)
+
+
+def test_histogram_detector():
+    """ Test HistogramDetector detects cuts between scenes with different colour palettes,
+    and yields the same cuts using stored metrics. """
+    rng = numpy.random.RandomState(0)
+    scenes = [cv2.addWeighted(
+        rng.randint(0, 256, (72, 128, 3)).astype(numpy.uint8), 0.5,
+        numpy.full((72, 128, 3), tint, dtype=numpy.uint8), 0.5, 0)
+              for tint in [(0, 0, 255), (0, 255, 0), (255, 0, 0)]]
+    frames = [numpy.roll(scenes[i // 20], i * 4, axis=1) for i in range(60)]
+
+    stats = StatsManager()
+    cut_lists = []
+    for use_frames in [True, False]:
+        detector = HistogramDetector()
+        detector.stats_manager = stats
+        cut_list = []
+        for frame_num, frame_img in enumerate(frames):
+            if not use_frames and not (detector.is_processing_required(frame_num) or
+                                       detector.is_processing_required(frame_num + 1)):
+                frame_img = None
+            cut_list += detector.process_frame(frame_num, frame_img)
+        cut_lists.append(cut_list)
+    assert cut_lists[0] == [20, 40]
+    assert cut_lists[0] == cut_lists[1]
+    # Only the first frame must be decoded when all metrics are stored.
+    assert [frame_num for frame_num in range(60)
+            if detector.is_processing_required(frame_num)] == [0]
+    # Metrics computed with a different number of bins must not be reused.
+    detector = HistogramDetector(bins=64)
+    detector.stats_manager = stats
+    assert detector.get_metrics() == ['hist_diff (bins=64)']
+    assert detector.is_processing_required(10)
+
+
+def test_motion_detector():
+    """ Test MotionDetector detects motion events on a static background, only within
+    the region of interest if one is set. """
+    rng = numpy.random.RandomState(0)
+    background = cv2.GaussianBlur(
+        rng.randint(0, 256, (360, 640, 3)).astype(numpy.uint8), (0, 0), 5)
+    frames = []
+    for frame_num in range(120):
+        frame_img = background.copy()
+        if 30 <= frame_num < 50:
+            x = (frame_num - 30) * 20
+            cv2.rectangle(frame_img, (x, 200), (x + 80, 260), (255, 255, 255), -1)
+        frames.append(frame_img)
+
+    for roi, expected_events in [(None, [(30, 60)]), ((0, 200, 640, 160), [(30, 60)]),
+                                 ((0, 0, 640, 180), [])]:
+        detector = MotionDetector(num_frames_post_scene=10, roi=roi)
+        event_list = []
+        for frame_num, frame_img in enumerate(frames):
+            event_list += detector.process_frame(frame_num, frame_img)
+        event_list += detector.post_process(len(frames))
+        assert event_list == expected_events
+
+    # Events still in progress when the video ends are closed by post_process.
+    detector = MotionDetector(num_frames_post_scene=10)
+    event_list = []
+    for frame_num, frame_img in enumerate(frames[:40]):
+        event_list += detector.process_frame(frame_num, frame_img)
+    assert not event_list
+    assert detector.post_process(40) == [(30, 40)]
+
+
+def test_motion_detector_auto_parameters():
+    """ Test MotionDetector resolves the auto downscale factor and kernel size from the
+    size of each video, without modifying its parameters. """
+    detector = MotionDetector()
+    for width, height, downscale, kernel_size in [(1920, 1080, 6, 7), (640, 360, 3, 5),
+                                                  (320, 180, 1, 3)]:
+        frame_img = numpy.zeros((height, width, 3), numpy.uint8)
+        assert detector.process_frame(0, frame_img) == []
+        assert (detector._downscale, detector._kernel_size) == (downscale, kernel_size)
+        assert (detector.downscale, detector.kernel_size) == (None, -1)
+
+
+def test_dissolve_detector():
+    """ Test DissolveDetector detects the middle of a dissolve but not hard cuts, with the
+    same results whether or not a ContentDetector is used with it. """
+    scenes = get_synthetic_scenes()
+    # Scene 0 dissolves into scene 1 over frames 40-59, followed by a hard cut at frame 100.
+    frames = []
+    for frame_num in range(140):
+        scene_num = 0 if frame_num < 60 else 1 if frame_num < 100 else 2
+        frame_img = numpy.roll(scenes[scene_num], frame_num, axis=1)
+        if 40 <= frame_num < 60:
+            alpha = (frame_num - 39) / 21.0
+            frame_img = cv2.addWeighted(
+                frame_img, 1.0 - alpha, numpy.roll(scenes[1], frame_num, axis=1), alpha, 0)
+        frames.append(frame_img)
+
+    dissolve_cut_lists = []
+    delta_lum = []
+    for detector_order in [[DissolveDetector], [ContentDetector, DissolveDetector],
+                           [DissolveDetector, ContentDetector]]:
+        stats = StatsManager()
+        detectors = [detector_type() for detector_type in detector_order]
+        for detector in detectors:
+            detector.stats_manager = stats
+            # The shared delta_lum metric is registered by whichever detector is added first.
+            try:
+                stats.register_metrics(detector.get_metrics())
+            except FrameMetricRegistered:
+                pass
+        cut_lists = [[] for _ in detectors]
+        for frame_num, frame_img in enumerate(frames):
+            for i, detector in enumerate(detectors):
+                cut_lists[i] += detector.process_frame(frame_num, frame_img)
+        dissolve_index = detector_order.index(DissolveDetector)
+        assert len(cut_lists[dissolve_index]) == 1
+        assert 45 <= cut_lists[dissolve_index][0] <= 55
+        if len(detectors) > 1:
+            assert cut_lists[1 - dissolve_index] == [100]
+        dissolve_cut_lists.append(cut_lists[dissolve_index])
+        delta_lum.append(stats.get_metrics(80, [ContentDetector.DELTA_V_KEY])[0])
+        # The subsample parameter is left as passed, even if computed automatically.
+        assert detectors[dissolve_index].subsample is None
+    assert dissolve_cut_lists[0] == dissolve_cut_lists[1] == dissolve_cut_lists[2]
+    # The frame difference is computed exactly as the ContentDetector's delta_lum metric.
+    assert delta_lum[0] == delta_lum[1] == delta_lum[2]
+    assert delta_lum[0] > 0.0
+    assert DissolveDetector(subsample=2).get_metrics() == [
+        'dissolve_luma_mean (subsample=2)', 'dissolve_luma_var (subsample=2)', 'delta_lum']
+
+
+def test_detectors_num_threads():
+    """ Test that computing metrics on tiles in parallel yields exactly the same metrics. """
+    rng = numpy.random.RandomState(0)
+    frames = [rng.randint(0, 256, (270, 480, 3)).astype(numpy.uint8) for _ in range(4)]
+    # Downscaled frames from the VideoManager are non-contiguous views.
+    frames += [frame[::3, ::3, :] for frame in frames]
+
+    for frame in frames:
+        assert compute_frame_average(frame, num_threads=3) == compute_frame_average(frame)
+
+    for detector_type in [ContentDetector, ThresholdDetector]:
+        for frame_list in [frames[:4], frames[4:]]:
+            metrics = []
+            for num_threads in [1, 3]:
+                stats = StatsManager()
+                detector = detector_type(num_threads=num_threads)
+                detector.stats_manager = stats
+                for frame_num, frame_img in enumerate(frame_list):
+                    detector.process_frame(frame_num, frame_img)
+                metrics.append([stats.get_metrics(frame_num, detector.get_metrics())
+                                for frame_num in range(1, 4)])
+            assert metrics[0] == metrics[1]
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" PySceneDetect scenedetect.evaluation Tests
+
+This file includes unit tests for the scenedetect.evaluation module, which implements
+the evaluate command (measuring accuracy against known cuts).
+"""
+
+# Standard project pylint disables for unit tests using pytest.
+# pylint: disable=no-self-use, protected-access, multiple-statements, invalid-name
+# pylint: disable=redefined-outer-name
+
+
+import json
+
+import pytest
+
+from scenedetect.benchmark import get_benchmark_cases
+from scenedetect.benchmark import get_synthetic_video
+from scenedetect.benchmark import parse_detector_spec
+from scenedetect.evaluation import evaluate
+from scenedetect.evaluation import get_accuracy
+from scenedetect.evaluation import get_best_case
+from scenedetect.evaluation import load_ground_truth
+from scenedetect.evaluation import match_cuts
+
+
+def test_match_cuts():
+    """ Test matching detected cuts to expected cuts within a frame tolerance. """
+    assert match_cuts([], [], 2) == (0, 0, 0)
+    assert match_cuts([10, 20, 30], [10, 20, 30], 0) == (3, 0, 0)
+    assert match_cuts([11, 22, 50], [10, 20, 30], 2) == (2, 1, 1)
+    assert match_cuts([11, 22, 50], [10, 20, 30], 1) == (1, 2, 2)
+    # Each detected cut only matches a single expected cut, and vice-versa.
+    assert match_cuts([10], [9, 11], 1) == (1, 0, 1)
+    assert match_cuts([9, 11], [10], 1) == (1, 1, 0)
+    assert get_accuracy(0, 0, 0) == (1.0, 1.0, 1.0)
+    assert get_accuracy(0, 2, 3) == (0.0, 0.0, 0.0)
+    precision, recall, f1_score = get_accuracy(2, 1, 1)
+    assert precision == pytest.approx(2 / 3.0) and recall == pytest.approx(2 / 3.0)
+    assert f1_score == pytest.approx(2 / 3.0)
+
+
+def test_parse_detector_spec():
+    """ Test parsing detector specifications with arguments. """
+    assert parse_detector_spec('content') == [('content', {})]
+    assert parse_detector_spec('content:threshold=27.5,luma_only=true+hash:name=x') == [
+        ('content', {'threshold': 27.5, 'luma_only': True}), ('hash', {'name': 'x'})]
+    with pytest.raises(ValueError):
+        parse_detector_spec('content:threshold')
+    with pytest.raises(ValueError):
+        parse_detector_spec('unknown:threshold=1')
+
+
+def test_evaluate(tmp_path):
+    """ Test evaluating detectors on a synthetic video with cuts, dissolves, and fades,
+    and that the cuts of each mode are identical to those of sequential mode. """
+    video = get_synthetic_video(str(tmp_path), width=160, height=96, num_frames=120,
+                                num_cuts=3, fade_length=10)
+    assert video['cuts'] == [30, 60, 90]
+    assert video['transitions'] == ['cut', 'dissolve', 'fade']
+    with pytest.raises(ValueError):
+        get_synthetic_video(str(tmp_path), width=160, height=96, num_frames=120,
+                            num_cuts=3, fade_length=30)
+
+    ground_truth_path = tmp_path / 'ground_truth.json'
+    ground_truth_path.write_text(json.dumps([
+        {'path': tmp_path.name + '.avi', 'cuts': [60, 30]}]))
+    assert load_ground_truth(str(ground_truth_path)) == [
+        {'path': str(tmp_path / (tmp_path.name + '.avi')), 'cuts': [30, 60]}]
+    ground_truth_path.write_text(json.dumps({'path': 'video.avi'}))
+    with pytest.raises(ValueError):
+        load_ground_truth(str(ground_truth_path))
+
+    cases = get_benchmark_cases(['content', 'content:threshold=1000'],
+                                modes=['sequential', 'workers'])
+    results = evaluate([video], cases, tolerance=2)
+    assert [result['identical'] for result in results] == [None, True, None, True]
+    content, _, insensitive, _ = results
+    assert content['precision'] == 1.0 and content['recall'] > 0.0
+    assert content['videos'][0]['true_positives'] > 0
+    assert insensitive['recall'] == 0.0 and insensitive['f1_score'] == 0.0
+    assert all(result['fps'] > 0 for result in results)
+    assert get_best_case(results, 0.5)['detector'] == 'content'
+    assert get_best_case(results, 1.1) is None
+
+    # Cuts of each case are compared to those of the reference detector when set.
+    results = evaluate([video], cases[:1], tolerance=2, reference='content:threshold=1000')
+    assert results[0]['identical'] is False
+    results = evaluate([video], get_benchmark_cases(['content:unknown=1']))
+    assert 'error' in results[0]
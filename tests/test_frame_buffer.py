@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+""" PySceneDetect scenedetect.frame_buffer Tests
+
+This file includes unit tests for the scenedetect.frame_buffer module, which is used
+to share decoded frames with detectors running in worker processes.
+"""
+
+# Standard project pylint disables for unit tests using pytest.
+# pylint: disable=no-self-use, protected-access, multiple-statements, invalid-name
+# pylint: disable=redefined-outer-name
+
+
+import numpy
+import pytest
+
+from scenedetect.frame_buffer import SharedFrameBuffer
+from scenedetect.platform import shared_memory
+
+
+@pytest.mark.skipif(
+    shared_memory is None, reason='requires multiprocessing.shared_memory (Python 3.8+)')
+def test_shared_frame_buffer():
+    """ Test that frames (including non-contiguous views) are shared between buffers
+    attached to the same shared memory block. """
+    frame_buffer = SharedFrameBuffer((4, 6, 3), numpy.uint8, num_slots=2)
+    try:
+        attached = SharedFrameBuffer.attach(*frame_buffer.get_info())
+        frame_img = numpy.arange(8 * 12 * 3, dtype=numpy.uint8).reshape(8, 12, 3)[::2, ::2, :]
+        frame_buffer.put_frame(1, frame_img)
+        assert numpy.array_equal(attached.get_frame(1), frame_img)
+        with pytest.raises(ValueError):
+            frame_buffer.put_frame(0, frame_img[:2])
+        attached.close()
+    finally:
+        frame_buffer.unlink()
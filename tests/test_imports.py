@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+""" PySceneDetect Import Time Tests
+
+This file includes regression tests for the startup time of the scenedetect module and
+command, ensuring that heavy dependencies (e.g. OpenCV, NumPy) are only imported when
+required to process videos.
+"""
+
+# Standard project pylint disables for unit tests using pytest.
+# pylint: disable=no-self-use, protected-access, multiple-statements, invalid-name
+# pylint: disable=redefined-outer-name
+
+
+import os
+import subprocess
+import sys
+
+# Third-Party Library Imports
+import pytest
+
+# Modules which must not be imported unless videos are processed.
+HEAVY_MODULES = ['cv2', 'numpy', 'tqdm', 'scenedetect.scene_manager',
+                 'scenedetect.video_manager', 'scenedetect.detectors']
+
+# Maximum total time, in milliseconds, to import all modules for `scenedetect --version`.
+# Only checked if the SCENEDETECT_TEST_IMPORT_TIME environment variable is set, as it
+# depends on the machine and its load.
+IMPORT_TIME_BUDGET_MS = 150
+
+
+def run_python(args):
+    # type: (List[str]) -> subprocess.CompletedProcess
+    """ Runs a new Python interpreter with the given arguments, with the scenedetect
+    module being tested importable. """
+    env = dict(os.environ)
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join([root_dir] + (
+        [env['PYTHONPATH']] if env.get('PYTHONPATH') else []))
+    return subprocess.run([sys.executable] + args, env=env, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, universal_newlines=True, check=True)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='requires module __getattr__ (Python 3.7+)')
+def test_lazy_attributes():
+    """ Test that importing scenedetect does not import any heavy modules, and that the
+    classes in the scenedetect namespace are still available. """
+    result = run_python(['-c', '; '.join([
+        'import sys',
+        'import scenedetect',
+        'print(sorted(set(%r) & set(sys.modules)))' % HEAVY_MODULES,
+        'from scenedetect import ContentDetector',
+        'print(ContentDetector.__module__, scenedetect.VideoManager.__module__)',
+        'print(scenedetect.detectors.HashDetector.__module__)'])])
+    assert result.stdout.split('\n')[:3] == [
+        '[]', 'scenedetect.detectors.content_detector scenedetect.video_manager',
+        'scenedetect.detectors.hash_detector']
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='requires module __getattr__ (Python 3.7+)')
+def test_version_imports():
+    """ Test that `scenedetect --version` does not import any heavy modules. """
+    result = run_python(['-c', '; '.join([
+        'import atexit, sys',
+        'atexit.register(lambda: print(sorted(set(%r) & set(sys.modules))))' % HEAVY_MODULES,
+        'from scenedetect.__main__ import main',
+        'sys.argv = ["scenedetect", "--version"]',
+        'main()'])])
+    output = result.stdout.splitlines()
+    assert output[0].startswith('PySceneDetect ')
+    assert output[-1] == '[]'
+
+
+@pytest.mark.skipif(not os.environ.get('SCENEDETECT_TEST_IMPORT_TIME'),
+                    reason='set SCENEDETECT_TEST_IMPORT_TIME to check the import time budget')
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='requires -X importtime (Python 3.7+)')
+def test_version_import_time():
+    """ Test that the time to import all modules required by `scenedetect --version` is
+    within budget. """
+    result = run_python(['-X', 'importtime', '-m', 'scenedetect', '--version'])
+    assert result.stdout.startswith('PySceneDetect ')
+    total_time_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        # Top-level imports (not indented) include the time of all nested imports.
+        if not name[1:].startswith(' '):
+            total_time_us += int(cumulative_us)
+    assert total_time_us / 1000.0 < IMPORT_TIME_BUDGET_MS
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+""" PySceneDetect scenedetect.metrics Tests
+
+This file includes unit tests for the scenedetect.metrics module, and the metrics hooks
+of the SceneManager.
+"""
+
+# Standard project pylint disables for unit tests using pytest.
+# pylint: disable=no-self-use, protected-access, multiple-statements, invalid-name
+# pylint: disable=redefined-outer-name
+
+
+import json
+
+import cv2
+import numpy
+
+from scenedetect.detectors import ContentDetector
+from scenedetect.metrics import JsonLinesSink
+from scenedetect.metrics import PrometheusTextfileSink
+from scenedetect.scene_manager import SceneManager
+from scenedetect.stats_manager import StatsManager
+
+
+def test_metrics_hooks(tmp_path):
+    """ Test that metrics hooks are called during and after detect_scenes, counting frames
+    served from the StatsManager separately from decoded frames, and unique cuts. """
+    video_path = str(tmp_path / 'cuts.avi')
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'MJPG'), 30.0, (160, 90))
+    random_state = numpy.random.RandomState(0)
+    for _ in range(2):
+        frame_img = random_state.randint(0, 256, (90, 160, 3)).astype(numpy.uint8)
+        for _ in range(30):
+            writer.write(frame_img)
+    writer.release()
+
+    stats_manager = StatsManager()
+    for _ in range(2):
+        updates = []
+        sm = SceneManager(stats_manager)
+        # Both detectors cut at the same frame, which is only counted once.
+        sm.add_detector(ContentDetector())
+        sm.add_detector(ContentDetector())
+        sm.add_metrics_hook(updates.append, interval=1e-6)
+        cap = cv2.VideoCapture(video_path)
+        try:
+            sm.detect_scenes(frame_source=cap, show_progress=False)
+        finally:
+            cap.release()
+        assert len(updates) > 1
+        assert [update['finished'] for update in updates] == [0] * (len(updates) - 1) + [1]
+        assert [update['frames_read'] for update in updates] == sorted(
+            update['frames_read'] for update in updates)
+        final = updates[-1]
+        assert final['frames_read'] == 60
+        assert final['num_cuts'] == len(sm.get_cut_list()) == 1
+        assert final['frames_skipped'] == 0
+    # All metrics are cached on the second pass, so almost all frames are only grabbed.
+    assert final['frames_cached'] >= 50
+    assert final['frames_decoded'] + final['frames_cached'] == 60
+
+    sm.remove_metrics_hook(updates.append)
+    assert not sm._metrics_hooks
+
+
+def test_metrics_sinks(tmp_path):
+    """ Test the JSON lines and Prometheus text format sinks. """
+    metrics = {'frames_read': 10, 'fps': 2.5, 'memory_usage': None, 'finished': 0}
+    jsonl_path = str(tmp_path / 'metrics.jsonl')
+    jsonl_sink = JsonLinesSink(jsonl_path, fields={'video': 'a.mp4'})
+    jsonl_sink(metrics)
+    jsonl_sink(dict(metrics, finished=1))
+    with open(jsonl_path, 'r') as jsonl_file:
+        updates = [json.loads(line) for line in jsonl_file]
+    assert updates == [dict(metrics, video='a.mp4'), dict(metrics, video='a.mp4', finished=1)]
+
+    prom_path = str(tmp_path / 'metrics.prom')
+    PrometheusTextfileSink(prom_path, labels={'video': 'a "b".mp4'})(metrics)
+    with open(prom_path, 'r') as prom_file:
+        lines = prom_file.read().splitlines()
+    assert 'scenedetect_frames_read_total{video="a \\"b\\".mp4"} 10' in lines
+    assert '# TYPE scenedetect_frames_read_total counter' in lines
+    assert 'scenedetect_frames_per_second{video="a \\"b\\".mp4"} 2.5' in lines
+    assert not any('memory_usage' in line for line in lines)
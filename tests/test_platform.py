@@ -44,6 +44,7 @@ import cv2
 from scenedetect.video_manager import VideoManager
 
 from scenedetect.platform import CommandTooLong, invoke_command
+from scenedetect.platform import format_table
 from scenedetect.platform import get_aspect_ratio
 
 
@@ -65,6 +66,20 @@ def test_long_command():
             invoke_command('x' * 2**15)
 
 
+def test_format_table():
+    """ Test format_table pads each column to its longest value, left-justifying only the
+    first num_left_columns columns. """
+    rows = [('Case', 'FPS'), ('content', '120.5'), ('hash', '9.0')]
+    assert format_table(rows).split('\n') == [
+        'Case       FPS',
+        '--------------',
+        'content  120.5',
+        'hash       9.0']
+    assert format_table(rows, num_left_columns=0).split('\n')[2:] == [
+        'content  120.5',
+        '   hash    9.0']
+
+
 def test_get_aspect_ratio(test_video_file):
     """ Test get_aspect_ratio function. """
     expected_value = 1.0
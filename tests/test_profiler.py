@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+""" PySceneDetect scenedetect.profiler Tests
+
+This file includes unit tests for the scenedetect.profiler module, which is used to
+measure the time spent in each stage of processing a video.
+"""
+
+# Standard project pylint disables for unit tests using pytest.
+# pylint: disable=no-self-use, protected-access, multiple-statements, invalid-name
+# pylint: disable=redefined-outer-name
+
+
+import json
+
+import cv2
+import numpy
+
+from scenedetect.detectors import ContentDetector
+from scenedetect.profiler import Profiler
+from scenedetect.profiler import profile_stage
+from scenedetect.scene_manager import SceneManager
+from scenedetect.stats_manager import StatsManager
+from scenedetect.video_manager import VideoManager
+
+
+def test_profiler_stages():
+    """ Test that stages are counted in the order they are first recorded, and that no
+    time is recorded without a Profiler. """
+    profiler = Profiler()
+    with profiler.stage('b'):
+        pass
+    for _ in range(3):
+        with profile_stage(profiler, 'a'):
+            pass
+    with profile_stage(None, 'c'):
+        pass
+    stages = profiler.get_stages()
+    assert list(stages) == ['b', 'a']
+    assert [num_calls for num_calls, _ in stages.values()] == [1, 3]
+    assert all(total_time >= 0.0 for _, total_time in stages.values())
+    report = profiler.get_report()
+    assert report.splitlines()[0].split()[0] == 'Stage'
+    assert 'Elapsed time:' in report
+    profiler.reset()
+    assert not profiler.get_stages()
+
+
+def test_profile_detect_scenes(tmp_path):
+    """ Test that a Profiler shared by the VideoManager, SceneManager and StatsManager
+    records each stage of detecting scenes, and that the trace includes every call. """
+    video_path = str(tmp_path / 'cuts.avi')
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'MJPG'), 30.0, (160, 90))
+    random_state = numpy.random.RandomState(0)
+    for _ in range(2):
+        frame_img = random_state.randint(0, 256, (90, 160, 3)).astype(numpy.uint8)
+        for _ in range(30):
+            writer.write(frame_img)
+    writer.release()
+
+    profiler = Profiler(record_trace=True)
+    vm = VideoManager([video_path], profiler=profiler)
+    stats_manager = StatsManager(profiler=profiler)
+    sm = SceneManager(stats_manager, profiler)
+    sm.add_detector(ContentDetector())
+    try:
+        vm.start()
+        assert sm.detect_scenes(frame_source=vm, show_progress=False) == 60
+    finally:
+        vm.release()
+    with open(str(tmp_path / 'cuts.stats.csv'), 'w') as stats_file:
+        stats_manager.save_to_csv(stats_file, vm.get_base_timecode())
+
+    stages = profiler.get_stages()
+    assert stages['VideoManager.grab'][0] == 61
+    assert stages['VideoManager.retrieve'][0] == 60
+    assert stages['ContentDetector.process_frame'][0] == 60
+    assert stages['ContentDetector.post_process'][0] == 1
+    assert stages['SceneManager.detect_scenes'][0] == 1
+    assert stages['StatsManager.save'][0] == 1
+
+    trace_path = tmp_path / 'trace.json'
+    with open(str(trace_path), 'w') as trace_file:
+        profiler.save_trace(trace_file)
+    with open(str(trace_path), 'r') as trace_file:
+        events = json.load(trace_file)['traceEvents']
+    assert len(events) == sum(num_calls for num_calls, _ in stages.values())
+    assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in events)
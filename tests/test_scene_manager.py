@@ -53,16 +53,29 @@ Alternatively, the TEST_VIDEO_FILE constant can be replaced with any valid video
 import os
 import os.path
 import glob
+import threading
+import time
 
 # Third-Party Library Imports
 import cv2
+import numpy
+import pytest
 
 # PySceneDetect Library Imports
+from scenedetect.benchmark import get_synthetic_video
+from scenedetect.scene_detector import SceneDetector
 from scenedetect.scene_manager import SceneManager
 from scenedetect.scene_manager import save_images
 from scenedetect.frame_timecode import FrameTimecode
 from scenedetect.video_manager import VideoManager
+from scenedetect.detectors import CascadeDetector
 from scenedetect.detectors import ContentDetector
+from scenedetect.detectors import MotionDetector
+from scenedetect.detectors import ThresholdDetector
+from scenedetect.detectors import HashDetector
+from scenedetect.detectors import HistogramDetector
+from scenedetect.stats_manager import StatsManager
+from scenedetect.platform import shared_memory
 
 
 def test_using_pyscenedetect_videomanager(test_video_file):
@@ -226,3 +239,216 @@ def test_detect_scenes_callback(test_video_file):
 
     finally:
         vm.release()
+
+
+def test_sparse_detector_events(tmp_path):
+    """ Test SceneManager with a sparse detector (MotionDetector), ensuring events are
+    returned as the scene list, including any event still in progress at the end. """
+    video_path = str(tmp_path / 'motion.avi')
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'MJPG'), 30.0, (320, 180))
+    background = cv2.GaussianBlur(
+        numpy.random.RandomState(0).randint(0, 256, (180, 320, 3)).astype(numpy.uint8),
+        (0, 0), 3)
+    for frame_num in range(90):
+        frame_img = background.copy()
+        if 20 <= frame_num < 40 or frame_num >= 80:
+            x = (frame_num % 20) * 10
+            cv2.rectangle(frame_img, (x, 80), (x + 40, 120), (255, 255, 255), -1)
+        writer.write(frame_img)
+    writer.release()
+
+    cap = cv2.VideoCapture(video_path)
+    sm = SceneManager()
+    sm.add_detector(MotionDetector(num_frames_post_scene=5))
+    assert sm.get_num_detectors() == 1
+
+    try:
+        num_frames = sm.detect_scenes(frame_source=cap)
+        assert num_frames == 90
+        assert not sm.get_cut_list()
+        assert [(start.get_frames(), end.get_frames())
+                for start, end in sm.get_scene_list()] == [(20, 45), (80, 90)]
+    finally:
+        cap.release()
+
+
+def test_pipeline_detect_scenes(tmp_path):
+    """ Test SceneManager pipeline mode (workers > 0) produces the same cuts and metrics
+    as sequential mode, both when computing and when reusing cached metrics. """
+    video_path = str(tmp_path / 'cuts.avi')
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'MJPG'), 30.0, (160, 90))
+    random_state = numpy.random.RandomState(0)
+    scenes = [random_state.randint(0, 256, (90, 160, 3)).astype(numpy.uint8)
+              for _ in range(3)]
+    for frame_num in range(120):
+        frame_img = scenes[frame_num // 40]
+        if 70 <= frame_num < 80:
+            # Fade out the second scene to black.
+            frame_img = (frame_img * ((80 - frame_num) / 10.0)).astype(numpy.uint8)
+        writer.write(frame_img)
+    writer.release()
+
+    def detect(workers, stats_manager):
+        cap = cv2.VideoCapture(video_path)
+        sm = SceneManager(stats_manager)
+        sm.add_detector(ContentDetector())
+        sm.add_detector(ThresholdDetector())
+        sm.add_detector(HashDetector())
+        sm.add_detector(HistogramDetector())
+        try:
+            assert sm.detect_scenes(frame_source=cap, workers=workers) == 120
+        finally:
+            cap.release()
+        return sm.get_cut_list()
+
+    sequential_stats = StatsManager()
+    pipeline_stats = StatsManager()
+    cut_list = detect(0, sequential_stats)
+    assert cut_list
+    assert detect(3, pipeline_stats) == cut_list
+    assert pipeline_stats._frame_metrics == sequential_stats._frame_metrics
+    # Second pass with all metrics already cached.
+    assert detect(3, pipeline_stats) == cut_list
+    assert pipeline_stats._frame_metrics == sequential_stats._frame_metrics
+
+
+
+def test_pipeline_scores_frames_concurrently(tmp_path):
+    """ Test that in pipeline mode, a frame is scored while the previous frame is still
+    being scored (score_frame only waits for the prepared data of the previous frame). """
+
+    class SlowScoreDetector(SceneDetector):
+        """ Detector which takes a long time to score each frame. """
+        def __init__(self):
+            super(SlowScoreDetector, self).__init__()
+            self.lock = threading.Lock()
+            self.num_scoring = 0
+            self.max_scoring = 0
+        def is_pipeline_supported(self):
+            return True
+        def prepare_frame(self, frame_img):
+            return float(frame_img.mean())
+        def score_frame(self, frame_num, curr_data, last_data):
+            with self.lock:
+                self.num_scoring += 1
+                self.max_scoring = max(self.max_scoring, self.num_scoring)
+            time.sleep(0.02)
+            with self.lock:
+                self.num_scoring -= 1
+            return {}
+
+    video = get_synthetic_video(str(tmp_path), width=64, height=48, num_frames=30, num_cuts=0)
+    detector = SlowScoreDetector()
+    sm = SceneManager()
+    sm.add_detector(detector)
+    cap = cv2.VideoCapture(video['path'])
+    try:
+        assert sm.detect_scenes(frame_source=cap, workers=4) == 30
+    finally:
+        cap.release()
+    assert detector.max_scoring > 1
+
+
+@pytest.mark.skipif(
+    shared_memory is None, reason='requires multiprocessing.shared_memory (Python 3.8+)')
+def test_multiprocess_detect_scenes(tmp_path):
+    """ Test SceneManager multiprocess mode (processes > 0) produces the same cuts, events,
+    and metrics as sequential mode. """
+    video_path = str(tmp_path / 'cuts.avi')
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'MJPG'), 30.0, (160, 90))
+    random_state = numpy.random.RandomState(0)
+    scenes = [random_state.randint(0, 256, (90, 160, 3)).astype(numpy.uint8)
+              for _ in range(3)]
+    for frame_num in range(120):
+        frame_img = scenes[frame_num // 40].copy()
+        if 50 <= frame_num < 60:
+            cv2.rectangle(frame_img, (frame_num, 20), (frame_num + 30, 50), (255, 255, 255), -1)
+        writer.write(frame_img)
+    writer.release()
+
+    def detect(processes):
+        cap = cv2.VideoCapture(video_path)
+        stats_manager = StatsManager()
+        sm = SceneManager(stats_manager)
+        sm.add_detector(ContentDetector())
+        sm.add_detector(HistogramDetector())
+        sm.add_detector(MotionDetector(num_frames_post_scene=5))
+        # CascadeDetector keeps a reference to the previous frame in the frame buffer.
+        sm.add_detector(CascadeDetector(HashDetector()))
+        try:
+            assert sm.detect_scenes(frame_source=cap, processes=processes) == 120
+        finally:
+            cap.release()
+        return sm.get_cut_list(), sm.get_event_list(), stats_manager._frame_metrics
+
+    cut_list, event_list, frame_metrics = detect(0)
+    assert cut_list and event_list
+    assert detect(2) == (cut_list, event_list, frame_metrics)
+
+
+def test_checkpoint_resume(tmp_path, monkeypatch):
+    """ Test SceneManager resumes from a checkpoint saved before processing was
+    interrupted, and detects the same cuts as an uninterrupted run. """
+    video = get_synthetic_video(str(tmp_path), width=160, height=90, num_frames=300,
+                                num_cuts=4, fade_length=10)
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+    # Advance the clock by one second on every call, so checkpoints are saved every few frames.
+    clock = iter(range(1000000))
+    monkeypatch.setattr('scenedetect.scene_manager.get_time', lambda: float(next(clock)))
+
+    class Interrupted(Exception):
+        pass
+
+    class InterruptedSource(object):
+        def __init__(self, video_manager, num_frames):
+            self.video_manager = video_manager
+            self.num_frames = num_frames
+        def read(self):
+            self.num_frames -= 1
+            if self.num_frames < 0:
+                raise Interrupted()
+            return self.video_manager.read()
+        def get(self, prop):
+            return self.video_manager.get(prop)
+        def seek(self, timecode):
+            return self.video_manager.seek(timecode)
+
+    def detect(workers, num_frames=None, resume=False):
+        video_manager = VideoManager([video['path']])
+        sm = SceneManager()
+        sm.add_detector(ContentDetector())
+        sm.add_detector(ThresholdDetector(threshold=40))
+        sm.set_checkpoint(checkpoint_path, interval=20.0, key=video['path'])
+        resume_frame = sm.load_checkpoint(checkpoint_path, key=video['path']) if resume else None
+        video_manager.start()
+        frame_source = video_manager
+        if num_frames is not None:
+            frame_source = InterruptedSource(video_manager, num_frames)
+        try:
+            sm.detect_scenes(frame_source=frame_source, workers=workers)
+        finally:
+            video_manager.release()
+        return sm.get_cut_list(), resume_frame
+
+    cut_list, _ = detect(0)
+    assert cut_list
+    assert not os.path.exists(checkpoint_path)
+    for workers in (0, 2):
+        with pytest.raises(Interrupted):
+            detect(workers, num_frames=150)
+        assert os.path.exists(checkpoint_path)
+        resumed_cut_list, resume_frame = detect(workers, resume=True)
+        assert 0 < resume_frame <= 150
+        assert resumed_cut_list == cut_list
+        # The checkpoint is removed once processing is complete.
+        assert not os.path.exists(checkpoint_path)
+    # Checkpoints of other inputs are ignored.
+    with pytest.raises(Interrupted):
+        detect(0, num_frames=150)
+    sm = SceneManager()
+    sm.add_detector(ContentDetector())
+    sm.add_detector(ThresholdDetector(threshold=40))
+    assert sm.load_checkpoint(checkpoint_path, key='other') is None
+    sm = SceneManager()
+    sm.add_detector(ContentDetector(threshold=10))
+    assert sm.load_checkpoint(checkpoint_path, key=video['path']) is None
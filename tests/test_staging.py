@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+""" PySceneDetect scenedetect.staging Tests
+
+This file includes unit tests for the scenedetect.staging module, which is used to
+copy input videos to local storage ahead of processing them.
+"""
+
+# Standard project pylint disables for unit tests using pytest.
+# pylint: disable=no-self-use, protected-access, multiple-statements, invalid-name
+# pylint: disable=redefined-outer-name
+
+
+import os
+
+import pytest
+
+from scenedetect.staging import StagingCache
+
+
+def test_staging_cache(tmp_path):
+    """ Test that inputs are copied to the scratch directory, and that the least recently
+    used copies are evicted once the size limit is exceeded (unless in use). """
+    input_paths = []
+    for name in ['a.mp4', 'b.mp4', 'c.mp4']:
+        (tmp_path / name).write_bytes(name.encode('ascii') * 50)
+        input_paths.append(str(tmp_path / name))
+    stager = StagingCache(str(tmp_path / 'scratch'), max_size=250, chunk_size=64)
+    try:
+        staged_a = stager.acquire(input_paths[0])
+        assert os.path.basename(staged_a) == 'a.mp4'
+        with open(staged_a, 'rb') as staged_file:
+            assert staged_file.read() == b'a.mp4' * 50
+        staged_b = stager.stage(input_paths[1]).result()
+        # Copy of a.mp4 is in use, so only b.mp4 can be evicted to stage c.mp4.
+        stager.stage(input_paths[2]).result()
+        assert stager.get_total_size() == 500
+        assert os.path.exists(staged_a) and not os.path.exists(staged_b)
+        stager.release(input_paths[0])
+        assert not os.path.exists(staged_a)
+        assert stager.get_total_size() == 250
+        with pytest.raises(IOError):
+            stager.acquire(str(tmp_path / 'missing.mp4'))
+    finally:
+        stager.close()
+    assert not os.listdir(str(tmp_path / 'scratch'))
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" PySceneDetect scenedetect.stats_cache Tests
+
+This file includes unit tests for the scenedetect.stats_cache module, which caches
+frame metrics and detected scenes keyed by the content of the input videos.
+"""
+
+# Standard project pylint disables for unit tests using pytest.
+# pylint: disable=no-self-use, protected-access, multiple-statements, invalid-name
+# pylint: disable=redefined-outer-name
+
+
+import os
+
+from scenedetect.benchmark import get_synthetic_video
+from scenedetect.cli.batch import run_cli_job
+from scenedetect.detectors import CascadeDetector
+from scenedetect.detectors import ContentDetector
+from scenedetect.detectors import MotionDetector
+from scenedetect.detectors import ThresholdDetector
+from scenedetect.scene_detector import SceneDetector
+from scenedetect.scene_manager import SceneManager
+from scenedetect.stats_cache import RESULTS_EXTENSION
+from scenedetect.stats_cache import STATS_EXTENSION
+from scenedetect.stats_cache import StatsCache
+from scenedetect.stats_cache import get_cache_keys
+from scenedetect.stats_cache import get_content_hash
+from scenedetect.stats_cache import get_detector_config
+from scenedetect.stats_cache import get_metric_config
+from scenedetect.stats_manager import StatsManager
+from scenedetect.video_manager import VideoManager
+
+
+def test_cache_keys(tmp_path):
+    """ Test the cache keys only depend on the content of the input and the options. """
+    path = tmp_path / 'a.bin'
+    path.write_bytes(b'a' * 3000)
+    copy_path = tmp_path / 'b.bin'
+    copy_path.write_bytes(b'a' * 3000)
+    assert get_content_hash(str(path), 1000) == get_content_hash(str(copy_path), 1000)
+    copy_path.write_bytes(b'a' * 1200 + b'b' + b'a' * 1799)
+    assert get_content_hash(str(path), 1000) != get_content_hash(str(copy_path), 1000)
+
+    assert get_detector_config(ContentDetector(threshold=30.0)) != get_detector_config(
+        ContentDetector(threshold=27.0))
+    assert 'num_threads' not in get_detector_config(ContentDetector(num_threads=2))
+
+    keys = get_cache_keys([str(path)], 0, None, 1, [ContentDetector()])
+    assert keys == get_cache_keys([str(path)], 0, None, 1, [ContentDetector()])
+    # Changing the detector parameters only changes the key of the results.
+    other_keys = get_cache_keys([str(path)], 0, None, 1, [ContentDetector(threshold=40.0)])
+    assert other_keys[0] == keys[0] and other_keys[1] != keys[1]
+    for other_keys in (get_cache_keys([str(path)], 10, None, 1, [ContentDetector()]),
+                       get_cache_keys([str(path)], 0, None, 2, [ContentDetector()]),
+                       get_cache_keys([str(path)], 0, None, 1, [ThresholdDetector()])):
+        assert other_keys[0] != keys[0] and other_keys[1] != keys[1]
+    # Parameters which affect the values of the metrics (even if not in the metric keys)
+    # must change the key of the frame metrics.
+    assert 'threshold' not in get_metric_config(MotionDetector())
+    keys = get_cache_keys([str(path)], 0, None, 1, [MotionDetector(kernel_size=3)])
+    other_keys = get_cache_keys([str(path)], 0, None, 1, [MotionDetector(kernel_size=5)])
+    assert other_keys[0] != keys[0] and other_keys[1] != keys[1]
+
+
+class _ThresholdOnlyDetector(SceneDetector):
+    """ Detector whose min_scene_len (unlike its threshold) affects its metrics. """
+    METRIC_INDEPENDENT_PARAMETERS = frozenset(['threshold'])
+
+    def __init__(self, threshold=1.0, min_scene_len=15):
+        super(_ThresholdOnlyDetector, self).__init__()
+        self.threshold = threshold
+        self.min_scene_len = min_scene_len
+
+
+def test_metric_independent_parameters():
+    """ Test the parameters excluded from the key of the frame metrics are declared by
+    each detector, including detectors wrapped by a CascadeDetector. """
+    assert get_metric_config(_ThresholdOnlyDetector()) == (
+        '_ThresholdOnlyDetector(min_scene_len=15)')
+    assert get_metric_config(CascadeDetector(ContentDetector(threshold=20.0))) == (
+        get_metric_config(CascadeDetector(ContentDetector(threshold=40.0))))
+    assert 'threshold=20.0' in get_detector_config(CascadeDetector(
+        ContentDetector(threshold=20.0), gate_threshold=8.0))
+    assert get_metric_config(CascadeDetector(ContentDetector(luma_only=True))) != (
+        get_metric_config(CascadeDetector(ContentDetector())))
+
+
+def test_stats_cache_eviction(tmp_path):
+    """ Test entries are loaded/saved, and the least recently used ones are evicted. """
+    # Each entry is about 160 bytes, so only two fit in the cache.
+    stats_cache = StatsCache(str(tmp_path / 'cache'), max_size=350)
+    for i, key in enumerate(['a', 'b']):
+        stats_cache.save_results(key, {'cuts': [0] * 50})
+        os.utime(stats_cache.get_path(key, RESULTS_EXTENSION), (i, i))
+    # Reading an entry marks it as the most recently used.
+    assert stats_cache.load_results('a') == {'cuts': [0] * 50}
+    stats_cache.save_results('c', {'cuts': [0] * 50})
+    assert stats_cache.get_total_size() <= 350
+    assert stats_cache.load_results('b') is None
+    assert stats_cache.load_results('a') is not None
+    assert stats_cache.load_results('c') is not None
+    assert not stats_cache.load_stats('b', StatsManager())
+
+
+def test_scene_manager_results(tmp_path):
+    """ Test restoring the results of detect_scenes with SceneManager.set_results. """
+    video = get_synthetic_video(str(tmp_path), width=64, height=48, num_frames=100,
+                                num_cuts=3)
+    video_manager = VideoManager([video['path']])
+    try:
+        scene_manager = SceneManager()
+        scene_manager.add_detector(ContentDetector())
+        video_manager.start()
+        scene_manager.detect_scenes(video_manager, show_progress=False)
+        results = scene_manager.get_results()
+    finally:
+        video_manager.release()
+    restored = SceneManager()
+    restored.set_results(results)
+    assert restored.get_scene_list() == scene_manager.get_scene_list()
+    assert restored.get_cut_list() == scene_manager.get_cut_list()
+    assert len(restored.get_cut_list()) == 3
+
+
+def test_cli_cache(tmp_path):
+    """ Test the --cache-dir option skips detection of inputs processed before. """
+    video = get_synthetic_video(str(tmp_path), width=64, height=48, num_frames=100,
+                                num_cuts=3)
+    cache_dir = str(tmp_path / 'cache')
+    args = ['--cache-dir', cache_dir, '-q', '-i', video['path'], 'detect-content']
+    cli_ctx, error, _ = run_cli_job(args)
+    assert error is None
+    scene_list = cli_ctx.scene_manager.get_scene_list()
+    assert len(scene_list) == 4
+    assert sorted(name.split('.', 1)[1] for name in os.listdir(cache_dir)) == [
+        RESULTS_EXTENSION[1:], STATS_EXTENSION[1:]]
+
+    cli_ctx, error, _ = run_cli_job(args)
+    assert error is None
+    assert cli_ctx.num_frames_processed == 100
+    assert cli_ctx.scene_manager.get_scene_list() == scene_list
+    # Frame metrics are reused when only the detector parameters change.
+    cli_ctx, error, _ = run_cli_job(args + ['-t', '35'])
+    assert error is None
+    assert cli_ctx.stats_manager.metrics_exist(1, ['content_val'])
+    assert len(os.listdir(cache_dir)) == 3
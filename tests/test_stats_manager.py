@@ -47,6 +47,8 @@ These files will be deleted, if possible, after the tests are completed running.
 
 
 # Standard Library Imports
+import gzip
+import io
 import os
 import random
 
@@ -65,6 +67,9 @@ from scenedetect.platform import get_csv_writer
 from scenedetect.stats_manager import StatsManager
 from scenedetect.stats_manager import FrameMetricRegistered
 from scenedetect.stats_manager import StatsFileCorrupt
+from scenedetect.stats_manager import open_stats_file
+from scenedetect.stats_manager import read_stats_index
+from scenedetect.stats_manager import write_stats_index
 
 from scenedetect.stats_manager import COLUMN_NAME_FRAME_NUMBER
 from scenedetect.stats_manager import COLUMN_NAME_TIMECODE
@@ -314,3 +319,191 @@ def test_load_corrupt_stats():
 
         with pytest.raises(StatsFileCorrupt):
             stats_manager.load_from_csv(TEST_STATS_FILES[0])
+
+
+def test_save_load_integer_metrics():
+    """ Test that integer metrics (e.g. 64-bit frame hashes) are loaded back exactly. """
+
+    some_metric_key = 'some_metric'
+    some_metric_value = 2**63 + 12345
+    some_frame_key = 100
+    base_timecode = FrameTimecode(0, 29.97)
+
+    stats_manager = StatsManager()
+    stats_manager.register_metrics([some_metric_key])
+    stats_manager.set_metrics(some_frame_key, {some_metric_key: some_metric_value})
+    with open(TEST_STATS_FILES[0], 'w') as stats_file:
+        stats_manager.save_to_csv(stats_file, base_timecode)
+
+    stats_manager = StatsManager()
+    with open(TEST_STATS_FILES[0], 'r') as stats_file:
+        stats_manager.load_from_csv(stats_file)
+
+    metric_value = stats_manager.get_metrics(some_frame_key, [some_metric_key])[0]
+    assert isinstance(metric_value, int)
+    assert metric_value == some_metric_value
+
+
+def test_save_load_csv_format():
+    """ Test that saved stats files are the same as writing each row with a csv.writer,
+    and that loading them restores the same metrics (including missing values). """
+    base_timecode = FrameTimecode(10, 29.97)
+    random_state = random.Random(0)
+    stats_manager = StatsManager()
+    stats_manager.register_metrics(['float_metric', 'int_metric', 'sparse_metric'])
+    for frame_num in range(25000):
+        metrics = {'float_metric': random_state.choice(
+            [random_state.random(), 1e-7 * random_state.random(), 0.0, 12345.0]),
+                   'int_metric': random_state.getrandbits(64)}
+        if frame_num % 3 == 0:
+            metrics['sparse_metric'] = random_state.randint(0, 100)
+        stats_manager.set_metrics(frame_num, metrics)
+    stats_manager.set_metrics(123, {'sparse_metric': 'a, "quoted" value'})
+
+    output = io.StringIO()
+    stats_manager.save_to_csv(output, base_timecode)
+    expected = io.StringIO()
+    csv_writer = get_csv_writer(expected)
+    csv_writer.writerow([COLUMN_NAME_FRAME_NUMBER, COLUMN_NAME_TIMECODE,
+                         'float_metric', 'int_metric', 'sparse_metric'])
+    for frame_num in sorted(stats_manager._frame_metrics):
+        frame_timecode = base_timecode + frame_num
+        csv_writer.writerow(
+            [frame_timecode.get_frames(), frame_timecode.get_timecode()] + [
+                str(metric) for metric in stats_manager.get_metrics(
+                    frame_num, ['float_metric', 'int_metric', 'sparse_metric'])])
+    assert output.getvalue() == expected.getvalue()
+
+    # String metrics are only supported when saving.
+    stats_manager.set_metrics(123, {'sparse_metric': 5})
+    output = io.StringIO()
+    stats_manager.save_to_csv(output, base_timecode)
+    loaded_stats_manager = StatsManager()
+    assert loaded_stats_manager.load_from_csv(io.StringIO(output.getvalue())) == 25000
+    assert loaded_stats_manager._frame_metrics == {
+        frame_num + 10: metrics for frame_num, metrics in stats_manager._frame_metrics.items()}
+    assert isinstance(loaded_stats_manager.get_metrics(10, ['int_metric'])[0], int)
+    assert isinstance(loaded_stats_manager.get_metrics(10, ['float_metric'])[0], float)
+
+
+def test_save_load_compressed(tmp_path):
+    """ Test saving and loading a stats file compressed with gzip. """
+    stats_manager = StatsManager()
+    stats_manager.register_metrics(['some_metric'])
+    for frame_num in range(1000):
+        stats_manager.set_metrics(frame_num, {'some_metric': frame_num / 3.0})
+    base_timecode = FrameTimecode(0, 30.0)
+
+    stats_path = str(tmp_path / 'video.stats.csv')
+    with open_stats_file(stats_path, 'wt') as stats_file:
+        stats_manager.save_to_csv(stats_file, base_timecode)
+    with open_stats_file(stats_path + '.gz', 'wt') as stats_file:
+        stats_manager.save_to_csv(stats_file, base_timecode)
+    with gzip.open(stats_path + '.gz', 'rt') as stats_file, open(stats_path, 'rt') as csv_file:
+        assert stats_file.read() == csv_file.read()
+    assert os.path.getsize(stats_path + '.gz') < os.path.getsize(stats_path) / 2
+
+    loaded_stats_manager = StatsManager()
+    with open_stats_file(stats_path + '.gz', 'rt') as stats_file:
+        assert loaded_stats_manager.load_from_csv(stats_file) == 1000
+    assert loaded_stats_manager._frame_metrics == stats_manager._frame_metrics
+    with pytest.raises(ValueError):
+        stats_manager.start_stream(stats_path + '.gz', base_timecode)
+
+
+def test_load_range_save_to_path(tmp_path):
+    """ Test loading only a range of frames from a stats file with an index, and that saving
+    it back only replaces that range, the same as saving all metrics. """
+    stats_path = str(tmp_path / 'video.stats.csv')
+    base_timecode = FrameTimecode(0, 30.0)
+    metric_keys = ['some_metric', 'other_metric']
+    all_metrics = StatsManager()
+    all_metrics.register_metrics(metric_keys)
+    for frame_num in range(5000):
+        all_metrics.set_metrics(frame_num, {'some_metric': frame_num / 7.0,
+                                            'other_metric': frame_num % 13})
+    all_metrics.save_to_path(stats_path, base_timecode)
+    assert read_stats_index(stats_path) is not None
+
+    def get_expected():
+        output = io.StringIO()
+        all_metrics.save_to_csv(output, base_timecode)
+        return output.getvalue()
+
+    # Ranges in the middle, start, and end of the file.
+    for start_frame, end_frame in [(2500, 2600), (None, 10), (4990, None)]:
+        stats_manager = StatsManager()
+        stats_manager.register_metrics(metric_keys)
+        num_frames = stats_manager.load_range(stats_path, start_frame, end_frame)
+        assert num_frames == 1000
+        frame_numbers = stats_manager.get_frame_numbers()
+        assert start_frame is None or frame_numbers[0] <= start_frame
+        assert end_frame is None or frame_numbers[-1] >= end_frame - 1
+        for frame_num in frame_numbers[::3]:
+            stats_manager.set_metrics(frame_num, {'some_metric': -1.0})
+            all_metrics.set_metrics(frame_num, {'some_metric': -1.0})
+        stats_manager.save_to_path(stats_path, base_timecode)
+        with open(stats_path, 'rt') as stats_file:
+            assert stats_file.read() == get_expected()
+        index = read_stats_index(stats_path)
+        assert index is not None
+        assert write_stats_index(stats_path)
+        assert read_stats_index(stats_path) == dict(index, mtime=os.stat(stats_path).st_mtime_ns)
+
+    # Frames outside of the range loaded require the rest of the file to be loaded.
+    stats_manager = StatsManager()
+    stats_manager.register_metrics(metric_keys)
+    stats_manager.load_range(stats_path, 2500, 2600)
+    stats_manager.set_metrics(6000, {'some_metric': 1.0})
+    all_metrics.set_metrics(6000, {'some_metric': 1.0})
+    stats_manager.save_to_path(stats_path, base_timecode)
+    with open(stats_path, 'rt') as stats_file:
+        assert stats_file.read() == get_expected()
+
+
+def test_stream_to_csv(tmp_path):
+    """ Test streaming metrics to a stats file, resuming from an interrupted stream, and that
+    the completed stream is the same as the output of save_to_csv. """
+
+    metric_keys = ['a', 'b']
+    base_timecode = FrameTimecode(0, 29.97)
+    stream_path = str(tmp_path / 'stream.csv')
+
+    stats_manager = StatsManager()
+    stats_manager.register_metrics(metric_keys)
+    stats_manager.start_stream(stream_path, base_timecode, flush_interval=1000.0)
+    assert stats_manager.is_streaming()
+    for frame_num in range(20):
+        stats_manager.set_metrics(frame_num, {'a': frame_num * 0.5, 'b': frame_num})
+        # Only flushed once flush_interval has passed, unless forced.
+        assert stats_manager.flush_stream(force=False) == 0
+        if frame_num % 5 == 4:
+            assert stats_manager.flush_stream() == 5
+    # Simulate an interrupted write of the next row.
+    stats_manager._stream_file.write('20,00:00:00.667,1')
+    stats_manager._stream_file.flush()
+
+    stats_manager = StatsManager()
+    stats_manager.register_metrics(metric_keys)
+    with open(stream_path, 'r') as stats_file:
+        assert stats_manager.load_from_csv(stats_file) == 20
+    assert not stats_manager.metrics_exist(20, metric_keys)
+
+    # Resume, and update an earlier frame after it was written.
+    stats_manager.start_stream(stream_path, base_timecode)
+    for frame_num in range(20, 30):
+        stats_manager.set_metrics(frame_num, {'a': frame_num * 0.5, 'b': frame_num})
+    stats_manager.flush_stream()
+    stats_manager.set_metrics(3, {'a': -1.0})
+    stats_manager.flush_stream()
+    with open(stream_path, 'r') as stats_file:
+        assert StatsManager().load_from_csv(stats_file) == 31
+    stats_manager.close_stream()
+    assert not stats_manager.is_streaming()
+    assert not stats_manager.is_save_required()
+
+    with open(str(tmp_path / 'saved.csv'), 'w') as stats_file:
+        stats_manager.save_to_csv(stats_file, base_timecode)
+    with open(stream_path, 'r') as stream_file, open(str(tmp_path / 'saved.csv')) as saved_file:
+        assert stream_file.read() == saved_file.read()
+    assert stats_manager.get_metrics(3, metric_keys) == [-1.0, 3]
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" PySceneDetect scenedetect.sweep Tests
+
+This file includes unit tests for the scenedetect.sweep module, which implements the
+sweep command (finding the cuts of many detector parameters from cached metrics).
+"""
+
+# Standard project pylint disables for unit tests using pytest.
+# pylint: disable=no-self-use, protected-access, multiple-statements, invalid-name
+# pylint: disable=redefined-outer-name
+
+
+import io
+import itertools
+
+import pytest
+
+from scenedetect.benchmark import get_synthetic_video
+from scenedetect.detectors import AdaptiveDetector
+from scenedetect.detectors import ContentDetector
+from scenedetect.detectors import ThresholdDetector
+from scenedetect.scene_manager import SceneManager
+from scenedetect.stats_manager import StatsManager
+from scenedetect.sweep import add_accuracy
+from scenedetect.sweep import get_report
+from scenedetect.sweep import load_cut_list
+from scenedetect.sweep import parse_sweep_values
+from scenedetect.sweep import sweep
+from scenedetect.sweep import write_results
+from scenedetect.video_manager import VideoManager
+
+
+def detect_cuts(video_path, detector_factory, stats_manager):
+    # type: (str, Callable[[VideoManager], SceneDetector], StatsManager) -> List[int]
+    """ Detects the cuts of the video with the detector returned by detector_factory. """
+    video_manager = VideoManager([video_path])
+    try:
+        scene_manager = SceneManager(stats_manager)
+        scene_manager.add_detector(detector_factory(video_manager))
+        video_manager.start()
+        scene_manager.detect_scenes(video_manager, show_progress=False)
+        return [cut.get_frames() for cut in scene_manager.get_cut_list()]
+    finally:
+        video_manager.release()
+
+
+def test_parse_sweep_values():
+    """ Test parsing lists and ranges of sweep values. """
+    assert parse_sweep_values('10,20:30:2.5') == [10.0, 20.0, 22.5, 25.0, 27.5, 30.0]
+    assert parse_sweep_values('0.1:0.3:0.1') == [0.1, 0.2, 0.3]
+    assert parse_sweep_values('5:15:5', int) == [5, 10, 15]
+    for spec in ('1:2', '2:1:1', '1:2:0', 'x'):
+        with pytest.raises(ValueError):
+            parse_sweep_values(spec)
+    assert load_cut_list(io.StringIO(u'30, 10\n20')) == [10, 20, 30]
+
+
+@pytest.mark.parametrize('detector', ['content', 'threshold', 'adaptive'])
+def test_sweep_matches_detector(tmp_path, detector):
+    """ Test that the cuts of each combination are identical to those of the detector. """
+    video = get_synthetic_video(str(tmp_path), width=64, height=48, num_frames=200,
+                                num_cuts=5, fade_length=8)
+    # Swept parameters, in the order of the arguments of each detector factory.
+    if detector == 'content':
+        names = ('threshold', 'min_scene_len')
+        parameters = {'thresholds': [5.0, 30.0, 60.0], 'min_scene_lens': [0, 15, 50]}
+        def detector_factory(threshold, min_scene_len):
+            return lambda video_manager: ContentDetector(threshold, min_scene_len)
+    elif detector == 'threshold':
+        names = ('threshold', 'min_scene_len', 'fade_bias')
+        parameters = {'thresholds': [12, 60], 'min_scene_lens': [0, 50],
+                      'fade_biases': [-1.0, 0.5], 'add_final_scene': True}
+        def detector_factory(threshold, min_scene_len, fade_bias):
+            return lambda video_manager: ThresholdDetector(
+                threshold, min_scene_len, fade_bias, add_final_scene=True)
+    else:
+        names = ('adaptive_threshold', 'min_scene_len', 'window_width', 'min_delta_hsv')
+        parameters = {'adaptive_thresholds': [2.0, 3.0], 'min_scene_lens': [0, 50],
+                      'window_widths': [1, 3], 'min_delta_hsvs': [0.0, 15.0]}
+        def detector_factory(adaptive_threshold, min_scene_len, window_width, min_delta_hsv):
+            return lambda video_manager: AdaptiveDetector(
+                video_manager, adaptive_threshold, min_scene_len=min_scene_len,
+                window_width=window_width, min_delta_hsv=min_delta_hsv)
+
+    # Metrics do not depend on the parameters, so they are computed only once.
+    stats_manager = StatsManager()
+    swept_values = [values for values in parameters.values() if isinstance(values, list)]
+    detect_cuts(video['path'], detector_factory(*[values[0] for values in swept_values]),
+                stats_manager)
+    results = sweep(stats_manager, detector, **parameters)
+    assert len(results) == len(list(itertools.product(*swept_values)))
+    found_cuts = False
+    for result in results:
+        expected = detect_cuts(video['path'], detector_factory(
+            *[result[name] for name in names]), StatsManager())
+        assert result['cuts'] == expected
+        assert result['num_scenes'] == len(expected) + 1
+        found_cuts = found_cuts or bool(expected)
+    assert found_cuts
+
+
+def test_sweep_results(tmp_path):
+    """ Test the accuracy, report, and CSV output of sweep results. """
+    stats_manager = StatsManager()
+    for frame_num in range(1, 100):
+        stats_manager.set_metrics(frame_num, {
+            ContentDetector.FRAME_SCORE_KEY: 50.0 if frame_num % 20 == 0 else 1.0})
+    results = sweep(stats_manager, 'content', thresholds=[10.0, 0.0], min_scene_lens=[15])
+    assert results[0]['cuts'] == [20, 40, 60, 80]
+    assert results[1]['cuts'] == [15, 30, 45, 60, 75, 90]
+    add_accuracy(results, [20, 40, 60, 80], tolerance=0)
+    assert results[0]['f1_score'] == 1.0 and results[1]['precision'] == pytest.approx(1 / 6.0)
+    report = get_report(results, max_rows=1).splitlines()
+    assert len(report) == 3 and report[2].split()[0] == '10'
+    output = io.StringIO()
+    write_results(output, results)
+    lines = output.getvalue().splitlines()
+    assert lines[0] == 'detector,threshold,min_scene_len,num_scenes,precision,recall,f1_score,cuts'
+    assert lines[1] == 'content,10.0,15,5,1.0,1.0,1.0,20 40 60 80'
+    with pytest.raises(ValueError):
+        sweep(stats_manager, 'hash')
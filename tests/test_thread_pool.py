@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+#
+#         PySceneDetect: Python-Based Video Scene Detector
+#   ---------------------------------------------------------------
+#     [  Site: http://www.bcastell.com/projects/PySceneDetect/   ]
+#     [  Github: https://github.com/Breakthrough/PySceneDetect/  ]
+#     [  Documentation: http://pyscenedetect.readthedocs.org/    ]
+#
+# Copyright (C) 2014-2021 Brandon Castellano <http://www.bcastell.com>.
+#
+# PySceneDetect is licensed under the BSD 3-Clause License; see the included
+# LICENSE file, or visit one of the following pages for details:
+#  - https://github.com/Breakthrough/PySceneDetect/
+#  - http://www.bcastell.com/projects/PySceneDetect/
+#
+# This software uses Numpy, OpenCV, click, tqdm, simpletable, and pytest.
+# See the included LICENSE files or one of the above URLs for more information.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+""" PySceneDetect scenedetect.thread_pool Tests
+
+This file includes unit tests for the scenedetect.thread_pool module, which is used
+to compute frame metrics on horizontal tiles of each frame in parallel.
+"""
+
+# Standard project pylint disables for unit tests using pytest.
+# pylint: disable=no-self-use, protected-access, multiple-statements, invalid-name
+# pylint: disable=redefined-outer-name
+
+
+from scenedetect.thread_pool import get_thread_pool
+from scenedetect.thread_pool import get_tile_slices
+from scenedetect.thread_pool import map_tiles
+
+
+def test_tile_slices():
+    """ Test that tiles cover every row of a frame exactly once, in order. """
+    for height in [1, 7, 100, 2160]:
+        for num_tiles in [1, 2, 3, 8, 16]:
+            tiles = get_tile_slices(height, num_tiles)
+            assert len(tiles) == min(height, num_tiles)
+            assert [row for tile in tiles for row in range(height)[tile]] == list(range(height))
+
+
+def test_map_tiles():
+    """ Test that map_tiles returns results in order, and that thread pools persist. """
+    assert map_tiles(lambda rows: (rows.start, rows.stop), 10, 1) == [(0, 10)]
+    assert map_tiles(lambda rows: (rows.start, rows.stop), 10, 3) == [(0, 3), (3, 6), (6, 10)]
+    assert get_thread_pool(3) is get_thread_pool(3)